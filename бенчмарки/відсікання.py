@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк вибіркових відсікань ChessAI (PVS, вікно кореня, нульовий хід, LMR, марні ходи)
+
+Набирає позиції з випадкових партій (фіксований seed) і шукає кожну на
+фіксовану глибину без лімітів часу й вузлів у кількох конфігураціях:
+усі відсікання вимкнено (база), кожне окремо і всі разом. Для кожної
+конфігурації - сума вузлів, скорочення вузлів відносно бази, час, лічильники
+відсікання і скільки найкращих ходів збіглося з базою. Кожен пошук іде з
+чистою таблицею транспозицій і евристиками, тож конфігурації не заважають одна одній.
+
+Приклад:
+    python бенчмарки/відсікання.py --depth 3 --positions 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from логування import set_quiet_mode  # noqa: E402
+
+
+def collect_positions(count: int, plies: int, seed: int):
+    """Знімки позицій після plies випадкових півходів"""
+    from стан_гри import GameState
+
+    game_state = GameState()
+    positions = []
+    for index in range(count):
+        rng = random.Random(seed + index)
+        game_state.reset_game()
+        for _ in range(plies):
+            legal_moves = game_state.generate_legal_moves()
+            if not legal_moves or game_state.game_over:
+                break
+            game_state.apply_move(rng.choice(legal_moves))
+        if not game_state.game_over:
+            positions.append(game_state.snapshot())
+    return positions, game_state
+
+
+def run(pruning: Dict[str, bool], positions: List[dict], game_state, depth: int) -> dict:
+    """Пошук усіх позицій на глибину depth з перемикачами pruning"""
+    from штучний_інтелект import ChessAI
+    from штучний_інтелект.алгоритм import PRUNING_COUNTERS
+
+    nodes, moves = 0, []
+    counters = dict.fromkeys(PRUNING_COUNTERS, 0)
+    start_time = time.perf_counter()
+    for snapshot in positions:
+        game_state.restore_snapshot(snapshot)
+        ai = ChessAI(depth=depth, time_limit=None, node_limit=None, pruning=pruning)
+        moves.append(ai.get_best_move(game_state, game_state.current_player))
+        stats = ai.get_search_stats()
+        nodes += stats['nodes']
+        for name in counters:
+            counters[name] += stats[name]
+    return {'nodes': nodes, 'time': time.perf_counter() - start_time, 'moves': moves, 'counters': counters}
+
+
+def main(argv: Optional[List[str]] = None):
+    from штучний_інтелект.алгоритм import PRUNING_TECHNIQUES
+
+    parser = argparse.ArgumentParser(description="Скорочення вузлів вибірковими відсіканнями")
+    parser.add_argument("--positions", type=int, default=3, help="кількість позицій")
+    parser.add_argument("--plies", type=int, default=40, help="випадкових півходів до позиції")
+    parser.add_argument("--seed", type=int, default=0, help="seed випадкових партій")
+    parser.add_argument("--depth", type=int, default=3, help="фіксована глибина пошуку")
+    parser.add_argument("--techniques", nargs="+", choices=PRUNING_TECHNIQUES, default=list(PRUNING_TECHNIQUES),
+                        help="які відсікання вимірювати окремо")
+    args = parser.parse_args(argv)
+
+    set_quiet_mode(True)
+    positions, game_state = collect_positions(args.positions, args.plies, args.seed)
+    print(f"⏱️ Позицій: {len(positions)}, глибина {args.depth}")
+
+    configs = [("без відсікань", {})]
+    configs += [(technique, {technique: True}) for technique in args.techniques]
+    configs.append(("усі", {technique: True for technique in PRUNING_TECHNIQUES}))
+
+    baseline = None
+    for name, enabled in configs:
+        pruning = {technique: enabled.get(technique, False) for technique in PRUNING_TECHNIQUES}
+        result = run(pruning, positions, game_state, args.depth)
+        baseline = baseline or result
+        same = sum(move == base for move, base in zip(result['moves'], baseline['moves']))
+        counters = ", ".join(f"{counter} {count}" for counter, count in result['counters'].items() if count)
+        print(f"   {name:14s}: {result['nodes']:8d} вузлів ({result['nodes'] / max(1, baseline['nodes']):6.1%}), "
+              f"{result['time']:7.1f} с, ходи як у бази {same}/{len(positions)}"
+              + (f"\n{'':19s}{counters}" if counters else ""))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
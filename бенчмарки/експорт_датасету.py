@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Перевірка та бенчмарк експорту тензорів ознак (штучний_інтелект.датасет)
+
+Експортує партії з різною кількістю процесів і вимірює позицій/с, звіряє, що
+шарди однакові незалежно від кількості процесів, а потім відтворює випадкові
+позиції й порівнює їхні площини з наївним обходом дошки (get_all_pieces,
+параліч, таймер туманності, посилення кожної фігури) і мітки - з ходом партії.
+
+Приклад:
+    python бенчмарки/експорт_датасету.py логи/симуляції.jsonl --workers 1 2 4 --samples 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from логування import set_quiet_mode  # noqa: E402
+
+
+def naive_planes(game_state):
+    """Площини позиції обходом фігур (еталон для encode_planes)"""
+    import numpy as np
+    from налаштування import PieceColor, BOARD_ROWS, BOARD_COLS
+    from штучний_інтелект import датасет
+
+    board = game_state.board
+    planes = np.zeros((датасет.PLANE_COUNT, BOARD_ROWS, BOARD_COLS), dtype=np.uint8)
+    for row, col, piece in board.get_all_pieces():
+        color_name = 'white' if piece.color == PieceColor.WHITE else 'black'
+        planes[датасет.PLANE_NAMES.index(f"{color_name}_{piece.type.name.lower()}"), row, col] = 1
+        planes[датасет.PLANE_PARALYSIS, row, col] = board.paralysis_turns[piece.id]
+        planes[датасет.PLANE_NEBULA_TIMER, row, col] = board.get_nebula_timer(piece.id)
+        planes[датасет.PLANE_ENHANCED, row, col] = board.enhanced[piece.id]
+    planes[датасет.PLANE_SIDE_TO_MOVE] = game_state.current_player == PieceColor.WHITE
+    return planes
+
+
+def read_dataset(directory: Path):
+    """Усі шарди теки: (площини, мітки) одним масивом (лише для невеликих перевірок)"""
+    import numpy as np
+
+    manifest = json.loads((directory / "опис.json").read_text(encoding="utf-8"))
+    planes = [np.load(directory / shard['planes'], mmap_mode='r') for shard in manifest['shards']]
+    labels = [np.load(directory / shard['labels']) for shard in manifest['shards']]
+    return np.concatenate(planes), np.concatenate(labels)
+
+
+def verify_samples(sources: List[Path], planes, labels, samples: int, seed: int) -> int:
+    """Відтворює випадкові позиції датасету і звіряє площини й мітки; повертає кількість розбіжностей"""
+    import numpy as np
+    from стан_гри import GameState
+    from штучний_інтелект.книга_дебютів import iter_games
+    from штучний_інтелект.транспозиції import encode_full_move
+    from штучний_інтелект import датасет
+
+    games = [(notations, result) for source in sources for notations, result in iter_games(source)
+             if result in датасет.RESULT_LABELS]
+    rng = random.Random(seed)
+    game_state = GameState()
+    failures = 0
+    for row in sorted(rng.sample(range(len(labels)), min(samples, len(labels)))):
+        label = labels[row]
+        notations, result = games[int(label['game'])]
+        game_state.reset_game()
+        for notation in notations[:int(label['ply'])]:
+            game_state.apply_move(game_state.find_move_by_notation(notation))
+        move = game_state.find_move_by_notation(notations[int(label['ply'])])
+        expected = naive_planes(game_state)
+        if (not np.array_equal(planes[row], expected) or int(label['move']) != encode_full_move(move)
+                or int(label['result']) != датасет.RESULT_LABELS[result]):
+            failures += 1
+            print(f"❌ Позиція {row} (партія {label['game']}, півхід {label['ply']}) не збігається")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Звірка і швидкість експорту тензорів ознак")
+    parser.add_argument("sources", type=Path, nargs="+", help="JSONL симулятора, .pgn або лог партій")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2], help="кількості процесів для порівняння")
+    parser.add_argument("--shard-size", type=int, default=1024, help="позицій у шарді")
+    parser.add_argument("--samples", type=int, default=100, help="позицій для звірки відтворенням")
+    parser.add_argument("--seed", type=int, default=0, help="seed вибору позицій")
+    args = parser.parse_args(argv)
+
+    set_quiet_mode(True)
+    import numpy as np
+    from штучний_інтелект.датасет import export_dataset
+
+    failures = 0
+    reference = None
+    for workers in args.workers:
+        directory = Path(tempfile.mkdtemp(prefix="датасет_"))
+        stats = export_dataset(args.sources, directory, args.shard_size, workers)
+        print(f"🧮 {workers} процесів: {stats['positions']} позицій, {stats['shards']} шардів, "
+              f"{stats['time']:.1f} с ({stats['positions'] / max(stats['time'], 1e-9):.0f} позицій/с)")
+        planes, labels = read_dataset(directory)
+        if reference is None:
+            reference = (planes, labels)
+            failures += verify_samples(args.sources, planes, labels, args.samples, args.seed)
+        elif not (np.array_equal(reference[0], planes) and np.array_equal(reference[1], labels)):
+            failures += 1
+            print(f"❌ Датасет {workers} процесів відрізняється від датасету {args.workers[0]} процесів")
+
+    print(f"   розбіжностей: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Перевірка та бенчмарк інкрементальної оцінки позиції (PositionEvaluator)
+
+Грає випадкові партії (фіксований seed) і після кожного півходу звіряє
+накопичувачі дошки (piece_counts, square_score, enhanced_counts) з повним
+перерахунком - PositionEvaluator.verify_incremental(). Потім на зібраних
+позиціях вимірює оцінок/с:
+    - "сканування": повне сканування дошки (матеріал по get_all_pieces,
+                    контроль центру пробами 16 клітинок), як оцінювач робив раніше;
+    - "gather":     таблиці ваг клітинок одним векторним gather по mailbox
+                    (PositionEvaluator.evaluate_square_tables);
+    - "накопичувачі": поточний evaluate_position.
+
+Приклад:
+    python бенчмарки/оцінка_позиції.py --games 4 --plies 150 --repeat 5
+    python бенчмарки/оцінка_позиції.py --tables таблиці.npz
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from налаштування import PieceColor  # noqa: E402
+from логування import set_quiet_mode  # noqa: E402
+
+CENTER_SQUARES = [(row, col) for row in range(8, 12) for col in range(8, 12)]
+
+
+def legacy_evaluate(evaluator, game_state) -> float:
+    """Оцінка повним скануванням дошки (для порівняння швидкості)"""
+    board = game_state.board
+    material = 0.0
+    for row, col, piece in board.get_all_pieces():
+        value = evaluator.PIECE_VALUES.get(piece.type, 0.0)
+        material += value if piece.color == PieceColor.WHITE else -value
+
+    center = 0
+    for row, col in CENTER_SQUARES:
+        piece = board.get_piece_at(row, col)
+        if piece and not piece.is_empty():
+            center += 1 if piece.color == PieceColor.WHITE else -1
+
+    return (material * evaluator.MATERIAL_WEIGHT + center * evaluator.CENTER_WEIGHT
+            + evaluator._calculate_special_abilities(game_state) * evaluator.SPECIAL_WEIGHT)
+
+
+def gather_evaluate(evaluator, game_state) -> float:
+    """Оцінка з повним перерахунком таблиць ваг клітинок (gather по mailbox)"""
+    return (evaluator._calculate_material(game_state) * evaluator.MATERIAL_WEIGHT
+            + evaluator.evaluate_square_tables(game_state.board)
+            + evaluator._calculate_special_abilities(game_state) * evaluator.SPECIAL_WEIGHT)
+
+
+def play_and_verify(evaluator, games: int, plies: int, seed: int):
+    """Випадкові партії зі звіркою після кожного півходу; повертає знімки та кількість розбіжностей"""
+    from стан_гри import GameState
+
+    game_state = GameState()
+    positions = []
+    failures = 0
+    for game_index in range(games):
+        rng = random.Random(seed + game_index)
+        game_state.reset_game()
+        evaluator.evaluate_position(game_state)
+        for ply in range(plies):
+            legal_moves = game_state.generate_legal_moves()
+            if not legal_moves or game_state.game_over:
+                break
+            game_state.apply_move(rng.choice(legal_moves))
+            mismatches = evaluator.verify_incremental(game_state)
+            if mismatches:
+                failures += 1
+                print(f"❌ Партія {game_index}, півхід {ply}: {mismatches}")
+            positions.append(game_state.snapshot())
+    return positions, game_state, failures
+
+
+def measure(game_state, positions: List[dict], evaluate: Callable, repeat: int) -> float:
+    """Оцінок за секунду на зібраних позиціях (мінімальний час з repeat проходів)"""
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for snapshot in positions:
+            game_state.restore_snapshot(snapshot)
+            start_time = time.perf_counter()
+            evaluate(game_state)
+            elapsed += time.perf_counter() - start_time
+        best = min(best, elapsed)
+    return len(positions) / max(best, 1e-9)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Звірка та швидкість інкрементальної оцінки позиції")
+    parser.add_argument("--games", type=int, default=4, help="кількість випадкових партій")
+    parser.add_argument("--plies", type=int, default=150, help="півходів на партію")
+    parser.add_argument("--seed", type=int, default=0, help="seed випадкових партій")
+    parser.add_argument("--repeat", type=int, default=5, help="проходів вимірювання (береться найкращий)")
+    parser.add_argument("--tables", type=Path, default=None, help="файл .npz з таблицями ваг клітинок")
+    args = parser.parse_args(argv)
+
+    from штучний_інтелект import PositionEvaluator
+
+    set_quiet_mode(True)
+    evaluator = PositionEvaluator(args.tables)
+    positions, game_state, failures = play_and_verify(evaluator, args.games, args.plies, args.seed)
+    print(f"🔎 Позицій: {len(positions)}, розбіжностей накопичувачів: {failures}")
+
+    for snapshot in positions:
+        game_state.restore_snapshot(snapshot)
+        incremental = evaluator.evaluate_position(game_state)
+        full = gather_evaluate(evaluator, game_state)
+        if not game_state.game_over and abs(incremental - full) > 1e-6:
+            failures += 1
+            print(f"❌ Оцінка {incremental:.4f} != повний перерахунок {full:.4f}")
+
+    scan = measure(game_state, positions, lambda state: legacy_evaluate(evaluator, state), args.repeat)
+    gather = measure(game_state, positions, lambda state: gather_evaluate(evaluator, state), args.repeat)
+    incremental = measure(game_state, positions, evaluator.evaluate_position, args.repeat)
+    print(f"   сканування:   {scan:10.0f} оцінок/с")
+    print(f"   gather:       {gather:10.0f} оцінок/с (x{gather / max(scan, 1e-9):.2f})")
+    print(f"   накопичувачі: {incremental:10.0f} оцінок/с (x{incremental / max(scan, 1e-9):.2f})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
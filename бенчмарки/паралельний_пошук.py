@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк паралельного пошуку кореня (ChessAI workers)
+
+Набирає позиції з випадкових партій (фіксований seed) і для кожної кількості
+процесів шукає хід з однаковим лімітом часу. Порівнюються вузли/с (сума по
+всіх процесах) і прискорення відносно одного процесу. Пул процесів створюється
+до вимірювання (розминковий пошук), тож старт процесів не входить у час.
+
+Прискорення близьке до лінійного можливе лише за наявності вільних ядер:
+на машині з одним ядром процеси ділять його між собою.
+
+Приклад:
+    python бенчмарки/паралельний_пошук.py --workers 1 2 4 8 --time 3 --depth 4
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from логування import set_quiet_mode  # noqa: E402
+
+
+def collect_positions(count: int, plies: int, seed: int) -> List[dict]:
+    """Знімки позицій після plies випадкових півходів"""
+    from стан_гри import GameState
+
+    game_state = GameState()
+    positions = []
+    for index in range(count):
+        rng = random.Random(seed + index)
+        game_state.reset_game()
+        for _ in range(plies):
+            legal_moves = game_state.generate_legal_moves()
+            if not legal_moves or game_state.game_over:
+                break
+            game_state.apply_move(rng.choice(legal_moves))
+        if not game_state.game_over:
+            positions.append(game_state.snapshot())
+    return positions, game_state
+
+
+def run(workers: int, positions: List[dict], game_state, depth: int, time_limit: float) -> dict:
+    """Пошук на всіх позиціях з workers процесами; повертає середні вузли/с і глибину"""
+    from штучний_інтелект import ChessAI
+
+    ai = ChessAI(depth=depth, time_limit=time_limit, workers=workers)
+    try:
+        # Розминка: старт процесів пулу
+        game_state.restore_snapshot(positions[0])
+        ai.depth = 1
+        ai.get_best_move(game_state, game_state.current_player)
+        ai.depth = depth
+
+        nps, depths, moves = [], [], []
+        for snapshot in positions:
+            game_state.restore_snapshot(snapshot)
+            move = ai.get_best_move(game_state, game_state.current_player)
+            stats = ai.get_search_stats()
+            nps.append(stats['nps'])
+            depths.append(stats['depth'])
+            moves.append(move)
+        return {'nps': statistics.mean(nps), 'depth': statistics.mean(depths), 'moves': moves}
+    finally:
+        ai.shutdown()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Прискорення паралельного пошуку кореня")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="кількості процесів")
+    parser.add_argument("--positions", type=int, default=3, help="кількість позицій")
+    parser.add_argument("--plies", type=int, default=40, help="випадкових півходів до позиції")
+    parser.add_argument("--seed", type=int, default=0, help="seed випадкових партій")
+    parser.add_argument("--depth", type=int, default=4, help="максимальна глибина пошуку")
+    parser.add_argument("--time", type=float, default=3.0, help="ліміт часу на хід, с")
+    args = parser.parse_args(argv)
+
+    set_quiet_mode(True)
+    positions, game_state = collect_positions(args.positions, args.plies, args.seed)
+    print(f"⏱️ Позицій: {len(positions)}, ядер: {os.cpu_count()}")
+
+    baseline = None
+    for workers in args.workers:
+        start_time = time.perf_counter()
+        result = run(workers, positions, game_state, args.depth, args.time)
+        baseline = baseline or result['nps']
+        print(f"   процесів {workers}: {result['nps']:9.0f} вузлів/с, прискорення x{result['nps'] / baseline:.2f}, "
+              f"глибина {result['depth']:.1f}, {time.perf_counter() - start_time:.1f} с")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк затримки перемикання ходу (GameState.switch_player)
+
+Набирає позиції з випадкових партій (фіксований seed), а потім для кожної
+позиції відновлює знімок і вимірює:
+    - "до":    послідовність switch_player до конвеєра завершення ходу
+               (окремі сканування: шах, is_checkmate, is_stalemate з повною
+               фільтрацією ходів кожної фігури, звіт туманностей окремим обходом);
+    - "після": поточний switch_player (один прохід, запис TurnStatus).
+
+Обидва варіанти працюють у тихому режимі, тому вимірюється лише обчислення.
+
+Приклад:
+    python бенчмарки/перемикання_ходу.py --games 4 --plies 120 --repeat 3
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from налаштування import PieceColor  # noqa: E402
+from логування import set_quiet_mode, finish_current_turn  # noqa: E402
+
+
+def _legacy_has_moves(calculator, color: PieceColor) -> bool:
+    """Пошук легального ходу так, як його робили is_checkmate / is_stalemate раніше"""
+    for row, col in calculator.board.get_all_pieces_of_color(color):
+        piece = calculator.board.get_piece_at(row, col)
+        if piece and not piece.is_empty():
+            moves, attacks, teleports = calculator.get_possible_moves(piece, row, col)
+            if moves or attacks or teleports:
+                return True
+    return False
+
+
+def legacy_switch_player(game_state):
+    """Відтворення старої послідовності switch_player (для порівняння)"""
+    calculator = game_state.move_calculator
+    board = game_state.board
+
+    game_state.clear_selection()
+    game_state.moon_double_move = None
+    game_state.recently_resurrected_pieces.clear()
+    game_state._update_soul_corners()
+    board.tick_paralysis(game_state.current_player)
+    finish_current_turn()
+    game_state.current_player = (PieceColor.BLACK if game_state.current_player == PieceColor.WHITE
+                                 else PieceColor.WHITE)
+    board.tick_paralysis(game_state.current_player)
+    game_state.turn_number += 1
+
+    calculator.update_board(board)
+    color = game_state.current_player
+    attacker_pos = calculator._is_king_in_check(color)
+    if attacker_pos:
+        calculator._find_king(color)
+
+    # is_checkmate: власна перевірка шаху + пошук ходу
+    if calculator._is_king_in_check(color) is not None:
+        king_pos = calculator._find_king(color)
+        if king_pos and (board.is_paralyzed_at(*king_pos) or not _legacy_has_moves(calculator, color)):
+            return
+    # is_stalemate: ще одна перевірка шаху + повторний пошук ходу
+    if calculator._is_king_in_check(color) is None and not _legacy_has_moves(calculator, color):
+        return
+
+    board.tick_nebula_timers(color)
+    game_state._check_draw_rules()
+    for piece_id in board.get_nebula_timer_ids():
+        position = board.find_piece_position(piece_id)
+        if position:
+            board.get_piece_at(*position)
+
+
+def collect_positions(games: int, plies: int, seed: int) -> List[dict]:
+    """Знімки станів із випадкових партій (позиції перед перемиканням ходу не потрібні -
+    switch_player вимірюється на стані відразу після ходу)"""
+    from стан_гри import GameState
+
+    game_state = GameState()
+    positions = []
+    for game_index in range(games):
+        rng = random.Random(seed + game_index)
+        game_state.reset_game()
+        for _ in range(plies):
+            legal_moves = game_state.generate_legal_moves()
+            if not legal_moves or game_state.game_over:
+                break
+            game_state.apply_move(rng.choice(legal_moves))
+            positions.append(game_state.snapshot())
+    return positions, game_state
+
+
+def measure(game_state, positions: List[dict], switch: Callable, repeat: int) -> List[float]:
+    """Затримки switch у мілісекундах (мінімум з repeat вимірів на позицію)"""
+    timings = []
+    for snapshot in positions:
+        best = float("inf")
+        for _ in range(repeat):
+            game_state.restore_snapshot(snapshot)
+            start_time = time.perf_counter()
+            switch(game_state)
+            best = min(best, time.perf_counter() - start_time)
+        timings.append(best * 1000)
+    return timings
+
+
+def _describe(timings: List[float]) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (f"середнє {statistics.mean(ordered):7.2f} мс, медіана {statistics.median(ordered):7.2f} мс, "
+            f"p95 {p95:7.2f} мс, макс {ordered[-1]:7.2f} мс")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Затримка перемикання ходу: до і після конвеєра")
+    parser.add_argument("--games", type=int, default=4, help="кількість випадкових партій")
+    parser.add_argument("--plies", type=int, default=120, help="півходів на партію")
+    parser.add_argument("--seed", type=int, default=0, help="seed випадкових партій")
+    parser.add_argument("--repeat", type=int, default=3, help="вимірів на позицію (береться мінімум)")
+    args = parser.parse_args(argv)
+
+    set_quiet_mode(True)
+    positions, game_state = collect_positions(args.games, args.plies, args.seed)
+    print(f"⏱️ Позицій: {len(positions)}")
+
+    before = measure(game_state, positions, legacy_switch_player, args.repeat)
+    after = measure(game_state, positions, lambda state: state.switch_player(), args.repeat)
+
+    print(f"   до:    {_describe(before)}")
+    print(f"   після: {_describe(after)}")
+    print(f"   прискорення (середнє): x{statistics.mean(before) / max(statistics.mean(after), 1e-9):.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Перевірка та бенчмарк підбору ваг оцінки (штучний_інтелект.підбір_ваг)
+
+Спершу звіряє лінійну модель підбору з PositionEvaluator.evaluate_position
+на позиціях випадкових партій (фіксований seed) - ознаки і вектор параметрів
+мають давати ту саму оцінку. Потім бере вибірку (готову --dataset або зібрану
+з партій sources), повторює її рядки до --positions і вимірює час підбору K
+та епох градієнтного спуску.
+
+Приклад:
+    python бенчмарки/підбір_ваг.py логи/симуляції.jsonl --positions 1000000 --epochs 3
+    python бенчмарки/підбір_ваг.py --dataset логи/позиції.npz
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from логування import set_quiet_mode  # noqa: E402
+
+# Допуск звірки оцінки моделі з evaluate_position (у пішаках)
+EVAL_TOLERANCE = 1e-9
+
+
+def verify_model(games: int, plies: int, seed: int) -> int:
+    """Звірка оцінки моделі з evaluate_position після кожного півходу; повертає кількість розбіжностей"""
+    import numpy as np
+    from стан_гри import GameState
+    from штучний_інтелект.оцінка import PositionEvaluator
+    from штучний_інтелект import підбір_ваг
+
+    evaluator = PositionEvaluator()
+    parameters = підбір_ваг.evaluator_parameters(evaluator)
+    model = підбір_ваг._Model()
+    game_state = GameState()
+    failures = checked = 0
+    for game_index in range(games):
+        rng = random.Random(seed + game_index)
+        game_state.reset_game()
+        for _ in range(plies):
+            legal_moves = game_state.generate_legal_moves()
+            if not legal_moves:
+                break
+            game_state.apply_move(rng.choice(legal_moves))
+            if game_state.game_over:
+                break
+            material, special, squares = підбір_ваг.position_features(game_state)
+            row = підбір_ваг.TuningSet(np.array([material], dtype=np.int8), np.array([special], dtype=np.int8),
+                                       np.array([squares], dtype=np.uint16), np.zeros(1, dtype=np.float32))
+            expected = evaluator.evaluate_position(game_state)
+            actual = float(model.evaluate(parameters, row)[0])
+            checked += 1
+            if abs(actual - expected) > EVAL_TOLERANCE:
+                failures += 1
+                print(f"❌ Партія {game_index}: модель {actual:.6f}, evaluate_position {expected:.6f}")
+    print(f"🔎 Звірено оцінок: {checked}, розбіжностей: {failures}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Звірка моделі і час підбору ваг оцінки")
+    parser.add_argument("sources", type=Path, nargs="*", help="JSONL симулятора, .pgn або лог партій")
+    parser.add_argument("--dataset", type=Path, default=None, help="готова вибірка .npz")
+    parser.add_argument("--positions", type=int, default=1000000, help="позицій для вимірювання (рядки повторюються)")
+    parser.add_argument("--epochs", type=int, default=3, help="епох підбору")
+    parser.add_argument("--workers", type=int, default=1, help="процесів вибірки")
+    parser.add_argument("--games", type=int, default=3, help="випадкових партій для звірки моделі")
+    parser.add_argument("--plies", type=int, default=150, help="ліміт півходів партії звірки")
+    parser.add_argument("--seed", type=int, default=0, help="seed")
+    args = parser.parse_args(argv)
+
+    set_quiet_mode(True)
+    import numpy as np
+    from штучний_інтелект.оцінка import PositionEvaluator
+    from штучний_інтелект import підбір_ваг
+
+    failures = verify_model(args.games, args.plies, args.seed)
+
+    if args.dataset is not None and not args.sources:
+        data = підбір_ваг.TuningSet.load(args.dataset)
+    elif args.sources:
+        start_time = time.perf_counter()
+        data = підбір_ваг.extract_positions(args.sources, workers=args.workers)
+        print(f"📥 Вибірка: {len(data)} тихих позицій за {time.perf_counter() - start_time:.1f} с "
+              f"({args.workers} процесів)")
+    else:
+        return 1 if failures else 0
+    if not len(data):
+        print("Немає тихих позицій")
+        return 1
+
+    rows = np.random.default_rng(args.seed).integers(0, len(data), args.positions)
+    data = data.subset(rows)
+    initial = підбір_ваг.evaluator_parameters(PositionEvaluator())
+
+    start_time = time.perf_counter()
+    підбір_ваг.fit_k(підбір_ваг._Model(), initial, data)
+    fit_k_time = time.perf_counter() - start_time
+
+    result = підбір_ваг.tune(data, initial, args.epochs, seed=args.seed,
+                             on_epoch=lambda epoch, train, validation: print(
+                                 f"   епоха {epoch}: втрата {train:.5f}, перевірка {validation:.5f}"))
+    epoch_time = max(0.0, result.time - fit_k_time) / max(1, args.epochs)
+    print(f"⏱️ {len(data)} позицій: K = {result.k:.3f} за {fit_k_time:.2f} с, "
+          f"епоха {epoch_time:.2f} с, разом {result.time:.1f} с")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
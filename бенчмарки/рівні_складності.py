@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Калібрування рівнів складності ChessAI (DIFFICULTY_LEVELS)
+
+Набирає позиції з випадкових партій (фіксований seed) і на кожному рівні
+шукає хід у кожній позиції двічі новим рушієм. Для рівня - середній і
+найбільший час ходу, середні вузли і завершена глибина (скільки позицій не
+дійшли до глибини рівня - бюджет замалий), та скільки ходів повторилися
+в другому прогоні (рівні без ліміту часу мають збігатися
+повністю). Час ходу - це вартість бюджету вузлів на цій машині: якщо він
+далекий від бажаного, бюджети рівнів варто переглянути.
+
+Приклад:
+    python бенчмарки/рівні_складності.py --levels 1 2 3 --positions 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from логування import set_quiet_mode  # noqa: E402
+
+
+def collect_positions(count: int, plies: int, seed: int):
+    """Початкова позиція і знімки позицій після plies випадкових півходів"""
+    from стан_гри import GameState
+
+    game_state = GameState()
+    positions = [game_state.snapshot()]
+    for index in range(count - 1):
+        rng = random.Random(seed + index)
+        game_state.reset_game()
+        for _ in range(plies):
+            legal_moves = game_state.generate_legal_moves()
+            if not legal_moves or game_state.game_over:
+                break
+            game_state.apply_move(rng.choice(legal_moves))
+        if not game_state.game_over:
+            positions.append(game_state.snapshot())
+    return positions, game_state
+
+
+def run(level: int, positions: List[dict], game_state) -> dict:
+    """Один прогін рівня: хід, час, вузли і глибина для кожної позиції"""
+    from штучний_інтелект import ChessAI
+
+    moves, times, nodes, depths = [], [], [], []
+    for snapshot in positions:
+        game_state.restore_snapshot(snapshot)
+        ai = ChessAI()
+        ai.set_difficulty(level, deterministic=True)
+        start_time = time.perf_counter()
+        moves.append(ai.get_best_move(game_state, game_state.current_player))
+        times.append(time.perf_counter() - start_time)
+        stats = ai.get_search_stats()
+        nodes.append(stats['nodes'])
+        depths.append(stats['depth'])
+    return {'moves': moves, 'times': times, 'nodes': nodes, 'depths': depths}
+
+
+def main(argv: Optional[List[str]] = None):
+    from штучний_інтелект.алгоритм import DIFFICULTY_LEVELS
+
+    parser = argparse.ArgumentParser(description="Час ходу і відтворюваність рівнів складності")
+    parser.add_argument("--levels", type=int, nargs="+", choices=sorted(DIFFICULTY_LEVELS),
+                        default=sorted(DIFFICULTY_LEVELS), help="рівні складності")
+    parser.add_argument("--positions", type=int, default=4, help="кількість позицій (з початковою)")
+    parser.add_argument("--plies", type=int, default=30, help="випадкових півходів до позиції")
+    parser.add_argument("--seed", type=int, default=0, help="seed випадкових партій")
+    args = parser.parse_args(argv)
+
+    set_quiet_mode(True)
+    positions, game_state = collect_positions(args.positions, args.plies, args.seed)
+    print(f"⏱️ Позицій: {len(positions)}")
+
+    for level in args.levels:
+        limits = DIFFICULTY_LEVELS[level]
+        first = run(level, positions, game_state)
+        second = run(level, positions, game_state)
+        same = sum(move == repeat for move, repeat in zip(first['moves'], second['moves']))
+        times = first['times'] + second['times']
+        print(f"   рівень {level} ({limits.root_move_nodes} вузлів на хід кореня, глибина {limits.depth}): "
+              f"{statistics.mean(times):6.2f} с/хід (макс. {max(times):.2f}), "
+              f"{statistics.mean(first['nodes']):7.0f} вузлів, глибина {statistics.mean(first['depths']):.1f}, "
+              f"не дійшли до глибини {sum(depth < limits.depth for depth in first['depths'])}, "
+              f"повтори {same}/{len(positions)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
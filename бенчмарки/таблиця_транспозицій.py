@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Стрес-тест спільної таблиці транспозицій (розірвані записи)
+
+1. Детермінована перевірка: у слот записується слово перевірки одного запису
+   і дані іншого (як після одночасного запису двох процесів) - зондування
+   обох ключів має дати промах.
+2. Навантаження: кілька процесів під'єднуються до крихітної спільної таблиці
+   (багато колізій кошиків) і водночас пишуть і читають записи, поля яких
+   однозначно виводяться з ключа. Будь-яке влучання з полями не від свого
+   ключа - розірваний запис, що пройшов перевірку (має бути 0).
+
+Приклад:
+    python бенчмарки/таблиця_транспозицій.py --workers 4 --seconds 5
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from штучний_інтелект.транспозиції import (TranspositionTable, BOUND_EXACT,  # noqa: E402
+                                            DEFAULT_BUCKET_SIZE, TT_ENTRY_DTYPE)
+
+
+def expected_entry(key: int) -> tuple:
+    """Поля запису, які однозначно визначає ключ: (глибина, оцінка, межа, хід)"""
+    return (key % 50, float((key >> 8) % 10000) / 4, BOUND_EXACT + (key >> 40) % 3, 1 + (key >> 20) % 190000)
+
+
+def check_torn_entry(size_mb: float) -> bool:
+    """Слово перевірки від одного запису + дані від іншого не проходять перевірку"""
+    table = TranspositionTable(size_mb)
+    first = table.bucket_count << 1 | 1       # Обидва ключі в кошику 1
+    second = table.bucket_count << 2 | 1
+    table.store(first, *expected_entry(first))
+    torn_check = table.table[1, 0]['check']
+    table.clear()
+    table.store(second, *expected_entry(second))
+    stored = table.probe(second) is not None
+    table.table[1, 0]['check'] = torn_check
+    return stored and table.probe(first) is None and table.probe(second) is None
+
+
+def hammer(shared_name: str, size_mb: float, seed: int, seconds: float, key_count: int) -> tuple:
+    """Процес навантаження: випадкові записи й зондування; повертає (операції, влучання, розірвані)"""
+    table = TranspositionTable(size_mb, DEFAULT_BUCKET_SIZE, TT_ENTRY_DTYPE, shared_name=shared_name)
+    rng = random.Random(seed)
+    keys = [random.Random(index).getrandbits(64) for index in range(key_count)]
+    operations = hits = torn = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(1000):
+            key = rng.choice(keys)
+            if rng.random() < 0.5:
+                table.store(key, *expected_entry(key))
+            else:
+                entry = table.probe(key)
+                if entry is not None:
+                    hits += 1
+                    if tuple(entry) != expected_entry(key):
+                        torn += 1
+            operations += 1
+    table.close()
+    return operations, hits, torn
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Стрес-тест спільної таблиці транспозицій")
+    parser.add_argument("--workers", type=int, default=4, help="кількість процесів")
+    parser.add_argument("--seconds", type=float, default=5.0, help="тривалість навантаження, с")
+    parser.add_argument("--size-kb", type=float, default=4.0, help="розмір таблиці, КБ (мала - більше колізій)")
+    parser.add_argument("--keys", type=int, default=4096, help="кількість різних ключів")
+    args = parser.parse_args(argv)
+    size_mb = args.size_kb / 1024
+
+    torn_detected = check_torn_entry(size_mb)
+    print(f"{'✅' if torn_detected else '❌'} Розірваний запис відкидається перевіркою XOR")
+
+    table = TranspositionTable(size_mb, shared=True)
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers) as pool:
+        results = pool.starmap(hammer, [(table.shared_name, size_mb, seed, args.seconds, args.keys)
+                                        for seed in range(args.workers)])
+    fill_rate = table.fill_rate()
+    table.close()
+
+    operations = sum(result[0] for result in results)
+    hits = sum(result[1] for result in results)
+    torn = sum(result[2] for result in results)
+    print(f"{'✅' if torn == 0 else '❌'} Процесів: {args.workers}, операцій: {operations} "
+          f"({operations / args.seconds:.0f}/с), влучань: {hits}, розірваних влучань: {torn}, "
+          f"заповненість: {fill_rate:.0%}")
+    return 0 if torn_detected and torn == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
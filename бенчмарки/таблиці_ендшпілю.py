@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Генерація і перевірка таблиць ендшпілю (таблиці_ендшпілю)
+
+Генерує таблицю набору (або бере готову з --dir) і звіряє її з правилами
+гри: у випадкових позиціях таблиці (сильна сторона - випадкового кольору)
+кожен легальний хід GameState виконується, нащадок зондується, і значення
+позиції має збігатися з мінімаксом по нащадках (мат на дошці, найшвидший
+виграш, нічия або найдовший опір). Також вимірюється час зондування.
+
+Приклад:
+    python бенчмарки/таблиці_ендшпілю.py KRK --positions 300 --workers 4
+    python бенчмарки/таблиці_ендшпілю.py KQK --nebulas 0xf --dir ресурси/ендшпіль
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from логування import set_quiet_mode  # noqa: E402
+
+
+def piece_ids(piece_type, color) -> int:
+    """Стартовий ID фігури типу і кольору (для Фурії - без Щита на дошці прив'язка не діє)"""
+    from розташування_фігур import get_initial_piece_positions
+
+    return next(piece_id for _, _, found_type, found_color, piece_id in get_initial_piece_positions()
+                if found_type == piece_type and found_color == color)
+
+
+def setup_position(game_state, piece_type, nebula_mask: int, strong_color, side: int,
+                   strong_king: int, weak_king: int, piece: int):
+    """Розставляє позицію таблиці на дошці GameState (таймер туманності - як після тіку)"""
+    from налаштування import PieceType, PieceColor, NEBULAS
+    from розташування_фігур import Piece
+    from штучний_інтелект.таблиці_ендшпілю import (_CELL_COORDS, SQUARES, NEBULA_TIMER_STATES,
+                                                   SIDE_STRONG)
+
+    weak_color = PieceColor.BLACK if strong_color == PieceColor.WHITE else PieceColor.WHITE
+    game_state.reset_game()
+    board = game_state.board
+    for position in list(board.position_by_id.values()):
+        board.clear_square(*position)
+    timer = None
+    if piece >= SQUARES:
+        nebula, timer = divmod(piece - SQUARES, NEBULA_TIMER_STATES)
+        piece = SQUARES + nebula
+        if side == SIDE_STRONG and timer > 0:
+            timer -= 1
+    placements = ((strong_king, PieceType.KING, strong_color), (weak_king, PieceType.KING, weak_color),
+                  (piece, piece_type, strong_color))
+    for cell, placed_type, color in placements:
+        board.set_piece(*_CELL_COORDS[cell], Piece(placed_type, color, piece_ids(placed_type, color)))
+    if timer is not None:
+        board.set_nebula_timer(piece_ids(piece_type, strong_color), timer)
+
+    for index, name in enumerate(NEBULAS):
+        game_state.nebula_blocked[name] = not nebula_mask >> index & 1
+    game_state.nebulas_activated = {"white": bool(nebula_mask & 0b1100), "black": bool(nebula_mask & 0b0011)}
+    game_state.current_player = strong_color if side == SIDE_STRONG else weak_color
+    game_state.no_capture_draw_plies = 0
+    game_state.move_calculator.update_board(board)
+
+
+def minimax_from_children(game_state, tablebases):
+    """Значення позиції з нащадків: (результат, півходи) з точки зору того, хто ходить"""
+    from штучний_інтелект.таблиці_ендшпілю import ProbeResult
+
+    snapshot = game_state.snapshot()
+    replies = []
+    for move in game_state.generate_legal_moves():
+        if not game_state.apply_move(move):
+            continue
+        if game_state.game_over:
+            reply = ProbeResult(-1, 0) if game_state.winner in ('white', 'black') else ProbeResult(0, 0)
+        elif len(game_state.board.pieces_by_id) < 3:
+            reply = ProbeResult(0, 0)
+        else:
+            reply = tablebases.probe(game_state)
+        game_state.restore_snapshot(snapshot)
+        game_state.move_calculator.update_board(game_state.board)
+        if reply is None:
+            raise AssertionError(f"нащадок після {move} не знайдено в таблиці")
+        replies.append(reply)
+
+    if not replies:
+        status = game_state.get_turn_status()
+        return ProbeResult(-1, 0) if status.in_check else ProbeResult(0, 0)
+    losses = [reply.plies for reply in replies if reply.result < 0]
+    if losses:
+        return ProbeResult(1, min(losses) + 1)
+    if any(reply.result == 0 for reply in replies):
+        return ProbeResult(0, 0)
+    return ProbeResult(-1, max(reply.plies for reply in replies) + 1)
+
+
+def main(argv: Optional[List[str]] = None):
+    from налаштування import PieceColor
+    from штучний_інтелект.таблиці_ендшпілю import (EndgameTablebases, generate_table, parse_material,
+                                                   table_name, CODE_ILLEGAL, PIECE_RULES)
+
+    parser = argparse.ArgumentParser(description="Генерація таблиці ендшпілю і звірка з правилами гри")
+    parser.add_argument("material", help="набір KXK")
+    parser.add_argument("--nebulas", type=lambda text: int(text, 0), default=0, help="маска відкритих туманностей")
+    parser.add_argument("--dir", type=Path, default=None, help="тека з готовою таблицею (без генерації)")
+    parser.add_argument("--workers", type=int, default=1, help="процесів генерації")
+    parser.add_argument("--positions", type=int, default=200, help="позицій для звірки")
+    parser.add_argument("--seed", type=int, default=0, help="seed вибору позицій")
+    args = parser.parse_args(argv)
+
+    set_quiet_mode(True)
+    piece_type = parse_material(args.material)
+    nebula_mask = args.nebulas if PIECE_RULES[piece_type].enters_nebula else 0
+    directory = args.dir
+    if directory is None:
+        directory = Path(tempfile.mkdtemp(prefix="ендшпіль_"))
+        stats = generate_table(piece_type, nebula_mask, directory, args.workers)
+        print(f"♔ {stats['path'].name}: {stats['time']:.1f} с ({args.workers} процесів), "
+              f"{stats['size_mb']:.0f} МБ, матів {stats['mates']}, виграшів {stats['wins']}, "
+              f"найдовший мат {stats['longest_mate']} півходів")
+
+    from стан_гри import GameState
+
+    tablebases = EndgameTablebases(directory)
+    table = tablebases.tables[(piece_type, nebula_mask)]
+    rng = random.Random(args.seed)
+    game_state = GameState()
+    checked, mismatches, probe_time = 0, 0, 0.0
+    while checked < args.positions:
+        index = tuple(rng.randrange(size) for size in table.shape)
+        if table[index] == CODE_ILLEGAL:
+            continue
+        strong_color = rng.choice((PieceColor.WHITE, PieceColor.BLACK))
+        setup_position(game_state, piece_type, nebula_mask, strong_color, *index)
+        start_time = time.perf_counter()
+        probed = tablebases.probe(game_state)
+        probe_time += time.perf_counter() - start_time
+        expected = minimax_from_children(game_state, tablebases)
+        checked += 1
+        if probed != expected:
+            mismatches += 1
+            print(f"   ❌ {table_name(piece_type, nebula_mask)} {index}: таблиця {probed}, ходи гри {expected}")
+
+    print(f"   звірено позицій: {checked}, розбіжностей: {mismatches}, "
+          f"зондування {probe_time / checked * 1e6:.0f} мкс")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
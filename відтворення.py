@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Відтворення записаних партій "Вершителі часу" зі швидким переходом на будь-який півхід
+
+GameReplay застосовує список PGN-токенів (див. стан_гри.move_to_notation) до
+власного GameState. Під час завантаження кожен токен один раз розв'язується
+у Move (дельта півходу), а кожні K півходів зберігається повний знімок стану
+(GameState.snapshot). seek(ply) відновлює найближчу контрольну точку не пізніше
+ply і доіграє не більше K-1 ходів; крок уперед від поточної позиції - один хід.
+
+Джерела ходів:
+    - PGN з логування.generate_pgn_string (заголовки, номери ходів і результат
+      відкидаються);
+    - запис партії симулятора (JSONL, поле "moves").
+
+Приклад:
+    python відтворення.py логи/симуляції.jsonl --game 0 --ply 120
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from розташування_фігур import Move
+from логування import quiet_mode, game_logger
+
+DEFAULT_CHECKPOINT_INTERVAL = 4
+
+# Номери ходів "12." / "12..." та результати партії в PGN
+_PGN_MOVE_NUMBER = re.compile(r'^\d+\.(\.\.)?$')
+_PGN_RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+
+
+def parse_pgn_moves(pgn_text: str) -> List[str]:
+    """Витягує PGN-токени ходів з тексту generate_pgn_string"""
+    tokens = []
+    for line in pgn_text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("["):
+            continue
+        for token in line.split():
+            if _PGN_MOVE_NUMBER.match(token) or token in _PGN_RESULTS:
+                continue
+            tokens.append(token)
+    return tokens
+
+
+class GameReplay:
+    """
+    Відтворення партії з контрольними точками.
+
+    checkpoints[i] - знімок стану після i * K півходів (checkpoints[0] - початок),
+    moves[p] - хід, що переводить позицію з півходу p у p + 1.
+    """
+
+    def __init__(self, notations: List[str], checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        from стан_гри import GameState
+
+        if checkpoint_interval < 1:
+            raise ValueError(f"Інтервал контрольних точок має бути >= 1, отримано {checkpoint_interval}")
+
+        self.notations = list(notations)
+        self.checkpoint_interval = checkpoint_interval
+        self.moves: List[Move] = []
+        self.checkpoints: List[dict] = []
+
+        with quiet_mode():
+            self.game_state = GameState()
+            self.checkpoints.append(self.game_state.snapshot())
+
+            for ply, notation in enumerate(self.notations):
+                move = self.game_state.find_move_by_notation(notation)
+                if move is None or not self.game_state.apply_move(move):
+                    raise ValueError(f"Неможливо відтворити хід '{notation}' на півході {ply + 1}")
+                self.moves.append(move)
+                if (ply + 1) % checkpoint_interval == 0:
+                    self.checkpoints.append(self.game_state.snapshot())
+
+        self.ply = len(self.moves)
+        game_logger.info(f"Завантажено партію для відтворення: {self.ply} півходів, "
+                         f"{len(self.checkpoints)} контрольних точок")
+
+    @classmethod
+    def from_pgn(cls, pgn_text: str, **kwargs) -> "GameReplay":
+        """Створює відтворення з PGN тексту (логування.generate_pgn_string)"""
+        return cls(parse_pgn_moves(pgn_text), **kwargs)
+
+    @classmethod
+    def from_record(cls, record: Dict, **kwargs) -> "GameReplay":
+        """Створює відтворення із запису партії симулятора (рядок JSONL)"""
+        return cls(record["moves"], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def seek(self, ply: int):
+        """
+        Переходить на позицію після ply півходів і повертає GameState.
+        Якщо ціль попереду в межах поточного інтервалу - лише доігрує ходи,
+        інакше відновлює найближчу контрольну точку.
+        """
+        if not 0 <= ply <= len(self.moves):
+            raise IndexError(f"Півхід {ply} поза межами партії (0..{len(self.moves)})")
+
+        checkpoint_ply = (ply // self.checkpoint_interval) * self.checkpoint_interval
+        with quiet_mode():
+            if not checkpoint_ply <= self.ply <= ply:
+                self.game_state.restore_snapshot(self.checkpoints[checkpoint_ply // self.checkpoint_interval])
+                self.ply = checkpoint_ply
+
+            while self.ply < ply:
+                self.game_state.apply_move(self.moves[self.ply])
+                self.ply += 1
+
+        return self.game_state
+
+    def step_forward(self):
+        """Один півхід уперед"""
+        return self.seek(min(self.ply + 1, len(self.moves)))
+
+    def step_back(self):
+        """Один півхід назад"""
+        return self.seek(max(self.ply - 1, 0))
+
+    def current_move(self) -> Optional[Move]:
+        """Останній застосований хід (None на початковій позиції)"""
+        return self.moves[self.ply - 1] if self.ply > 0 else None
+
+
+def load_replay(path: Path, game_index: int = 0, **kwargs) -> GameReplay:
+    """Завантажує партію з .pgn файлу або game_index-ту партію з JSONL симулятора"""
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix == ".jsonl":
+        for line in text.splitlines():
+            record = json.loads(line)
+            if record.get("game") == game_index:
+                return GameReplay.from_record(record, **kwargs)
+        raise ValueError(f"Партію {game_index} не знайдено у {path}")
+    return GameReplay.from_pgn(text, **kwargs)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Відтворення записаної партії з контрольними точками")
+    parser.add_argument("path", type=Path, help="PGN файл або JSONL симулятора")
+    parser.add_argument("--game", type=int, default=0, help="номер партії у JSONL")
+    parser.add_argument("--ply", type=int, default=None, help="перейти на півхід (за замовчуванням - кінець)")
+    parser.add_argument("--interval", type=int, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help="інтервал контрольних точок K")
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    replay = load_replay(args.path, args.game, checkpoint_interval=args.interval)
+    load_time = time.perf_counter() - start_time
+
+    target = len(replay) if args.ply is None else args.ply
+    start_time = time.perf_counter()
+    game_state = replay.seek(target)
+    seek_time = time.perf_counter() - start_time
+
+    move = replay.current_move()
+    print(f"📼 Партія: {len(replay)} півходів, завантаження {load_time:.2f} с")
+    print(f"⏩ Півхід {target} за {seek_time * 1000:.1f} мс, останній хід: {move}, "
+          f"хід {'білих' if game_state.current_player > 0 else 'чорних'}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
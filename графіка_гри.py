@@ -11,7 +11,7 @@ from налаштування import (
     NEBULAS, LETTERS_BOTTOM, NUMBERS_LEFT,
     LIGHT_SQUARE_COLOR, DARK_SQUARE_COLOR, BACKGROUND_COLOR,
     BLACK_BORDER_COLOR, ATTACK_DOT_COLOR, MOVE_DOT_COLOR, SWAP_DOT_COLOR,
-    TELEPORT_DOT_COLOR,
+    TELEPORT_DOT_COLOR, HINT_DOT_COLOR,
     PARALYSIS_COLOR, RESURRECTION_COLOR_GREEN, RESURRECTION_COLOR_GRAY,
     MOON_HIGHLIGHT_COLOR, LABEL_TEXT_COLOR, TIMER_TEXT_COLOR,
     WHITE_COLOR, RED_SEMI_TRANSPARENT, RED_SOLID,
@@ -39,6 +39,7 @@ class BoardWidget(QWidget):
         self.attack_move_dots = set()  # Нові крапки для ходів з можливістю атаки (сині з червоним контуром)
         self.swap_dots = set()
         self.teleport_dots = set()
+        self.hint_dots = set()  # Клітинки ходу-підказки аналізу ШІ (звідки і куди)
         self.paralyzed_cells = {}
         self.paralysis_landing_dots = set()
         self.resurrection_corners = {}
@@ -308,6 +309,10 @@ class BoardWidget(QWidget):
         for row, col in self.shield_positions:
             self._draw_shield_zone(painter, row, col)
 
+        # Підказка - поверх усіх ефектів
+        for row, col in self.hint_dots:
+            self._draw_move_dot(painter, row, col, HINT_DOT_COLOR)
+
     def _draw_move_dot(self, painter, row: int, col: int, color: QColor):
         x = self._offset_x + col * (self._cell_size + 2 * CELL_MARGIN)
         y = self._offset_y + row * (self._cell_size + 2 * CELL_MARGIN)
@@ -797,6 +802,7 @@ class BoardWidget(QWidget):
         self.move_dots.clear()
         self.swap_dots.clear()
         self.teleport_dots.clear()
+        self.hint_dots.clear()
         self.paralyzed_cells.clear()
         self.paralysis_landing_dots.clear()
         self.resurrection_corners.clear()
@@ -808,6 +814,13 @@ class BoardWidget(QWidget):
         self.nebula_timers.clear()
         self.update()
 
+    def set_hint_move(self, move):
+        """Підсвічує хід-підказку крапками на клітинках звідки і куди (None - прибрати)"""
+        self.hint_dots.clear()
+        if move is not None:
+            self.hint_dots.update(square for square in (move.from_square, move.to_square) if square is not None)
+        self.update()
+
     def clear_move_indicators(self):
         self.attack_dots.clear()
         self.move_dots.clear()
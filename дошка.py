@@ -2,12 +2,45 @@
 import numpy as np
 from typing import List, Tuple, Optional, Set, Dict
 from налаштування import (
-    BOARD_ROWS, BOARD_COLS, PieceType, PieceColor, CellType, NEBULAS
+    BOARD_ROWS, BOARD_COLS, PieceType, PieceColor, CellType, NEBULAS,
+    MAX_PIECE_ID, WHITE_ID_START, BLACK_ID_START
 )
 from розташування_фігур import Piece
 from логування import game_logger
 
 
+# Колір фігури за її ID: 1000-1999 білі, 2000+ чорні (0 - немає фігури)
+PIECE_ID_COLORS = np.zeros(MAX_PIECE_ID, dtype=np.int8)
+PIECE_ID_COLORS[WHITE_ID_START:BLACK_ID_START] = PieceColor.WHITE
+PIECE_ID_COLORS[BLACK_ID_START:] = PieceColor.BLACK
+
+# Кількість таблиць ваг клітинок: колір × тип фігури
+SQUARE_TABLE_COUNT = 2 * len(PieceType)
+# Плаский індекс клітинки для збирання (gather) з таблиць ваг
+_SQUARE_INDICES = np.arange(BOARD_ROWS * BOARD_COLS)
+
+
+def piece_table_index(piece: Piece) -> int:
+    """Індекс таблиці ваг клітинок фігури: індекс кольору (0 - білі, 1 - чорні) * 16 + тип"""
+    return (0 if piece.color == PieceColor.WHITE else 1) * len(PieceType) + int(piece.type)
+
+
+# ОПТИМІЗАЦІЯ: 64-бітна Zobrist таблиця генерується один раз на процес і
+# спільна для всіх дошок (створення Board не перебудовує таблицю на ~10 МБ)
+_ZOBRIST_TABLE = None
+
+
+def get_zobrist_table() -> np.ndarray:
+    """Повертає спільну Zobrist таблицю [рядок, колонка, ID фігури] -> uint64"""
+    global _ZOBRIST_TABLE
+    if _ZOBRIST_TABLE is None:
+        rng = np.random.RandomState(42)  # Для відтворюваності між процесами
+        _ZOBRIST_TABLE = rng.randint(
+            0, 2**64, (BOARD_ROWS, BOARD_COLS, MAX_PIECE_ID), dtype=np.uint64
+        )
+    return _ZOBRIST_TABLE
+
+
 class Board:
     def __init__(self):
         self.rows = BOARD_ROWS  # 22
@@ -45,25 +78,64 @@ class Board:
             for name in NEBULAS.keys()
         }
         
+        # ОПТИМІЗАЦІЯ: Статуси фігур у NumPy-масивах, індексованих за ID фігури.
+        # Тік таймерів, закінчення та "щойно закінчені" рахуються векторно
+        # для всієї сторони одразу, без обходу словників.
+        self.paralysis_turns = np.zeros(MAX_PIECE_ID, dtype=np.int8)
+        self.nebula_timers = np.zeros(MAX_PIECE_ID, dtype=np.int8)
+        self.enhanced = np.zeros(MAX_PIECE_ID, dtype=np.bool_)
+        
         # ОПТИМІЗАЦІЯ: Zobrist хешування для швидкого порівняння позицій
         self._init_zobrist()
         self.position_hash = np.uint64(0)
         
+        # ОПТИМІЗАЦІЯ: Накопичувачі оцінки ШІ - оновлюються дельтами разом із хешем,
+        # тож оцінка листа не сканує дошку. piece_counts[індекс кольору, тип] -
+        # кількість фігур; square_score - сума ваг square_weights[індекс кольору, тип,
+        # рядок, колонка] усіх фігур (ваги задає оцінювач, None - не рахується);
+        # enhanced_counts[індекс кольору] - посилені фігури на дошці
+        self.piece_counts = np.zeros((2, len(PieceType)), dtype=np.int16)
+        self.enhanced_counts = np.zeros(2, dtype=np.int16)
+        # Індекс таблиці ваг за ID фігури (piece_table_index; 0 - порожня клітинка,
+        # таблиця білого EMPTY нульова) - для векторного gather по mailbox
+        self.piece_table_indices = np.zeros(MAX_PIECE_ID, dtype=np.int8)
+        self.square_weights: Optional[np.ndarray] = None
+        self.square_score = 0.0
+        
         game_logger.info("Ініціалізовано оптимізовану дошку з NumPy, бітбордами та кешуванням")
     
     def _init_zobrist(self):
         """Ініціалізація Zobrist таблиці для хешування"""
-        np.random.seed(42)  # Для відтворюваності
-        self.zobrist_table = np.random.randint(
-            0, 2**32, (self.rows, self.cols, 3000), dtype=np.uint32
-        )
+        self.zobrist_table = get_zobrist_table()
     
     def _update_hash(self, row: int, col: int, piece_id: int, is_adding: bool):
         """Оновлює Zobrist хеш позиції"""
-        if piece_id > 0 and piece_id < 3000:
+        if piece_id > 0 and piece_id < MAX_PIECE_ID:
             hash_value = self.zobrist_table[row, col, piece_id]
             self.position_hash ^= hash_value
     
+    def _accumulate(self, piece: Piece, row: int, col: int, sign: int):
+        """Оновлює накопичувачі оцінки: sign=1 - фігура з'явилась, -1 - зникла"""
+        color_index = 0 if piece.color == PieceColor.WHITE else 1
+        self.piece_counts[color_index, piece.type] += sign
+        if self.enhanced[piece.id]:
+            self.enhanced_counts[color_index] += sign
+        if self.square_weights is not None:
+            self.square_score += sign * self.square_weights[color_index, piece.type, row, col]
+    
+    def set_square_weights(self, square_weights: Optional[np.ndarray]):
+        """Задає таблиці ваг клітинок і перераховує square_score повністю"""
+        self.square_weights = square_weights
+        self.square_score = self.gather_square_score(square_weights) if square_weights is not None else 0.0
+    
+    def gather_square_score(self, square_weights: np.ndarray) -> float:
+        """
+        Повна сума ваг клітинок усіх фігур одним векторним gather:
+        mailbox → індекс таблиці (piece_table_indices) → вага клітинки.
+        """
+        tables = square_weights.reshape(SQUARE_TABLE_COUNT, BOARD_ROWS * BOARD_COLS)
+        return float(tables[self.piece_table_indices[self.mailbox].ravel(), _SQUARE_INDICES].sum())
+    
     def position_to_bit(self, row: int, col: int) -> int:
         """Конвертує позицію (row, col) в біт для бітборда"""
         if 0 <= row < self.rows and 0 <= col < self.cols:
@@ -102,6 +174,7 @@ class Board:
         
         # Встановлюємо фігуру
         self.mailbox[row, col] = piece.id
+        self.piece_table_indices[piece.id] = piece_table_index(piece)
         self.pieces_by_id[piece.id] = piece
         self.position_by_id[piece.id] = (row, col)  # Оновлюємо позицію
         
@@ -111,8 +184,9 @@ class Board:
             self.bitboards[piece.color][piece.type] |= (1 << bit)
             self.all_pieces[piece.color] |= (1 << bit)
         
-        # Оновлюємо хеш
+        # Оновлюємо хеш і накопичувачі оцінки
         self._update_hash(row, col, piece.id, True)
+        self._accumulate(piece, row, col, 1)
         
         # Інвалідуємо кеш
         self._cache_valid = False
@@ -136,8 +210,9 @@ class Board:
                 self.bitboards[piece.color][piece.type] &= mask
                 self.all_pieces[piece.color] &= mask
             
-            # Оновлюємо хеш
+            # Оновлюємо хеш і накопичувачі оцінки
             self._update_hash(row, col, piece_id, False)
+            self._accumulate(piece, row, col, -1)
         
         # Очищуємо клітинку
         self.mailbox[row, col] = 0
@@ -177,9 +252,12 @@ class Board:
             self.bitboards[piece.color][piece.type] ^= move_mask
             self.all_pieces[piece.color] ^= move_mask
         
-        # Оновлюємо хеш
+        # Оновлюємо хеш і ваги клітинок (кількість фігур не змінюється)
         self._update_hash(from_row, from_col, piece_id, False)
         self._update_hash(to_row, to_col, piece_id, True)
+        if self.square_weights is not None:
+            weights = self.square_weights[0 if piece.color == PieceColor.WHITE else 1, piece.type]
+            self.square_score += weights[to_row, to_col] - weights[from_row, from_col]
         
         return True
     
@@ -298,4 +376,139 @@ class Board:
     def count_pieces(self, piece_type: PieceType, color: PieceColor) -> int:
         """Підраховує кількість фігур певного типу та кольору"""
         bitboard = self.bitboards[color][piece_type]
-        return bin(bitboard).count('1')
\ No newline at end of file
+        return bin(bitboard).count('1')
+    
+    # ═══ СТАТУСИ ФІГУР (параліч, таймер туманності, посилення) ═══
+    
+    def set_paralysis(self, piece_id: int, duration: int):
+        """Встановлює параліч фігури на duration тіків її сторони"""
+        self.paralysis_turns[piece_id] = duration
+    
+    def clear_paralysis(self, piece_id: int):
+        """Знімає параліч з фігури"""
+        self.paralysis_turns[piece_id] = 0
+    
+    def is_paralyzed(self, piece_id: int) -> bool:
+        """Перевіряє, чи паралізована фігура (O(1) за ID)"""
+        return 0 < piece_id < MAX_PIECE_ID and bool(self.paralysis_turns[piece_id] > 0)
+    
+    def is_paralyzed_at(self, row: int, col: int) -> bool:
+        """Перевіряє, чи паралізована фігура на клітинці (O(1) через mailbox)"""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        return self.is_paralyzed(int(self.mailbox[row, col]))
+    
+    def get_paralyzed_ids(self) -> np.ndarray:
+        """Повертає ID усіх паралізованих фігур, що стоять на дошці"""
+        ids = np.flatnonzero(self.paralysis_turns)
+        return np.array([pid for pid in ids if pid in self.position_by_id], dtype=np.int64)
+    
+    def has_paralyzed(self, color: PieceColor) -> bool:
+        """Чи є на дошці паралізовані фігури кольору color (векторна маска по ID)"""
+        ids = np.flatnonzero((PIECE_ID_COLORS == color) & (self.paralysis_turns > 0))
+        return any(int(pid) in self.position_by_id for pid in ids)
+    
+    def set_nebula_timer(self, piece_id: int, timer: int):
+        """Встановлює таймер перебування фігури в туманності"""
+        self.nebula_timers[piece_id] = timer
+    
+    def clear_nebula_timer(self, piece_id: int):
+        """Скидає таймер туманності фігури"""
+        self.nebula_timers[piece_id] = 0
+    
+    def get_nebula_timer(self, piece_id: int) -> int:
+        """Повертає таймер туманності фігури (0 - фігура не в туманності)"""
+        return int(self.nebula_timers[piece_id])
+    
+    def get_nebula_timer_ids(self) -> np.ndarray:
+        """Повертає ID фігур на дошці з активним таймером туманності"""
+        ids = np.flatnonzero(self.nebula_timers)
+        return np.array([pid for pid in ids if pid in self.position_by_id], dtype=np.int64)
+    
+    def set_enhanced(self, piece_id: int, enhanced: bool = True):
+        """Позначає фігуру посиленою (синхронізує масив статусів та Piece.is_enhanced)"""
+        if piece_id in self.position_by_id and bool(self.enhanced[piece_id]) != enhanced:
+            color_index = 0 if PIECE_ID_COLORS[piece_id] == PieceColor.WHITE else 1
+            self.enhanced_counts[color_index] += 1 if enhanced else -1
+        self.enhanced[piece_id] = enhanced
+        piece = self.pieces_by_id.get(piece_id)
+        if piece:
+            piece.is_enhanced = enhanced
+    
+    def tick_paralysis(self, color: PieceColor) -> np.ndarray:
+        """
+        Зменшує таймери паралічу всіх фігур кольору color одним векторним кроком.
+        Повертає ID фігур, параліч яких закінчився саме на цьому тіку.
+        """
+        ticking = (PIECE_ID_COLORS == color) & (self.paralysis_turns > 0)
+        self.paralysis_turns[ticking] -= 1
+        return np.flatnonzero(ticking & (self.paralysis_turns == 0))
+    
+    def tick_nebula_timers(self, color: PieceColor) -> np.ndarray:
+        """
+        Зменшує таймери туманностей фігур кольору color одним векторним кроком.
+        Повертає ID фігур, чий час у туманності щойно вичерпано.
+        """
+        ticking = (PIECE_ID_COLORS == color) & (self.nebula_timers > 0)
+        self.nebula_timers[ticking] -= 1
+        return np.flatnonzero(ticking & (self.nebula_timers == 0))
+    
+    # ═══ ЗНІМКИ СТАНУ (контрольні точки відтворення, пошук ШІ) ═══
+    
+    def snapshot(self) -> tuple:
+        """
+        Повертає повний знімок дошки: mailbox, індекси фігур, бітборди, туманності,
+        масиви статусів, хеш і накопичувачі оцінки. Об'єкти Piece спільні зі знімком - їхній is_enhanced
+        відновлюється з масиву enhanced під час restore().
+        """
+        return (
+            self.mailbox.copy(),
+            dict(self.pieces_by_id),
+            dict(self.position_by_id),
+            {color: dict(boards) for color, boards in self.bitboards.items()},
+            dict(self.all_pieces),
+            {name: dict(state) for name, state in self.nebula_states.items()},
+            self.paralysis_turns.copy(),
+            self.nebula_timers.copy(),
+            self.enhanced.copy(),
+            self.position_hash,
+            self.piece_counts.copy(),
+            self.enhanced_counts.copy(),
+            self.square_weights,
+            self.square_score,
+        )
+    
+    def restore(self, snapshot: tuple):
+        """
+        Відновлює дошку зі знімку snapshot(). Знімок копіюється, а не забирається,
+        тому одну контрольну точку можна відновлювати скільки завгодно разів.
+        """
+        (mailbox, pieces_by_id, position_by_id, bitboards, all_pieces,
+         nebula_states, paralysis_turns, nebula_timers, enhanced, position_hash,
+         piece_counts, enhanced_counts, square_weights, square_score) = snapshot
+        
+        # ОПТИМІЗАЦІЯ: Масиви копіюються на місці, без нових алокацій
+        np.copyto(self.mailbox, mailbox)
+        np.copyto(self.paralysis_turns, paralysis_turns)
+        np.copyto(self.nebula_timers, nebula_timers)
+        np.copyto(self.enhanced, enhanced)
+        np.copyto(self.piece_counts, piece_counts)
+        np.copyto(self.enhanced_counts, enhanced_counts)
+        
+        self.pieces_by_id = dict(pieces_by_id)
+        self.position_by_id = dict(position_by_id)
+        self.bitboards = {color: dict(boards) for color, boards in bitboards.items()}
+        self.all_pieces = dict(all_pieces)
+        self.nebula_states = {name: dict(state) for name, state in nebula_states.items()}
+        self.position_hash = position_hash
+        
+        for piece_id, piece in self.pieces_by_id.items():
+            piece.is_enhanced = bool(self.enhanced[piece_id])
+            self.piece_table_indices[piece_id] = piece_table_index(piece)
+        
+        # Знімок зроблено з іншими вагами клітинок - сума перераховується під поточні
+        if square_weights is self.square_weights:
+            self.square_score = square_score
+        else:
+            self.set_square_weights(self.square_weights)
+        self._cache_valid = False
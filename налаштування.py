@@ -60,6 +60,24 @@ WHITE_ID_END = 1099
 BLACK_ID_START = 2000
 BLACK_ID_END = 2099
 
+# Верхня межа ID фігур (розмір масивів статусів та Zobrist таблиці)
+MAX_PIECE_ID = 3000
+
+# Правила нічиєї (0 - правило вимкнено)
+REPETITION_DRAW_COUNT = 3     # Скільки разів має повторитися той самий стан партії
+NO_CAPTURE_DRAW_PLIES = 100   # Півходів поспіль без зміни кількості фігур на дошці
+
+# Суперник ШІ в графічному інтерфейсі
+AI_DIFFICULTY = 3             # Рівень складності 1-5 (DIFFICULTY_LEVELS у штучний_інтелект/алгоритм.py)
+AI_SEARCH_WORKERS = 1         # Процесів пошуку (> 1 - паралельний пошук кореня / оцінка листів MCTS)
+AI_ENGINE = "alphabeta"       # Рушій ШІ: "alphabeta" (ChessAI) або "mcts" (MCTSAI)
+AI_PONDER = True              # Пошук під час ходу людини (на передбачену відповідь)
+AI_STATS_LOG = None           # JSONL-файл статистики кожного пошуку ШІ (None - не писати)
+AI_HINT_LINES = 3             # Найкращих ходів в аналізі кнопки "Підказка"
+AI_HINT_TIME = 5.0            # Час аналізу підказки в секундах
+AI_OPENING_BOOK = "ресурси/книга_дебютів.bin"   # Книга дебютів відносно теки гри (немає файлу - без книги)
+AI_TABLEBASE_DIR = "ресурси/ендшпіль"          # Таблиці ендшпілю відносно теки гри (немає - без таблиць)
+
 # --- Кольори дошки та фігур ---
 DARK_SQUARE_COLOR = QColor(0, 0, 0)
 LIGHT_SQUARE_COLOR = QColor(255, 255, 255)
@@ -70,6 +88,7 @@ BLACK_BORDER_COLOR = QColor(0, 0, 0)
 ATTACK_DOT_COLOR = QColor(255, 0, 0)      # Червона для атак
 MOVE_DOT_COLOR = QColor(0, 127, 255)      # Синя для звичайних ходів (включаючи вхід у туманність)
 SWAP_DOT_COLOR = QColor(200, 200, 200, 200)  # Сіра для обмінів
+HINT_DOT_COLOR = QColor(50, 205, 50)      # Зелена для ходу-підказки (звідки і куди)
 TELEPORT_DOT_COLOR = QColor(148, 0, 211)  # Фіолетова для телепортації
 
 # --- Налаштування контурів клітинок ---
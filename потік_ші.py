@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Фоновий пошук ходу ШІ для графічного інтерфейсу
+
+Пошук ChessAI іде в окремому QThread на копії партії (ChessAI.clone_for_search),
+тож головний потік Qt лише відображає незмінний стан і не блокується.
+Результат повертається сигналом (черга подій Qt) і застосовується в головному
+потоці через GameState.apply_move.
+
+Кожен запуск має номер: скасування (нова гра, вихід у меню) збільшує номер,
+а результати й прогрес застарілих пошуків відкидаються. Новий пошук чекає,
+доки попередній потік завершиться після request_stop().
+
+Пондеринг (ponder): під час ходу людини ШІ шукає позицію після передбаченої
+відповіді. Якщо людина зіграла її (той самий хеш стану), start() не запускає
+новий пошук, а перетворює пондеринг на звичайний пошук (ChessAI.ponder_hit)
+або одразу віддає вже знайдений хід. Промах зупиняє пондеринг до старту
+справжнього пошуку, тож під час ходу ШІ зайвого навантаження немає.
+
+Статистика пошуку, що дав останній хід ШІ (статистика.SearchStats), лишається
+в last_stats - її показує кнопка "Підказка"; stats_log дописує кожен пошук у JSONL.
+
+Аналіз (analyze, кнопка "Підказка"): той самий рушій і потік шукають кілька
+найкращих ходів позиції людини (ChessAI.analyze) і публікують рядки кожної
+завершеної глибини сигналом analysis_updated. Аналіз замінює пондеринг;
+хід людини скасовує аналіз, як і будь-який інший пошук.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from логування import game_logger, quiet_mode
+from налаштування import (AI_DIFFICULTY, AI_SEARCH_WORKERS, AI_ENGINE, AI_STATS_LOG, AI_HINT_LINES,
+                          AI_HINT_TIME, AI_OPENING_BOOK, AI_TABLEBASE_DIR)
+from стан_гри import move_to_notation
+
+
+class AISearchThread(QThread):
+    """Потік одного пошуку: ChessAI.search (або analyze при analysis_lines > 0) на вже скопійованій партії"""
+    progress = pyqtSignal(int, object)      # (номер пошуку, статистика ітерації)
+    move_found = pyqtSignal(int, object)    # (номер пошуку, хід або None)
+    analysis = pyqtSignal(int, object, bool)   # (номер пошуку, рядки аналізу, аналіз завершено)
+
+    def __init__(self, ai, search_state, search_id: int, analysis_lines: int = 0, parent=None):
+        super().__init__(parent)
+        self.ai = ai
+        self.search_state = search_state
+        self.search_id = search_id
+        self.analysis_lines = analysis_lines
+
+    def run(self):
+        if self.analysis_lines:
+            self._run_analysis()
+            return
+        self.ai.on_iteration = lambda stats: self.progress.emit(self.search_id, stats)
+        move = None
+        try:
+            with quiet_mode():
+                move = self.ai.search(self.search_state)
+        except Exception as error:
+            game_logger.error(f"Помилка пошуку ШІ: {error}")
+        finally:
+            self.ai.on_iteration = None
+        self.move_found.emit(self.search_id, move)
+
+    def _run_analysis(self):
+        lines = []
+        try:
+            with quiet_mode():
+                lines = self.ai.analyze(self.search_state, self.analysis_lines,
+                                        lambda update: self.analysis.emit(self.search_id, update, False),
+                                        AI_HINT_TIME)
+        except Exception as error:
+            game_logger.error(f"Помилка аналізу ШІ: {error}")
+        self.analysis.emit(self.search_id, lines, True)
+
+
+class AIController(QObject):
+    """Керує рушієм ШІ (ChessAI або MCTSAI) та потоками пошуку: запуск, прогрес, скасування, завершення"""
+    progress = pyqtSignal(dict)      # Статистика завершеної ітерації поточного пошуку
+    move_ready = pyqtSignal(object)  # Хід для позиції, з якої запущено поточний пошук
+    analysis_updated = pyqtSignal(object, bool)   # Рядки аналізу (AnalysisLine) і чи аналіз завершено
+
+    def __init__(self, difficulty: int = AI_DIFFICULTY, workers: int = AI_SEARCH_WORKERS,
+                 engine: str = AI_ENGINE, stats_log: Optional[str] = AI_STATS_LOG, parent=None):
+        super().__init__(parent)
+        from штучний_інтелект import create_engine
+        from штучний_інтелект.книга_дебютів import OpeningBook
+        from штучний_інтелект.таблиці_ендшпілю import EndgameTablebases
+
+        self.ai = create_engine(engine, workers=workers)
+        self.ai.set_difficulty(difficulty)
+        self.ai.stats_log = stats_log
+        self.ai.book = OpeningBook.open_if_exists(Path(__file__).parent / AI_OPENING_BOOK)
+        self.ai.tablebases = EndgameTablebases.open_if_exists(Path(__file__).parent / AI_TABLEBASE_DIR)
+        self.last_stats = None
+        self._thread: Optional[AISearchThread] = None
+        self._pending = None
+        self._search_id = 0
+        # Пондеринг: хеш позиції, яку шукаємо наперед, і вже знайдений для неї хід
+        self._ponder_key: Optional[int] = None
+        self._ponder_result = None
+        self._ponder_finished = False
+        self.ponder_move = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        # Номер пошуку-аналізу (кнопка "Підказка")
+        self._analysis_id: Optional[int] = None
+
+    def is_thinking(self) -> bool:
+        """Чи є поточний (не скасований) пошук ходу ШІ (пондеринг не враховується)"""
+        if self._ponder_key is not None or self._analysis_id == self._search_id:
+            return False
+        return self._pending is not None or (self._thread is not None and self._thread.search_id == self._search_id)
+
+    def is_pondering(self) -> bool:
+        return self._ponder_key is not None
+
+    def start(self, game_state):
+        """Запускає пошук ходу для поточної позиції game_state (копія робиться тут, у головному потоці)"""
+        if self._ponder_key is not None:
+            if self._ponder_key == game_state.compute_state_hash():
+                self._on_ponder_hit()
+                return
+            self.ponder_misses += 1
+            game_logger.info("Пондеринг: промах, спекулятивний пошук відкинуто")
+            self._ponder_key = None
+        self._submit(self.ai.clone_for_search(game_state), False)
+
+    def ponder(self, game_state):
+        """Хід суперника: пошук позиції після його передбаченої відповіді"""
+        self._ponder_key = None
+        if self.ai.deterministic:
+            return  # Тепла таблиця пондерингу зробила б хід рівня складності невідтворюваним
+        search_state = self.ai.clone_for_search(game_state)
+        with quiet_mode():
+            reply = self.ai.predict_reply(search_state)
+            if reply is None or not search_state.apply_move(reply) or search_state.game_over:
+                return
+        self._ponder_key = search_state.compute_state_hash()
+        self.ponder_move = reply
+        self._ponder_result = None
+        self._ponder_finished = False
+        game_logger.info(f"Пондеринг: очікувана відповідь {move_to_notation(reply)}")
+        self._submit(search_state, True)
+
+    def analyze(self, game_state, lines: int = AI_HINT_LINES):
+        """Аналіз позиції game_state (хід людини): замість пондерингу - lines найкращих ходів"""
+        self._ponder_key = None
+        self._submit(self.ai.clone_for_search(game_state), False, lines)
+        self._analysis_id = self._search_id
+
+    def cancel_analysis(self):
+        """Скасовує аналіз, якщо він - поточний пошук (позиція змінилася)"""
+        if self._analysis_id == self._search_id:
+            self.cancel()
+
+    def cancel(self):
+        """Скасовує поточний пошук: його результат буде відкинуто"""
+        self._search_id += 1
+        self._pending = None
+        self._ponder_key = None
+        if self._thread is not None:
+            self.ai.request_stop()
+
+    def shutdown(self):
+        """Скасування з очікуванням потоку і завершенням процесів пошуку (закриття вікна)"""
+        self.cancel()
+        if self._thread is not None:
+            self._thread.wait()
+        self.ai.shutdown()
+
+    def _submit(self, search_state, ponder: bool, analysis_lines: int = 0):
+        self._search_id += 1
+        if self._thread is not None:
+            # Попередній пошук ще не завершився - новий стартує після нього
+            self.ai.request_stop()
+            self._pending = (self._search_id, search_state, ponder, analysis_lines)
+            return
+        self._launch(self._search_id, search_state, ponder, analysis_lines)
+
+    def _on_ponder_hit(self):
+        """Людина зіграла передбачений хід: пондеринг продовжується як звичайний пошук"""
+        self._ponder_key = None
+        self.ponder_hits += 1
+        game_logger.info("Пондеринг: влучання, пошук продовжується з теплою таблицею")
+        if self._ponder_finished:
+            # Пондеринг уже дійшов до максимальної глибини - хід готовий
+            QTimer.singleShot(0, lambda move=self._ponder_result: self.move_ready.emit(move))
+        else:
+            self.ai.ponder_hit()
+
+    def _launch(self, search_id: int, search_state, ponder: bool, analysis_lines: int = 0):
+        # Потік ще не стартував - прапорець пондерингу безпечно ставити з головного потоку
+        self.ai.pondering = ponder
+        thread = AISearchThread(self.ai, search_state, search_id, analysis_lines, self)
+        thread.progress.connect(self._on_progress)
+        thread.move_found.connect(self._on_move_found)
+        thread.analysis.connect(self._on_analysis)
+        thread.finished.connect(self._on_thread_finished)
+        self._thread = thread
+        thread.start()
+
+    def _on_progress(self, search_id: int, stats: Dict[str, object]):
+        if search_id == self._search_id:
+            self.progress.emit(dict(stats, pondering=self._ponder_key is not None))
+
+    def _on_move_found(self, search_id: int, move):
+        if search_id != self._search_id:
+            return
+        # Потік уже вийшов з пошуку - статистика рушія відповідає цьому ходу
+        self.last_stats = self.ai.last_stats
+        if self._ponder_key is not None:
+            # Пондеринг завершився раніше за хід людини - хід чекає на влучання
+            self._ponder_result = move
+            self._ponder_finished = True
+            return
+        self.move_ready.emit(move)
+
+    def _on_analysis(self, search_id: int, lines, finished: bool):
+        if search_id != self._search_id:
+            return
+        if finished:
+            self.last_stats = self.ai.last_stats
+        self.analysis_updated.emit(lines, finished)
+
+    def _on_thread_finished(self):
+        finished = self._thread
+        self._thread = None
+        if finished is not None:
+            finished.deleteLater()
+        if self._pending is not None:
+            search_id, search_state, ponder, analysis_lines = self._pending
+            self._pending = None
+            self._launch(search_id, search_state, ponder, analysis_lines)
@@ -6,6 +6,12 @@ from розташування_фігур import Piece, Move, is_valid_position
 from логування import game_logger
 
 
+# Прив'язка Щит ↔ Фурія за ID фігур: загибель однієї знищує іншу
+SHIELD_TO_FURY = {2039: 2038, 2041: 2040, 1007: 1006, 1009: 1008}
+FURY_TO_SHIELD = {fury_id: shield_id for shield_id, fury_id in SHIELD_TO_FURY.items()}
+BONDED_PARTNERS = {**SHIELD_TO_FURY, **FURY_TO_SHIELD}
+
+
 def get_path_cells(from_row: int, from_col: int, to_row: int, to_col: int) -> List[Tuple[int, int]]:
     path = []
     row_direction = 0 if from_row == to_row else (1 if to_row > from_row else -1)
@@ -80,7 +86,7 @@ class MoveCalculator:
             return self._moves_cache[cache_key]
 
         # КРИТИЧНО: Паралізовані фігури не можуть ходити!
-        if self.game_state and (row, col) in self.game_state.paralyzed_pieces:
+        if self.game_state and self.board.is_paralyzed_at(row, col):
             result = [], [], []
             self._moves_cache[cache_key] = result
             return result
@@ -299,16 +305,14 @@ class MoveCalculator:
     def handle_shield_fury_bond(self, captured_piece: Piece, capture_row: int, capture_col: int) -> List[Tuple[int, int]]:
         additional_casualties = []
         if captured_piece.type == PieceType.SHIELD:
-            fury_pairs = {2039: 2038, 2041: 2040, 1007: 1006, 1009: 1008}
-            fury_id = fury_pairs.get(captured_piece.id)
+            fury_id = SHIELD_TO_FURY.get(captured_piece.id)
             if fury_id:
                 fury_pos = self.board.find_piece_position(fury_id)
                 if fury_pos:
                     additional_casualties.append(fury_pos)
                     game_logger.info(f"Прив'язка: Щит знищено → Фурія також вмирає!")
         elif captured_piece.type == PieceType.FURY:
-            shield_pairs = {2038: 2039, 2040: 2041, 1006: 1007, 1008: 1009}
-            shield_id = shield_pairs.get(captured_piece.id)
+            shield_id = FURY_TO_SHIELD.get(captured_piece.id)
             if shield_id:
                 shield_pos = self.board.find_piece_position(shield_id)
                 if shield_pos:
@@ -1456,7 +1460,9 @@ class MoveCalculator:
 
         return moves, attacks
 
-    def _filter_legal_moves(self, piece: Piece, from_row: int, from_col: int, moves: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    def _filter_legal_moves(self, piece: Piece, from_row: int, from_col: int, moves: List[Tuple[int, int]],
+                            first_only: bool = False) -> List[Tuple[int, int]]:
+        """Залишає ходи, після яких власний король не під шахом (first_only - до першого такого)"""
         legal_moves = []
         for move_item in moves:
             marker = None
@@ -1483,6 +1489,9 @@ class MoveCalculator:
             self.board.set_piece(from_row, from_col, piece)
             if original_piece and not original_piece.is_empty():
                 self.board.set_piece(to_row, to_col, original_piece)
+            
+            if first_only and legal_moves:
+                break
         
         return legal_moves
 
@@ -1657,37 +1666,34 @@ class MoveCalculator:
             return False
         
         # КРИТИЧНО: Якщо король паралізований І під шахом - це МАТ!
-        if self.game_state and king_pos in self.game_state.paralyzed_pieces:
-            paralysis_info = self.game_state.paralyzed_pieces[king_pos]
-            # Перевіряємо, що паралізований саме король цього кольору
-            if paralysis_info.get('color') == color:
-                print(f"⚡👑 МАТ! Король паралізований і під шахом!")
-                return True
+        # (статус береться за ID фігури, тому це завжди король цього кольору)
+        if self.game_state and self.board.is_paralyzed_at(king_pos[0], king_pos[1]):
+            print(f"⚡👑 МАТ! Король паралізований і під шахом!")
+            return True
         
         # Стандартна перевірка - чи є хоча б один легальний хід
-        all_pieces = self.board.get_all_pieces_of_color(color)
-        for row, col in all_pieces:
-            piece = self.board.get_piece_at(row, col)
-            if piece and not piece.is_empty():
-                moves, attacks, teleports = self.get_possible_moves(piece, row, col)
-                if moves or attacks or teleports:
-                    return False
-        
-        return True
+        return not self.has_legal_move(color)
 
     def is_stalemate(self, color: PieceColor) -> bool:
         if self._is_king_in_check(color) is not None:
             return False
         
-        all_pieces = self.board.get_all_pieces_of_color(color)
-        for row, col in all_pieces:
+        return not self.has_legal_move(color)
+
+    def has_legal_move(self, color: PieceColor) -> bool:
+        """
+        Чи є у сторони хоча б один легальний хід (для мату та пату).
+        ОПТИМІЗАЦІЯ: псевдолегальні ходи перевіряються по одному до першого легального,
+        без повної фільтрації всіх ходів кожної фігури.
+        """
+        for row, col in self.board.get_all_pieces_of_color(color):
             piece = self.board.get_piece_at(row, col)
-            if piece and not piece.is_empty():
-                moves, attacks, teleports = self.get_possible_moves(piece, row, col)
-                if moves or attacks or teleports:
-                    return False
-        
-        return True
+            if piece.is_empty():
+                continue
+            for candidates in self.get_possible_moves(piece, row, col, filter_legal=False):
+                if candidates and self._filter_legal_moves(piece, row, col, candidates, first_only=True):
+                    return True
+        return False
 
     def get_resurrection_positions(self, color: PieceColor) -> List[Tuple[int, int]]:
         """Повертає позиції для воскресіння пішаків."""
@@ -78,6 +78,8 @@ class Move:
     is_nebula_teleport: bool = False
     special_move_flag: Optional[str] = None  # 'TEMPLE_SWAP', 'ARISTOCRAT_EXCHANGE_ALLY', etc.
     teleport_penalty: int = 0
+    landing_square: Optional[Tuple[int, int]] = None  # Приземлення Тріумфатора після паралічу
+    resurrected_type: Optional[PieceType] = None  # Тип душі для воскресіння Всадником
 
     def __str__(self):
         return f"Move({self.from_square} -> {self.to_square}, type={self.special_move_flag or 'NORMAL'})"
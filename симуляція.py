@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пакетний безголовий симулятор партій "Вершителі часу"
+
+Грає багато партій паралельно (ProcessPoolExecutor) без графіки та логування
+партії. Кожен процес тримає ОДИН GameState і перевикористовує його через
+reset_game(). Гравці: випадковий, жадібний, ChessAI або MCTSAI з фіксованими seed.
+
+Кожна завершена партія одразу дописується рядком JSON у вихідний файл:
+    {"game", "seed", "white", "black", "result", "reason", "plies", "moves", ...}
+Ходи записуються PGN-токенами (див. стан_гри.move_to_notation).
+
+Приклад:
+    python симуляція.py --games 200 --workers 4 --white random --black greedy --seed 1
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from налаштування import PieceType, PieceColor
+from розташування_фігур import Move
+from логування import set_quiet_mode, game_logger
+
+PLAYER_TYPES = ("random", "greedy", "ai", "mcts")
+
+# Стан процесу-воркера: один GameState на процес, перевикористовується між партіями
+_worker_game_state = None
+
+
+class RandomPlayer:
+    """Гравець, що обирає випадковий легальний хід"""
+
+    name = "random"
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def choose_move(self, game_state, legal_moves: List[Move]) -> Move:
+        return self.rng.choice(legal_moves)
+
+
+class GreedyPlayer:
+    """Гравець, що бере найцінніший матеріал одразу (нічия - випадково)"""
+
+    name = "greedy"
+
+    def __init__(self, seed: int):
+        from штучний_інтелект.оцінка import PositionEvaluator
+        self.rng = random.Random(seed)
+        self.piece_values = PositionEvaluator.PIECE_VALUES
+
+    def _move_gain(self, game_state, move: Move) -> float:
+        if move.is_capture or move.special_move_flag == 'TRIUMPHATOR_PARALYSIS':
+            target = game_state.board.get_piece_at(*move.to_square)
+            value = self.piece_values.get(target.type, 0.0)
+            # Паралізація не знищує фігуру - цінуємо її нижче за взяття
+            return value if move.is_capture else value * 0.25
+        return 0.0
+
+    def choose_move(self, game_state, legal_moves: List[Move]) -> Move:
+        gains = [self._move_gain(game_state, move) for move in legal_moves]
+        best_gain = max(gains)
+        best_moves = [move for move, gain in zip(legal_moves, gains) if gain == best_gain]
+        return self.rng.choice(best_moves)
+
+
+class AIPlayer:
+    """
+    Гравець на основі ChessAI (з випадковим запасним ходом): детермінований
+    рівень складності з бюджетом вузлів, тож партія з тим самим seed повторюється
+    """
+
+    name = "ai"
+
+    def __init__(self, seed: int, level: int = 2):
+        from штучний_інтелект import ChessAI
+        self.rng = random.Random(seed)
+        self.ai = ChessAI(noise_seed=seed)
+        self.ai.set_difficulty(level, deterministic=True)
+
+    def choose_move(self, game_state, legal_moves: List[Move]) -> Move:
+        move = self.ai.get_best_move(game_state, game_state.current_player)
+        return move if move in legal_moves else self.rng.choice(legal_moves)
+
+
+class MCTSPlayer(AIPlayer):
+    """Гравець на основі MCTSAI: рівень складності лише лімітом листів (без ліміту часу)"""
+
+    name = "mcts"
+
+    def __init__(self, seed: int, level: int = 2):
+        from штучний_інтелект import MCTSAI
+        self.rng = random.Random(seed)
+        self.ai = MCTSAI(seed=seed)
+        self.ai.set_difficulty(level, deterministic=True)
+
+
+def create_player(player_type: str, seed: int, ai_level: int = 2):
+    """Створює гравця за назвою типу"""
+    if player_type == "random":
+        return RandomPlayer(seed)
+    if player_type == "greedy":
+        return GreedyPlayer(seed)
+    if player_type == "ai":
+        return AIPlayer(seed, ai_level)
+    if player_type == "mcts":
+        return MCTSPlayer(seed, ai_level)
+    raise ValueError(f"Невідомий тип гравця: {player_type}")
+
+
+def _result_from_state(game_state) -> Optional[tuple]:
+    """Визначає результат завершеної партії: (результат PGN, причина) або None"""
+    if game_state.game_over:
+        if game_state.winner == 'white':
+            return "1-0", game_state.game_over_reason
+        if game_state.winner == 'black':
+            return "0-1", game_state.game_over_reason
+        return "1/2-1/2", game_state.game_over_reason
+
+    # Шах у правилах не обмежує взяття Короля - втрата Короля завершує партію
+    for color, result in ((PieceColor.WHITE, "0-1"), (PieceColor.BLACK, "1-0")):
+        if not game_state.board.get_all_pieces_of_type(PieceType.KING, color):
+            return result, "king_captured"
+    return None
+
+
+def _init_worker():
+    """Ініціалізація процесу-воркера: тихий режим і один GameState на процес"""
+    global _worker_game_state
+    from стан_гри import GameState
+    set_quiet_mode(True)
+    _worker_game_state = GameState()
+
+
+def play_game(game_index: int, seed: int, white: str, black: str,
+              max_plies: int, ai_level: int = 2) -> Dict:
+    """Грає одну партію у GameState поточного процесу та повертає її запис"""
+    from стан_гри import move_to_notation
+
+    game_state = _worker_game_state
+    game_state.reset_game()
+
+    players = {
+        PieceColor.WHITE: create_player(white, seed * 2, ai_level),
+        PieceColor.BLACK: create_player(black, seed * 2 + 1, ai_level),
+    }
+
+    moves = []
+    outcome = None
+    start_time = time.perf_counter()
+
+    while len(moves) < max_plies:
+        outcome = _result_from_state(game_state)
+        if outcome:
+            break
+
+        legal_moves = game_state.generate_legal_moves()
+        if not legal_moves:
+            outcome = ("1/2-1/2", "no_moves")
+            break
+
+        move = players[game_state.current_player].choose_move(game_state, legal_moves)
+        notation = move_to_notation(move)
+        if not game_state.apply_move(move):
+            outcome = ("*", f"illegal_move {notation}")
+            break
+        moves.append(notation)
+
+    if outcome is None:
+        outcome = _result_from_state(game_state) or ("1/2-1/2", "ply_limit")
+
+    return {
+        "game": game_index,
+        "seed": seed,
+        "white": white,
+        "black": black,
+        "result": outcome[0],
+        "reason": outcome[1],
+        "plies": len(moves),
+        "moves": moves,
+        "worker": os.getpid(),
+        "seconds": round(time.perf_counter() - start_time, 4),
+    }
+
+
+def run_simulation(games: int, workers: int, white: str, black: str, seed: int,
+                   max_plies: int, output: Path, ai_level: int = 2) -> Dict[int, Dict[str, float]]:
+    """
+    Запускає пакет партій у пулі процесів. Кожна завершена партія одразу
+    записується у output (JSONL). Повертає статистику по воркерах.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    worker_stats: Dict[int, Dict[str, float]] = {}
+    results = {"1-0": 0, "0-1": 0, "1/2-1/2": 0, "*": 0}
+
+    wall_start = time.perf_counter()
+    with open(output, "w", encoding="utf-8") as out_file, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(play_game, index, seed + index, white, black, max_plies, ai_level)
+            for index in range(games)
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            out_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out_file.flush()
+
+            stats = worker_stats.setdefault(record["worker"], {"games": 0, "plies": 0, "seconds": 0.0})
+            stats["games"] += 1
+            stats["plies"] += record["plies"]
+            stats["seconds"] += record["seconds"]
+            results[record["result"]] += 1
+    wall_time = time.perf_counter() - wall_start
+
+    print(f"🎲 Зіграно {games} партій за {wall_time:.2f} с "
+          f"({games / wall_time:.2f} партій/с, результати: {results})")
+    for pid, stats in sorted(worker_stats.items()):
+        busy = max(stats["seconds"], 1e-9)
+        print(f"   воркер {pid}: {stats['games']} партій, "
+              f"{stats['games'] / busy:.2f} партій/с, {stats['plies'] / busy:.1f} півходів/с")
+    game_logger.info(f"Симуляція завершена: {games} партій, {wall_time:.2f} с, вивід {output}")
+    return worker_stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Пакетна симуляція партій без графіки")
+    parser.add_argument("--games", type=int, default=10, help="кількість партій")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="кількість процесів")
+    parser.add_argument("--white", choices=PLAYER_TYPES, default="random", help="гравець за білих")
+    parser.add_argument("--black", choices=PLAYER_TYPES, default="random", help="гравець за чорних")
+    parser.add_argument("--seed", type=int, default=0, help="базовий seed (партія i отримує seed + i)")
+    parser.add_argument("--max-plies", type=int, default=400, help="ліміт півходів на партію")
+    parser.add_argument("--ai-level", type=int, default=2, help="рівень складності гравців ai і mcts (1-5)")
+    parser.add_argument("--output", type=Path, default=Path(__file__).parent / "логи" / "симуляції.jsonl",
+                        help="вихідний JSONL файл")
+    args = parser.parse_args(argv)
+
+    run_simulation(args.games, args.workers, args.white, args.black, args.seed,
+                   args.max_plies, args.output, args.ai_level)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
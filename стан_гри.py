@@ -1,1469 +1,1991 @@
-# -*- coding: utf-8 -*-
-import datetime
-from typing import List, Tuple, Optional
-from дошка import Board
-from розташування_фігур import Piece, Move, get_initial_piece_positions
-from правила_фігур import MoveCalculator
-from налаштування import (
-    PieceType, PieceColor,
-    LETTERS_BOTTOM, NUMBERS_LEFT,
-    PIECE_NAMES_UA, NEBULAS
-)
-from логування import game_logger, game_print, log_error, end_game
-
-def coordinates_to_chess_notation(row: int, col: int) -> str:
-    """Конвертує координати в шахову нотацію"""
-    if 0 <= col - 1 < len(LETTERS_BOTTOM):
-        letter = LETTERS_BOTTOM[col - 1]
-    else:
-        letter = chr(ord('A') + col - 1)
-    
-    # Перевертаємо номер рядка для правильної нотації
-    chess_row = 21 - row
-    return f"{letter}{chess_row}"
-
-def get_color_name_ua(piece_color: PieceColor) -> str:
-    return "білий" if piece_color == PieceColor.WHITE else "чорний"
-
-def get_color_name_ua_with_gender(piece_color: PieceColor, piece_type: PieceType) -> str:
-    feminine_pieces = {PieceType.QUEEN, PieceType.ROOK, PieceType.FURY, PieceType.LIGHTNING}
-    if piece_type in feminine_pieces:
-        return "біла" if piece_color == PieceColor.WHITE else "чорна"
-    else:
-        return "білий" if piece_color == PieceColor.WHITE else "чорний"
-
-def is_nebula_coordinates(row: int, col: int) -> bool:
-    for nebula_name, (neb_row, neb_col) in NEBULAS.items():
-        if neb_row == row and neb_col == col:
-            return True
-    return False
-
-def get_nebula_name(row: int, col: int) -> Optional[str]:
-    for nebula_name, (neb_row, neb_col) in NEBULAS.items():
-        if neb_row == row and neb_col == col:
-            return nebula_name
-    return None
-
-def get_nebula_emoji_name(nebula_name: str) -> str:
-    nebula_names_ua = {
-        "top_left": "верхня ліва",
-        "top_right": "верхня права", 
-        "bottom_left": "нижня ліва",
-        "bottom_right": "нижня права"
-    }
-    return nebula_names_ua.get(nebula_name, nebula_name)
-
-class GameState:
-    def __init__(self):
-        self.board = Board()
-        self.current_player = PieceColor.WHITE
-        self.turn_number = 1
-        self.selected_piece = None
-        self.possible_moves = []
-        self.possible_attacks = []
-        self.possible_teleports = []
-        
-        self.move_calculator = MoveCalculator(self.board)
-        self.move_calculator.set_game_state(self)
-        
-        self.move_history = []
-        self.captured_pieces = {"white": [], "black": []}
-        
-        self.paralysis_selection = None  # {'triumphator_pos': (r,c), 'target_pos': (r,c)}
-        self.paralyzed_pieces = {}  # {(row, col): {'duration': int, 'piece_id': int}}
-        self.moon_double_move = None
-        
-        self.nebula_blocked = {
-            "top_left": True,
-            "top_right": True, 
-            "bottom_left": True,
-            "bottom_right": True
-        }
-        
-        self.resurrected_pawns = {"white": 0, "black": 0}
-        self.resurrection_available = {"white": 0, "black": 0}
-        self.nebulas_activated = {"white": False, "black": False}
-        self.nebula_piece_timers = {}
-        self.recently_resurrected_pieces = set()
-
-        # Eye enhancement attributes
-        self.eye_enhancement_used = {"white": False, "black": False}
-        self.triumphant_eye_links = {}
-        self.eye_enhancement_selection = None
-        
-        # Система полювання на душі Всадником
-        self.hunted_souls = {
-            "white": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False},
-            "black": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False}
-        }
-        self.performed_resurrection = {"white": False, "black": False}  # Одне воскресіння всадником на всю гру (НАЗАВЖДІ)
-        self.soul_corners = []  # Список куточків для воскресіння: [(row, col, piece_type, is_green, player_color)]
-        
-        # Система Аристократа - дипломатичний обмін
-        self.aristocrat_exchanges = []  # Список можливих обмінів: [(row, col)]
-        
-        # Система Місяця - подвійний хід
-        self.moon_double_move_active = {"white": False, "black": False}  # Активація подвійного ходу
-        self.moon_double_move_used = {"white": False, "black": False}  # Використання подвійного ходу (один раз за гру)
-        self.moon_double_move_first_piece = None  # ID фігури, що зробила перший хід
-        
-        # Система Храму - священний обмін
-        self.temple_swap_used = {
-            "black_left": False,    # Храм на позиції (1, 1) - ID 2000
-            "black_right": False,   # Храм на позиції (1, 18) - ID 2017
-            "white_left": False,    # Храм на позиції (20, 1) - ID 1030
-            "white_right": False    # Храм на позиції (20, 18) - ID 1047
-        }
-        self.temple_swap_selection = None  # {'temple_pos': (r,c), 'temple_id': str}
-        
-        # Статус завершення гри
-        self.game_over = False
-        self.winner = None  # 'white', 'black', або 'draw' (для пату)
-        self.game_over_reason = None  # 'checkmate', 'stalemate', тощо
-        
-        self._setup_initial_position()
-    
-    def _setup_initial_position(self):
-        initial_positions = get_initial_piece_positions()
-        for row, col, piece_type, piece_color, piece_id in initial_positions:
-            if 1 <= row <= 20 and 1 <= col <= 18:
-                piece = Piece(piece_type, piece_color, piece_id)
-                self.board.set_piece(row, col, piece)
-        
-        # Setup Triumphant-Eye links
-        self.triumphant_eye_links = {
-            1004: [1000, 1001],
-            1005: [1002, 1003],
-            2036: [2042, 2043],
-            2037: [2044, 2045],
-        }
-
-    def get_piece_at(self, row: int, col: int) -> Optional[Piece]:
-        piece = self.board.get_piece_at(row, col)
-        if piece and not piece.is_empty():
-            return piece
-        return None
-    
-    def is_nebula_blocked(self, row: int, col: int) -> bool:
-        for nebula_name, (nebula_row, nebula_col) in NEBULAS.items():
-            if nebula_row == row and nebula_col == col:
-                return self.nebula_blocked.get(nebula_name, False)
-        return False
-    
-    def unlock_nebula(self, nebula_name: str):
-        if nebula_name in self.nebula_blocked:
-            self.nebula_blocked[nebula_name] = False
-    
-    def get_nebula_ring_color(self, row: int, col: int, current_player_color: PieceColor) -> Optional[PieceColor]:
-        if self.is_nebula_blocked(row, col):
-            return PieceColor.BLACK if current_player_color == PieceColor.WHITE else PieceColor.WHITE
-        return None
-    
-    def select_piece(self, row: int, col: int) -> bool:
-        if self.paralysis_selection:
-            return self._handle_paralysis_landing_selection(row, col)
-
-        # Eye enhancement тепер обробляється в графіка_інтерфейсу.py через _handle_enhancement_click()
-        # Тут ми просто блокуємо звичайний вибір фігур під час посилення
-        if self.eye_enhancement_selection:
-            return False
-
-        if (row, col) in self.paralyzed_pieces:
-            game_print("❌ Ця фігура паралізована!")
-            return False
-
-        piece = self.get_piece_at(row, col)
-            
-        if piece is None or piece.color != self.current_player:
-            self.clear_selection()
-            # Очищаємо вибір Храму, якщо клікаємо на порожню клітинку або ворожу фігуру
-            self.temple_swap_selection = None
-            return False
-        
-        # Якщо вибираємо не Храм, очищаємо попередній вибір обміну
-        if piece.type != PieceType.TEMPLE:
-            self.temple_swap_selection = None
-        
-        if piece.id in self.recently_resurrected_pieces:
-            return False
-        
-        # Перевірка подвійного ходу Місяця
-        color_key = "white" if piece.color == PieceColor.WHITE else "black"
-        if self.moon_double_move_active[color_key]:
-            if self.moon_double_move_first_piece is not None:
-                # Другий хід - можна вибрати тільки Місяць
-                if piece.type != PieceType.MOON:
-                    game_print("🌙 Під час подвійного ходу можна вибрати тільки Місяць!")
-                    return False
-        
-        supported_pieces = [
-            PieceType.PAWN, PieceType.ROOK, PieceType.KNIGHT, 
-            PieceType.BISHOP, PieceType.QUEEN, PieceType.KING,
-            PieceType.SHIELD, PieceType.FURY, PieceType.TEMPLE,
-            PieceType.ARISTOCRAT, PieceType.RIDER, PieceType.MOON,
-            PieceType.LIGHTNING, PieceType.TRIUMPHATOR, PieceType.EYE
-        ]
-        
-        if piece.type not in supported_pieces:
-            return False
-        
-        self.selected_piece = (row, col)
-        self.possible_moves, self.possible_attacks, self.possible_teleports = self.move_calculator.get_possible_moves(piece, row, col)
-        
-        # Додаткова логіка для Храму - показуємо можливості священного обміну
-        if piece.type == PieceType.TEMPLE:
-            temple_id = self.get_temple_id(row, col)
-            if temple_id and not self.temple_swap_used.get(temple_id, False):
-                # Храм ще не використав свій обмін
-                self.temple_swap_selection = {
-                    'temple_pos': (row, col),
-                    'temple_id': temple_id
-                }
-                # Можливі обміни будуть відображені як спеціальні крапки в графічному інтерфейсі
-        
-        return True
-
-    def _handle_paralysis_landing_selection(self, row: int, col: int) -> bool:
-        """Обробляє вибір місця приземлення після ініціації паралічу"""
-        if not self.paralysis_selection:
-            return False
-        
-        triumphator_pos = self.paralysis_selection['triumphator_pos']
-        target_pos = self.paralysis_selection['target_pos']
-        
-        landing_squares = self.move_calculator.get_paralysis_landing_squares(
-            target_pos[0], target_pos[1]
-        )
-        
-        if (row, col) not in landing_squares:
-            self.paralysis_selection = None
-            return False
-        
-        self._execute_paralysis(triumphator_pos, target_pos, (row, col))
-        
-        self.paralysis_selection = None
-        self.clear_selection()
-        
-        self.switch_player()
-        return True
-
-    def make_move(self, to_row: int, to_col: int) -> bool:
-        if self.selected_piece is None:
-            return False
-        
-        from_row, from_col = self.selected_piece
-        piece = self.board.get_piece_at(from_row, from_col)
-        
-        if piece and piece.type == PieceType.TRIUMPHATOR:
-            if (to_row, to_col) in self.possible_attacks:
-                self.paralysis_selection = {
-                    'triumphator_pos': (from_row, from_col),
-                    'target_pos': (to_row, to_col)
-                }
-                self.clear_selection()
-                return True
-        
-        # КРИТИЧНО: Обробка обміну Аристократа - він НЕ ВБИВАЄ, а МІНЯЄТЬСЯ!
-        if piece and piece.type == PieceType.ARISTOCRAT:
-            # Перевірка обміну з ворожою фігурою (червона крапка)
-            if (to_row, to_col) in self.possible_attacks:
-                target_piece = self.board.get_piece_at(to_row, to_col)
-                if target_piece and not target_piece.is_empty():
-                    # Це обмін з ворожою фігурою - НЕ атака!
-                    return self.execute_aristocrat_exchange(from_row, from_col, to_row, to_col)
-            
-            # Перевірка обміну з союзною фігурою (сіра крапка)
-            for move_item in self.possible_moves:
-                if isinstance(move_item, tuple) and len(move_item) == 3 and move_item[2] == 'swap':
-                    move_row, move_col, _ = move_item
-                    if (to_row, to_col) == (move_row, move_col):
-                        # Це обмін з союзною фігурою - НЕ звичайний хід!
-                        return self.execute_aristocrat_exchange(from_row, from_col, to_row, to_col)
-            
-            # Якщо дійшли сюди - це звичайний хід Аристократа на пусту клітинку
-        
-        # Обробка священного обміну Храму
-        if piece and piece.type == PieceType.TEMPLE:
-            # Перевіряємо, чи це спроба обміну з союзною фігурою
-            if self.temple_swap_selection:
-                swap_targets = self.get_temple_swap_targets(from_row, from_col)
-                if (to_row, to_col) in swap_targets:
-                    # Виконуємо священний обмін
-                    result = self.execute_temple_swap(from_row, from_col, to_row, to_col)
-                    self.temple_swap_selection = None
-                    return result
-        
-        # Перевірка звичайних ходів (враховуючи формат з 'swap', але виключаючи обміни)
-        is_regular_move = False
-        is_swap_move = False
-        
-        for move_item in self.possible_moves:
-            if isinstance(move_item, tuple):
-                if len(move_item) == 3 and move_item[2] == 'swap':
-                    move_row, move_col, _ = move_item
-                    if (to_row, to_col) == (move_row, move_col):
-                        is_swap_move = True
-                        break
-                elif len(move_item) >= 2:
-                    move_row, move_col = move_item[0], move_item[1]
-                    if (to_row, to_col) == (move_row, move_col):
-                        is_regular_move = True
-                        break
-            else:
-                if (to_row, to_col) == move_item:
-                    is_regular_move = True
-                    break
-        
-        # Якщо це обмін (swap) і не Аристократ - щось не так
-        if is_swap_move and piece.type != PieceType.ARISTOCRAT:
-            return False
-        
-        # Для Аристократа обміни вже оброблені вище, тут тільки звичайні ходи
-        is_attack = (to_row, to_col) in self.possible_attacks
-        is_teleport = (to_row, to_col) in self.possible_teleports
-        
-        if not (is_regular_move or is_attack or is_teleport):
-            return False
-        
-        if is_teleport:
-            return self._handle_teleport_move(from_row, from_col, to_row, to_col)
-        else:
-            # КРИТИЧНО: is_attack тут означає РЕАЛЬНУ атаку, а не обмін!
-            # Для Аристократа обміни вже оброблені вище
-            return self._handle_regular_move(from_row, from_col, to_row, to_col, is_attack)
-
-    def _execute_paralysis(self, triumphator_pos: Tuple[int, int], 
-                           target_pos: Tuple[int, int], 
-                           landing_pos: Tuple[int, int]):
-        """Виконує параліч цілі"""
-        triumphator = self.board.get_piece_at(triumphator_pos[0], triumphator_pos[1])
-        target = self.board.get_piece_at(target_pos[0], target_pos[1])
-        
-        if not triumphator or not target:
-            return
-        
-        duration = self._calculate_paralysis_duration(triumphator)
-        
-        self.board.move_piece(triumphator_pos[0], triumphator_pos[1], 
-                              landing_pos[0], landing_pos[1])
-        
-        self.paralyzed_pieces[target_pos] = {
-            'duration': duration,
-            'piece_id': target.id,
-            'color': target.color
-        }
-        
-        triumphator_color = get_color_name_ua(triumphator.color)
-        target_color = get_color_name_ua(target.color)
-        target_name = PIECE_NAMES_UA.get(target.type, "невідома")
-        
-        # Показуємо фактичну кількість пропущених ходів (duration - 1, бо duration включає поточний хід)
-        turns_to_skip = duration - 1
-        game_print(f"⚡ {triumphator_color} Тріумфатор паралізував {target_color} {target_name} на {turns_to_skip} ходів!")
-
-    def _calculate_paralysis_duration(self, triumphator: Piece) -> int:
-        """
-        Розраховує тривалість паралічу на основі стану Очей.
-        Duration = кількість ходів, які гравець ПРОПУСТИТЬ.
-        Для пропуску 1 ходу потрібно duration = 2 (бо таймер зменшується на початку кожного ходу цього гравця).
-        """
-        linked_eyes = self.triumphant_eye_links.get(triumphator.id, [])
-        
-        living_eyes = 0
-        for eye_id in linked_eyes:
-            if self.board.find_piece_position(eye_id):
-                living_eyes += 1
-        
-        # Якщо є живі очі: пропуск 1 ходу (duration=2)
-        # Якщо немає очей: пропуск 2 ходів (duration=3)
-        return 2 if living_eyes > 0 else 3
-
-    def _handle_teleport_move(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
-        """Обробляє телепортацію між туманностями"""
-        piece = self.board.get_piece_at(from_row, from_col)
-        
-        from_nebula = get_nebula_name(from_row, from_col)
-        to_nebula = get_nebula_name(to_row, to_col)
-        
-        penalty = 1 if from_row != to_row else 0
-        
-        piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
-        piece_color = get_color_name_ua_with_gender(piece.color, piece.type)
-        from_nebula_ua = get_nebula_emoji_name(from_nebula) if from_nebula else "невідома"
-        to_nebula_ua = get_nebula_emoji_name(to_nebula) if to_nebula else "невідома"
-        
-        move_log = f"💫 {piece_color} {piece_name} id({piece.id}) з {from_nebula_ua} туманності ({from_row}, {from_col}) телепортується на {to_nebula_ua} туманність ({to_row}, {to_col})"
-        penalty_text = " (з штрафом часу -1)" if penalty else " (без штрафу часу)"
-        move_log += penalty_text
-        
-        game_print(move_log)
-        
-        self.board.move_piece(from_row, from_col, to_row, to_col)
-        self.teleport_piece(piece.id, (from_row, from_col), (to_row, to_col))
-        
-        move = Move(
-            from_square=(from_row, from_col),
-            to_square=(to_row, to_col),
-            is_nebula_teleport=True,
-            teleport_penalty=penalty
-        )
-        self.move_history.append(move)
-        
-        self.switch_player()
-        return True
-
-    def _handle_regular_move(self, from_row: int, from_col: int, to_row: int, to_col: int, is_attack: bool) -> bool:
-        """Обробляє звичайні ходи та атаки"""
-        piece = self.board.get_piece_at(from_row, from_col)
-        captured_piece = self.board.get_piece_at(to_row, to_col) if is_attack else None
-        
-        is_pawn_back_move = False
-        if piece.type == PieceType.PAWN and not is_attack:
-            direction = -1 if piece.color == PieceColor.WHITE else 1
-            if (to_row - from_row) == -direction:
-                is_pawn_back_move = True
-                self.move_calculator.register_pawn_back_move(piece.id)
-        
-        move = Move(
-            from_square=(from_row, from_col),
-            to_square=(to_row, to_col),
-            is_capture=is_attack,
-            is_pawn_back_move=is_pawn_back_move
-        )
-        self.move_history.append(move)
-        
-        if captured_piece and not captured_piece.is_empty():
-            if captured_piece.color == PieceColor.WHITE:
-                self.captured_pieces["white"].append(captured_piece)
-            else:
-                self.captured_pieces["black"].append(captured_piece)
-                
-            if captured_piece.type == PieceType.PAWN:
-                self.update_resurrection_availability(captured_piece.color)
-        
-        # ВИПРАВЛЕНО: Імпорт логування на початку функції
-        
-        piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
-        piece_color = get_color_name_ua_with_gender(piece.color, piece.type)
-        from_chess = coordinates_to_chess_notation(from_row, from_col)
-        to_chess = coordinates_to_chess_notation(to_row, to_col)
-        
-        from_is_nebula = is_nebula_coordinates(from_row, from_col)
-        to_is_nebula = is_nebula_coordinates(to_row, to_col)
-        
-        if from_is_nebula:
-            from_nebula_name = get_nebula_name(from_row, from_col)
-            from_nebula_emoji = get_nebula_emoji_name(from_nebula_name) if from_nebula_name else ""
-            from_desc = f"{from_nebula_emoji} туманності ({from_row}, {from_col})"
-        else:
-            from_desc = f"{from_chess} ({from_row}, {from_col})"
-        
-        timer_reset = ""
-        if from_is_nebula and not to_is_nebula:
-            timer_reset = ", таймер обнуляється"
-        
-        if is_attack and captured_piece:
-            captured_name = PIECE_NAMES_UA.get(captured_piece.type, "невідома")
-            captured_color = get_color_name_ua_with_gender(captured_piece.color, captured_piece.type)
-            
-            if to_is_nebula:
-                nebula_name = get_nebula_name(to_row, to_col)
-                nebula_emoji_name = get_nebula_emoji_name(nebula_name) if nebula_name else ""
-                to_desc = f"{nebula_emoji_name} туманність 🌀({to_row}, {to_col}), присвоєно час 5"
-            else:
-                to_desc = f"{to_chess} ({to_row}, {to_col})"
-            
-            game_print(f"⚔️ {piece_color} {piece_name} id({piece.id}) з {from_desc} атакує {captured_color} {captured_name} id({captured_piece.id}) на {to_desc}{timer_reset}")
-        else:
-            if to_is_nebula:
-                nebula_name = get_nebula_name(to_row, to_col)
-                nebula_emoji_name = get_nebula_emoji_name(nebula_name) if nebula_name else ""
-                to_desc = f"{nebula_emoji_name} туманність 🌀({to_row}, {to_col}), присвоєно час 5"
-            else:
-                to_desc = f"{to_chess} ({to_row}, {to_col})"
-                
-            game_print(f"🏃 {piece_color} {piece_name} id({piece.id}) ходить з {from_desc} на {to_desc}{timer_reset}")
-
-        # ═══ МЕХАНІКА ЕЛЕКТРИЧНОГО ПАРАЛІЧУ БЛИСКАВКИ ═══
-        # Якщо захоплюється Блискавка, атакуюча фігура паралізується на 1 хід
-        # Виняток: Король не паралізується
-        # Особливе правило: Блискавка, що вбиває іншу блискавку, теж знищується
-        lightning_paralysis_applied = False
-        lightning_mutual_destruction = False
-        if is_attack and captured_piece and captured_piece.type == PieceType.LIGHTNING:
-            # Якщо атакуюча фігура - Король, нічого не відбувається
-            if piece.type == PieceType.KING:
-                pass
-            # Якщо атакуюча фігура - теж Блискавка, обидві знищуються
-            elif piece.type == PieceType.LIGHTNING:
-                lightning_mutual_destruction = True
-                attacker_name = PIECE_NAMES_UA.get(piece.type, "фігура")
-                attacker_color = get_color_name_ua_with_gender(piece.color, piece.type)
-                target_color = get_color_name_ua_with_gender(captured_piece.color, captured_piece.type)
-                game_print(f"⚡💥💥 {attacker_color} блискавка id({piece.id}) атакує {target_color} блискавку id({captured_piece.id})!")
-                game_print(f"   💀💀 Обидві блискавки знищуються в електричному вибуху!")
-                # Логування взаємного знищення блискавок
-            # Інші фігури паралізуються
-            else:
-                lightning_paralysis_applied = True
-                attacker_name = PIECE_NAMES_UA.get(piece.type, "фігура")
-                attacker_color = get_color_name_ua_with_gender(piece.color, piece.type)
-                game_print(f"⚡💥 {attacker_color} {attacker_name} id({piece.id}) захопив Блискавку і отримав електричний шок!")
-                to_notation = coordinates_to_chess_notation(to_row, to_col)
-                game_print(f"   ⛔ {attacker_name} на {to_notation} ({to_row}, {to_col}) паралізована на 1 хід!")
-                
-                # Логування паралізації від Блискавки
-        self.board.move_piece(from_row, from_col, to_row, to_col)
-        
-        # Взаємне знищення блискавок - видаляємо атакуючу блискавку після ходу
-        if lightning_mutual_destruction:
-            destroyed_piece = self.board.get_piece_at(to_row, to_col)
-            if destroyed_piece:
-                self.board.clear_square(to_row, to_col)
-                game_print(f"   ⚡ {get_color_name_ua_with_gender(destroyed_piece.color, destroyed_piece.type)} блискавка id({destroyed_piece.id}) на {coordinates_to_chess_notation(to_row, to_col)} знищена")
-        
-        # Застосовуємо параліч ПІСЛЯ переміщення фігури на нову позицію
-        if lightning_paralysis_applied:
-            self.paralyzed_pieces[(to_row, to_col)] = {
-                'duration': 2,  # duration=2 для пропуску 1 повного ходу
-                'piece_id': piece.id,
-                'color': piece.color
-            }
-        
-        self._process_move_side_effects(piece, from_row, from_col, to_row, to_col, captured_piece)
-        
-        enhancement_triggered = self._check_eye_enhancement(piece, to_row)
-
-        if enhancement_triggered:
-            return True
-
-        # Обробка подвійного ходу Місяця - КРИТИЧНО: перший хід ОБОВ'ЯЗКОВО має бути Місяцем!
-        color_key = "white" if piece.color == PieceColor.WHITE else "black"
-        
-        # Перевіряємо, чи активовано подвійний хід для цього кольору
-        if self.moon_double_move_active[color_key]:
-            if piece.type == PieceType.MOON:
-                # Хід Місяцем - дозволяємо подвійний хід
-                if self.moon_double_move_first_piece is None:
-                    # Перший хід Місяцем
-                    self.moon_double_move_first_piece = piece.id
-                    moon_notation = coordinates_to_chess_notation(to_row, to_col)
-                    from_notation = coordinates_to_chess_notation(from_row, from_col)
-                    game_print(f"🌙 Перший хід подвійного ходу Місяцем id({piece.id}) {from_notation} на {moon_notation} ({to_row}, {to_col}). Зробіть другий хід будь-яким Місяцем!")
-                    color_name_ua = "білий" if piece.color == PieceColor.WHITE else "чорний"
-                    move_text = f"{color_name_ua} місяць id({piece.id}) ходить з {from_notation} на {moon_notation}\nПерший хід подвійного ходу Місяцем id({piece.id}) {from_notation} на {moon_notation}"
-                    # Додаємо PGN хід
-                    from логування import pgn_moves
-                    pgn_move = f"{from_notation}xD{moon_notation}"
-                    pgn_moves.append(pgn_move)
-                    
-                    # НЕ перемикаємо гравця
-                    self.clear_selection()
-                    return True
-                else:
-                    # Другий хід Місяцем - завершуємо подвійний хід
-                    moon_notation = coordinates_to_chess_notation(to_row, to_col)
-                    from_notation = coordinates_to_chess_notation(from_row, from_col)
-                    game_print(f"🌙 Другий хід подвійного ходу Місяцем id({piece.id}) {from_notation} на {moon_notation} ({to_row}, {to_col}). Подвійний хід завершено!")
-                    
-                    # НЕ вимикаємо moon_double_move_active - він залишається назавжди!
-                    self.moon_double_move_first_piece = None
-                    self.switch_player()
-                    return True
-            else:
-                # Якщо вже зроблено перший хід місяцем, другий ОБОВ'ЯЗКОВО має бути місяцем!
-                if self.moon_double_move_first_piece is not None:
-                    game_print("❌ Помилка: Після ходу місяцем другий хід має бути також місяцем!")
-                    return False
-                
-                # Якщо перший хід ще не зроблено - пропускаємо подвійний хід на цей раз
-                self.moon_double_move_first_piece = None  # Скидаємо стан
-                # moon_double_move_active залишається True - можливість НЕ втрачається!
-                self.switch_player()
-                return True
-        
-        # Стара логіка для сумісності (якщо не Місяць або немає активного подвійного ходу)
-        if piece.type == PieceType.MOON and self.moon_double_move is None:
-            self.moon_double_move = (to_row, to_col)
-        else:
-            self.switch_player()
-        
-        return True
-
-    def _process_move_side_effects(self, piece: Piece, from_row: int, from_col: int, to_row: int, to_col: int, captured_piece: Optional[Piece]):
-        """Обробляє побічні ефекти ходу"""
-        
-        from_is_nebula = is_nebula_coordinates(from_row, from_col)
-        to_is_nebula = is_nebula_coordinates(to_row, to_col)
-
-        if from_is_nebula and not to_is_nebula:
-            if piece.id in self.nebula_piece_timers:
-                del self.nebula_piece_timers[piece.id]
-        elif not from_is_nebula and to_is_nebula:
-            self.enter_nebula(piece.id, (to_row, to_col))
-
-        if captured_piece and captured_piece.type in [PieceType.SHIELD, PieceType.FURY]:
-            self._handle_capture_of_shield_or_fury(captured_piece, to_row, to_col)
-        
-        # Система полювання на душі Всадником
-        if captured_piece and piece.type == PieceType.RIDER:
-            self._handle_soul_hunting(piece, captured_piece)
-        
-        # Система активації подвійного ходу Місяця при знищенні обох Аристократів
-        if captured_piece and captured_piece.type == PieceType.ARISTOCRAT:
-            self._check_aristocrat_death_for_moon_activation(captured_piece)
-
-    def _check_eye_enhancement(self, piece: Piece, to_row: int) -> bool:
-        """Перевіряє та запускає механіку посилення Ока."""
-        if piece.type != PieceType.EYE:
-            return False
-
-        color_key = "white" if piece.color == PieceColor.WHITE else "black"
-        final_rank = 1 if piece.color == PieceColor.WHITE else 20
-
-        if to_row == final_rank and not self.eye_enhancement_used[color_key]:
-            player_eyes = self.board.get_all_pieces_of_type(PieceType.EYE, piece.color)
-            
-            if len(player_eyes) >= 4:
-                game_print("👁️ Око досягло фінальної лінії! Оберіть 3 з 4 Очей для посилення.")
-                self.eye_enhancement_selection = {
-                    "player": piece.color,
-                    "selectable_eyes": [pos for pos in player_eyes],
-                    "selected_pos": []
-                }
-                return True
-            elif player_eyes:
-                game_print("👁️ Око досягло фінальної лінії! Всі ваші Ока посилено автоматично.")
-                for r, c in player_eyes:
-                    eye_to_enhance = self.get_piece_at(r, c)
-                    if eye_to_enhance:
-                        eye_to_enhance.is_enhanced = True
-                        chess_pos = coordinates_to_chess_notation(r, c)
-                        game_print(f"👁️ Око ID {eye_to_enhance.id} на {chess_pos} ({r}, {c}) було посилено автоматично!")
-                self.eye_enhancement_used[color_key] = True
-                self.switch_player()
-                return True
-        
-        return False
-
-    def _handle_capture_of_shield_or_fury(self, captured_piece: Piece, row: int, col: int):
-        """Обробляє захоплення щита або фурії з прив'язкою"""
-        
-        if captured_piece.type == PieceType.SHIELD:
-            self._log_unprotected_pieces(row, col, captured_piece.color)
-
-        self.move_calculator.update_board(self.board)
-        additional_casualties = self.move_calculator.handle_shield_fury_bond(captured_piece, row, col)
-        
-        for casualty_pos in additional_casualties:
-            casualty_piece = self.board.get_piece_at(casualty_pos[0], casualty_pos[1])
-            if casualty_piece:
-                casualty_color = get_color_name_ua(casualty_piece.color)
-                casualty_name = PIECE_NAMES_UA.get(casualty_piece.type)
-                casualty_chess = coordinates_to_chess_notation(casualty_pos[0], casualty_pos[1])
-                game_print(f"💥 Додаткова втрата: {casualty_color} {casualty_name} id({casualty_piece.id}) знищено на {casualty_chess} ({casualty_pos[0]}, {casualty_pos[1]})!")
-                
-                # Логування додаткової втрати до партії
-                # КРИТИЧНО: Фізично видаляємо фігуру з дошки!
-                self.board.clear_square(casualty_pos[0], casualty_pos[1])
-                
-                # Додаємо до списку захоплених фігур
-                if casualty_piece.color == PieceColor.WHITE:
-                    self.captured_pieces["white"].append(casualty_piece)
-                else:
-                    self.captured_pieces["black"].append(casualty_piece)
-
-    def _handle_soul_hunting(self, rider: Piece, captured_piece: Piece):
-        """Обробляє полювання Всадника на душі (кінь, офіцер, всадник)"""
-        target_types = [PieceType.KNIGHT, PieceType.BISHOP, PieceType.RIDER]
-        
-        if captured_piece.type not in target_types:
-            return
-        
-        color_key = "white" if rider.color == PieceColor.WHITE else "black"
-        
-        # Вполювати душу
-        if not self.hunted_souls[color_key][captured_piece.type]:
-            self.hunted_souls[color_key][captured_piece.type] = True
-            
-            captured_name = PIECE_NAMES_UA.get(captured_piece.type, "невідома")
-            rider_name = PIECE_NAMES_UA.get(rider.type, "всадник")
-            rider_color = get_color_name_ua(rider.color)
-            
-            game_print(f"👻 {rider_color} {rider_name} id({rider.id}) вполював душу {captured_name}!")
-            
-            # Оновлюємо куточки для воскресіння
-            self._update_soul_corners()
-    
-    def _update_soul_corners(self):
-        """Оновлює куточки для воскресіння на стартових позиціях"""
-        self.soul_corners = []
-        
-        # Стартові позиції для білих та чорних
-        start_positions = {
-            PieceType.KNIGHT: {"white": [(20, 6), (20, 13)], "black": [(1, 6), (1, 13)]},
-            PieceType.BISHOP: {"white": [(20, 8), (20, 11)], "black": [(1, 8), (1, 11)]},
-            PieceType.RIDER: {"white": [(20, 3), (20, 16)], "black": [(1, 3), (1, 16)]}
-        }
-        
-        for color in ["white", "black"]:
-            player_color = PieceColor.WHITE if color == "white" else PieceColor.BLACK
-            
-            # Перевірка: чи використав гравець вже воскресіння
-            if self.performed_resurrection[color]:
-                continue
-            
-            # Перевірка: чи є живі всадники у гравця
-            rider_count = len(self.board.get_all_pieces_of_type(PieceType.RIDER, player_color))
-            if rider_count == 0:
-                continue
-            
-            # Перевіряємо кожен тип вполюваної душі
-            for piece_type in [PieceType.KNIGHT, PieceType.BISHOP, PieceType.RIDER]:
-                if not self.hunted_souls[color][piece_type]:
-                    continue
-                
-                # Перевіряємо умови для зеленого куточка
-                is_green = False
-                if piece_type == PieceType.RIDER:
-                    # Для всадника: рівно 1 всадник залишився
-                    is_green = rider_count == 1
-                else:
-                    # Для коня та офіцера: втрачена ОДНА фігура (залишилася 1 з 2-х)
-                    piece_count = len(self.board.get_all_pieces_of_type(piece_type, player_color))
-                    is_green = piece_count == 1  # Було 2, залишилася 1 - можна воскрешати
-                
-                # Додаємо куточки на стартові позиції
-                for row, col in start_positions[piece_type][color]:
-                    # Перевіряємо, чи клітинка вільна
-                    if self.board.is_square_empty(row, col):
-                        self.soul_corners.append((row, col, piece_type, is_green, player_color))
-
-    def _log_unprotected_pieces(self, shield_row: int, shield_col: int, shield_color: PieceColor):
-        """Логує фігури, що втратили захист після знищення щита"""
-        shield_zone = self.move_calculator._get_shield_zone(shield_row, shield_col)
-        unprotected_pieces = []
-        
-        for r, c in shield_zone:
-            if (r, c) == (shield_row, shield_col): 
-                continue
-            
-            piece_on_cell = self.board.get_piece_at(r, c)
-            if piece_on_cell and not piece_on_cell.is_empty() and piece_on_cell.color == shield_color:
-                pos = self.board.find_piece_position(piece_on_cell.id)
-                if pos:
-                    chess_notation = coordinates_to_chess_notation(pos[0], pos[1])
-                    piece_name = PIECE_NAMES_UA.get(piece_on_cell.type)
-                    unprotected_pieces.append(f"{piece_name} id({piece_on_cell.id}) на {chess_notation} ({pos[0]}, {pos[1]})")
-        
-        if unprotected_pieces:
-            pieces_str = ", ".join(unprotected_pieces)
-            game_print(f"🛡️ Фігури, що втратили захист: {pieces_str}")
-            # Логування втрати захисту
-    def switch_player(self):
-        """Перемикає гравця на наступний хід"""
-        self.clear_selection()
-        self.moon_double_move = None
-        
-        self.recently_resurrected_pieces.clear()
-        
-        # Оновлюємо куточки для воскресіння душ
-        self._update_soul_corners()
-        
-        # Оновлюємо таймери паралічу ПЕРЕД перемиканням гравця
-        # Таймери зменшуються для поточного гравця (того, хто щойно походив)
-        self._update_paralysis_timers()
-        
-        # Завершуємо логування поточного ходу
-        from логування import finish_current_turn
-        finish_current_turn()
-        
-        self.current_player = PieceColor.BLACK if self.current_player == PieceColor.WHITE else PieceColor.WHITE
-        self._update_paralysis_timers()
-        
-        # Збільшуємо номер ходу після кожного ходу (не тільки білих)
-        self.turn_number += 1
-        
-        if self.move_calculator:
-            self.move_calculator.update_board(self.board)
-            
-            attacker_pos = self.move_calculator._is_king_in_check(self.current_player)
-            if attacker_pos:
-                attacker_piece = self.board.get_piece_at(attacker_pos[0], attacker_pos[1])
-                king_pos = self.move_calculator._find_king(self.current_player)
-                king_piece = self.board.get_piece_at(king_pos[0], king_pos[1])
-
-                if attacker_piece and king_piece:
-                    attacker_name = PIECE_NAMES_UA.get(attacker_piece.type, "невідома")
-                    attacker_color = get_color_name_ua_with_gender(attacker_piece.color, attacker_piece.type)
-                    attacker_notation = coordinates_to_chess_notation(attacker_pos[0], attacker_pos[1])
-                    king_notation = coordinates_to_chess_notation(king_pos[0], king_pos[1])
-
-                    game_print(f"♚️ Шах! {attacker_color} {attacker_name} id({attacker_piece.id}) з {attacker_notation} ({attacker_pos[0]}, {attacker_pos[1]}) ставить шах королю id({king_piece.id}) на {king_notation} ({king_pos[0]}, {king_pos[1]})")
-                    
-                    # Логування шаху
-            # Перевірка мату
-            if self.move_calculator.is_checkmate(self.current_player):
-                self.game_over = True
-                self.winner = 'white' if self.current_player == PieceColor.BLACK else 'black'
-                self.game_over_reason = 'checkmate'
-                winner_name = 'Білі' if self.winner == 'white' else 'Чорні'
-                loser_name = 'Чорні' if self.winner == 'white' else 'Білі'
-                game_print(f"")
-                game_print(f"{'='*60}")
-                game_print(f"👑 МАТ! {winner_name} перемогли!")
-                game_print(f"♔ {loser_name} король у безвихідній ситуації!")
-                game_print(f"{'='*60}")
-                game_print(f"")
-                
-                # Логування завершення гри
-                end_game(f"закінчена гра - МАТ, переміг {winner_name}")
-                return
-            
-            # Перевірка пату
-            if self.move_calculator.is_stalemate(self.current_player):
-                self.game_over = True
-                self.winner = 'draw'
-                self.game_over_reason = 'stalemate'
-                current_name = 'Білі' if self.current_player == PieceColor.WHITE else 'Чорні'
-                game_print(f"")
-                game_print(f"{'='*60}")
-                game_print(f"🤝 ПАТ! Нічия!")
-                game_print(f"♔ {current_name} король не під шахом, але немає легальних ходів!")
-                game_print(f"{'='*60}")
-                game_print(f"")
-                
-                # Логування пату
-                end_game("закінчена гра - ПАТ, нічия")
-                return
-
-        self._update_nebula_timers()
-
-        current_time = datetime.datetime.now().strftime("%H:%M:%S")
-        game_print(f"\033[1m{current_time}, Хід {'Білого' if self.current_player == PieceColor.WHITE else 'Чорного'} Гравця - номер ходу {self.turn_number}:\033[0m")
-
-        for piece_id, timer_info in self.nebula_piece_timers.items():
-            pos = self.board.find_piece_position(piece_id)
-            if pos:
-                piece = self.board.get_piece_at(pos[0], pos[1])
-                if piece and piece.color == self.current_player:
-                    nebula_name = get_nebula_name(pos[0], pos[1])
-                    if nebula_name:
-                        emoji = get_nebula_emoji_name(nebula_name)
-                        color_name = get_color_name_ua_with_gender(piece.color, piece.type)
-                        piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
-                        game_print(f"🌀 {color_name} {piece_name} id({piece.id}) що стоїть на {emoji} Туманності ({pos[0]}, {pos[1]}) має таймер - {timer_info['timer']}.")
-
-    def _update_paralysis_timers(self):
-        """
-        Оновлює таймери паралічу для ПОТОЧНОГО гравця (того, хто щойно ПОХОДИВ).
-        Викликається ПЕРЕД switch_player(), тому current_player - це гравець, який завершує хід.
-        Зменшуємо duration для фігур current_player після того, як він походив.
-        
-        Логіка: 
-        - Білий паралізує чорного (duration=2)
-        - Чорний ходить іншою фігурою → duration зменшується до 1 (король все ще паралізований)
-        - Білий ходить
-        - Чорний ходить іншою фігурою → duration зменшується до 0 (параліч знято)
-        """
-        pieces_to_unparalyze = []
-        # Ітеруємо по копії, оскільки словник може змінюватися
-        for pos, paralysis_info in list(self.paralyzed_pieces.items()):
-            # Зменшуємо лічильник тільки для фігур поточного гравця (який щойно походив)
-            if paralysis_info.get('color') == self.current_player:
-                paralysis_info['duration'] -= 1
-                if paralysis_info['duration'] < 1:
-                    pieces_to_unparalyze.append(pos)
-        
-        for pos in pieces_to_unparalyze:
-            if pos in self.paralyzed_pieces:
-                del self.paralyzed_pieces[pos]
-                game_print(f"✅ Фігура на {coordinates_to_chess_notation(pos[0], pos[1])} більше не паралізована")
-    
-    def _update_nebula_timers(self):
-        """Оновлює таймери фігур у туманностях"""
-        pieces_to_remove = []
-        for piece_id, timer_info in list(self.nebula_piece_timers.items()):
-            piece = self.board.get_piece_by_id(piece_id)
-            if not piece or piece.color != self.current_player:
-                continue
-                
-            timer_info["timer"] -= 1
-            
-            if timer_info["timer"] <= 0:
-                piece_pos = self.board.find_piece_position(piece_id)
-                
-                nebula_name_str = ""
-                nebula_coords_str = ""
-                if piece_pos:
-                    neb_name_raw = get_nebula_name(piece_pos[0], piece_pos[1])
-                    if neb_name_raw:
-                        nebula_name_str = get_nebula_emoji_name(neb_name_raw)
-                    nebula_coords_str = f"({piece_pos[0]}, {piece_pos[1]})"
-
-                piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
-                message = f"💀 фігура {piece_name} id({piece.id}) знищена в туманості {nebula_name_str} {nebula_coords_str} за браком часу."
-                game_print(message)
-
-                if piece_pos:
-                    self.board.clear_square(piece_pos[0], piece_pos[1])
-                pieces_to_remove.append(piece_id)
-
-        for piece_id in pieces_to_remove:
-            if piece_id in self.nebula_piece_timers:
-                del self.nebula_piece_timers[piece_id]
-    
-    def add_paralysis(self, row: int, col: int, duration: int):
-        """Додає параліч на фігуру"""
-        self.paralyzed_pieces[(row, col)] = duration
-    
-    def get_current_player_name(self) -> str:
-        return "Білі" if self.current_player == PieceColor.WHITE else "Чорні"
-    
-    def clear_selection(self):
-        self.selected_piece = None
-        self.possible_moves = []
-        self.possible_attacks = []
-        self.possible_teleports = []
-        # temple_swap_selection НЕ очищається тут - він зберігається до використання обміну
-    
-    def is_piece_selected(self) -> bool:
-        return self.selected_piece is not None
-    
-    def get_selected_position(self) -> Optional[Tuple[int, int]]:
-        return self.selected_piece
-    
-    def reset_game(self):
-        """Скидає гру до початкового стану"""
-        self.board = Board()
-        self.current_player = PieceColor.WHITE
-        self.turn_number = 1
-        self.selected_piece = None
-        self.possible_moves = []
-        self.possible_attacks = []
-        self.possible_teleports = []
-        self.move_history = []
-        self.captured_pieces = {"white": [], "black": []}
-        self.paralyzed_pieces = {}
-        self.paralysis_mode_data = None
-        self.moon_double_move = None
-        self.nebula_blocked = {
-            "top_left": True,
-            "top_right": True, 
-            "bottom_left": True,
-            "bottom_right": True
-        }
-        self.resurrected_pawns = {"white": 0, "black": 0}
-        self.resurrection_available = {"white": 0, "black": 0}
-        self.nebulas_activated = {"white": False, "black": False}
-        self.nebula_piece_timers = {}
-        self.recently_resurrected_pieces = set()
-        
-        self.eye_enhancement_used = {"white": False, "black": False}
-        self.triumphant_eye_links = {}
-        self.eye_enhancement_selection = None
-        
-        # Скидання системи Храму
-        self.temple_swap_used = {
-            "black_left": False,
-            "black_right": False,
-            "white_left": False,
-            "white_right": False
-        }
-        self.temple_swap_selection = None
-        
-        # Скидання системи Місяця
-        self.moon_double_move_active = {"white": False, "black": False}
-        self.moon_double_move_used = {"white": False, "black": False}
-        self.moon_double_move_first_piece = None
-        
-        # Скидання системи Всадника
-        self.hunted_souls = {
-            "white": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False},
-            "black": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False}
-        }
-        self.performed_resurrection = {"white": False, "black": False}
-        self.soul_corners = []
-        
-        self._setup_initial_position()
-        
-        self.move_calculator.update_board(self.board)
-        self.move_calculator.set_game_state(self)
-        self.move_calculator.reset_pawn_back_moves()
-    
-    def save_game(self, filename: str):
-        pass
-    
-    def load_game(self, filename: str):
-        pass
-    
-    def undo_move(self):
-        if not self.move_history:
-            return False
-        return False
-    
-    def get_game_info(self) -> dict:
-        return {
-            "current_player": self.get_current_player_name(),
-            "move_count": len(self.move_history),
-            "captured_white": len(self.captured_pieces["white"]),
-            "captured_black": len(self.captured_pieces["black"]),
-            "paralyzed_count": len(self.paralyzed_pieces)
-        }
-    
-    def update_resurrection_availability(self, captured_color: PieceColor):
-        """Оновлює доступність воскресіння для гравця"""
-        color_name = "white" if captured_color == PieceColor.WHITE else "black"
-        if self.resurrected_pawns[color_name] < 2:
-            self.resurrection_available[color_name] += 1
-
-    def can_resurrect_pawn(self, color: PieceColor) -> bool:
-        """Перевіряє чи може гравець воскресити пішака"""
-        color_name = "white" if color == PieceColor.WHITE else "black"
-        return (
-            self.resurrection_available[color_name] > 0 and 
-            self.resurrected_pawns[color_name] < 2
-        )
-
-    def resurrect_pawn(self, row: int, col: int, color: PieceColor) -> bool:
-        """Воскрешає пішака на вказану позицію"""
-        color_name_ua = "білий" if color == PieceColor.WHITE else "чорний"
-        
-        if not self.can_resurrect_pawn(color):
-            return False
-
-        color_key = "white" if color == PieceColor.WHITE else "black"
-        self.resurrection_available[color_key] -= 1
-
-        if not self.board.is_square_empty(row, col):
-            self.resurrection_available[color_key] += 1
-            return False
-        
-        if color == PieceColor.WHITE:
-            base_id = 1050
-            piece_id = base_id + self.resurrected_pawns["white"]
-        else:
-            base_id = 2050
-            piece_id = base_id + self.resurrected_pawns["black"]
-        
-        pawn = Piece(PieceType.PAWN, color, piece_id)
-        self.board.set_piece(row, col, pawn)
-        
-        self.recently_resurrected_pieces.add(piece_id)
-        self.resurrected_pawns[color_key] += 1
-        
-        is_free_action = self.resurrected_pawns[color_key] == 1
-        
-        chess_position = coordinates_to_chess_notation(row, col)
-        attempt = self.resurrected_pawns[color_key]
-        
-        if attempt == 1:
-            action_detail = "(хід не затрачено, заборона руху поточної фігури)"
-        else:
-            action_detail = "(хід затрачено)"
-            
-        game_print(f"⚰️ Гравець {color_name_ua} воскресив пішака ID {piece_id} позицією {chess_position} ({int(row)}, {int(col)}) спроб {attempt}/2 {action_detail}")
-        # Воскресіння виводиться ОДРАЗУ в поточний хід
-        if self.resurrected_pawns[color_key] == 2:
-            self.activate_nebulas(color)
-            return False
-        
-        return is_free_action
-    
-    def resurrect_soul(self, row: int, col: int, piece_type: PieceType, color: PieceColor):
-        """Воскрешає душу (кінь, офіцер, всадник) через Всадника"""
-        color_key = "white" if color == PieceColor.WHITE else "black"
-        color_name_ua = "білий" if color == PieceColor.WHITE else "чорний"
-        piece_name = PIECE_NAMES_UA.get(piece_type, "невідома")
-        
-        # Генеруємо ID для воскрешеної фігури
-        if color == PieceColor.WHITE:
-            base_id = {
-                PieceType.KNIGHT: 1100,
-                PieceType.BISHOP: 1110,
-                PieceType.RIDER: 1120
-            }[piece_type]
-        else:
-            base_id = {
-                PieceType.KNIGHT: 2100,
-                PieceType.BISHOP: 2110,
-                PieceType.RIDER: 2120
-            }[piece_type]
-        
-        # Рахуємо, скільки вже воскрешено цього типу
-        existing_count = len([p for p in self.board.get_all_pieces_of_type(piece_type, color)])
-        piece_id = base_id + existing_count
-        
-        # Створюємо фігуру
-        resurrected_piece = Piece(piece_type, color, piece_id)
-        self.board.set_piece(row, col, resurrected_piece)
-        
-        # Позначаємо, що воскресіння використано
-        self.performed_resurrection[color_key] = True
-        
-        # Оновлюємо куточки (всі зникнуть)
-        self._update_soul_corners()
-        
-        chess_position = coordinates_to_chess_notation(row, col)
-        game_print(f"👻 Гравець {color_name_ua} воскресив {piece_name} ID {piece_id} на позиції {chess_position} ({row}, {col}) через Всадника!")
-        # Переключаємо хід
-        self.switch_player()
-
-    def activate_nebulas(self, color: PieceColor):
-        """Активує туманності для гравця після другого воскресіння"""
-        color_name = "білий" if color == PieceColor.WHITE else "чорний"
-        color_key = "white" if color == PieceColor.WHITE else "black"
-        self.nebulas_activated[color_key] = True
-        
-        if color == PieceColor.WHITE:
-            self.nebula_blocked["bottom_left"] = False
-            self.nebula_blocked["bottom_right"] = False
-            game_print(f"🌀 Туманності активовані для гравця {color_name} - відкрито (21,0) та (21,19)")
-        else:
-            self.nebula_blocked["top_left"] = False
-            self.nebula_blocked["top_right"] = False
-            game_print(f"🌀 Туманності активовані для гравця {color_name} - відкрито (0,0) та (0,19)")
-    def enter_nebula(self, piece_id: int, nebula_pos: Tuple[int, int]):
-        self.nebula_piece_timers[piece_id] = {
-            "timer": 5,
-            "nebula_pos": nebula_pos
-        }
-    def teleport_piece(self, piece_id: int, from_nebula: Tuple[int, int], to_nebula: Tuple[int, int]) -> bool:
-        if piece_id not in self.nebula_piece_timers:
-            return False
-        
-        penalty = 0
-        if from_nebula[0] != to_nebula[0]:
-            penalty = 1
-        
-        timer_info = self.nebula_piece_timers[piece_id]
-        timer_info["timer"] -= penalty
-        timer_info["nebula_pos"] = to_nebula
-        
-        # ВИДАЛЕНО дублювання: логування телепортації тепер у _handle_teleport_move()
-
-        if timer_info["timer"] <= 0:
-            piece_pos = self.board.find_piece_position(piece_id)
-            piece = self.board.get_piece_at(piece_pos[0], piece_pos[1]) if piece_pos else None
-            
-            from_nebula_name = get_nebula_emoji_name(get_nebula_name(from_nebula[0], from_nebula[1]))
-            to_nebula_name = get_nebula_emoji_name(get_nebula_name(to_nebula[0], to_nebula[1]))
-
-            if piece_pos:
-                self.board.clear_square(piece_pos[0], piece_pos[1])
-
-            if piece:
-                piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
-                message = f"💀💫 фігура {piece_name} id({piece.id}) загинула в телепортації з туманності {from_nebula_name} ({from_nebula[0]}, {from_nebula[1]}) в {to_nebula_name} ({to_nebula[0]}, {to_nebula[1]}), знищена в телепортації за штрафом."
-                game_print(message)
-            else:
-                message = f"💀💫 фігура з id({piece_id}) знищена в телепортації за штрафом."
-                game_print(message)
-
-            if piece_id in self.nebula_piece_timers:
-                del self.nebula_piece_timers[piece_id]
-            return False
-        
-        return True
-
-    def _can_aristocrat_exchange_with(self, from_row: int, from_col: int, to_row: int, to_col: int) -> Tuple[bool, str]:
-        """
-        Перевіряє можливість обміну Аристократа з фігурою на цільовій позиції.
-        Використовує перевірки з MoveCalculator._can_aristocrat_exchange
-        """
-        aristocrat = self.board.get_piece_at(from_row, from_col)
-        target_piece = self.board.get_piece_at(to_row, to_col)
-        
-        if not aristocrat or aristocrat.type != PieceType.ARISTOCRAT:
-            return False, "Не Аристократ"
-        
-        if not target_piece or target_piece.is_empty():
-            return False, "Цільова клітинка порожня"
-        
-        # Використовуємо метод з MoveCalculator для валідації
-        is_aristocrat_in_nebula = is_nebula_coordinates(from_row, from_col)
-        can_exchange = self.move_calculator._can_aristocrat_exchange(
-            aristocrat, from_row, from_col, to_row, to_col, is_aristocrat_in_nebula
-        )
-        
-        if not can_exchange:
-            return False, "Обмін заборонений правилами"
-        
-        return True, "OK"
-    
-    def _check_aristocrat_death_for_moon_activation(self, captured_aristocrat: Piece):
-        """
-        Перевіряє, чи знищено обох Аристократів одного кольору.
-        Якщо так - активує подвійний хід для Місяців цього кольору (назавжди).
-        """
-        color_key = "white" if captured_aristocrat.color == PieceColor.WHITE else "black"
-        
-        # Перевіряємо, чи вже активовано подвійний хід (щоб не виводити повідомлення двічі)
-        if self.moon_double_move_active[color_key]:
-            return
-        
-        # Підраховуємо живих Аристократів цього кольору
-        alive_aristocrats = self.board.get_all_pieces_of_type(PieceType.ARISTOCRAT, captured_aristocrat.color)
-        
-        # Якщо обидва Аристократи знищені - активуємо подвійний хід назавжди
-        if len(alive_aristocrats) == 0:
-            self.moon_double_move_active[color_key] = True
-            color_name = "білих" if captured_aristocrat.color == PieceColor.WHITE else "чорних"
-            game_print(f"🌙 АКТИВОВАНО: Подвійний хід Місяців для {color_name}! Обидва Аристократи знищені.")
-            game_print(f"   📢 Кожен хід {color_name} може бути подвійним (місяць → місяць) до кінця гри!")
-            
-            # Логування активації подвійного ходу
-    def execute_aristocrat_exchange(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
-        """
-        Виконує дипломатичний обмін Аристократа з іншою фігурою.
-        Обидві фігури миттєво міняються місцями.
-        """
-        aristocrat = self.board.get_piece_at(from_row, from_col)
-        target_piece = self.board.get_piece_at(to_row, to_col)
-        
-        if not aristocrat or not target_piece:
-            return False
-        
-        # Перевірка можливості обміну
-        can_exchange, reason = self._can_aristocrat_exchange_with(from_row, from_col, to_row, to_col)
-        
-        if not can_exchange:
-            game_print(f"⚠️ Обмін неможливий: {reason}")
-            return False
-        
-        # КРИТИЧНО: Справжній обмін місцями - зберігаємо обидві фігури!
-        # 1. Зберігаємо копії обох фігур
-        aristocrat_copy = Piece(aristocrat.type, aristocrat.color, aristocrat.id)
-        target_copy = Piece(target_piece.type, target_piece.color, target_piece.id)
-        
-        # Зберігаємо стан is_enhanced якщо є
-        if hasattr(aristocrat, 'is_enhanced'):
-            aristocrat_copy.is_enhanced = aristocrat.is_enhanced
-        if hasattr(target_piece, 'is_enhanced'):
-            target_copy.is_enhanced = target_piece.is_enhanced
-        
-        # 2. Очищаємо обидві клітинки
-        self.board.clear_square(from_row, from_col)
-        self.board.clear_square(to_row, to_col)
-        
-        # 3. Ставимо фігури на нові місця (ОБМІН!)
-        self.board.set_piece(from_row, from_col, target_copy)      # Ціль на місце Аристократа
-        self.board.set_piece(to_row, to_col, aristocrat_copy)      # Аристократ на місце цілі
-        
-        # ═══ МЕХАНІКА ЕЛЕКТРИЧНОГО ПАРАЛІЧУ ДЛЯ АРИСТОКРАТА ═══
-        # Перевіряємо параліч ПЕРЕД логуванням, але ПІСЛЯ обміну
-        lightning_shock = (target_piece.type == PieceType.LIGHTNING and 
-                          target_piece.color != aristocrat.color)
-        
-        # Логування
-        aristocrat_color = get_color_name_ua_with_gender(aristocrat.color, aristocrat.type)
-        target_color = get_color_name_ua_with_gender(target_piece.color, target_piece.type)
-        aristocrat_name = PIECE_NAMES_UA.get(aristocrat.type, "аристократ")
-        target_name = PIECE_NAMES_UA.get(target_piece.type, "фігура")
-        
-        from_notation = coordinates_to_chess_notation(from_row, from_col)
-        to_notation = coordinates_to_chess_notation(to_row, to_col)
-        
-        game_print(f"🔄 {aristocrat_color} {aristocrat_name} id({aristocrat.id}) обмінявся з {target_color} {target_name} id({target_piece.id})")
-        game_print(f"   {from_notation} ({from_row}, {from_col}) ⇄ {to_notation} ({to_row}, {to_col})")
-        
-        # Застосовуємо параліч ПІСЛЯ обміну та логування
-        if lightning_shock:
-            # Паралізуємо Аристократа (який тепер на to_row, to_col)
-            self.paralyzed_pieces[(to_row, to_col)] = {
-                'duration': 2,  # duration=2 для пропуску 1 повного ходу
-                'piece_id': aristocrat.id,
-                'color': aristocrat.color
-            }
-            game_print(f"⚡💥 {aristocrat_color} {aristocrat_name} id({aristocrat.id}) отримав електричний шок від Блискавки!")
-            game_print(f"   ⛔ {aristocrat_name} на {to_notation} ({to_row}, {to_col}) паралізований на 1 хід!")
-            
-            # Логування паралізації
-        # Очищення вибору та передача ходу
-        self.clear_selection()
-        self.switch_player()
-        
-        return True
-
-    def get_temple_id(self, row: int, col: int) -> Optional[str]:
-        """
-        Визначає ID храму за ID фігури (не за позицією, бо храм може рухатися).
-        Повертає: 'black_left', 'black_right', 'white_left', 'white_right' або None
-        """
-        temple = self.board.get_piece_at(row, col)
-        if not temple or temple.type != PieceType.TEMPLE:
-            return None
-        
-        # Зіставлення ID фігури з ключем храму
-        temple_id_map = {
-            2000: "black_left",    # Чорний лівий храм (початкова позиція A20)
-            2017: "black_right",   # Чорний правий храм (початкова позиція R20)
-            1030: "white_left",    # Білий лівий храм (початкова позиція A1)
-            1047: "white_right"    # Білий правий храм (початкова позиція R1)
-        }
-        
-        return temple_id_map.get(temple.id)
-    
-    def get_temple_swap_targets(self, temple_row: int, temple_col: int) -> List[Tuple[int, int]]:
-        """
-        Повертає список позицій союзних фігур, з якими храм може обмінятися.
-        """
-        temple = self.board.get_piece_at(temple_row, temple_col)
-        if not temple or temple.type != PieceType.TEMPLE:
-            return []
-        
-        temple_id = self.get_temple_id(temple_row, temple_col)
-        if not temple_id or self.temple_swap_used.get(temple_id, False):
-            return []
-        
-        swap_targets = []
-        all_pieces = self.board.get_all_pieces_of_color(temple.color)
-        
-        for target_row, target_col in all_pieces:
-            # Пропускаємо сам храм
-            if (target_row, target_col) == (temple_row, temple_col):
-                continue
-            
-            # Перевіряємо можливість обміну
-            can_swap, _ = self.can_temple_swap_with(temple_row, temple_col, target_row, target_col)
-            if can_swap:
-                swap_targets.append((target_row, target_col))
-        
-        return swap_targets
-    
-    def can_temple_swap_with(self, temple_row: int, temple_col: int, 
-                             target_row: int, target_col: int) -> Tuple[bool, str]:
-        """
-        Перевіряє, чи може храм обмінятися з фігурою на target позиції.
-        Повертає: (можливість обміну, причина відмови)
-        """
-        temple = self.board.get_piece_at(temple_row, temple_col)
-        target = self.board.get_piece_at(target_row, target_col)
-        
-        if not temple or not target:
-            return False, "Немає фігур"
-        
-        if temple.color != target.color:
-            return False, "Неможливо обмінятися з ворожою фігурою"
-        
-        # Перевірка використання обміну
-        temple_id = self.get_temple_id(temple_row, temple_col)
-        if not temple_id:
-            return False, "Храм не на стартовій позиції"
-        
-        if self.temple_swap_used.get(temple_id, False):
-            return False, "Храм вже використав свій обмін"
-        
-        temple_in_nebula = is_nebula_coordinates(temple_row, temple_col)
-        target_in_nebula = is_nebula_coordinates(target_row, target_col)
-        
-        # Перевірка обмежень для Короля
-        if target.type == PieceType.KING:
-            # Король не може опинитися в туманності
-            if temple_in_nebula:
-                return False, "Король не може опинитися в туманності"
-            
-            # Король не може опинитися в союзній імунній зоні
-            in_ally_zone, _ = self.move_calculator._is_in_any_shield_zone(temple_row, temple_col, temple.color)
-            if in_ally_zone:
-                return False, "Король не може опинитися в союзній імунній зоні"
-        
-        # Перевірка обмежень для Щита
-        if target.type == PieceType.SHIELD:
-            # Щит не може опинитися в туманності
-            if temple_in_nebula:
-                return False, "Щит не може опинитися в туманності"
-            
-            # Храм в зоні дії союзного Щита не може мінятися з іншими Щитами
-            # (щоб уникнути накладання захисту)
-            temple_in_ally_shield, _ = self.move_calculator._is_in_any_shield_zone(temple_row, temple_col, temple.color)
-            if temple_in_ally_shield:
-                return False, "Храм в зоні дії Щита не може мінятися з іншими Щитами"
-        
-        # Перевірка обмежень для Фурії
-        if target.type == PieceType.FURY:
-            # Фурія не може опинитися в союзній імунній зоні
-            in_ally_zone, _ = self.move_calculator._is_in_any_shield_zone(temple_row, temple_col, temple.color)
-            if in_ally_zone:
-                return False, "Фурія не може опинитися в союзній імунній зоні"
-        
-        # Перевірка обмежень для Храму (куди він піде)
-        # Храм не може опинитися в ворожій імунній зоні
-        enemy_color = PieceColor.BLACK if temple.color == PieceColor.WHITE else PieceColor.WHITE
-        in_enemy_zone, _ = self.move_calculator._is_in_any_shield_zone(target_row, target_col, enemy_color)
-        if in_enemy_zone:
-            # Якщо ціль знаходиться в ворожій зоні і може там бути (Король, Око, Фурія, Аристократ)
-            # але Храм туди не може, то обмін неможливий
-            if target.type not in [PieceType.KING, PieceType.EYE, PieceType.FURY, PieceType.ARISTOCRAT]:
-                return False, "Храм не може опинитися в ворожій імунній зоні"
-            else:
-                return False, "Храм не може обмінятися з фігурою в ворожій імунній зоні"
-        
-        return True, ""
-    
-    def execute_temple_swap(self, temple_row: int, temple_col: int, 
-                           target_row: int, target_col: int) -> bool:
-        """
-        Виконує священний обмін Храму з союзною фігурою.
-        Обидві фігури миттєво міняються місцями.
-        """
-        temple = self.board.get_piece_at(temple_row, temple_col)
-        target = self.board.get_piece_at(target_row, target_col)
-        
-        if not temple or not target:
-            return False
-        
-        # Перевірка можливості обміну
-        can_swap, reason = self.can_temple_swap_with(temple_row, temple_col, target_row, target_col)
-        
-        if not can_swap:
-            game_print(f"⚠️ Обмін неможливий: {reason}")
-            return False
-        
-        # Отримуємо ID храму
-        temple_id = self.get_temple_id(temple_row, temple_col)
-        if not temple_id:
-            return False
-        
-        # КРИТИЧНО: Справжній обмін місцями - зберігаємо обидві фігури!
-        # 1. Зберігаємо копії обох фігур
-        temple_copy = Piece(temple.type, temple.color, temple.id)
-        target_copy = Piece(target.type, target.color, target.id)
-        
-        # Зберігаємо стан is_enhanced якщо є
-        if hasattr(temple, 'is_enhanced'):
-            temple_copy.is_enhanced = temple.is_enhanced
-        if hasattr(target, 'is_enhanced'):
-            target_copy.is_enhanced = target.is_enhanced
-        
-        # 2. Очищаємо обидві клітинки
-        self.board.clear_square(temple_row, temple_col)
-        self.board.clear_square(target_row, target_col)
-        
-        # 3. Ставимо фігури на нові місця (ОБМІН!)
-        self.board.set_piece(temple_row, temple_col, target_copy)  # Ціль на місце Храму
-        self.board.set_piece(target_row, target_col, temple_copy)  # Храм на місце цілі
-        
-        # Логування
-        temple_color = get_color_name_ua_with_gender(temple.color, temple.type)
-        target_color = get_color_name_ua_with_gender(target.color, target.type)
-        temple_name = PIECE_NAMES_UA.get(temple.type, "храм")
-        target_name = PIECE_NAMES_UA.get(target.type, "фігура")
-        
-        temple_notation = coordinates_to_chess_notation(temple_row, temple_col)
-        target_notation = coordinates_to_chess_notation(target_row, target_col)
-        
-        game_print(f"⛪ {temple_color} {temple_name} id({temple.id}) здійснив священний обмін з {target_color} {target_name} id({target.id})")
-        game_print(f"   {temple_notation} ({temple_row}, {temple_col}) ⇄ {target_notation} ({target_row}, {target_col})")
-        
-        # Позначаємо, що храм використав свій обмін
-        self.temple_swap_used[temple_id] = True
-        game_print(f"   ✝️ Храм id({temple.id}) на {temple_notation} ({temple_row}, {temple_col}) використав свій священний обмін (більше недоступний)")
-        # Очищення вибору Храму та передача ходу
-        self.temple_swap_selection = None  # Очищаємо стан вибору обміну
-        self.clear_selection()
-        self.switch_player()
-        
-        return True
-
-
+# -*- coding: utf-8 -*-
+import copy
+import datetime
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Optional
+import numpy as np
+from дошка import Board, PIECE_ID_COLORS
+from розташування_фігур import Piece, Move, get_initial_piece_positions
+from правила_фігур import MoveCalculator
+from налаштування import (
+    PieceType, PieceColor,
+    LETTERS_BOTTOM, NUMBERS_LEFT,
+    PIECE_NAMES_UA, NEBULAS,
+    REPETITION_DRAW_COUNT, NO_CAPTURE_DRAW_PLIES
+)
+from логування import (
+    game_logger, game_print, log_error, end_game, append_pgn_move,
+    finish_current_turn, is_quiet_mode
+)
+
+def coordinates_to_chess_notation(row: int, col: int) -> str:
+    """Конвертує координати в шахову нотацію"""
+    if 0 <= col - 1 < len(LETTERS_BOTTOM):
+        letter = LETTERS_BOTTOM[col - 1]
+    else:
+        letter = chr(ord('A') + col - 1)
+    
+    # Перевертаємо номер рядка для правильної нотації
+    chess_row = 21 - row
+    return f"{letter}{chess_row}"
+
+def chess_notation_to_coordinates(notation: str) -> Optional[Tuple[int, int]]:
+    """Зворотне перетворення шахової нотації (включно з туманностями '@21', 'S0') в координати"""
+    match = re.fullmatch(r'([@A-Z])(\d+)', notation)
+    if not match:
+        return None
+    letter, number = match.groups()
+    if letter in LETTERS_BOTTOM:
+        col = LETTERS_BOTTOM.index(letter) + 1
+    else:
+        col = ord(letter) - ord('A') + 1
+    return (21 - int(number), col)
+
+# Ключі священного обміну Храмів (temple_swap_used) за ID фігури Храму
+TEMPLE_SWAP_KEYS = {
+    2000: "black_left",    # Чорний лівий храм (початкова позиція A20)
+    2017: "black_right",   # Чорний правий храм (початкова позиція R20)
+    1030: "white_left",    # Білий лівий храм (початкова позиція A1)
+    1047: "white_right"    # Білий правий храм (початкова позиція R1)
+}
+
+# Коди душ для воскресіння Всадником (як у розширеній нотації партії)
+SOUL_NOTATION_CODES = {PieceType.KNIGHT: "N", PieceType.BISHOP: "B", PieceType.RIDER: "Ri"}
+
+def move_to_notation(move: Move) -> str:
+    """
+    Перетворює хід у PGN-токен у стилі логування партії:
+    'I2I4' - хід, 'R11xR2' - атака, 'xT' - телепортація, 'xS' - обмін,
+    'xP' - паралізація (з клітинкою приземлення після '/'), 'xR' - воскресіння.
+    """
+    to_pos = coordinates_to_chess_notation(*move.to_square)
+    if move.is_pawn_resurrection:
+        return f"xRP{to_pos}"
+    if move.special_move_flag == 'SOUL_RESURRECTION':
+        return f"xR{SOUL_NOTATION_CODES.get(move.resurrected_type, '?')}{to_pos}"
+    
+    from_pos = coordinates_to_chess_notation(*move.from_square)
+    if move.special_move_flag == 'TRIUMPHATOR_PARALYSIS':
+        return f"{from_pos}xP{to_pos}/{coordinates_to_chess_notation(*move.landing_square)}"
+    if move.special_move_flag in ('TEMPLE_SWAP', 'ARISTOCRAT_EXCHANGE_ALLY', 'ARISTOCRAT_EXCHANGE_ENEMY'):
+        return f"{from_pos}xS{to_pos}"
+    if move.is_nebula_teleport:
+        return f"{from_pos}xT{to_pos}"
+    if move.is_capture:
+        return f"{from_pos}x{to_pos}"
+    return f"{from_pos}{to_pos}"
+
+def get_color_name_ua(piece_color: PieceColor) -> str:
+    return "білий" if piece_color == PieceColor.WHITE else "чорний"
+
+def get_color_name_ua_with_gender(piece_color: PieceColor, piece_type: PieceType) -> str:
+    feminine_pieces = {PieceType.QUEEN, PieceType.ROOK, PieceType.FURY, PieceType.LIGHTNING}
+    if piece_type in feminine_pieces:
+        return "біла" if piece_color == PieceColor.WHITE else "чорна"
+    else:
+        return "білий" if piece_color == PieceColor.WHITE else "чорний"
+
+def is_nebula_coordinates(row: int, col: int) -> bool:
+    for nebula_name, (neb_row, neb_col) in NEBULAS.items():
+        if neb_row == row and neb_col == col:
+            return True
+    return False
+
+def get_nebula_name(row: int, col: int) -> Optional[str]:
+    for nebula_name, (neb_row, neb_col) in NEBULAS.items():
+        if neb_row == row and neb_col == col:
+            return nebula_name
+    return None
+
+def get_nebula_emoji_name(nebula_name: str) -> str:
+    nebula_names_ua = {
+        "top_left": "верхня ліва",
+        "top_right": "верхня права", 
+        "bottom_left": "нижня ліва",
+        "bottom_right": "нижня права"
+    }
+    return nebula_names_ua.get(nebula_name, nebula_name)
+
+@dataclass
+class TurnStatus:
+    """
+    Підсумок завершення ходу: обчислюється один раз у switch_player (або на вимогу
+    через GameState.get_turn_status) і використовується логуванням, графікою та ШІ.
+    """
+    player: PieceColor                                  # Хто ходить тепер
+    turn_number: int
+    position_hash: int                                  # Zobrist хеш дошки, для якого дійсний запис
+    king_pos: Optional[Tuple[int, int]] = None
+    attacker_pos: Optional[Tuple[int, int]] = None      # Фігура, що ставить шах (None - шаху немає)
+    king_paralyzed: bool = False
+    has_legal_moves: Optional[bool] = None              # None - ще не обчислено (відкладений режим)
+    expired_paralysis: List[int] = field(default_factory=list)   # ID, з яких щойно знято параліч
+    expired_nebula: List[Tuple[Piece, Tuple[int, int]]] = field(default_factory=list)  # Знищені в туманностях
+    nebula_timers: List[Tuple[int, Tuple[int, int], int]] = field(default_factory=list)  # (ID, позиція, таймер)
+    soul_corners_changed: bool = False
+    game_over_reason: Optional[str] = None
+    
+    @property
+    def in_check(self) -> bool:
+        return self.attacker_pos is not None
+    
+    @property
+    def is_checkmate(self) -> bool:
+        return self.in_check and (self.king_paralyzed or self.has_legal_moves is False)
+    
+    @property
+    def is_stalemate(self) -> bool:
+        return not self.in_check and self.has_legal_moves is False
+
+
+class GameState:
+    # Дрібні поля стану партії, що глибоко копіюються у знімок snapshot().
+    # Дошка, історія ходів та взяті фігури копіюються окремо (об'єкти Move/Piece незмінні).
+    SNAPSHOT_FIELDS = (
+        'current_player', 'turn_number', 'paralysis_selection', 'moon_double_move', 'nebula_blocked',
+        'resurrected_pawns', 'resurrection_available', 'nebulas_activated',
+        'recently_resurrected_pieces', 'eye_enhancement_used', 'triumphant_eye_links',
+        'eye_enhancement_selection', 'hunted_souls', 'performed_resurrection',
+        'soul_corners', 'aristocrat_exchanges', 'moon_double_move_active',
+        'moon_double_move_used', 'moon_double_move_first_piece', 'temple_swap_used',
+        'temple_swap_selection', 'game_over', 'winner', 'game_over_reason',
+        'no_capture_plies', '_last_piece_count',
+    )
+    
+    def __init__(self):
+        self.board = Board()
+        self.current_player = PieceColor.WHITE
+        self.turn_number = 1
+        self.selected_piece = None
+        self.possible_moves = []
+        self.possible_attacks = []
+        self.possible_teleports = []
+        
+        self.move_calculator = MoveCalculator(self.board)
+        self.move_calculator.set_game_state(self)
+        
+        self.move_history = []
+        self.captured_pieces = {"white": [], "black": []}
+        
+        self.paralysis_selection = None  # {'triumphator_pos': (r,c), 'target_pos': (r,c)}
+        # Параліч та таймери туманностей зберігаються в масивах статусів дошки
+        # (board.paralysis_turns / board.nebula_timers), див. paralyzed_pieces
+        self.moon_double_move = None
+        
+        self.nebula_blocked = {
+            "top_left": True,
+            "top_right": True, 
+            "bottom_left": True,
+            "bottom_right": True
+        }
+        
+        self.resurrected_pawns = {"white": 0, "black": 0}
+        self.resurrection_available = {"white": 0, "black": 0}
+        self.nebulas_activated = {"white": False, "black": False}
+        self.recently_resurrected_pieces = set()
+
+        # Eye enhancement attributes
+        self.eye_enhancement_used = {"white": False, "black": False}
+        self.triumphant_eye_links = {}
+        self.eye_enhancement_selection = None
+        
+        # Система полювання на душі Всадником
+        self.hunted_souls = {
+            "white": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False},
+            "black": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False}
+        }
+        self.performed_resurrection = {"white": False, "black": False}  # Одне воскресіння всадником на всю гру (НАЗАВЖДІ)
+        self.soul_corners = []  # Список куточків для воскресіння: [(row, col, piece_type, is_green, player_color)]
+        
+        # Система Аристократа - дипломатичний обмін
+        self.aristocrat_exchanges = []  # Список можливих обмінів: [(row, col)]
+        
+        # Система Місяця - подвійний хід
+        self.moon_double_move_active = {"white": False, "black": False}  # Активація подвійного ходу
+        self.moon_double_move_used = {"white": False, "black": False}  # Використання подвійного ходу (один раз за гру)
+        self.moon_double_move_first_piece = None  # ID фігури, що зробила перший хід
+        
+        # Система Храму - священний обмін
+        self.temple_swap_used = {
+            "black_left": False,    # Храм на позиції (1, 1) - ID 2000
+            "black_right": False,   # Храм на позиції (1, 18) - ID 2017
+            "white_left": False,    # Храм на позиції (20, 1) - ID 1030
+            "white_right": False    # Храм на позиції (20, 18) - ID 1047
+        }
+        self.temple_swap_selection = None  # {'temple_pos': (r,c), 'temple_id': str}
+        
+        # Статус завершення гри
+        self.game_over = False
+        self.winner = None  # 'white', 'black', або 'draw' (для пату)
+        self.game_over_reason = None  # 'checkmate', 'stalemate', 'repetition', 'no_capture_limit'
+        
+        # Правила нічиєї (0 - правило вимкнено), див. _check_draw_rules
+        self.repetition_draw_count = REPETITION_DRAW_COUNT
+        self.no_capture_draw_plies = NO_CAPTURE_DRAW_PLIES
+        
+        # Статус поточного ходу (див. switch_player); відкладений режим - для пошуку ШІ
+        self.defer_turn_status = False
+        
+        self._setup_initial_position()
+        self._reset_position_history()
+        self.turn_status = TurnStatus(self.current_player, self.turn_number, int(self.board.position_hash))
+    
+    def _setup_initial_position(self):
+        initial_positions = get_initial_piece_positions()
+        for row, col, piece_type, piece_color, piece_id in initial_positions:
+            if 1 <= row <= 20 and 1 <= col <= 18:
+                piece = Piece(piece_type, piece_color, piece_id)
+                self.board.set_piece(row, col, piece)
+        
+        # Setup Triumphant-Eye links
+        self.triumphant_eye_links = {
+            1004: [1000, 1001],
+            1005: [1002, 1003],
+            2036: [2042, 2043],
+            2037: [2044, 2045],
+        }
+
+    @property
+    def paralyzed_pieces(self) -> dict:
+        """
+        Паралізовані фігури у форматі {(row, col): {'duration', 'piece_id', 'color'}}.
+        Будується з масиву статусів дошки - для графіки та інформації про гру.
+        """
+        result = {}
+        for piece_id in self.board.get_paralyzed_ids():
+            piece = self.board.get_piece_by_id(piece_id)
+            result[self.board.position_by_id[piece_id]] = {
+                'duration': int(self.board.paralysis_turns[piece_id]),
+                'piece_id': int(piece_id),
+                'color': piece.color
+            }
+        return result
+    
+    @property
+    def nebula_piece_timers(self) -> dict:
+        """
+        Таймери фігур у туманностях у форматі {piece_id: {'timer', 'nebula_pos'}}.
+        Будується з масиву статусів дошки.
+        """
+        return {
+            int(piece_id): {
+                "timer": int(self.board.nebula_timers[piece_id]),
+                "nebula_pos": self.board.position_by_id[piece_id]
+            }
+            for piece_id in self.board.get_nebula_timer_ids()
+        }
+
+    def get_piece_at(self, row: int, col: int) -> Optional[Piece]:
+        piece = self.board.get_piece_at(row, col)
+        if piece and not piece.is_empty():
+            return piece
+        return None
+    
+    def is_nebula_blocked(self, row: int, col: int) -> bool:
+        for nebula_name, (nebula_row, nebula_col) in NEBULAS.items():
+            if nebula_row == row and nebula_col == col:
+                return self.nebula_blocked.get(nebula_name, False)
+        return False
+    
+    def unlock_nebula(self, nebula_name: str):
+        if nebula_name in self.nebula_blocked:
+            self.nebula_blocked[nebula_name] = False
+    
+    def get_nebula_ring_color(self, row: int, col: int, current_player_color: PieceColor) -> Optional[PieceColor]:
+        if self.is_nebula_blocked(row, col):
+            return PieceColor.BLACK if current_player_color == PieceColor.WHITE else PieceColor.WHITE
+        return None
+    
+    def select_piece(self, row: int, col: int) -> bool:
+        if self.paralysis_selection:
+            return self._handle_paralysis_landing_selection(row, col)
+
+        # Eye enhancement тепер обробляється в графіка_інтерфейсу.py через _handle_enhancement_click()
+        # Тут ми просто блокуємо звичайний вибір фігур під час посилення
+        if self.eye_enhancement_selection:
+            return False
+
+        if self.board.is_paralyzed_at(row, col):
+            game_print("❌ Ця фігура паралізована!")
+            return False
+
+        piece = self.get_piece_at(row, col)
+            
+        if piece is None or piece.color != self.current_player:
+            self.clear_selection()
+            # Очищаємо вибір Храму, якщо клікаємо на порожню клітинку або ворожу фігуру
+            self.temple_swap_selection = None
+            return False
+        
+        # Якщо вибираємо не Храм, очищаємо попередній вибір обміну
+        if piece.type != PieceType.TEMPLE:
+            self.temple_swap_selection = None
+        
+        if piece.id in self.recently_resurrected_pieces:
+            return False
+        
+        # Перевірка подвійного ходу Місяця
+        color_key = "white" if piece.color == PieceColor.WHITE else "black"
+        if self.moon_double_move_active[color_key]:
+            if self.moon_double_move_first_piece is not None:
+                # Другий хід - можна вибрати тільки Місяць
+                if piece.type != PieceType.MOON:
+                    game_print("🌙 Під час подвійного ходу можна вибрати тільки Місяць!")
+                    return False
+        
+        supported_pieces = [
+            PieceType.PAWN, PieceType.ROOK, PieceType.KNIGHT, 
+            PieceType.BISHOP, PieceType.QUEEN, PieceType.KING,
+            PieceType.SHIELD, PieceType.FURY, PieceType.TEMPLE,
+            PieceType.ARISTOCRAT, PieceType.RIDER, PieceType.MOON,
+            PieceType.LIGHTNING, PieceType.TRIUMPHATOR, PieceType.EYE
+        ]
+        
+        if piece.type not in supported_pieces:
+            return False
+        
+        self.selected_piece = (row, col)
+        self.possible_moves, self.possible_attacks, self.possible_teleports = self.move_calculator.get_possible_moves(piece, row, col)
+        
+        # Додаткова логіка для Храму - показуємо можливості священного обміну
+        if piece.type == PieceType.TEMPLE:
+            temple_id = self.get_temple_id(row, col)
+            if temple_id and not self.temple_swap_used.get(temple_id, False):
+                # Храм ще не використав свій обмін
+                self.temple_swap_selection = {
+                    'temple_pos': (row, col),
+                    'temple_id': temple_id
+                }
+                # Можливі обміни будуть відображені як спеціальні крапки в графічному інтерфейсі
+        
+        return True
+
+    def _handle_paralysis_landing_selection(self, row: int, col: int) -> bool:
+        """Обробляє вибір місця приземлення після ініціації паралічу"""
+        if not self.paralysis_selection:
+            return False
+        
+        triumphator_pos = self.paralysis_selection['triumphator_pos']
+        target_pos = self.paralysis_selection['target_pos']
+        
+        landing_squares = self.move_calculator.get_paralysis_landing_squares(
+            target_pos[0], target_pos[1]
+        )
+        
+        if (row, col) not in landing_squares:
+            self.paralysis_selection = None
+            return False
+        
+        self._execute_paralysis(triumphator_pos, target_pos, (row, col))
+        self._record_move(Move(triumphator_pos, target_pos, special_move_flag='TRIUMPHATOR_PARALYSIS',
+                               landing_square=(row, col)))
+        
+        self.paralysis_selection = None
+        self.clear_selection()
+        
+        self.switch_player()
+        return True
+
+    def make_move(self, to_row: int, to_col: int) -> bool:
+        if self.selected_piece is None:
+            return False
+        
+        from_row, from_col = self.selected_piece
+        piece = self.board.get_piece_at(from_row, from_col)
+        
+        if piece and piece.type == PieceType.TRIUMPHATOR:
+            if (to_row, to_col) in self.possible_attacks:
+                self.paralysis_selection = {
+                    'triumphator_pos': (from_row, from_col),
+                    'target_pos': (to_row, to_col)
+                }
+                self.clear_selection()
+                return True
+        
+        # КРИТИЧНО: Обробка обміну Аристократа - він НЕ ВБИВАЄ, а МІНЯЄТЬСЯ!
+        if piece and piece.type == PieceType.ARISTOCRAT:
+            # Перевірка обміну з ворожою фігурою (червона крапка)
+            if (to_row, to_col) in self.possible_attacks:
+                target_piece = self.board.get_piece_at(to_row, to_col)
+                if target_piece and not target_piece.is_empty():
+                    # Це обмін з ворожою фігурою - НЕ атака!
+                    return self.execute_aristocrat_exchange(from_row, from_col, to_row, to_col)
+            
+            # Перевірка обміну з союзною фігурою (сіра крапка)
+            for move_item in self.possible_moves:
+                if isinstance(move_item, tuple) and len(move_item) == 3 and move_item[2] == 'swap':
+                    move_row, move_col, _ = move_item
+                    if (to_row, to_col) == (move_row, move_col):
+                        # Це обмін з союзною фігурою - НЕ звичайний хід!
+                        return self.execute_aristocrat_exchange(from_row, from_col, to_row, to_col)
+            
+            # Якщо дійшли сюди - це звичайний хід Аристократа на пусту клітинку
+        
+        # Обробка священного обміну Храму
+        if piece and piece.type == PieceType.TEMPLE:
+            # Перевіряємо, чи це спроба обміну з союзною фігурою
+            if self.temple_swap_selection:
+                swap_targets = self.get_temple_swap_targets(from_row, from_col)
+                if (to_row, to_col) in swap_targets:
+                    # Виконуємо священний обмін
+                    result = self.execute_temple_swap(from_row, from_col, to_row, to_col)
+                    self.temple_swap_selection = None
+                    return result
+        
+        # Перевірка звичайних ходів (враховуючи формат з 'swap', але виключаючи обміни)
+        is_regular_move = False
+        is_swap_move = False
+        
+        for move_item in self.possible_moves:
+            if isinstance(move_item, tuple):
+                if len(move_item) == 3 and move_item[2] == 'swap':
+                    move_row, move_col, _ = move_item
+                    if (to_row, to_col) == (move_row, move_col):
+                        is_swap_move = True
+                        break
+                elif len(move_item) >= 2:
+                    move_row, move_col = move_item[0], move_item[1]
+                    if (to_row, to_col) == (move_row, move_col):
+                        is_regular_move = True
+                        break
+            else:
+                if (to_row, to_col) == move_item:
+                    is_regular_move = True
+                    break
+        
+        # Якщо це обмін (swap) і не Аристократ - щось не так
+        if is_swap_move and piece.type != PieceType.ARISTOCRAT:
+            return False
+        
+        # Для Аристократа обміни вже оброблені вище, тут тільки звичайні ходи
+        is_attack = (to_row, to_col) in self.possible_attacks
+        is_teleport = (to_row, to_col) in self.possible_teleports
+        
+        if not (is_regular_move or is_attack or is_teleport):
+            return False
+        
+        if is_teleport:
+            return self._handle_teleport_move(from_row, from_col, to_row, to_col)
+        else:
+            # КРИТИЧНО: is_attack тут означає РЕАЛЬНУ атаку, а не обмін!
+            # Для Аристократа обміни вже оброблені вище
+            return self._handle_regular_move(from_row, from_col, to_row, to_col, is_attack)
+
+    def _record_move(self, move: Move):
+        """Записує виконаний хід в історію партії та PGN (токен move_to_notation)"""
+        self.move_history.append(move)
+        append_pgn_move(move_to_notation(move))
+
+    def _execute_paralysis(self, triumphator_pos: Tuple[int, int], 
+                           target_pos: Tuple[int, int], 
+                           landing_pos: Tuple[int, int]):
+        """Виконує параліч цілі"""
+        triumphator = self.board.get_piece_at(triumphator_pos[0], triumphator_pos[1])
+        target = self.board.get_piece_at(target_pos[0], target_pos[1])
+        
+        if not triumphator or not target:
+            return
+        
+        duration = self._calculate_paralysis_duration(triumphator)
+        
+        self.board.move_piece(triumphator_pos[0], triumphator_pos[1], 
+                              landing_pos[0], landing_pos[1])
+        
+        self.board.set_paralysis(target.id, duration)
+        
+        triumphator_color = get_color_name_ua(triumphator.color)
+        target_color = get_color_name_ua(target.color)
+        target_name = PIECE_NAMES_UA.get(target.type, "невідома")
+        
+        # Показуємо фактичну кількість пропущених ходів (duration - 1, бо duration включає поточний хід)
+        turns_to_skip = duration - 1
+        game_print(f"⚡ {triumphator_color} Тріумфатор паралізував {target_color} {target_name} на {turns_to_skip} ходів!")
+
+    def _calculate_paralysis_duration(self, triumphator: Piece) -> int:
+        """
+        Розраховує тривалість паралічу на основі стану Очей.
+        Duration = кількість ходів, які гравець ПРОПУСТИТЬ.
+        Для пропуску 1 ходу потрібно duration = 2 (бо таймер зменшується на початку кожного ходу цього гравця).
+        """
+        linked_eyes = self.triumphant_eye_links.get(triumphator.id, [])
+        
+        living_eyes = 0
+        for eye_id in linked_eyes:
+            if self.board.find_piece_position(eye_id):
+                living_eyes += 1
+        
+        # Якщо є живі очі: пропуск 1 ходу (duration=2)
+        # Якщо немає очей: пропуск 2 ходів (duration=3)
+        return 2 if living_eyes > 0 else 3
+
+    def _handle_teleport_move(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
+        """Обробляє телепортацію між туманностями"""
+        piece = self.board.get_piece_at(from_row, from_col)
+        
+        from_nebula = get_nebula_name(from_row, from_col)
+        to_nebula = get_nebula_name(to_row, to_col)
+        
+        penalty = 1 if from_row != to_row else 0
+        
+        piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
+        piece_color = get_color_name_ua_with_gender(piece.color, piece.type)
+        from_nebula_ua = get_nebula_emoji_name(from_nebula) if from_nebula else "невідома"
+        to_nebula_ua = get_nebula_emoji_name(to_nebula) if to_nebula else "невідома"
+        
+        move_log = f"💫 {piece_color} {piece_name} id({piece.id}) з {from_nebula_ua} туманності ({from_row}, {from_col}) телепортується на {to_nebula_ua} туманність ({to_row}, {to_col})"
+        penalty_text = " (з штрафом часу -1)" if penalty else " (без штрафу часу)"
+        move_log += penalty_text
+        
+        game_print(move_log)
+        
+        self.board.move_piece(from_row, from_col, to_row, to_col)
+        self.teleport_piece(piece.id, (from_row, from_col), (to_row, to_col))
+        
+        move = Move(
+            from_square=(from_row, from_col),
+            to_square=(to_row, to_col),
+            is_nebula_teleport=True,
+            teleport_penalty=penalty
+        )
+        self._record_move(move)
+        
+        self.switch_player()
+        return True
+
+    def _handle_regular_move(self, from_row: int, from_col: int, to_row: int, to_col: int, is_attack: bool) -> bool:
+        """Обробляє звичайні ходи та атаки"""
+        piece = self.board.get_piece_at(from_row, from_col)
+        captured_piece = self.board.get_piece_at(to_row, to_col) if is_attack else None
+        
+        is_pawn_back_move = False
+        if piece.type == PieceType.PAWN and not is_attack:
+            direction = -1 if piece.color == PieceColor.WHITE else 1
+            if (to_row - from_row) == -direction:
+                is_pawn_back_move = True
+                self.move_calculator.register_pawn_back_move(piece.id)
+        
+        move = Move(
+            from_square=(from_row, from_col),
+            to_square=(to_row, to_col),
+            is_capture=is_attack,
+            is_pawn_back_move=is_pawn_back_move
+        )
+        self._record_move(move)
+        
+        if captured_piece and not captured_piece.is_empty():
+            if captured_piece.color == PieceColor.WHITE:
+                self.captured_pieces["white"].append(captured_piece)
+            else:
+                self.captured_pieces["black"].append(captured_piece)
+                
+            if captured_piece.type == PieceType.PAWN:
+                self.update_resurrection_availability(captured_piece.color)
+        
+        # ВИПРАВЛЕНО: Імпорт логування на початку функції
+        
+        piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
+        piece_color = get_color_name_ua_with_gender(piece.color, piece.type)
+        from_chess = coordinates_to_chess_notation(from_row, from_col)
+        to_chess = coordinates_to_chess_notation(to_row, to_col)
+        
+        from_is_nebula = is_nebula_coordinates(from_row, from_col)
+        to_is_nebula = is_nebula_coordinates(to_row, to_col)
+        
+        if from_is_nebula:
+            from_nebula_name = get_nebula_name(from_row, from_col)
+            from_nebula_emoji = get_nebula_emoji_name(from_nebula_name) if from_nebula_name else ""
+            from_desc = f"{from_nebula_emoji} туманності ({from_row}, {from_col})"
+        else:
+            from_desc = f"{from_chess} ({from_row}, {from_col})"
+        
+        timer_reset = ""
+        if from_is_nebula and not to_is_nebula:
+            timer_reset = ", таймер обнуляється"
+        
+        if is_attack and captured_piece:
+            captured_name = PIECE_NAMES_UA.get(captured_piece.type, "невідома")
+            captured_color = get_color_name_ua_with_gender(captured_piece.color, captured_piece.type)
+            
+            if to_is_nebula:
+                nebula_name = get_nebula_name(to_row, to_col)
+                nebula_emoji_name = get_nebula_emoji_name(nebula_name) if nebula_name else ""
+                to_desc = f"{nebula_emoji_name} туманність 🌀({to_row}, {to_col}), присвоєно час 5"
+            else:
+                to_desc = f"{to_chess} ({to_row}, {to_col})"
+            
+            game_print(f"⚔️ {piece_color} {piece_name} id({piece.id}) з {from_desc} атакує {captured_color} {captured_name} id({captured_piece.id}) на {to_desc}{timer_reset}")
+        else:
+            if to_is_nebula:
+                nebula_name = get_nebula_name(to_row, to_col)
+                nebula_emoji_name = get_nebula_emoji_name(nebula_name) if nebula_name else ""
+                to_desc = f"{nebula_emoji_name} туманність 🌀({to_row}, {to_col}), присвоєно час 5"
+            else:
+                to_desc = f"{to_chess} ({to_row}, {to_col})"
+                
+            game_print(f"🏃 {piece_color} {piece_name} id({piece.id}) ходить з {from_desc} на {to_desc}{timer_reset}")
+
+        # ═══ МЕХАНІКА ЕЛЕКТРИЧНОГО ПАРАЛІЧУ БЛИСКАВКИ ═══
+        # Якщо захоплюється Блискавка, атакуюча фігура паралізується на 1 хід
+        # Виняток: Король не паралізується
+        # Особливе правило: Блискавка, що вбиває іншу блискавку, теж знищується
+        lightning_paralysis_applied = False
+        lightning_mutual_destruction = False
+        if is_attack and captured_piece and captured_piece.type == PieceType.LIGHTNING:
+            # Якщо атакуюча фігура - Король, нічого не відбувається
+            if piece.type == PieceType.KING:
+                pass
+            # Якщо атакуюча фігура - теж Блискавка, обидві знищуються
+            elif piece.type == PieceType.LIGHTNING:
+                lightning_mutual_destruction = True
+                attacker_name = PIECE_NAMES_UA.get(piece.type, "фігура")
+                attacker_color = get_color_name_ua_with_gender(piece.color, piece.type)
+                target_color = get_color_name_ua_with_gender(captured_piece.color, captured_piece.type)
+                game_print(f"⚡💥💥 {attacker_color} блискавка id({piece.id}) атакує {target_color} блискавку id({captured_piece.id})!")
+                game_print(f"   💀💀 Обидві блискавки знищуються в електричному вибуху!")
+                # Логування взаємного знищення блискавок
+            # Інші фігури паралізуються
+            else:
+                lightning_paralysis_applied = True
+                attacker_name = PIECE_NAMES_UA.get(piece.type, "фігура")
+                attacker_color = get_color_name_ua_with_gender(piece.color, piece.type)
+                game_print(f"⚡💥 {attacker_color} {attacker_name} id({piece.id}) захопив Блискавку і отримав електричний шок!")
+                to_notation = coordinates_to_chess_notation(to_row, to_col)
+                game_print(f"   ⛔ {attacker_name} на {to_notation} ({to_row}, {to_col}) паралізована на 1 хід!")
+                
+                # Логування паралізації від Блискавки
+        self.board.move_piece(from_row, from_col, to_row, to_col)
+        
+        # Взаємне знищення блискавок - видаляємо атакуючу блискавку після ходу
+        if lightning_mutual_destruction:
+            destroyed_piece = self.board.get_piece_at(to_row, to_col)
+            if destroyed_piece:
+                self.board.clear_square(to_row, to_col)
+                game_print(f"   ⚡ {get_color_name_ua_with_gender(destroyed_piece.color, destroyed_piece.type)} блискавка id({destroyed_piece.id}) на {coordinates_to_chess_notation(to_row, to_col)} знищена")
+        
+        # Застосовуємо параліч ПІСЛЯ переміщення фігури на нову позицію
+        if lightning_paralysis_applied:
+            self.board.set_paralysis(piece.id, 2)  # duration=2 для пропуску 1 повного ходу
+        
+        self._process_move_side_effects(piece, from_row, from_col, to_row, to_col, captured_piece)
+        
+        enhancement_triggered = self._check_eye_enhancement(piece, to_row)
+
+        if enhancement_triggered:
+            return True
+
+        # Обробка подвійного ходу Місяця - КРИТИЧНО: перший хід ОБОВ'ЯЗКОВО має бути Місяцем!
+        color_key = "white" if piece.color == PieceColor.WHITE else "black"
+        
+        # Перевіряємо, чи активовано подвійний хід для цього кольору
+        if self.moon_double_move_active[color_key]:
+            if piece.type == PieceType.MOON:
+                # Хід Місяцем - дозволяємо подвійний хід
+                if self.moon_double_move_first_piece is None:
+                    # Перший хід Місяцем
+                    self.moon_double_move_first_piece = piece.id
+                    moon_notation = coordinates_to_chess_notation(to_row, to_col)
+                    from_notation = coordinates_to_chess_notation(from_row, from_col)
+                    game_print(f"🌙 Перший хід подвійного ходу Місяцем id({piece.id}) {from_notation} на {moon_notation} ({to_row}, {to_col}). Зробіть другий хід будь-яким Місяцем!")
+                    color_name_ua = "білий" if piece.color == PieceColor.WHITE else "чорний"
+                    move_text = f"{color_name_ua} місяць id({piece.id}) ходить з {from_notation} на {moon_notation}\nПерший хід подвійного ходу Місяцем id({piece.id}) {from_notation} на {moon_notation}"
+                    # Позначаємо записаний PGN хід як перший хід подвійного ходу
+                    from логування import replace_last_pgn_move
+                    pgn_move = f"{from_notation}xD{moon_notation}"
+                    replace_last_pgn_move(pgn_move)
+                    
+                    # НЕ перемикаємо гравця
+                    self.clear_selection()
+                    return True
+                else:
+                    # Другий хід Місяцем - завершуємо подвійний хід
+                    moon_notation = coordinates_to_chess_notation(to_row, to_col)
+                    from_notation = coordinates_to_chess_notation(from_row, from_col)
+                    game_print(f"🌙 Другий хід подвійного ходу Місяцем id({piece.id}) {from_notation} на {moon_notation} ({to_row}, {to_col}). Подвійний хід завершено!")
+                    
+                    # НЕ вимикаємо moon_double_move_active - він залишається назавжди!
+                    self.moon_double_move_first_piece = None
+                    self.switch_player()
+                    return True
+            else:
+                # Якщо вже зроблено перший хід місяцем, другий ОБОВ'ЯЗКОВО має бути місяцем!
+                if self.moon_double_move_first_piece is not None:
+                    game_print("❌ Помилка: Після ходу місяцем другий хід має бути також місяцем!")
+                    return False
+                
+                # Якщо перший хід ще не зроблено - пропускаємо подвійний хід на цей раз
+                self.moon_double_move_first_piece = None  # Скидаємо стан
+                # moon_double_move_active залишається True - можливість НЕ втрачається!
+                self.switch_player()
+                return True
+        
+        # Стара логіка для сумісності (якщо не Місяць або немає активного подвійного ходу)
+        if piece.type == PieceType.MOON and self.moon_double_move is None:
+            self.moon_double_move = (to_row, to_col)
+        else:
+            self.switch_player()
+        
+        return True
+
+    def _process_move_side_effects(self, piece: Piece, from_row: int, from_col: int, to_row: int, to_col: int, captured_piece: Optional[Piece]):
+        """Обробляє побічні ефекти ходу"""
+        
+        from_is_nebula = is_nebula_coordinates(from_row, from_col)
+        to_is_nebula = is_nebula_coordinates(to_row, to_col)
+
+        if from_is_nebula and not to_is_nebula:
+            self.board.clear_nebula_timer(piece.id)
+        elif not from_is_nebula and to_is_nebula:
+            self.enter_nebula(piece.id, (to_row, to_col))
+
+        if captured_piece and captured_piece.type in [PieceType.SHIELD, PieceType.FURY]:
+            self._handle_capture_of_shield_or_fury(captured_piece, to_row, to_col)
+        
+        # Система полювання на душі Всадником
+        if captured_piece and piece.type == PieceType.RIDER:
+            self._handle_soul_hunting(piece, captured_piece)
+        
+        # Система активації подвійного ходу Місяця при знищенні обох Аристократів
+        if captured_piece and captured_piece.type == PieceType.ARISTOCRAT:
+            self._check_aristocrat_death_for_moon_activation(captured_piece)
+
+    def _check_eye_enhancement(self, piece: Piece, to_row: int) -> bool:
+        """Перевіряє та запускає механіку посилення Ока."""
+        if piece.type != PieceType.EYE:
+            return False
+
+        color_key = "white" if piece.color == PieceColor.WHITE else "black"
+        final_rank = 1 if piece.color == PieceColor.WHITE else 20
+
+        if to_row == final_rank and not self.eye_enhancement_used[color_key]:
+            player_eyes = self.board.get_all_pieces_of_type(PieceType.EYE, piece.color)
+            
+            if len(player_eyes) >= 4:
+                game_print("👁️ Око досягло фінальної лінії! Оберіть 3 з 4 Очей для посилення.")
+                self.eye_enhancement_selection = {
+                    "player": piece.color,
+                    "selectable_eyes": [pos for pos in player_eyes],
+                    "selected_pos": []
+                }
+                return True
+            elif player_eyes:
+                game_print("👁️ Око досягло фінальної лінії! Всі ваші Ока посилено автоматично.")
+                for r, c in player_eyes:
+                    eye_to_enhance = self.get_piece_at(r, c)
+                    if eye_to_enhance:
+                        self.board.set_enhanced(eye_to_enhance.id)
+                        chess_pos = coordinates_to_chess_notation(r, c)
+                        game_print(f"👁️ Око ID {eye_to_enhance.id} на {chess_pos} ({r}, {c}) було посилено автоматично!")
+                self.eye_enhancement_used[color_key] = True
+                self.switch_player()
+                return True
+        
+        return False
+
+    def _handle_capture_of_shield_or_fury(self, captured_piece: Piece, row: int, col: int):
+        """Обробляє захоплення щита або фурії з прив'язкою"""
+        
+        if captured_piece.type == PieceType.SHIELD:
+            self._log_unprotected_pieces(row, col, captured_piece.color)
+
+        self.move_calculator.update_board(self.board)
+        additional_casualties = self.move_calculator.handle_shield_fury_bond(captured_piece, row, col)
+        
+        for casualty_pos in additional_casualties:
+            casualty_piece = self.board.get_piece_at(casualty_pos[0], casualty_pos[1])
+            if casualty_piece:
+                casualty_color = get_color_name_ua(casualty_piece.color)
+                casualty_name = PIECE_NAMES_UA.get(casualty_piece.type)
+                casualty_chess = coordinates_to_chess_notation(casualty_pos[0], casualty_pos[1])
+                game_print(f"💥 Додаткова втрата: {casualty_color} {casualty_name} id({casualty_piece.id}) знищено на {casualty_chess} ({casualty_pos[0]}, {casualty_pos[1]})!")
+                
+                # Логування додаткової втрати до партії
+                # КРИТИЧНО: Фізично видаляємо фігуру з дошки!
+                self.board.clear_square(casualty_pos[0], casualty_pos[1])
+                
+                # Додаємо до списку захоплених фігур
+                if casualty_piece.color == PieceColor.WHITE:
+                    self.captured_pieces["white"].append(casualty_piece)
+                else:
+                    self.captured_pieces["black"].append(casualty_piece)
+
+    def _handle_soul_hunting(self, rider: Piece, captured_piece: Piece):
+        """Обробляє полювання Всадника на душі (кінь, офіцер, всадник)"""
+        target_types = [PieceType.KNIGHT, PieceType.BISHOP, PieceType.RIDER]
+        
+        if captured_piece.type not in target_types:
+            return
+        
+        color_key = "white" if rider.color == PieceColor.WHITE else "black"
+        
+        # Вполювати душу
+        if not self.hunted_souls[color_key][captured_piece.type]:
+            self.hunted_souls[color_key][captured_piece.type] = True
+            
+            captured_name = PIECE_NAMES_UA.get(captured_piece.type, "невідома")
+            rider_name = PIECE_NAMES_UA.get(rider.type, "всадник")
+            rider_color = get_color_name_ua(rider.color)
+            
+            game_print(f"👻 {rider_color} {rider_name} id({rider.id}) вполював душу {captured_name}!")
+            
+            # Оновлюємо куточки для воскресіння
+            self._update_soul_corners()
+    
+    def _update_soul_corners(self):
+        """Оновлює куточки для воскресіння на стартових позиціях"""
+        self.soul_corners = []
+        
+        # Стартові позиції для білих та чорних
+        start_positions = {
+            PieceType.KNIGHT: {"white": [(20, 6), (20, 13)], "black": [(1, 6), (1, 13)]},
+            PieceType.BISHOP: {"white": [(20, 8), (20, 11)], "black": [(1, 8), (1, 11)]},
+            PieceType.RIDER: {"white": [(20, 3), (20, 16)], "black": [(1, 3), (1, 16)]}
+        }
+        
+        for color in ["white", "black"]:
+            player_color = PieceColor.WHITE if color == "white" else PieceColor.BLACK
+            
+            # Перевірка: чи використав гравець вже воскресіння
+            if self.performed_resurrection[color]:
+                continue
+            
+            # Перевірка: чи є живі всадники у гравця
+            rider_count = len(self.board.get_all_pieces_of_type(PieceType.RIDER, player_color))
+            if rider_count == 0:
+                continue
+            
+            # Перевіряємо кожен тип вполюваної душі
+            for piece_type in [PieceType.KNIGHT, PieceType.BISHOP, PieceType.RIDER]:
+                if not self.hunted_souls[color][piece_type]:
+                    continue
+                
+                # Перевіряємо умови для зеленого куточка
+                is_green = False
+                if piece_type == PieceType.RIDER:
+                    # Для всадника: рівно 1 всадник залишився
+                    is_green = rider_count == 1
+                else:
+                    # Для коня та офіцера: втрачена ОДНА фігура (залишилася 1 з 2-х)
+                    piece_count = len(self.board.get_all_pieces_of_type(piece_type, player_color))
+                    is_green = piece_count == 1  # Було 2, залишилася 1 - можна воскрешати
+                
+                # Додаємо куточки на стартові позиції
+                for row, col in start_positions[piece_type][color]:
+                    # Перевіряємо, чи клітинка вільна
+                    if self.board.is_square_empty(row, col):
+                        self.soul_corners.append((row, col, piece_type, is_green, player_color))
+
+    def _log_unprotected_pieces(self, shield_row: int, shield_col: int, shield_color: PieceColor):
+        """Логує фігури, що втратили захист після знищення щита"""
+        shield_zone = self.move_calculator._get_shield_zone(shield_row, shield_col)
+        unprotected_pieces = []
+        
+        for r, c in shield_zone:
+            if (r, c) == (shield_row, shield_col): 
+                continue
+            
+            piece_on_cell = self.board.get_piece_at(r, c)
+            if piece_on_cell and not piece_on_cell.is_empty() and piece_on_cell.color == shield_color:
+                pos = self.board.find_piece_position(piece_on_cell.id)
+                if pos:
+                    chess_notation = coordinates_to_chess_notation(pos[0], pos[1])
+                    piece_name = PIECE_NAMES_UA.get(piece_on_cell.type)
+                    unprotected_pieces.append(f"{piece_name} id({piece_on_cell.id}) на {chess_notation} ({pos[0]}, {pos[1]})")
+        
+        if unprotected_pieces:
+            pieces_str = ", ".join(unprotected_pieces)
+            game_print(f"🛡️ Фігури, що втратили захист: {pieces_str}")
+            # Логування втрати захисту
+    def switch_player(self):
+        """
+        Перемикає гравця на наступний хід.
+        
+        Конвеєр завершення ходу:
+        1. Тіки таймерів паралічу обох сторін (векторно) та оновлення куточків душ
+        2. Один прохід обчислення статусу в TurnStatus: шах, нападник, наявність
+           легального ходу (до першого знайденого) - мат і пат беруться звідси
+        3. Тік таймерів туманностей і правила нічиєї
+        4. Звіт у консоль/партія.log із того самого запису (_report_turn_status)
+        
+        У відкладеному режимі (defer_turn_status, пошук ШІ) крок 2 пропускається:
+        шах та мат/пат визначає сам пошук, а get_turn_status() дорахує статус на вимогу.
+        """
+        self.clear_selection()
+        self.moon_double_move = None
+        
+        self.recently_resurrected_pieces.clear()
+        
+        # Оновлюємо куточки для воскресіння душ
+        previous_soul_corners = self.soul_corners
+        self._update_soul_corners()
+        
+        # Таймери паралічу зменшуються спершу для гравця, що щойно походив, потім для наступного
+        expired_paralysis = self._update_paralysis_timers()
+        
+        # Завершуємо логування поточного ходу
+        finish_current_turn()
+        
+        self.current_player = PieceColor.BLACK if self.current_player == PieceColor.WHITE else PieceColor.WHITE
+        expired_paralysis.extend(self._update_paralysis_timers())
+        
+        # Збільшуємо номер ходу після кожного ходу (не тільки білих)
+        self.turn_number += 1
+        
+        status = TurnStatus(
+            player=self.current_player,
+            turn_number=self.turn_number,
+            position_hash=int(self.board.position_hash),
+            expired_paralysis=expired_paralysis,
+            soul_corners_changed=previous_soul_corners != self.soul_corners,
+        )
+        self.turn_status = status
+        
+        if self.move_calculator:
+            self.move_calculator.update_board(self.board)
+            if not self.defer_turn_status:
+                self._compute_turn_status(status, with_legal_moves=True)
+        
+        if status.is_checkmate:
+            self._set_game_over('white' if self.current_player == PieceColor.BLACK else 'black', 'checkmate')
+        elif status.is_stalemate:
+            self._set_game_over('draw', 'stalemate')
+        else:
+            status.expired_nebula = self._update_nebula_timers()
+            # Повторення стану / ліміт півходів без взяттів
+            draw_reason = self._check_draw_rules()
+            if draw_reason:
+                self._set_game_over('draw', draw_reason)
+            status.nebula_timers = self._collect_nebula_timers(self.current_player)
+        
+        status.game_over_reason = self.game_over_reason if self.game_over else None
+        self._report_turn_status(status)
+    
+    def _compute_turn_status(self, status: "TurnStatus", with_legal_moves: bool):
+        """Заповнює шах, нападника та (за потреби) наявність легального ходу одним проходом"""
+        calculator = self.move_calculator
+        status.king_pos = calculator._find_king(status.player)
+        status.attacker_pos = calculator._is_king_in_check(status.player) if status.king_pos else None
+        status.king_paralyzed = status.king_pos is not None and self.board.is_paralyzed_at(*status.king_pos)
+        
+        # Паралізований король під шахом - мат без пошуку ходів
+        if with_legal_moves and not (status.in_check and status.king_paralyzed):
+            status.has_legal_moves = calculator.has_legal_move(status.player)
+    
+    def get_turn_status(self, with_legal_moves: bool = False) -> "TurnStatus":
+        """
+        Статус поточного ходу для графіки, логування та ШІ. Якщо дошка змінилася без
+        передачі ходу (перший хід подвійного ходу Місяця, безкоштовне воскресіння)
+        або статус було відкладено, потрібні поля дораховуються.
+        """
+        status = self.turn_status
+        if status.player != self.current_player or status.position_hash != int(self.board.position_hash):
+            status = TurnStatus(self.current_player, self.turn_number, int(self.board.position_hash))
+            self.turn_status = status
+        if status.king_pos is None and status.attacker_pos is None and not status.king_paralyzed:
+            self._compute_turn_status(status, with_legal_moves=False)
+        if with_legal_moves and status.has_legal_moves is None:
+            self._compute_turn_status(status, with_legal_moves=True)
+        return status
+    
+    def _set_game_over(self, winner: str, reason: str):
+        """Фіксує завершення партії (звіт і запис у лог - у _report_turn_status)"""
+        self.game_over = True
+        self.winner = winner
+        self.game_over_reason = reason
+    
+    def _report_turn_status(self, status: "TurnStatus"):
+        """Виводить підсумок ходу в консоль і партія.log із запису TurnStatus"""
+        if is_quiet_mode():
+            return
+        
+        for piece_id in status.expired_paralysis:
+            pos = self.board.find_piece_position(piece_id)
+            if pos:
+                game_print(f"✅ Фігура на {coordinates_to_chess_notation(pos[0], pos[1])} більше не паралізована")
+        
+        if status.in_check:
+            attacker_pos, king_pos = status.attacker_pos, status.king_pos
+            attacker_piece = self.board.get_piece_at(attacker_pos[0], attacker_pos[1])
+            king_piece = self.board.get_piece_at(king_pos[0], king_pos[1])
+            attacker_name = PIECE_NAMES_UA.get(attacker_piece.type, "невідома")
+            attacker_color = get_color_name_ua_with_gender(attacker_piece.color, attacker_piece.type)
+            attacker_notation = coordinates_to_chess_notation(attacker_pos[0], attacker_pos[1])
+            king_notation = coordinates_to_chess_notation(king_pos[0], king_pos[1])
+            game_print(f"♚️ Шах! {attacker_color} {attacker_name} id({attacker_piece.id}) з {attacker_notation} ({attacker_pos[0]}, {attacker_pos[1]}) ставить шах королю id({king_piece.id}) на {king_notation} ({king_pos[0]}, {king_pos[1]})")
+        
+        if status.game_over_reason == 'checkmate':
+            if status.king_paralyzed:
+                game_print(f"⚡👑 МАТ! Король паралізований і під шахом!")
+            winner_name = 'Білі' if self.winner == 'white' else 'Чорні'
+            loser_name = 'Чорні' if self.winner == 'white' else 'Білі'
+            self._print_game_over_banner(f"👑 МАТ! {winner_name} перемогли!",
+                                         f"♔ {loser_name} король у безвихідній ситуації!")
+            end_game(f"закінчена гра - МАТ, переміг {winner_name}")
+            return
+        
+        if status.game_over_reason == 'stalemate':
+            current_name = 'Білі' if status.player == PieceColor.WHITE else 'Чорні'
+            self._print_game_over_banner("🤝 ПАТ! Нічия!",
+                                         f"♔ {current_name} король не під шахом, але немає легальних ходів!")
+            end_game("закінчена гра - ПАТ, нічия")
+            return
+        
+        for piece, piece_pos in status.expired_nebula:
+            nebula_name_str = ""
+            nebula_coords_str = ""
+            if piece_pos:
+                neb_name_raw = get_nebula_name(piece_pos[0], piece_pos[1])
+                if neb_name_raw:
+                    nebula_name_str = get_nebula_emoji_name(neb_name_raw)
+                nebula_coords_str = f"({piece_pos[0]}, {piece_pos[1]})"
+            piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
+            game_print(f"💀 фігура {piece_name} id({piece.id}) знищена в туманості {nebula_name_str} {nebula_coords_str} за браком часу.")
+        
+        if status.game_over_reason == 'repetition':
+            self._print_game_over_banner("🤝 НІЧИЯ! Повторення позиції!",
+                                         f"🔁 Той самий стан партії повторився {self.repetition_count()} рази")
+            end_game("закінчена гра - повторення позиції, нічия")
+            return
+        
+        if status.game_over_reason == 'no_capture_limit':
+            self._print_game_over_banner("🤝 НІЧИЯ! Ліміт ходів без взяттів!",
+                                         f"⏳ {self.no_capture_plies} півходів поспіль без зміни кількості фігур")
+            end_game("закінчена гра - ліміт ходів без взяттів, нічия")
+            return
+        
+        current_time = datetime.datetime.now().strftime("%H:%M:%S")
+        game_print(f"\033[1m{current_time}, Хід {'Білого' if status.player == PieceColor.WHITE else 'Чорного'} Гравця - номер ходу {status.turn_number}:\033[0m")
+        
+        for piece_id, pos, timer in status.nebula_timers:
+            piece = self.board.get_piece_by_id(piece_id)
+            nebula_name = get_nebula_name(pos[0], pos[1])
+            if piece and nebula_name:
+                emoji = get_nebula_emoji_name(nebula_name)
+                color_name = get_color_name_ua_with_gender(piece.color, piece.type)
+                piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
+                game_print(f"🌀 {color_name} {piece_name} id({piece.id}) що стоїть на {emoji} Туманності ({pos[0]}, {pos[1]}) має таймер - {timer}.")
+    
+    def _print_game_over_banner(self, headline: str, details: str):
+        """Банер завершення партії (мат, пат, нічия за правилами)"""
+        game_print(f"")
+        game_print(f"{'='*60}")
+        game_print(headline)
+        game_print(details)
+        game_print(f"{'='*60}")
+        game_print(f"")
+    
+
+    # ═══ ІСТОРІЯ СТАНІВ ТА ПРАВИЛА НІЧИЄЇ ═══
+    
+    def compute_state_hash(self) -> int:
+        """
+        64-бітний хеш повного стану партії: Zobrist хеш розташування фігур, черга ходу,
+        статуси фігур (параліч, таймери туманностей, посилення) та прапорці систем
+        фігур, що впливають на легальні ходи. Стабільний між процесами.
+        """
+        board = self.board
+        digest = hashlib.blake2b(int(board.position_hash).to_bytes(8, 'little'), digest_size=8)
+        digest.update(b'W' if self.current_player == PieceColor.WHITE else b'B')
+        for status in (board.paralysis_turns, board.nebula_timers, board.enhanced):
+            ids = np.flatnonzero(status)
+            digest.update(ids.tobytes())
+            digest.update(status[ids].tobytes())
+        flags = (
+            self.resurrection_available, self.resurrected_pawns, self.nebula_blocked,
+            self.moon_double_move_active, self.moon_double_move_used, self.moon_double_move_first_piece,
+            self.performed_resurrection, self.hunted_souls, self.temple_swap_used,
+            self.eye_enhancement_used, sorted(self.move_calculator.pawns_used_back_move),
+        )
+        digest.update(repr(flags).encode())
+        return int.from_bytes(digest.digest(), 'little')
+    
+    def _reset_position_history(self):
+        """Починає історію станів з поточної (початкової) позиції"""
+        self.position_history = np.zeros(256, dtype=np.uint64)
+        self.history_length = 0
+        self.position_counts: Dict[int, int] = {}
+        self.no_capture_plies = 0
+        self._last_piece_count = len(self.board.pieces_by_id)
+        self._push_state_hash()
+    
+    def _restore_position_history(self, history: np.ndarray):
+        """Відновлює історію станів зі знімку (лічильники перебудовуються за O(n))"""
+        self.position_history = np.zeros(max(256, 2 * len(history)), dtype=np.uint64)
+        self.position_history[:len(history)] = history
+        self.history_length = len(history)
+        self.position_counts = dict(Counter(history.tolist()))
+    
+    def _push_state_hash(self) -> int:
+        """Додає хеш поточного стану в історію (масив за номером півходу + лічильник хеш→кількість)"""
+        state_hash = self.compute_state_hash()
+        if self.history_length == len(self.position_history):
+            self.position_history = np.concatenate([self.position_history,
+                                                    np.zeros_like(self.position_history)])
+        self.position_history[self.history_length] = state_hash
+        self.history_length += 1
+        self.position_counts[state_hash] = self.position_counts.get(state_hash, 0) + 1
+        return state_hash
+    
+    @property
+    def current_state_hash(self) -> int:
+        """Хеш повного стану поточної позиції (останній запис історії)"""
+        return int(self.position_history[self.history_length - 1])
+    
+    def repetition_count(self, state_hash: Optional[int] = None) -> int:
+        """Скільки разів стан траплявся в партії, O(1). За замовчуванням - поточний стан"""
+        if state_hash is None:
+            state_hash = self.current_state_hash
+        return self.position_counts.get(state_hash, 0)
+    
+    def _check_draw_rules(self) -> Optional[str]:
+        """
+        Записує новий стан в історію та перевіряє правила нічиєї:
+        повторення стану repetition_draw_count разів і no_capture_draw_plies
+        півходів поспіль без зміни кількості фігур. Повертає причину нічиєї або None.
+        """
+        piece_count = len(self.board.pieces_by_id)
+        if piece_count != self._last_piece_count:
+            self.no_capture_plies = 0
+            self._last_piece_count = piece_count
+        else:
+            self.no_capture_plies += 1
+        
+        state_hash = self._push_state_hash()
+        
+        if self.repetition_draw_count and self.position_counts[state_hash] >= self.repetition_draw_count:
+            return 'repetition'
+        if self.no_capture_draw_plies and self.no_capture_plies >= self.no_capture_draw_plies:
+            return 'no_capture_limit'
+        return None
+    
+    def _update_paralysis_timers(self) -> List[int]:
+        """
+        Оновлює таймери паралічу для ПОТОЧНОГО гравця (того, хто щойно ПОХОДИВ).
+        Викликається ПЕРЕД switch_player(), тому current_player - це гравець, який завершує хід.
+        Зменшуємо duration для фігур current_player після того, як він походив.
+        
+        Логіка: 
+        - Білий паралізує чорного (duration=2)
+        - Чорний ходить іншою фігурою → duration зменшується до 1 (король все ще паралізований)
+        - Білий ходить
+        - Чорний ходить іншою фігурою → duration зменшується до 0 (параліч знято)
+        
+        Повертає ID фігур, з яких параліч щойно знято (для TurnStatus).
+        """
+        # ОПТИМІЗАЦІЯ: Один векторний тік по масиву статусів замість обходу словника
+        return [int(piece_id) for piece_id in self.board.tick_paralysis(self.current_player)]
+    
+    def _update_nebula_timers(self) -> List[Tuple[Piece, Tuple[int, int]]]:
+        """
+        Оновлює таймери фігур у туманностях (векторний тік по масиву статусів).
+        Фігури, чий час вичерпано, знищуються; повертає [(фігура, позиція)] для TurnStatus.
+        """
+        destroyed = []
+        for piece_id in self.board.tick_nebula_timers(self.current_player):
+            piece = self.board.get_piece_by_id(piece_id)
+            if not piece:
+                continue
+            
+            piece_pos = self.board.find_piece_position(piece_id)
+            destroyed.append((piece, piece_pos))
+            if piece_pos:
+                self.board.clear_square(piece_pos[0], piece_pos[1])
+        return destroyed
+    
+    def _collect_nebula_timers(self, color: PieceColor) -> List[Tuple[int, Tuple[int, int], int]]:
+        """Фігури кольору color у туманностях: [(ID, позиція, таймер)]"""
+        timers = []
+        for piece_id in self.board.get_nebula_timer_ids():
+            pos = self.board.find_piece_position(piece_id)
+            if pos and PIECE_ID_COLORS[piece_id] == color and get_nebula_name(pos[0], pos[1]):
+                timers.append((int(piece_id), pos, self.board.get_nebula_timer(piece_id)))
+        return timers
+    
+    def add_paralysis(self, row: int, col: int, duration: int):
+        """Додає параліч на фігуру"""
+        piece = self.get_piece_at(row, col)
+        if piece:
+            self.board.set_paralysis(piece.id, duration)
+    
+    def get_current_player_name(self) -> str:
+        return "Білі" if self.current_player == PieceColor.WHITE else "Чорні"
+    
+    def clear_selection(self):
+        self.selected_piece = None
+        self.possible_moves = []
+        self.possible_attacks = []
+        self.possible_teleports = []
+        # temple_swap_selection НЕ очищається тут - він зберігається до використання обміну
+    
+    def is_piece_selected(self) -> bool:
+        return self.selected_piece is not None
+    
+    def get_selected_position(self) -> Optional[Tuple[int, int]]:
+        return self.selected_piece
+    
+    def reset_game(self):
+        """Скидає гру до початкового стану"""
+        self.board = Board()
+        self.current_player = PieceColor.WHITE
+        self.turn_number = 1
+        self.selected_piece = None
+        self.possible_moves = []
+        self.possible_attacks = []
+        self.possible_teleports = []
+        self.move_history = []
+        self.captured_pieces = {"white": [], "black": []}
+        self.paralysis_mode_data = None
+        self.moon_double_move = None
+        self.nebula_blocked = {
+            "top_left": True,
+            "top_right": True, 
+            "bottom_left": True,
+            "bottom_right": True
+        }
+        self.resurrected_pawns = {"white": 0, "black": 0}
+        self.resurrection_available = {"white": 0, "black": 0}
+        self.nebulas_activated = {"white": False, "black": False}
+        self.recently_resurrected_pieces = set()
+        
+        self.eye_enhancement_used = {"white": False, "black": False}
+        self.triumphant_eye_links = {}
+        self.eye_enhancement_selection = None
+        
+        # Скидання системи Храму
+        self.temple_swap_used = {
+            "black_left": False,
+            "black_right": False,
+            "white_left": False,
+            "white_right": False
+        }
+        self.temple_swap_selection = None
+        
+        # Скидання системи Місяця
+        self.moon_double_move_active = {"white": False, "black": False}
+        self.moon_double_move_used = {"white": False, "black": False}
+        self.moon_double_move_first_piece = None
+        
+        # Скидання системи Всадника
+        self.hunted_souls = {
+            "white": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False},
+            "black": {PieceType.KNIGHT: False, PieceType.BISHOP: False, PieceType.RIDER: False}
+        }
+        self.performed_resurrection = {"white": False, "black": False}
+        self.soul_corners = []
+        
+        # Скидання статусу завершення гри
+        self.game_over = False
+        self.winner = None
+        self.game_over_reason = None
+        
+        self._setup_initial_position()
+        self._reset_position_history()
+        self.turn_status = TurnStatus(self.current_player, self.turn_number, int(self.board.position_hash))
+        
+        self.move_calculator.update_board(self.board)
+        self.move_calculator.set_game_state(self)
+        self.move_calculator.reset_pawn_back_moves()
+    
+    # ═══ ХОДИ ЯК ОБ'ЄКТИ Move (для ШІ, симуляцій та відтворення партій) ═══
+    
+    def generate_legal_moves(self, include_resurrections: bool = True, tactical_only: bool = False) -> List[Move]:
+        """
+        Повертає всі легальні дії поточного гравця у вигляді Move.
+        Спеціальні дії позначаються special_move_flag:
+        'ARISTOCRAT_EXCHANGE_ALLY' / 'ARISTOCRAT_EXCHANGE_ENEMY', 'TEMPLE_SWAP',
+        'TRIUMPHATOR_PARALYSIS' (з landing_square), 'SOUL_RESURRECTION'.
+        tactical_only - лише атаки (взяття, обмін з ворогом, паралізація) для форсованого пошуку ШІ.
+        """
+        if self.game_over or self.eye_enhancement_selection:
+            return []
+        
+        color = self.current_player
+        color_key = "white" if color == PieceColor.WHITE else "black"
+        moon_second_move = (self.moon_double_move_active[color_key] and
+                            self.moon_double_move_first_piece is not None)
+        legal_moves = []
+        
+        for row, col in self.board.get_all_pieces_of_color(color):
+            piece = self.board.get_piece_at(row, col)
+            if piece.is_empty() or piece.id in self.recently_resurrected_pieces:
+                continue
+            if moon_second_move and piece.type != PieceType.MOON:
+                continue
+            legal_moves.extend(self._piece_moves(piece, row, col, moon_second_move, tactical_only))
+        
+        if include_resurrections and not moon_second_move and not tactical_only:
+            if self.can_resurrect_pawn(color):
+                for target in self.move_calculator.get_resurrection_positions(color):
+                    legal_moves.append(Move(None, target, is_pawn_resurrection=True))
+            
+            if not self.performed_resurrection[color_key]:
+                for corner_row, corner_col, piece_type, is_green, piece_color in self.soul_corners:
+                    if piece_color == color and is_green and self.board.is_square_empty(corner_row, corner_col):
+                        legal_moves.append(Move(None, (corner_row, corner_col),
+                                                special_move_flag='SOUL_RESURRECTION',
+                                                resurrected_type=piece_type))
+        
+        return legal_moves
+    
+    def generate_piece_moves(self, row: int, col: int, filter_legal: bool = True) -> List[Move]:
+        """
+        Ходи однієї фігури поточного гравця (без воскресінь) - дешевий генератор
+        для випадкових партій ШІ, що не перебирає всю армію. filter_legal=False -
+        без перевірки шаху власному королю (apply_move відхилить нелегальний хід).
+        """
+        if self.game_over or self.eye_enhancement_selection:
+            return []
+        
+        piece = self.board.get_piece_at(row, col)
+        if (piece is None or piece.is_empty() or piece.color != self.current_player
+                or piece.id in self.recently_resurrected_pieces):
+            return []
+        color_key = "white" if piece.color == PieceColor.WHITE else "black"
+        moon_second_move = (self.moon_double_move_active[color_key] and
+                            self.moon_double_move_first_piece is not None)
+        if moon_second_move and piece.type != PieceType.MOON:
+            return []
+        return self._piece_moves(piece, row, col, moon_second_move, False, filter_legal)
+    
+    def _piece_moves(self, piece: Piece, row: int, col: int, moon_second_move: bool,
+                     tactical_only: bool, filter_legal: bool = True) -> List[Move]:
+        """Ходи фігури у вигляді Move (спільна частина generate_legal_moves і generate_piece_moves)"""
+        legal_moves = []
+        if tactical_only:
+            # ОПТИМІЗАЦІЯ: легальність (шах власному королю) перевіряється лише для атак
+            _, attacks, _ = self.move_calculator.get_possible_moves(piece, row, col, filter_legal=False)
+            attacks = self.move_calculator._filter_legal_moves(piece, row, col, attacks)
+            moves, teleports = [], []
+        else:
+            moves, attacks, teleports = self.move_calculator.get_possible_moves(piece, row, col, filter_legal)
+        
+        for move_item in moves:
+            if len(move_item) == 3 and move_item[2] == 'swap':
+                legal_moves.append(Move((row, col), (move_item[0], move_item[1]),
+                                        special_move_flag='ARISTOCRAT_EXCHANGE_ALLY'))
+            else:
+                legal_moves.append(Move((row, col), (move_item[0], move_item[1])))
+        
+        for target in attacks:
+            if piece.type == PieceType.TRIUMPHATOR:
+                for landing in self.move_calculator.get_paralysis_landing_squares(target[0], target[1]):
+                    legal_moves.append(Move((row, col), target, special_move_flag='TRIUMPHATOR_PARALYSIS',
+                                            landing_square=landing))
+            elif piece.type == PieceType.ARISTOCRAT:
+                legal_moves.append(Move((row, col), target, special_move_flag='ARISTOCRAT_EXCHANGE_ENEMY'))
+            else:
+                legal_moves.append(Move((row, col), target, is_capture=True))
+        
+        for target in teleports:
+            legal_moves.append(Move((row, col), target, is_nebula_teleport=True,
+                                    teleport_penalty=1 if target[0] != row else 0))
+        
+        if piece.type == PieceType.TEMPLE and not moon_second_move and not tactical_only:
+            for target in self.get_temple_swap_targets(row, col):
+                legal_moves.append(Move((row, col), target, special_move_flag='TEMPLE_SWAP'))
+        return legal_moves
+    
+    def apply_move(self, move: Move) -> bool:
+        """
+        Виконує хід, отриманий з generate_legal_moves (або від ШІ), через ті самі
+        обробники, що й графічний інтерфейс. Вибір для посилення Очей робиться
+        автоматично (перші три Ока). Повертає True, якщо хід виконано.
+        """
+        if self.game_over:
+            return False
+        
+        color = self.current_player
+        self.paralysis_selection = None
+        
+        if move.is_pawn_resurrection:
+            row, col = move.to_square
+            if not (self.can_resurrect_pawn(color) and self.board.is_square_empty(row, col)):
+                return False
+            is_free_action = self.resurrect_pawn(row, col, color)
+            if not is_free_action:
+                self.switch_player()
+            return True
+        
+        if move.special_move_flag == 'SOUL_RESURRECTION':
+            self.resurrect_soul(move.to_square[0], move.to_square[1], move.resurrected_type, color)
+            return True
+        
+        if not self.select_piece(*move.from_square):
+            return False
+        
+        if not self.make_move(*move.to_square):
+            self.clear_selection()
+            return False
+        
+        if move.special_move_flag == 'TRIUMPHATOR_PARALYSIS':
+            if not self.paralysis_selection or not self.select_piece(*move.landing_square):
+                self.paralysis_selection = None
+                return False
+        
+        if self.eye_enhancement_selection:
+            selectable = self.eye_enhancement_selection["selectable_eyes"]
+            self.complete_eye_enhancement(selectable[:3])
+        
+        return True
+    
+    def make_null_move(self) -> bool:
+        """
+        Нульовий хід для пошуку ШІ: гравець пропускає хід (switch_player без руху
+        фігур, таймери тікають як після звичайного ходу). Неможливий посеред
+        подвійного ходу Місяця чи вибору посилення. Відкат - відновленням знімку.
+        """
+        if self.game_over or self.eye_enhancement_selection or self.paralysis_selection:
+            return False
+        if self.moon_double_move_first_piece is not None:
+            return False
+        self.switch_player()
+        return True
+    
+    def complete_eye_enhancement(self, selected_positions: List[Tuple[int, int]]):
+        """Завершує вибір Очей для посилення та передає хід"""
+        game_print("----- Посилення завершено -----")
+        for r, c in selected_positions:
+            eye_piece = self.get_piece_at(r, c)
+            if eye_piece:
+                self.board.set_enhanced(eye_piece.id)
+                chess_pos_final = coordinates_to_chess_notation(r, c)
+                game_print(f"👁️ Око ID {eye_piece.id} на {chess_pos_final} ({r}, {c}) було посилено!")
+        
+        color_key = "white" if self.current_player == PieceColor.WHITE else "black"
+        self.eye_enhancement_used[color_key] = True
+        self.eye_enhancement_selection = None
+        self.switch_player()
+    
+    def find_move_by_notation(self, notation: str) -> Optional[Move]:
+        """Знаходить легальний хід за PGN-токеном (див. move_to_notation)"""
+        # 'xD' перед клітинкою - позначка першого ходу подвійного ходу Місяця в PGN, сам хід
+        # звичайний; 'xD' перед цифрою - взяття на вертикалі D ('E3xD3')
+        notation = re.sub(r'xD(?=[@A-Z])', '', notation)
+        # ОПТИМІЗАЦІЯ: токен ходу фігури починається з її клітинки - генеруються
+        # лише її ходи, а не вся армія (відтворення партій для книги і датасетів)
+        match = re.match(r'[@A-Z]\d+', notation)
+        from_square = chess_notation_to_coordinates(match.group()) if match else None
+        if from_square is not None:
+            candidates = self.generate_piece_moves(*from_square)
+        else:
+            candidates = self.generate_legal_moves()
+        for move in candidates:
+            if move_to_notation(move) == notation:
+                return move
+        return None
+    
+    # ═══ ЗНІМКИ СТАНУ (контрольні точки відтворення, пошук ШІ) ═══
+    
+    def snapshot(self) -> dict:
+        """
+        Повний знімок стану партії: дошка (Board.snapshot), історія ходів, взяті фігури,
+        поля SNAPSHOT_FIELDS та використані зворотні ходи пішаків. Вибір фігури не зберігається.
+        """
+        state = {name: copy.deepcopy(getattr(self, name)) for name in self.SNAPSHOT_FIELDS}
+        state['board'] = self.board.snapshot()
+        state['move_history'] = list(self.move_history)
+        state['captured_pieces'] = {color: list(pieces) for color, pieces in self.captured_pieces.items()}
+        state['pawns_used_back_move'] = set(self.move_calculator.pawns_used_back_move)
+        state['position_history'] = self.position_history[:self.history_length].copy()
+        return state
+    
+    def restore_snapshot(self, state: dict):
+        """Відновлює партію зі знімку snapshot(); знімок лишається придатним для повторного відновлення"""
+        for name in self.SNAPSHOT_FIELDS:
+            setattr(self, name, copy.deepcopy(state[name]))
+        self.board.restore(state['board'])
+        self.move_history = list(state['move_history'])
+        self.captured_pieces = {color: list(pieces) for color, pieces in state['captured_pieces'].items()}
+        self.move_calculator.pawns_used_back_move = set(state['pawns_used_back_move'])
+        self._restore_position_history(state['position_history'])
+        
+        # Кеш ходів прив'язаний до хешу позиції, а статуси фігур у хеш не входять
+        self.move_calculator.update_board(self.board)
+        self.clear_selection()
+        self.turn_status = TurnStatus(self.current_player, self.turn_number, int(self.board.position_hash))
+    
+    def clone(self) -> "GameState":
+        """
+        Незалежна копія партії з власними об'єктами фігур - для пошуку ШІ,
+        щоб зміни під час пошуку не торкалися стану, який бачить графіка.
+        """
+        clone = GameState()
+        clone.repetition_draw_count = self.repetition_draw_count
+        clone.no_capture_draw_plies = self.no_capture_draw_plies
+        clone.restore_snapshot(self.snapshot())
+        board = clone.board
+        board.pieces_by_id = {piece_id: copy.copy(piece) for piece_id, piece in board.pieces_by_id.items()}
+        clone.move_calculator.update_board(board)
+        return clone
+    
+    def save_game(self, filename: str):
+        pass
+    
+    def load_game(self, filename: str):
+        pass
+    
+    def undo_move(self):
+        if not self.move_history:
+            return False
+        return False
+    
+    def get_game_info(self) -> dict:
+        return {
+            "current_player": self.get_current_player_name(),
+            "move_count": len(self.move_history),
+            "captured_white": len(self.captured_pieces["white"]),
+            "captured_black": len(self.captured_pieces["black"]),
+            "paralyzed_count": len(self.paralyzed_pieces)
+        }
+    
+    def update_resurrection_availability(self, captured_color: PieceColor):
+        """Оновлює доступність воскресіння для гравця"""
+        color_name = "white" if captured_color == PieceColor.WHITE else "black"
+        if self.resurrected_pawns[color_name] < 2:
+            self.resurrection_available[color_name] += 1
+
+    def can_resurrect_pawn(self, color: PieceColor) -> bool:
+        """Перевіряє чи може гравець воскресити пішака"""
+        color_name = "white" if color == PieceColor.WHITE else "black"
+        return (
+            self.resurrection_available[color_name] > 0 and 
+            self.resurrected_pawns[color_name] < 2
+        )
+
+    def resurrect_pawn(self, row: int, col: int, color: PieceColor) -> bool:
+        """Воскрешає пішака на вказану позицію"""
+        color_name_ua = "білий" if color == PieceColor.WHITE else "чорний"
+        
+        if not self.can_resurrect_pawn(color):
+            return False
+
+        color_key = "white" if color == PieceColor.WHITE else "black"
+        self.resurrection_available[color_key] -= 1
+
+        if not self.board.is_square_empty(row, col):
+            self.resurrection_available[color_key] += 1
+            return False
+        
+        if color == PieceColor.WHITE:
+            base_id = 1050
+            piece_id = base_id + self.resurrected_pawns["white"]
+        else:
+            base_id = 2050
+            piece_id = base_id + self.resurrected_pawns["black"]
+        
+        pawn = Piece(PieceType.PAWN, color, piece_id)
+        self.board.set_piece(row, col, pawn)
+        
+        self.recently_resurrected_pieces.add(piece_id)
+        self.resurrected_pawns[color_key] += 1
+        
+        is_free_action = self.resurrected_pawns[color_key] == 1
+        
+        chess_position = coordinates_to_chess_notation(row, col)
+        attempt = self.resurrected_pawns[color_key]
+        
+        if attempt == 1:
+            action_detail = "(хід не затрачено, заборона руху поточної фігури)"
+        else:
+            action_detail = "(хід затрачено)"
+            
+        game_print(f"⚰️ Гравець {color_name_ua} воскресив пішака ID {piece_id} позицією {chess_position} ({int(row)}, {int(col)}) спроб {attempt}/2 {action_detail}")
+        self._record_move(Move(None, (int(row), int(col)), is_pawn_resurrection=True))
+        # Воскресіння виводиться ОДРАЗУ в поточний хід
+        if self.resurrected_pawns[color_key] == 2:
+            self.activate_nebulas(color)
+            return False
+        
+        return is_free_action
+    
+    def resurrect_soul(self, row: int, col: int, piece_type: PieceType, color: PieceColor):
+        """Воскрешає душу (кінь, офіцер, всадник) через Всадника"""
+        color_key = "white" if color == PieceColor.WHITE else "black"
+        color_name_ua = "білий" if color == PieceColor.WHITE else "чорний"
+        piece_name = PIECE_NAMES_UA.get(piece_type, "невідома")
+        
+        # Генеруємо ID для воскрешеної фігури
+        if color == PieceColor.WHITE:
+            base_id = {
+                PieceType.KNIGHT: 1100,
+                PieceType.BISHOP: 1110,
+                PieceType.RIDER: 1120
+            }[piece_type]
+        else:
+            base_id = {
+                PieceType.KNIGHT: 2100,
+                PieceType.BISHOP: 2110,
+                PieceType.RIDER: 2120
+            }[piece_type]
+        
+        # Рахуємо, скільки вже воскрешено цього типу
+        existing_count = len([p for p in self.board.get_all_pieces_of_type(piece_type, color)])
+        piece_id = base_id + existing_count
+        
+        # Створюємо фігуру
+        resurrected_piece = Piece(piece_type, color, piece_id)
+        self.board.set_piece(row, col, resurrected_piece)
+        
+        # Позначаємо, що воскресіння використано
+        self.performed_resurrection[color_key] = True
+        
+        # Оновлюємо куточки (всі зникнуть)
+        self._update_soul_corners()
+        
+        chess_position = coordinates_to_chess_notation(row, col)
+        game_print(f"👻 Гравець {color_name_ua} воскресив {piece_name} ID {piece_id} на позиції {chess_position} ({row}, {col}) через Всадника!")
+        self._record_move(Move(None, (row, col), special_move_flag='SOUL_RESURRECTION',
+                               resurrected_type=piece_type))
+        # Переключаємо хід
+        self.switch_player()
+
+    def activate_nebulas(self, color: PieceColor):
+        """Активує туманності для гравця після другого воскресіння"""
+        color_name = "білий" if color == PieceColor.WHITE else "чорний"
+        color_key = "white" if color == PieceColor.WHITE else "black"
+        self.nebulas_activated[color_key] = True
+        
+        if color == PieceColor.WHITE:
+            self.nebula_blocked["bottom_left"] = False
+            self.nebula_blocked["bottom_right"] = False
+            game_print(f"🌀 Туманності активовані для гравця {color_name} - відкрито (21,0) та (21,19)")
+        else:
+            self.nebula_blocked["top_left"] = False
+            self.nebula_blocked["top_right"] = False
+            game_print(f"🌀 Туманності активовані для гравця {color_name} - відкрито (0,0) та (0,19)")
+    def enter_nebula(self, piece_id: int, nebula_pos: Tuple[int, int]):
+        self.board.set_nebula_timer(piece_id, 5)
+    def teleport_piece(self, piece_id: int, from_nebula: Tuple[int, int], to_nebula: Tuple[int, int]) -> bool:
+        timer = self.board.get_nebula_timer(piece_id)
+        if timer <= 0:
+            return False
+        
+        penalty = 0
+        if from_nebula[0] != to_nebula[0]:
+            penalty = 1
+        
+        timer -= penalty
+        self.board.set_nebula_timer(piece_id, max(timer, 0))
+        
+        # ВИДАЛЕНО дублювання: логування телепортації тепер у _handle_teleport_move()
+
+        if timer <= 0:
+            piece_pos = self.board.find_piece_position(piece_id)
+            piece = self.board.get_piece_at(piece_pos[0], piece_pos[1]) if piece_pos else None
+            
+            from_nebula_name = get_nebula_emoji_name(get_nebula_name(from_nebula[0], from_nebula[1]))
+            to_nebula_name = get_nebula_emoji_name(get_nebula_name(to_nebula[0], to_nebula[1]))
+
+            if piece_pos:
+                self.board.clear_square(piece_pos[0], piece_pos[1])
+
+            if piece:
+                piece_name = PIECE_NAMES_UA.get(piece.type, "невідома")
+                message = f"💀💫 фігура {piece_name} id({piece.id}) загинула в телепортації з туманності {from_nebula_name} ({from_nebula[0]}, {from_nebula[1]}) в {to_nebula_name} ({to_nebula[0]}, {to_nebula[1]}), знищена в телепортації за штрафом."
+                game_print(message)
+            else:
+                message = f"💀💫 фігура з id({piece_id}) знищена в телепортації за штрафом."
+                game_print(message)
+
+            return False
+        
+        return True
+
+    def _can_aristocrat_exchange_with(self, from_row: int, from_col: int, to_row: int, to_col: int) -> Tuple[bool, str]:
+        """
+        Перевіряє можливість обміну Аристократа з фігурою на цільовій позиції.
+        Використовує перевірки з MoveCalculator._can_aristocrat_exchange
+        """
+        aristocrat = self.board.get_piece_at(from_row, from_col)
+        target_piece = self.board.get_piece_at(to_row, to_col)
+        
+        if not aristocrat or aristocrat.type != PieceType.ARISTOCRAT:
+            return False, "Не Аристократ"
+        
+        if not target_piece or target_piece.is_empty():
+            return False, "Цільова клітинка порожня"
+        
+        # Використовуємо метод з MoveCalculator для валідації
+        is_aristocrat_in_nebula = is_nebula_coordinates(from_row, from_col)
+        can_exchange = self.move_calculator._can_aristocrat_exchange(
+            aristocrat, from_row, from_col, to_row, to_col, is_aristocrat_in_nebula
+        )
+        
+        if not can_exchange:
+            return False, "Обмін заборонений правилами"
+        
+        return True, "OK"
+    
+    def _check_aristocrat_death_for_moon_activation(self, captured_aristocrat: Piece):
+        """
+        Перевіряє, чи знищено обох Аристократів одного кольору.
+        Якщо так - активує подвійний хід для Місяців цього кольору (назавжди).
+        """
+        color_key = "white" if captured_aristocrat.color == PieceColor.WHITE else "black"
+        
+        # Перевіряємо, чи вже активовано подвійний хід (щоб не виводити повідомлення двічі)
+        if self.moon_double_move_active[color_key]:
+            return
+        
+        # Підраховуємо живих Аристократів цього кольору
+        alive_aristocrats = self.board.get_all_pieces_of_type(PieceType.ARISTOCRAT, captured_aristocrat.color)
+        
+        # Якщо обидва Аристократи знищені - активуємо подвійний хід назавжди
+        if len(alive_aristocrats) == 0:
+            self.moon_double_move_active[color_key] = True
+            color_name = "білих" if captured_aristocrat.color == PieceColor.WHITE else "чорних"
+            game_print(f"🌙 АКТИВОВАНО: Подвійний хід Місяців для {color_name}! Обидва Аристократи знищені.")
+            game_print(f"   📢 Кожен хід {color_name} може бути подвійним (місяць → місяць) до кінця гри!")
+            
+            # Логування активації подвійного ходу
+    def execute_aristocrat_exchange(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
+        """
+        Виконує дипломатичний обмін Аристократа з іншою фігурою.
+        Обидві фігури миттєво міняються місцями.
+        """
+        aristocrat = self.board.get_piece_at(from_row, from_col)
+        target_piece = self.board.get_piece_at(to_row, to_col)
+        
+        if not aristocrat or not target_piece:
+            return False
+        
+        # Перевірка можливості обміну
+        can_exchange, reason = self._can_aristocrat_exchange_with(from_row, from_col, to_row, to_col)
+        
+        if not can_exchange:
+            game_print(f"⚠️ Обмін неможливий: {reason}")
+            return False
+        
+        # КРИТИЧНО: Справжній обмін місцями - зберігаємо обидві фігури!
+        # 1. Зберігаємо копії обох фігур
+        aristocrat_copy = Piece(aristocrat.type, aristocrat.color, aristocrat.id)
+        target_copy = Piece(target_piece.type, target_piece.color, target_piece.id)
+        
+        # Зберігаємо стан is_enhanced якщо є
+        if hasattr(aristocrat, 'is_enhanced'):
+            aristocrat_copy.is_enhanced = aristocrat.is_enhanced
+        if hasattr(target_piece, 'is_enhanced'):
+            target_copy.is_enhanced = target_piece.is_enhanced
+        
+        # 2. Очищаємо обидві клітинки
+        self.board.clear_square(from_row, from_col)
+        self.board.clear_square(to_row, to_col)
+        
+        # 3. Ставимо фігури на нові місця (ОБМІН!)
+        self.board.set_piece(from_row, from_col, target_copy)      # Ціль на місце Аристократа
+        self.board.set_piece(to_row, to_col, aristocrat_copy)      # Аристократ на місце цілі
+        
+        # ═══ МЕХАНІКА ЕЛЕКТРИЧНОГО ПАРАЛІЧУ ДЛЯ АРИСТОКРАТА ═══
+        # Перевіряємо параліч ПЕРЕД логуванням, але ПІСЛЯ обміну
+        lightning_shock = (target_piece.type == PieceType.LIGHTNING and 
+                          target_piece.color != aristocrat.color)
+        
+        # Логування
+        aristocrat_color = get_color_name_ua_with_gender(aristocrat.color, aristocrat.type)
+        target_color = get_color_name_ua_with_gender(target_piece.color, target_piece.type)
+        aristocrat_name = PIECE_NAMES_UA.get(aristocrat.type, "аристократ")
+        target_name = PIECE_NAMES_UA.get(target_piece.type, "фігура")
+        
+        from_notation = coordinates_to_chess_notation(from_row, from_col)
+        to_notation = coordinates_to_chess_notation(to_row, to_col)
+        
+        game_print(f"🔄 {aristocrat_color} {aristocrat_name} id({aristocrat.id}) обмінявся з {target_color} {target_name} id({target_piece.id})")
+        game_print(f"   {from_notation} ({from_row}, {from_col}) ⇄ {to_notation} ({to_row}, {to_col})")
+        
+        # Застосовуємо параліч ПІСЛЯ обміну та логування
+        if lightning_shock:
+            # Паралізуємо Аристократа (який тепер на to_row, to_col)
+            self.board.set_paralysis(aristocrat.id, 2)  # duration=2 для пропуску 1 повного ходу
+            game_print(f"⚡💥 {aristocrat_color} {aristocrat_name} id({aristocrat.id}) отримав електричний шок від Блискавки!")
+            game_print(f"   ⛔ {aristocrat_name} на {to_notation} ({to_row}, {to_col}) паралізований на 1 хід!")
+            
+            # Логування паралізації
+        exchange_flag = ('ARISTOCRAT_EXCHANGE_ALLY' if target_piece.color == aristocrat.color
+                         else 'ARISTOCRAT_EXCHANGE_ENEMY')
+        self._record_move(Move((from_row, from_col), (to_row, to_col), special_move_flag=exchange_flag))
+        
+        # Очищення вибору та передача ходу
+        self.clear_selection()
+        self.switch_player()
+        
+        return True
+
+    def get_temple_id(self, row: int, col: int) -> Optional[str]:
+        """
+        Визначає ID храму за ID фігури (не за позицією, бо храм може рухатися).
+        Повертає: 'black_left', 'black_right', 'white_left', 'white_right' або None
+        """
+        temple = self.board.get_piece_at(row, col)
+        if not temple or temple.type != PieceType.TEMPLE:
+            return None
+        
+        return TEMPLE_SWAP_KEYS.get(temple.id)
+    
+    def get_temple_swap_targets(self, temple_row: int, temple_col: int) -> List[Tuple[int, int]]:
+        """
+        Повертає список позицій союзних фігур, з якими храм може обмінятися.
+        """
+        temple = self.board.get_piece_at(temple_row, temple_col)
+        if not temple or temple.type != PieceType.TEMPLE:
+            return []
+        
+        temple_id = self.get_temple_id(temple_row, temple_col)
+        if not temple_id or self.temple_swap_used.get(temple_id, False):
+            return []
+        
+        swap_targets = []
+        all_pieces = self.board.get_all_pieces_of_color(temple.color)
+        
+        for target_row, target_col in all_pieces:
+            # Пропускаємо сам храм
+            if (target_row, target_col) == (temple_row, temple_col):
+                continue
+            
+            # Перевіряємо можливість обміну
+            can_swap, _ = self.can_temple_swap_with(temple_row, temple_col, target_row, target_col)
+            if can_swap:
+                swap_targets.append((target_row, target_col))
+        
+        return swap_targets
+    
+    def can_temple_swap_with(self, temple_row: int, temple_col: int, 
+                             target_row: int, target_col: int) -> Tuple[bool, str]:
+        """
+        Перевіряє, чи може храм обмінятися з фігурою на target позиції.
+        Повертає: (можливість обміну, причина відмови)
+        """
+        temple = self.board.get_piece_at(temple_row, temple_col)
+        target = self.board.get_piece_at(target_row, target_col)
+        
+        if not temple or not target:
+            return False, "Немає фігур"
+        
+        if temple.color != target.color:
+            return False, "Неможливо обмінятися з ворожою фігурою"
+        
+        # Перевірка використання обміну
+        temple_id = self.get_temple_id(temple_row, temple_col)
+        if not temple_id:
+            return False, "Храм не на стартовій позиції"
+        
+        if self.temple_swap_used.get(temple_id, False):
+            return False, "Храм вже використав свій обмін"
+        
+        temple_in_nebula = is_nebula_coordinates(temple_row, temple_col)
+        target_in_nebula = is_nebula_coordinates(target_row, target_col)
+        
+        # Перевірка обмежень для Короля
+        if target.type == PieceType.KING:
+            # Король не може опинитися в туманності
+            if temple_in_nebula:
+                return False, "Король не може опинитися в туманності"
+            
+            # Король не може опинитися в союзній імунній зоні
+            in_ally_zone, _ = self.move_calculator._is_in_any_shield_zone(temple_row, temple_col, temple.color)
+            if in_ally_zone:
+                return False, "Король не може опинитися в союзній імунній зоні"
+        
+        # Перевірка обмежень для Щита
+        if target.type == PieceType.SHIELD:
+            # Щит не може опинитися в туманності
+            if temple_in_nebula:
+                return False, "Щит не може опинитися в туманності"
+            
+            # Храм в зоні дії союзного Щита не може мінятися з іншими Щитами
+            # (щоб уникнути накладання захисту)
+            temple_in_ally_shield, _ = self.move_calculator._is_in_any_shield_zone(temple_row, temple_col, temple.color)
+            if temple_in_ally_shield:
+                return False, "Храм в зоні дії Щита не може мінятися з іншими Щитами"
+        
+        # Перевірка обмежень для Фурії
+        if target.type == PieceType.FURY:
+            # Фурія не може опинитися в союзній імунній зоні
+            in_ally_zone, _ = self.move_calculator._is_in_any_shield_zone(temple_row, temple_col, temple.color)
+            if in_ally_zone:
+                return False, "Фурія не може опинитися в союзній імунній зоні"
+        
+        # Перевірка обмежень для Храму (куди він піде)
+        # Храм не може опинитися в ворожій імунній зоні
+        enemy_color = PieceColor.BLACK if temple.color == PieceColor.WHITE else PieceColor.WHITE
+        in_enemy_zone, _ = self.move_calculator._is_in_any_shield_zone(target_row, target_col, enemy_color)
+        if in_enemy_zone:
+            # Якщо ціль знаходиться в ворожій зоні і може там бути (Король, Око, Фурія, Аристократ)
+            # але Храм туди не може, то обмін неможливий
+            if target.type not in [PieceType.KING, PieceType.EYE, PieceType.FURY, PieceType.ARISTOCRAT]:
+                return False, "Храм не може опинитися в ворожій імунній зоні"
+            else:
+                return False, "Храм не може обмінятися з фігурою в ворожій імунній зоні"
+        
+        return True, ""
+    
+    def execute_temple_swap(self, temple_row: int, temple_col: int, 
+                           target_row: int, target_col: int) -> bool:
+        """
+        Виконує священний обмін Храму з союзною фігурою.
+        Обидві фігури миттєво міняються місцями.
+        """
+        temple = self.board.get_piece_at(temple_row, temple_col)
+        target = self.board.get_piece_at(target_row, target_col)
+        
+        if not temple or not target:
+            return False
+        
+        # Перевірка можливості обміну
+        can_swap, reason = self.can_temple_swap_with(temple_row, temple_col, target_row, target_col)
+        
+        if not can_swap:
+            game_print(f"⚠️ Обмін неможливий: {reason}")
+            return False
+        
+        # Отримуємо ID храму
+        temple_id = self.get_temple_id(temple_row, temple_col)
+        if not temple_id:
+            return False
+        
+        # КРИТИЧНО: Справжній обмін місцями - зберігаємо обидві фігури!
+        # 1. Зберігаємо копії обох фігур
+        temple_copy = Piece(temple.type, temple.color, temple.id)
+        target_copy = Piece(target.type, target.color, target.id)
+        
+        # Зберігаємо стан is_enhanced якщо є
+        if hasattr(temple, 'is_enhanced'):
+            temple_copy.is_enhanced = temple.is_enhanced
+        if hasattr(target, 'is_enhanced'):
+            target_copy.is_enhanced = target.is_enhanced
+        
+        # 2. Очищаємо обидві клітинки
+        self.board.clear_square(temple_row, temple_col)
+        self.board.clear_square(target_row, target_col)
+        
+        # 3. Ставимо фігури на нові місця (ОБМІН!)
+        self.board.set_piece(temple_row, temple_col, target_copy)  # Ціль на місце Храму
+        self.board.set_piece(target_row, target_col, temple_copy)  # Храм на місце цілі
+        
+        # Логування
+        temple_color = get_color_name_ua_with_gender(temple.color, temple.type)
+        target_color = get_color_name_ua_with_gender(target.color, target.type)
+        temple_name = PIECE_NAMES_UA.get(temple.type, "храм")
+        target_name = PIECE_NAMES_UA.get(target.type, "фігура")
+        
+        temple_notation = coordinates_to_chess_notation(temple_row, temple_col)
+        target_notation = coordinates_to_chess_notation(target_row, target_col)
+        
+        game_print(f"⛪ {temple_color} {temple_name} id({temple.id}) здійснив священний обмін з {target_color} {target_name} id({target.id})")
+        game_print(f"   {temple_notation} ({temple_row}, {temple_col}) ⇄ {target_notation} ({target_row}, {target_col})")
+        
+        # Позначаємо, що храм використав свій обмін
+        self.temple_swap_used[temple_id] = True
+        game_print(f"   ✝️ Храм id({temple.id}) на {temple_notation} ({temple_row}, {temple_col}) використав свій священний обмін (більше недоступний)")
+        self._record_move(Move((temple_row, temple_col), (target_row, target_col),
+                               special_move_flag='TEMPLE_SWAP'))
+        
+        # Очищення вибору Храму та передача ходу
+        self.temple_swap_selection = None  # Очищаємо стан вибору обміну
+        self.clear_selection()
+        self.switch_player()
+        
+        return True
+
+
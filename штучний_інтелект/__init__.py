@@ -1,4 +1,17 @@
-
-from .алгоритм import ChessAI
-from .оцінка import PositionEvaluator
-__all__ = ['ChessAI', 'PositionEvaluator']
+from .алгоритм import ChessAI
+from .монте_карло import MCTSAI
+from .оцінка import PositionEvaluator
+from .транспозиції import TranspositionTable
+
+# Рушії пошуку з однаковим інтерфейсом (get_best_move, search, set_difficulty, ...)
+ENGINES = {'alphabeta': ChessAI, 'mcts': MCTSAI}
+
+
+def create_engine(name: str = 'alphabeta', **kwargs):
+    """Створює рушій ШІ за назвою (ENGINES); kwargs - параметри конструктора рушія"""
+    if name not in ENGINES:
+        raise ValueError(f"Невідомий рушій ШІ: {name}")
+    return ENGINES[name](**kwargs)
+
+
+__all__ = ['ChessAI', 'MCTSAI', 'PositionEvaluator', 'TranspositionTable', 'ENGINES', 'create_engine']
@@ -1,51 +1,994 @@
-
-from typing import Tuple, Optional
-from налаштування import PieceType, PieceColor
-from розташування_фігур import Move
-from логування import game_logger
-
-
-class ChessAI:
-    def __init__(self, depth: int = 3):
-
-        self.depth = depth
-        self.evaluator = None
-        game_logger.info(f"Ініціалізовано ШІ з глибиною пошуку {depth}")
-
-    def get_best_move(self, game_state, color: PieceColor) -> Optional[Move]:
-
-        game_logger.warning("ШІ ще не реалізовано - повертаємо випадковий хід")
-        
-        # Правильно перебираємо всі фігури через API дошки
-        all_pieces = game_state.board.get_all_pieces_of_color(color)
-        
-        for row, col in all_pieces:
-            piece = game_state.board.get_piece_at(row, col)
-            if piece and not piece.is_empty() and piece.color == color:
-                moves, attacks = game_state.move_calculator.get_possible_moves(piece, row, col)
-                if moves:
-                    return Move(
-                        from_square=(row, col),
-                        to_square=moves[0],
-                        is_capture=False
-                    )
-                if attacks:
-                    return Move(
-                        from_square=(row, col),
-                        to_square=attacks[0],
-                        is_capture=True
-                    )
-        return None
-
-    def minimax(self, game_state, depth: int, alpha: float, beta: float,
-                maximizing_player: bool) -> float:
-
-        return 0.0
-
-    def set_difficulty(self, level: int):
-
-        if 1 <= level <= 5:
-            self.depth = level * 2
-            game_logger.info(f"Встановлено рівень складності ШІ: {level} (глибина: {self.depth})")
-        else:
-            game_logger.warning(f"Некоректний рівень складності: {level}")
+# -*- coding: utf-8 -*-
+
+"""
+Алгоритм пошуку ходів ШІ гри "Вершителі часу"
+
+Ітеративне поглиблення + альфа-бета пошук у формі негамаксу:
+- ходи беруться з єдиного генератора GameState.generate_legal_moves();
+- хід робиться через GameState.apply_move, відкат - відновленням знімку стану;
+- пошук іде на копії партії (GameState.clone) у тихому режимі;
+- бюджет часу та вузлів перевіряється в кожному вузлі, перервана ітерація
+  відкидається і повертається найкращий хід останньої завершеної глибини.
+
+Особливість гри: після першого ходу Місяця чи безкоштовного воскресіння
+ходить той самий гравець, тому оцінка такого нащадка НЕ змінює знак.
+
+При workers > 1 ходи кореня кожної ітерації шукають процеси пулу
+(паралельний_пошук.ParallelRootSearch) зі спільною таблицею транспозицій
+у shared_memory; workers = 1 - послідовний пошук з приватною таблицею.
+Пошук можна скасувати з іншого потоку через request_stop().
+
+Вибіркові відсікання (кожне вмикається окремо в ChessAI.pruning, лічильники
+в ChessAI.pruning_counts і статистиці пошуку):
+- pvs: пошук головного варіанту - перший хід з повним вікном, решта з нульовим
+  вікном і повторним пошуком, якщо хід виявився кращим;
+- aspiration: вікно навколо оцінки попередньої ітерації в корені (послідовний
+  пошук), при виході за межі - розширення і повторний пошук;
+- null_move: пропуск ходу (GameState.make_null_move) зі зменшеною глибиною;
+  вимкнено під шахом і коли в гравця є паралізовані фігури - тоді пропуск
+  ходу не нейтральний, бо таймери паралічу тікають;
+- lmr: пізні тихі ходи з низьким балом історичної евристики шукаються на
+  меншу глибину з нульовим вікном, кращий за альфа - повторно на повну;
+- futility: тихі ходи біля листів пропускаються, якщо статична оцінка з
+  запасом FUTILITY_MARGINS не дотягує до альфа.
+
+Інструментування: кожен пошук залишає статистика.SearchStats у last_stats
+(вузли форсованого пошуку, ефективне розгалуження, частки таблиці транспозицій,
+час ітерацій і розподіл часу між генерацією ходів, перевіркою шаху, make/unmake
+та оцінкою - лічильники search_counters); stats_log дописує її в JSONL.
+
+Аналіз (analyze, кнопка "Підказка"): multi-PV - на кожній глибині корінь
+шукається кілька разів, щоразу без уже знайдених ходів, тож кожен з N
+найкращих ходів має точну оцінку; головний варіант відновлюється з таблиці
+транспозицій. Таблиця між запитами не очищується, а останні рядки аналізу
+позиції публікуються одразу при повторному запиті.
+
+Пондеринг: поки суперник думає, ШІ шукає позицію після передбаченої
+відповіді (predict_reply) без лімітів (pondering = True). Якщо суперник
+зіграв передбачений хід, ponder_hit() з іншого потоку перетворює пошук на
+звичайний з бюджетом від цієї миті - таблиця транспозицій, історія і хід
+попередньої ітерації вже "теплі". Промах - request_stop(): відкидається лише
+спекулятивний корінь, таблиця транспозицій лишається для справжнього пошуку.
+
+Рівні складності (set_difficulty): бюджет вузлів на хід кореня замість часу
+(достатній, щоб глибина рівня завершилась), обмежена глибина форсованого
+пошуку і шум оцінки - детермінована функція Zobrist-хешу розташування та
+noise_seed (однаковий для позиції в будь-якому порядку обходу). Графіка лишає таблицю транспозицій теплою між ходами і пондерить.
+З deterministic=True (симулятор, калібрування рівнів) кожен пошук починається
+з чистої таблиці транспозицій та евристик, тож позиція з тією ж історією дає
+той самий хід на будь-якій машині (при workers = 1; пондеринг для таких
+рушіїв вимикається).
+
+Книга дебютів (book, книга_дебютів.OpeningBook): якщо позиція є в книзі,
+search() одразу повертає книжковий хід без пошуку (engine 'book' у статистиці).
+
+Таблиці ендшпілю (tablebases, таблиці_ендшпілю.EndgameTablebases): позиція
+"Король і фігура проти Короля" в корені розв'язується таблицею без пошуку
+(engine 'tablebase'), а у вузлах дерева дає точну оцінку замість пошуку
+(мат за N півходів - MATE_SCORE - ply - N, лічильник tb_hits).
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from налаштування import PieceType, PieceColor
+from розташування_фігур import Move
+from логування import game_logger, quiet_mode
+from .оцінка import PositionEvaluator
+from .транспозиції import (TranspositionTable, encode_full_move, square_index, DEFAULT_TABLE_SIZE_MB,
+                           BOUND_EXACT, BOUND_LOWER, BOUND_UPPER)
+from .впорядкування import MoveOrderer
+from .тактика import capture_gain, static_exchange, is_tactical_move
+from .статистика import (SearchStats, AnalysisLine, append_jsonl,
+                         ANALYSIS_LINES, ANALYSIS_TIME_LIMIT)
+
+# Оцінка мату: MATE_SCORE - ply, щоб швидший мат цінувався вище
+MATE_SCORE = 100000.0
+INFINITY_SCORE = 1000000.0
+# Оцінки, ближчі до MATE_SCORE, ніж на цю межу, означають знайдений мат
+MATE_THRESHOLD = MATE_SCORE - 1000.0
+
+# Форсований пошук: максимальна кількість тактичних півходів після основної глибини
+MAX_QUIESCENCE_DEPTH = 4
+# Дельта-відсікання: запас над оптимістичним виграшем тактичного ходу (у пішаках)
+DELTA_MARGIN = 2.0
+
+# Вибіркові відсікання (назви - ключі ChessAI.pruning)
+PRUNING_TECHNIQUES = ('pvs', 'aspiration', 'null_move', 'lmr', 'futility')
+# Лічильники відсікань (ChessAI.pruning_counts)
+PRUNING_COUNTERS = (
+    'pvs_researches',          # Нульове вікно PVS не втрималось - повторний пошук
+    'aspiration_researches',   # Оцінка кореня вийшла за вікно - повторна ітерація
+    'null_move_tries',
+    'null_move_cutoffs',
+    'lmr_reductions',
+    'lmr_researches',          # Скорочений хід виявився кращим - повторний пошук на повну глибину
+    'futility_pruned',         # Пропущено тихих ходів біля листів
+)
+# Лічильники інструментування (ChessAI.search_counters): вузли форсованого пошуку,
+# відсікання таблицею транспозицій, влучання в таблиці ендшпілю і час складників пошуку в секундах
+# (генерація ходів разом з фільтром легальності, окремі запити шаху,
+# знімок+хід+відкат, статична оцінка)
+SEARCH_COUNTERS = ('qnodes', 'tt_cutoffs', 'tb_hits', 'movegen_time', 'legality_time', 'make_time', 'eval_time')
+
+# Ширина нульового вікна (оцінки - дробові, у пішаках)
+NULL_WINDOW = 0.01
+# Півширина вікна кореня навколо оцінки попередньої ітерації (у пішаках)
+ASPIRATION_WINDOW = 1.0
+# Нульовий хід: скорочення глибини і мінімальна глибина вузла
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+# LMR: скорочуються ходи, починаючи з LMR_MIN_MOVES-го, на глибині від LMR_MIN_DEPTH,
+# з історичним балом нижче LMR_HISTORY_LIMIT; без балу після LMR_DEEP_MOVES-го - на 2 півходи
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+LMR_DEEP_MOVES = 8
+LMR_HISTORY_LIMIT = 64
+# Запас відсікання марних ходів для глибини 1 і 2 (у пішаках)
+FUTILITY_MARGINS = (0.0, 2.0, 4.5)
+
+
+
+class DifficultyLevel(NamedTuple):
+    """Рівень складності: без ліміту часу, тож сила і час ходу не залежать від машини"""
+    root_move_nodes: int    # Бюджет вузлів на хід кореня (ліміт пошуку - це × кількість ходів кореня)
+    depth: int
+    eval_noise: float       # Амплітуда шуму оцінки (у пішаках)
+    quiescence_depth: int
+
+
+# Рівні складності 1-5: бюджет вузлів (з форсованим пошуком) пропорційний кількості
+# ходів кореня (110-210), щоб глибина рівня завершувалась. Виміряно на позиціях
+# 0-60 випадкових півходів (вузлів на хід кореня до завершення глибини, макс.):
+# глибина 1 - 1.4, глибина 2 - 27, глибина 3 - 205. Завершена глибина рівнів 1-2 -
+# 1 (~0.1-0.4 с), 3-4 - 2 (~2-16 с), 5 - 3 (~10-70 с; бенчмарки/рівні_складності.py)
+DIFFICULTY_LEVELS = {
+    1: DifficultyLevel(root_move_nodes=4, depth=1, eval_noise=1.5, quiescence_depth=1),
+    2: DifficultyLevel(root_move_nodes=4, depth=1, eval_noise=0.8, quiescence_depth=2),
+    3: DifficultyLevel(root_move_nodes=40, depth=2, eval_noise=0.3, quiescence_depth=3),
+    4: DifficultyLevel(root_move_nodes=40, depth=2, eval_noise=0.1, quiescence_depth=4),
+    5: DifficultyLevel(root_move_nodes=300, depth=3, eval_noise=0.0, quiescence_depth=4),
+}
+
+_MASK64 = (1 << 64) - 1
+
+# Максимальна глибина аналізу (ліміт - час аналізу)
+ANALYSIS_MAX_DEPTH = 8
+
+
+def _position_noise(position_hash: int, seed: int) -> float:
+    """Псевдовипадкове число в [-1, 1] для розташування фігур (фіналізатор SplitMix64 від хешу і seed)"""
+    value = (int(position_hash) ^ (seed * 0x9E3779B97F4A7C15)) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    value ^= value >> 31
+    return value / (_MASK64 / 2) - 1.0
+
+
+def _score_to_tt(score: float, ply: int) -> float:
+    """Оцінка мату в таблиці зберігається відносно вузла, а не кореня"""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: float, ply: int) -> float:
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """Вичерпано бюджет часу або вузлів - поточна ітерація перервана"""
+
+
+class ChessAI:
+    def __init__(self, depth: int = 3, time_limit: Optional[float] = 2.0,
+                 node_limit: Optional[int] = None, tt_size_mb: float = DEFAULT_TABLE_SIZE_MB,
+                 workers: int = 1, transposition_table: Optional[TranspositionTable] = None,
+                 pruning: Optional[Dict[str, bool]] = None, eval_noise: float = 0.0,
+                 noise_seed: int = 0, quiescence_depth: int = MAX_QUIESCENCE_DEPTH):
+        """
+        Args:
+            depth: Максимальна глибина ітеративного поглиблення (півходи)
+            time_limit: Ліміт часу на хід у секундах (None - без ліміту)
+            node_limit: Ліміт вузлів на хід (None - без ліміту)
+            tt_size_mb: Розмір таблиці транспозицій у мегабайтах
+            workers: Кількість процесів пошуку кореня (1 - послідовний пошук)
+            transposition_table: Готова таблиця (наприклад, під'єднана спільна) замість нової
+            pruning: Перемикачі вибіркових відсікань (PRUNING_TECHNIQUES), решта - увімкнені
+            eval_noise: Амплітуда шуму статичної оцінки в пішаках (0 - без шуму)
+            noise_seed: Seed шуму оцінки
+            quiescence_depth: Максимальна кількість тактичних півходів форсованого пошуку
+        """
+        self.depth = depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.workers = max(1, workers)
+        self.evaluator = PositionEvaluator()
+        if transposition_table is None:
+            transposition_table = TranspositionTable(tt_size_mb, shared=self.workers > 1)
+        self.tt = transposition_table
+        self.move_orderer = MoveOrderer(self.evaluator.PIECE_VALUES)
+        self.pruning = {technique: True for technique in PRUNING_TECHNIQUES}
+        self.pruning.update(pruning or {})
+        self.pruning_counts = dict.fromkeys(PRUNING_COUNTERS, 0)
+        self.search_counters = dict.fromkeys(SEARCH_COUNTERS, 0)
+        self.eval_noise = eval_noise
+        self.noise_seed = noise_seed
+        self.quiescence_depth = quiescence_depth
+        # Детермінований пошук (рівні складності): кожен пошук з чистої таблиці та евристик
+        self.deterministic = False
+        # Бюджет вузлів на хід кореня (рівні складності): search() ставить node_limit за кількістю ходів
+        self.root_move_nodes: Optional[int] = None
+        # Книга дебютів (книга_дебютів.OpeningBook), None - без книги
+        self.book = None
+        # Таблиці ендшпілю (таблиці_ендшпілю.EndgameTablebases), None - без таблиць
+        self.tablebases = None
+        # Статистика останнього пошуку і JSONL-файл, куди її дописувати (None - не писати)
+        self.last_stats: Optional[SearchStats] = None
+        self.stats_log: Optional[Path] = None
+        self._iteration_times: List[float] = []
+        self._iteration_nodes: List[int] = []
+        # Останній аналіз: (хеш позиції, рядки)
+        self._analysis: Optional[Tuple[int, List[AnalysisLine]]] = None
+
+        self.nodes = 0
+        self._start_time = 0.0
+        # Відлік бюджету часу і вузлів (при ponder_hit починається заново)
+        self._limit_start = 0.0
+        self._node_base = 0
+        self.pondering = False
+        self._search_stats: Dict[str, object] = {}
+        # Скасування: request_stop() з іншого потоку або спільний прапорець процесів пулу
+        self._stop_requested = False
+        self.stop_flag = None
+        self._parallel = None
+        self._parallel_stats: Dict[str, float] = {}
+        # Виклик після кожної завершеної ітерації зі статистикою (як get_search_stats)
+        self.on_iteration: Optional[Callable[[Dict[str, object]], None]] = None
+        game_logger.info(f"Ініціалізовано ШІ з глибиною пошуку {depth} "
+                         f"(час: {time_limit} с, вузли: {node_limit}, процесів: {self.workers})")
+
+    def get_best_move(self, game_state, color: PieceColor) -> Optional[Move]:
+        """
+        Найкращий хід для color. Пошук іде на копії стану, тому game_state
+        (і все, що його відображає) під час пошуку не змінюється.
+        """
+        if game_state.current_player != color or game_state.game_over:
+            return None
+
+        with quiet_mode():
+            best_move = self.search(self.clone_for_search(game_state))
+
+        stats = self._search_stats
+        game_logger.info(f"ШІ обрав {best_move}: глибина {stats['depth']}, оцінка {stats['score']:.2f}, "
+                         f"вузлів {stats['nodes']}, {stats['nps']:.0f} вузлів/с, {stats['time']:.2f} с")
+        return best_move
+
+    @staticmethod
+    def clone_for_search(game_state):
+        """Копія партії для пошуку (можна шукати в іншому потоці, поки оригінал відображається)"""
+        with quiet_mode():
+            search_state = game_state.clone()
+        # Статус ходу (мат/пат) пошук визначає сам - без повної перевірки в switch_player
+        search_state.defer_turn_status = True
+        return search_state
+
+    def search(self, game_state) -> Optional[Move]:
+        """
+        Ітеративне поглиблення на game_state (стан змінюється і відновлюється).
+        Хід з попередньої ітерації йде першим у наступній.
+        """
+        if self.deterministic:
+            self.tt.clear()
+            self.move_orderer.clear()
+        self._begin_search()
+        if self.workers > 1:
+            self._get_parallel().new_search()
+            self._parallel_stats = {'tt_probes': 0, 'tt_hits': 0, 'cutoffs': 0, 'first_move_cutoffs': 0}
+
+        root_key = game_state.compute_state_hash()
+        if self.book is not None and not self.pondering:
+            book_move = self.book.choose_move(game_state, self.noise_seed)
+            if book_move is not None:
+                self._finish_search(0, book_move, 0.0, root_key, engine='book')
+                return book_move
+        if self.tablebases is not None and not self.pondering:
+            probed = self.tablebases.probe(game_state)
+            tablebase_move = self.tablebases.best_move(game_state) if probed is not None else None
+            if tablebase_move is not None:
+                self._finish_search(0, tablebase_move, self._tablebase_score(probed, 0), root_key,
+                                    engine='tablebase')
+                return tablebase_move
+        root_moves = self.move_orderer.order_moves(game_state.board, self._generate_moves(game_state), 0)
+        if self.root_move_nodes is not None:
+            self.node_limit = self.root_move_nodes * max(1, len(root_moves))
+        best_move = root_moves[0] if root_moves else None
+        best_score = 0.0
+        completed_depth = 0
+
+        for depth in range(1, self.depth + 1):
+            if not root_moves:
+                break
+            self._partial_best = None
+            iteration_start, iteration_base = time.perf_counter(), self.nodes
+            try:
+                if self.workers > 1:
+                    score, move = self._search_root_parallel(game_state, root_moves, depth)
+                elif self.pruning['aspiration'] and completed_depth and abs(best_score) < MATE_THRESHOLD:
+                    score, move = self._search_root_aspiration(game_state, root_moves, depth, best_score)
+                else:
+                    score, move = self._search_root(game_state, root_moves, depth,
+                                                    -INFINITY_SCORE, INFINITY_SCORE)
+            except SearchTimeout:
+                # Перервана перша ітерація: беремо найкраще з уже переглянутих ходів
+                if completed_depth == 0 and self._partial_best is not None:
+                    best_move, best_score = self._partial_best
+                break
+
+            if move is None:
+                break
+            best_move, best_score = move, score
+            completed_depth = depth
+            self._iteration_times.append(time.perf_counter() - iteration_start)
+            self._iteration_nodes.append(self.nodes - iteration_base)
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if self.on_iteration is not None:
+                self.on_iteration(self._collect_stats(completed_depth, best_move, best_score))
+
+            if abs(score) >= MATE_THRESHOLD:
+                break  # Мат знайдено - глибше шукати немає сенсу
+
+        self._finish_search(completed_depth, best_move, best_score, root_key)
+        return best_move
+
+    def analyze(self, game_state, lines: int = ANALYSIS_LINES,
+                on_update: Optional[Callable[[List[AnalysisLine]], None]] = None,
+                time_limit: Optional[float] = ANALYSIS_TIME_LIMIT,
+                depth: int = ANALYSIS_MAX_DEPTH) -> List[AnalysisLine]:
+        """
+        Аналіз позиції game_state (стан змінюється і відновлюється): lines
+        найкращих ходів з оцінками й головними варіантами, найкращий першим.
+        on_update отримує рядки кожної завершеної глибини (і одразу - рядки
+        попереднього аналізу цієї позиції). Ліміти ходу на час аналізу замінюються
+        time_limit і depth, а послаблення рівня складності (шум, форсований пошук)
+        не діють; пошук кореня послідовний навіть при workers > 1.
+        """
+        root_key = game_state.compute_state_hash()
+        result: List[AnalysisLine] = []
+        if self._analysis is not None and self._analysis[0] == root_key:
+            result = self._analysis[1]
+            if on_update is not None:
+                on_update(result)
+
+        limits = (self.time_limit, self.node_limit, self.depth, self.eval_noise, self.quiescence_depth)
+        self.time_limit, self.node_limit, self.depth = time_limit, None, depth
+        self.eval_noise, self.quiescence_depth = 0.0, MAX_QUIESCENCE_DEPTH
+        self.pondering = False
+        self._begin_search()
+        root_moves = self.move_orderer.order_moves(game_state.board, self._generate_moves(game_state), 0)
+        completed_depth = 0
+        try:
+            for search_depth in range(1, self.depth + 1):
+                if not root_moves:
+                    break
+                iteration_start, iteration_base = time.perf_counter(), self.nodes
+                found = self._search_lines(game_state, root_moves, search_depth, lines)
+                if not found:
+                    break
+                completed_depth = search_depth
+                self._iteration_times.append(time.perf_counter() - iteration_start)
+                self._iteration_nodes.append(self.nodes - iteration_base)
+                # Знайдені ходи - першими в наступній глибині, у порядку оцінок
+                found_moves = [move for move, _ in found]
+                root_moves = found_moves + [move for move in root_moves if move not in found_moves]
+                if result and result[0].depth >= search_depth:
+                    continue  # Попередній аналіз позиції глибший - його рядки лишаються
+                result = [AnalysisLine(move, score, self._principal_variation(game_state, move, search_depth),
+                                       search_depth) for move, score in found]
+                self._analysis = (root_key, result)
+                if on_update is not None:
+                    on_update(result)
+                if abs(found[0][1]) >= MATE_THRESHOLD:
+                    break
+        except SearchTimeout:
+            pass  # Перервана глибина відкидається - лишаються рядки попередньої
+        finally:
+            self.time_limit, self.node_limit, self.depth, self.eval_noise, self.quiescence_depth = limits
+
+        best_move, best_score = (result[0].move, result[0].score) if result else (None, 0.0)
+        self._finish_search(completed_depth, best_move, best_score, root_key)
+        return result
+
+    def _search_lines(self, game_state, moves: List[Move], depth: int,
+                      lines: int) -> List[Tuple[Move, float]]:
+        """
+        Multi-PV однієї глибини: корінь з повним вікном lines разів, щоразу без
+        уже знайдених ходів. Повертає (хід, точна оцінка) за спаданням оцінки.
+        """
+        remaining = list(moves)
+        found = []
+        while remaining and len(found) < lines:
+            score, move = self._search_root(game_state, remaining, depth, -INFINITY_SCORE, INFINITY_SCORE)
+            if move is None:
+                break
+            found.append((move, score))
+            remaining.remove(move)
+        return found
+
+    def _principal_variation(self, game_state, move: Move, depth: int) -> Tuple[Move, ...]:
+        """Головний варіант після move: найкращі ходи з таблиці транспозицій, доки вони легальні"""
+        snapshot = game_state.snapshot()
+        pv = [move]
+        seen = {game_state.compute_state_hash()}
+        try:
+            with quiet_mode():
+                if not game_state.apply_move(move):
+                    return tuple(pv)
+                while len(pv) < depth and not game_state.game_over:
+                    key = game_state.compute_state_hash()
+                    if key in seen:
+                        break
+                    seen.add(key)
+                    entry = self.tt.probe(key)
+                    if entry is None or not entry.move:
+                        break
+                    next_move = next((candidate for candidate in game_state.generate_legal_moves()
+                                      if encode_full_move(candidate) == entry.move), None)
+                    if next_move is None or not game_state.apply_move(next_move):
+                        break
+                    pv.append(next_move)
+        finally:
+            game_state.restore_snapshot(snapshot)
+        return tuple(pv)
+
+    def _begin_search(self):
+        """Годинник, нове покоління таблиці й евристик, обнулені лічильники"""
+        self.start_clock()
+        self._stop_requested = False
+        self.tt.new_search()
+        self.move_orderer.new_search()
+        self.pruning_counts = dict.fromkeys(PRUNING_COUNTERS, 0)
+        self.search_counters = dict.fromkeys(SEARCH_COUNTERS, 0)
+        self._iteration_times, self._iteration_nodes = [], []
+        self._partial_best: Optional[Tuple[Move, float]] = None
+
+    def _finish_search(self, completed_depth: int, best_move: Optional[Move], best_score: float,
+                       root_key: int, engine: str = 'alphabeta'):
+        """Підсумкова статистика пошуку (і запис у stats_log)"""
+        self._search_stats = self._collect_stats(completed_depth, best_move, best_score)
+        self.last_stats = self._build_search_stats(self._search_stats, root_key, engine)
+        if self.stats_log is not None:
+            append_jsonl(self.last_stats, self.stats_log)
+
+    def start_clock(self):
+        """Обнуляє лічильник вузлів і починає відлік часу пошуку та бюджету"""
+        self.nodes = 0
+        self._node_base = 0
+        self._start_time = self._limit_start = time.perf_counter()
+
+    def predict_reply(self, game_state) -> Optional[Move]:
+        """
+        Очікувана відповідь суперника в game_state: хід з таблиці транспозицій
+        (другий хід головного варіанту попереднього пошуку), інакше - перший
+        за впорядкуванням ходів. None - ходів немає.
+        """
+        if game_state.game_over:
+            return None
+        moves = game_state.generate_legal_moves()
+        if not moves:
+            return None
+        entry = self.tt.probe(game_state.compute_state_hash())
+        if entry is not None and entry.move:
+            for move in moves:
+                if encode_full_move(move) == entry.move:
+                    return move
+        return self.move_orderer.order_moves(game_state.board, moves, 0)[0]
+
+    def ponder_hit(self):
+        """Суперник зіграв передбачений хід: пондеринг стає звичайним пошуком (з іншого потоку)"""
+        self._node_base = self.nodes
+        self._limit_start = time.perf_counter()
+        self.pondering = False
+
+    def _collect_stats(self, completed_depth: int, best_move: Optional[Move], best_score: float) -> Dict[str, object]:
+        """Статистика пошуку на цю мить"""
+        elapsed = time.perf_counter() - self._start_time
+        stats = {
+            'depth': completed_depth,
+            'nodes': self.nodes,
+            'time': elapsed,
+            'nps': self.nodes / elapsed if elapsed > 0 else 0.0,
+            'score': best_score,
+            'best_move': best_move,
+            'workers': self.workers,
+            'ebf': SearchStats.effective_branching_factor(self._iteration_nodes),
+            'iteration_times': list(self._iteration_times),
+            'iteration_nodes': list(self._iteration_nodes),
+            **self.pruning_counts,
+            **self.search_counters,
+        }
+        if self.workers > 1:
+            parallel = self._parallel_stats
+            stats.update({
+                'tt_hit_rate': parallel['tt_hits'] / max(1, parallel['tt_probes']),
+                'tt_fill_rate': self.tt.fill_rate(),
+                'cutoffs': parallel['cutoffs'],
+                'first_move_cutoffs': parallel['first_move_cutoffs'],
+                'first_move_cutoff_rate': parallel['first_move_cutoffs'] / max(1, parallel['cutoffs']),
+            })
+        else:
+            stats.update({
+                'tt_hit_rate': self.tt.hits / max(1, self.tt.probes),
+                'tt_fill_rate': self.tt.fill_rate(),
+                **self.move_orderer.get_stats(),
+            })
+        return stats
+
+    def _search_root(self, game_state, moves: List[Move], depth: int,
+                     alpha: float, beta: float) -> Tuple[float, Optional[Move]]:
+        """
+        Корінь пошуку у вікні (alpha, beta). Оцінка <= alpha чи >= beta - лише межа
+        (вихід за вікно, див. _search_root_aspiration). Перший хід - повне вікно,
+        решта при PVS - нульове з повторним пошуком.
+        """
+        color = game_state.current_player
+        best_score = -INFINITY_SCORE
+        best_move = None
+
+        for move in moves:
+            score = self._search_pvs_move(game_state, move, color, depth, alpha, beta, 0, best_move is None)
+            if score is None:
+                continue
+            if best_move is None or score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+                self._partial_best = (move, score)
+            if alpha >= beta:
+                break
+
+        return best_score, best_move
+
+    def _search_root_aspiration(self, game_state, moves: List[Move], depth: int,
+                                previous_score: float) -> Tuple[float, Optional[Move]]:
+        """Корінь у вікні навколо оцінки попередньої ітерації; вихід за вікно розширює його вдвічі"""
+        window = ASPIRATION_WINDOW
+        while True:
+            alpha, beta = previous_score - window, previous_score + window
+            score, move = self._search_root(game_state, moves, depth, alpha, beta)
+            if move is None or (alpha < score < beta):
+                return score, move
+            self.pruning_counts['aspiration_researches'] += 1
+            window *= 2
+            if window > MATE_SCORE:
+                return self._search_root(game_state, moves, depth, -INFINITY_SCORE, INFINITY_SCORE)
+
+    def _get_parallel(self):
+        """Пул процесів створюється при першому паралельному пошуку і живе до shutdown()"""
+        if self._parallel is None:
+            # Відкладений імпорт: паралельний_пошук сам імпортує ChessAI
+            from .паралельний_пошук import ParallelRootSearch
+            tablebase_dir = self.tablebases.directory if self.tablebases is not None else None
+            self._parallel = ParallelRootSearch(self.workers, self.tt, self.pruning, tablebase_dir)
+        return self._parallel
+
+    def _search_root_parallel(self, game_state, moves: List[Move], depth: int) -> Tuple[float, Optional[Move]]:
+        """
+        Корінь пошуку в процесах пулу. Серед найкращих ходів процесів обирається
+        найвища оцінка, за рівності - раніший хід кореня (детермінований вибір).
+        """
+        time_limit = None
+        if self.time_limit is not None:
+            time_limit = self.time_limit - (time.perf_counter() - self._limit_start)
+            if time_limit <= 0:
+                raise SearchTimeout()
+        node_limit = None
+        if self.node_limit is not None:
+            node_limit = (self.node_limit - self.nodes + self._node_base) // self.workers
+            if node_limit <= 0:
+                raise SearchTimeout()
+
+        if self.pondering:
+            time_limit = node_limit = None
+        # Під час пондерингу бюджет з'являється лише після ponder_hit() - перевіряється в опитуванні
+        results = self._parallel.search_depth(game_state, moves, depth, time_limit, node_limit,
+                                              lambda: self._stop_requested or self._time_exceeded(),
+                                              (self.eval_noise, self.noise_seed, self.quiescence_depth))
+        stats = self._parallel_stats
+        best = None
+        for result in results:
+            self.nodes += result.nodes
+            stats['tt_probes'] += result.tt_probes
+            stats['tt_hits'] += result.tt_hits
+            stats['cutoffs'] += result.cutoffs
+            stats['first_move_cutoffs'] += result.first_move_cutoffs
+            for name, count in result.pruning_counts.items():
+                self.pruning_counts[name] += count
+            for name, value in result.search_counters.items():
+                self.search_counters[name] += value
+            if result.best_index is None:
+                continue
+            if (best is None or result.best_score > best.best_score
+                    or (result.best_score == best.best_score and result.best_index < best.best_index)):
+                best = result
+
+        if best is not None:
+            self._partial_best = (moves[best.best_index], best.best_score)
+        if not all(result.completed for result in results):
+            raise SearchTimeout()
+        if best is None:
+            return -INFINITY_SCORE, None
+        return best.best_score, moves[best.best_index]
+
+    def request_stop(self):
+        """Скасовує поточний пошук (з іншого потоку): повертається найкраще знайдене"""
+        self._stop_requested = True
+        if self._parallel is not None:
+            self._parallel.stop()
+
+    def shutdown(self):
+        """Завершує процеси паралельного пошуку і звільняє спільну таблицю транспозицій"""
+        if self._parallel is not None:
+            self._parallel.shutdown()
+            self._parallel = None
+        self.tt.close()
+
+    def _search_pvs_move(self, game_state, move: Move, color: PieceColor, depth: int,
+                         alpha: float, beta: float, ply: int, first: bool,
+                         reduction: int = 0) -> Optional[float]:
+        """
+        Хід у вузлі PVS: перший - повне вікно; решта (і скорочені LMR) - нульове
+        вікно, а якщо хід виявився кращим за альфа - повторний пошук на повну
+        глибину з повним вікном.
+        """
+        if first or (not self.pruning['pvs'] and not reduction):
+            return self._search_move(game_state, move, color, depth, alpha, beta, ply)
+
+        window_beta = alpha + NULL_WINDOW if self.pruning['pvs'] else beta
+        score = self._search_move(game_state, move, color, depth, alpha, window_beta, ply,
+                                  reduction=reduction)
+        if score is None or score <= alpha:
+            return score
+        if reduction:
+            self.pruning_counts['lmr_researches'] += 1
+            if not self.pruning['pvs']:
+                return self._search_move(game_state, move, color, depth, alpha, beta, ply)
+            score = self._search_move(game_state, move, color, depth, alpha, window_beta, ply)
+            if score is None or score <= alpha:
+                return score
+        if score < beta and window_beta < beta:
+            self.pruning_counts['pvs_researches'] += 1
+            score = self._search_move(game_state, move, color, depth, alpha, beta, ply)
+        return score
+
+    def _search_move(self, game_state, move: Move, color: PieceColor, depth: int,
+                     alpha: float, beta: float, ply: int, qdepth: Optional[int] = None,
+                     reduction: int = 0) -> Optional[float]:
+        """
+        Робить хід, оцінює нащадка і відкочує стан. qdepth задає нащадка
+        форсованого пошуку замість основного, reduction - скорочення глибини (LMR).
+        Повертає оцінку з точки зору color або None, якщо хід не застосувався.
+        """
+        counters = self.search_counters
+        make_start = time.perf_counter()
+        snapshot = game_state.snapshot()
+        try:
+            applied = game_state.apply_move(move)
+            counters['make_time'] += time.perf_counter() - make_start
+            if not applied:
+                return None
+            # КРИТИЧНО: той самий гравець ходить знову (Місяць, безкоштовне воскресіння) -
+            # вікно і знак оцінки нащадка не перевертаються
+            same_side = game_state.current_player == color
+            if not same_side:
+                alpha, beta = -beta, -alpha
+            if qdepth is None:
+                score = self._negamax(game_state, depth - 1 - reduction, alpha, beta, ply + 1)
+            else:
+                score = self._quiescence(game_state, alpha, beta, ply + 1, qdepth + 1)
+            return score if same_side else -score
+        finally:
+            restore_start = time.perf_counter()
+            game_state.restore_snapshot(snapshot)
+            counters['make_time'] += time.perf_counter() - restore_start
+
+    def _enter_node(self, game_state, ply: int) -> Optional[float]:
+        """Облік вузла, перевірка лімітів і кінця партії (оцінка або None, якщо грати далі)"""
+        self.nodes += 1
+        self._check_limits()
+
+        color = game_state.current_player
+        if game_state.game_over:
+            return self._game_over_score(game_state, color, ply)
+        # Шах не забороняє взяття Короля - втрата Короля означає програш
+        if not game_state.board.bitboards[color][PieceType.KING]:
+            return -MATE_SCORE + ply
+        if self.tablebases is not None and ply > 0:
+            probed = self.tablebases.probe(game_state)
+            if probed is not None:
+                self.search_counters['tb_hits'] += 1
+                return self._tablebase_score(probed, ply)
+        return None
+
+    @staticmethod
+    def _tablebase_score(probed, ply: int) -> float:
+        """Оцінка результату таблиці ендшпілю на відстані ply від кореня"""
+        if probed.result > 0:
+            return MATE_SCORE - ply - probed.plies
+        if probed.result < 0:
+            return -MATE_SCORE + ply + probed.plies
+        return 0.0
+
+    def _negamax(self, game_state, depth: int, alpha: float, beta: float, ply: int,
+                 allow_null: bool = True) -> float:
+        """
+        Альфа-бета негамакс: оцінка з точки зору гравця, що ходить.
+        allow_null=False - вузол одразу після нульового ходу (двох поспіль не буває).
+        """
+        if depth <= 0:
+            return self._quiescence(game_state, alpha, beta, ply, 0)
+
+        terminal_score = self._enter_node(game_state, ply)
+        if terminal_score is not None:
+            return terminal_score
+        if game_state.repetition_count() > 1:
+            return 0.0
+        color = game_state.current_player
+
+        # Ключ - хеш повного стану (черга ходу, статуси фігур, прапорці систем)
+        key = game_state.compute_state_hash()
+        entry = self.tt.probe(key)
+        tt_move_code = entry.move if entry is not None else 0
+        if entry is not None and entry.depth >= depth:
+            tt_score = _score_from_tt(entry.score, ply)
+            if (entry.bound == BOUND_EXACT
+                    or (entry.bound == BOUND_LOWER and tt_score >= beta)
+                    or (entry.bound == BOUND_UPPER and tt_score <= alpha)):
+                self.search_counters['tt_cutoffs'] += 1
+                return tt_score
+
+        pruning = self.pruning
+        # Шах і статична оцінка потрібні лише відсіканням - рахуються один раз на вузол
+        selective = pruning['null_move'] or pruning['lmr'] or pruning['futility']
+        in_check = selective and self._in_check(game_state)
+        static_score = None
+        if not in_check and (pruning['null_move'] or pruning['futility']):
+            static_score = self.evaluate(game_state, color)
+
+        if (pruning['null_move'] and allow_null and not in_check and ply > 0
+                and depth >= NULL_MOVE_MIN_DEPTH and abs(beta) < MATE_THRESHOLD
+                and static_score >= beta and not game_state.board.has_paralyzed(color)):
+            null_score = self._search_null_move(game_state, color, depth, beta, ply)
+            if null_score is not None and null_score >= beta:
+                self.pruning_counts['null_move_cutoffs'] += 1
+                return beta
+
+        moves = self._generate_moves(game_state)
+        if not moves:
+            return -MATE_SCORE + ply if self._in_check(game_state) else 0.0
+
+        futile = (pruning['futility'] and not in_check and depth < len(FUTILITY_MARGINS)
+                  and abs(alpha) < MATE_THRESHOLD and static_score + FUTILITY_MARGINS[depth] <= alpha)
+        original_alpha = alpha
+        best_score = -INFINITY_SCORE
+        best_move = None
+        searched = 0
+        history = self.move_orderer.history
+        ordered_moves = self.move_orderer.order_moves(game_state.board, moves, ply, tt_move_code)
+        for move_index, move in enumerate(ordered_moves):
+            quiet = not is_tactical_move(move) and encode_full_move(move) != tt_move_code
+            if futile and quiet and best_move is not None:
+                self.pruning_counts['futility_pruned'] += 1
+                continue
+            reduction = 0
+            if (pruning['lmr'] and quiet and not in_check and depth >= LMR_MIN_DEPTH
+                    and searched >= LMR_MIN_MOVES and move.to_square is not None
+                    and not self.move_orderer.is_killer(move, ply)):
+                history_score = history[square_index(move.from_square), square_index(move.to_square)]
+                if history_score < LMR_HISTORY_LIMIT:
+                    reduction = 2 if history_score == 0 and searched >= LMR_DEEP_MOVES and depth > 3 else 1
+                    self.pruning_counts['lmr_reductions'] += 1
+            score = self._search_pvs_move(game_state, move, color, depth, alpha, beta, ply,
+                                          best_move is None, reduction)
+            if score is None:
+                continue
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                # Позиція у впорядкованому списку (разом з відсіченими і нелегальними ходами)
+                self.move_orderer.record_cutoff(move, depth, ply, move_index)
+                break
+            searched += 1
+
+        if best_move is None:
+            return self.evaluate(game_state, color)
+
+        if best_score >= beta:
+            bound = BOUND_LOWER
+        elif best_score <= original_alpha:
+            bound = BOUND_UPPER
+        else:
+            bound = BOUND_EXACT
+        self.tt.store(key, depth, _score_to_tt(best_score, ply), bound,
+                      encode_full_move(best_move) if bound != BOUND_UPPER else 0)
+        return best_score
+
+    def _search_null_move(self, game_state, color: PieceColor, depth: int, beta: float,
+                          ply: int) -> Optional[float]:
+        """Нульовий хід зі скороченою глибиною і нульовим вікном біля beta (оцінка для color)"""
+        make_start = time.perf_counter()
+        snapshot = game_state.snapshot()
+        try:
+            applied = game_state.make_null_move()
+            self.search_counters['make_time'] += time.perf_counter() - make_start
+            if not applied:
+                return None
+            self.pruning_counts['null_move_tries'] += 1
+            return -self._negamax(game_state, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + NULL_WINDOW,
+                                  ply + 1, allow_null=False)
+        finally:
+            restore_start = time.perf_counter()
+            game_state.restore_snapshot(snapshot)
+            self.search_counters['make_time'] += time.perf_counter() - restore_start
+
+    def _quiescence(self, game_state, alpha: float, beta: float, ply: int, qdepth: int) -> float:
+        """
+        Форсований пошук після основної глибини: лише тактичні ходи (взяття,
+        обмін Аристократа з ворогом, паралізація Тріумфатора), доки позиція не стане тихою.
+        Ходи виконуються справжнім apply_move, тож параліч нападника Блискавкою,
+        взаємне знищення Блискавок і загибель прив'язаних Щита/Фурії враховані.
+        Stand-pat: гравець може не брати; дельта-відсікання пропускає ходи, що
+        навіть з оптимістичним виграшем не піднімуть альфа, а SEE - взяття,
+        що програють розмін.
+        """
+        terminal_score = self._enter_node(game_state, ply)
+        self.search_counters['qnodes'] += 1
+        if terminal_score is not None:
+            return terminal_score
+
+        color = game_state.current_player
+        stand_pat = self.evaluate(game_state, color)
+        if stand_pat >= beta or qdepth >= self.quiescence_depth:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        board = game_state.board
+        piece_values = self.evaluator.PIECE_VALUES
+        tactical_moves = self._generate_moves(game_state, tactical_only=True)
+
+        best_score = stand_pat
+        for move in self.move_orderer.order_moves(board, tactical_moves, ply):
+            if stand_pat + capture_gain(board, move, piece_values) + DELTA_MARGIN <= alpha:
+                continue
+            if move.is_capture and static_exchange(board, move, piece_values) < 0:
+                continue
+            score = self._search_move(game_state, move, color, 0, alpha, beta, ply, qdepth)
+            if score is None:
+                continue
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        return best_score
+
+    def _game_over_score(self, game_state, color: PieceColor, ply: int) -> float:
+        """Оцінка завершеної партії з точки зору color"""
+        if game_state.winner not in ('white', 'black'):
+            return 0.0
+        winner = PieceColor.WHITE if game_state.winner == 'white' else PieceColor.BLACK
+        return MATE_SCORE - ply if winner == color else -MATE_SCORE + ply
+
+    def _check_limits(self):
+        """Перериває пошук, якщо вичерпано бюджет часу або вузлів чи пошук скасовано"""
+        if self._stop_requested or (self.stop_flag is not None and self.stop_flag.value):
+            raise SearchTimeout()
+        if self.pondering:
+            return
+        if self.node_limit is not None and self.nodes - self._node_base > self.node_limit:
+            raise SearchTimeout()
+        if self._time_exceeded():
+            raise SearchTimeout()
+
+    def _time_exceeded(self) -> bool:
+        return (not self.pondering and self.time_limit is not None
+                and time.perf_counter() - self._limit_start >= self.time_limit)
+
+    def evaluate(self, game_state, color: PieceColor) -> float:
+        """Статична оцінка з точки зору color (оцінювач рахує з точки зору білих)"""
+        start = time.perf_counter()
+        score = self.evaluator.evaluate_position(game_state)
+        if self.eval_noise:
+            score += self.eval_noise * _position_noise(game_state.board.position_hash, self.noise_seed)
+        self.search_counters['eval_time'] += time.perf_counter() - start
+        return score * int(color)
+
+    def _generate_moves(self, game_state, tactical_only: bool = False) -> List[Move]:
+        """Легальні ходи з обліком часу генерації (movegen_time)"""
+        start = time.perf_counter()
+        moves = game_state.generate_legal_moves(tactical_only=tactical_only)
+        self.search_counters['movegen_time'] += time.perf_counter() - start
+        return moves
+
+    def _in_check(self, game_state) -> bool:
+        """Чи під шахом гравець, що ходить, з обліком часу (legality_time)"""
+        start = time.perf_counter()
+        in_check = game_state.get_turn_status().in_check
+        self.search_counters['legality_time'] += time.perf_counter() - start
+        return in_check
+
+    def minimax(self, game_state, depth: int, alpha: float, beta: float,
+                maximizing_player: bool) -> float:
+        """
+        Сумісна обгортка над негамаксом: оцінка з точки зору білих.
+        maximizing_player - чи ходять білі; ліміти часу/вузлів не діють.
+        """
+        time_limit, node_limit = self.time_limit, self.node_limit
+        self.time_limit = self.node_limit = None
+        self.nodes = 0
+        try:
+            if maximizing_player:
+                return self._negamax(game_state, depth, alpha, beta, 0)
+            return -self._negamax(game_state, depth, -beta, -alpha, 0)
+        finally:
+            self.time_limit, self.node_limit = time_limit, node_limit
+
+    def _build_search_stats(self, stats: Dict[str, object], root_key: int,
+                            engine: str = 'alphabeta') -> SearchStats:
+        """SearchStats з плоского словника _collect_stats (зондування - свої або сумарні процесів)"""
+        if self.workers > 1:
+            parallel = self._parallel_stats
+            probes, hits = parallel['tt_probes'], parallel['tt_hits']
+        else:
+            probes, hits = self.tt.probes, self.tt.hits
+        return SearchStats(
+            engine=engine, depth=stats['depth'], nodes=stats['nodes'], qnodes=stats['qnodes'],
+            time=stats['time'], nps=stats['nps'], score=stats['score'], best_move=stats['best_move'],
+            workers=self.workers, ebf=stats['ebf'], tt_probes=probes, tt_hits=hits,
+            tt_cutoffs=stats['tt_cutoffs'], tb_hits=stats['tb_hits'], tt_fill_rate=stats['tt_fill_rate'],
+            cutoffs=stats.get('cutoffs', 0), first_move_cutoffs=stats.get('first_move_cutoffs', 0),
+            iteration_times=stats['iteration_times'], iteration_nodes=stats['iteration_nodes'],
+            movegen_time=stats['movegen_time'], legality_time=stats['legality_time'],
+            make_time=stats['make_time'], eval_time=stats['eval_time'],
+            pruning={name: stats[name] for name in PRUNING_COUNTERS},
+            position=f"{root_key:016x}",
+        )
+
+    def get_search_stats(self) -> Dict[str, object]:
+        """
+        Статистика останнього пошуку: глибина, вузли, вузли/с, час, оцінка, хід,
+        таблиця транспозицій і якість впорядкування (first_move_cutoff_rate)
+        """
+        return dict(self._search_stats)
+
+    def set_difficulty(self, level: int, deterministic: bool = False):
+        """
+        Рівень складності 1-5 (DIFFICULTY_LEVELS): бюджет вузлів без ліміту часу, глибина, шум,
+        форсований пошук. deterministic - кожен пошук з чистої таблиці та евристик (відтворюваний хід)
+        """
+        if level in DIFFICULTY_LEVELS:
+            limits = DIFFICULTY_LEVELS[level]
+            self.time_limit = self.node_limit = None
+            self.root_move_nodes, self.depth = limits.root_move_nodes, limits.depth
+            self.eval_noise, self.quiescence_depth = limits.eval_noise, limits.quiescence_depth
+            self.deterministic = deterministic
+            game_logger.info(f"Встановлено рівень складності ШІ: {level} (глибина: {self.depth}, "
+                             f"вузлів на хід кореня: {self.root_move_nodes}, шум оцінки: {self.eval_noise}, "
+                             f"форсований пошук: {self.quiescence_depth}, детермінований: {deterministic})")
+        else:
+            game_logger.warning(f"Некоректний рівень складності: {level}")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""
+Впорядкування ходів для альфа-бета пошуку ШІ гри "Вершителі часу"
+
+Порядок ходів у вузлі:
+1. Хід з таблиці транспозицій
+2. Тактичні ходи (тактика.is_tactical_move) без програшу в розміні (SEE >= 0)
+   за MVV-LVA на основі PositionEvaluator.PIECE_VALUES
+3. Ходи-вбивці (killer moves) поточного півходу
+4. Решта тихих ходів за історичною евристикою (масив NumPy звідки×куди)
+5. Взяття, що програють розмін (SEE < 0)
+
+Статистика first-move cutoff rate показує якість впорядкування:
+частка відсікань, що сталися на першому ж переглянутому ході.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from розташування_фігур import Move
+from .оцінка import PositionEvaluator
+from .транспозиції import encode_full_move, square_index, BOARD_SQUARES
+from .тактика import is_tactical_move, capture_gain, static_exchange
+
+MAX_SEARCH_PLY = 64
+KILLERS_PER_PLY = 2
+
+# Яруси ключа сортування (ключі ярусів не перетинаються)
+_TT_MOVE_SCORE = 1 << 40
+_CAPTURE_SCORE = 1 << 32
+_KILLER_SCORE = 1 << 30
+_BAD_CAPTURE_SCORE = -(1 << 32)
+# Історичні бали діляться навпіл, щойно хоч один досягне межі
+_HISTORY_LIMIT = 1 << 24
+
+
+class MoveOrderer:
+    """Евристики впорядкування ходів: TT-хід, MVV-LVA, вбивці, історія"""
+
+    def __init__(self, piece_values: Dict = None):
+        self.piece_values = piece_values or PositionEvaluator.PIECE_VALUES
+        # Вбивці: коди ходів (encode_full_move) для кожного півходу від кореня
+        self.killers = np.zeros((MAX_SEARCH_PLY, KILLERS_PER_PLY), dtype=np.int64)
+        # Історія: [звідки, куди], рядок NO_SQUARE - ходи без початкової клітинки (воскресіння)
+        self.history = np.zeros((BOARD_SQUARES + 1, BOARD_SQUARES), dtype=np.int64)
+
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        """Новий пошук: вбивці скидаються, історія старіє вдвічі"""
+        self.killers.fill(0)
+        self.history >>= 1
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def clear(self):
+        """Повне очищення вбивць та історії (детермінований пошук)"""
+        self.killers.fill(0)
+        self.history.fill(0)
+
+    def _attacker_value(self, board, move: Move) -> float:
+        if move.from_square is None:
+            return 0.0
+        piece_id = board.mailbox[move.from_square]
+        piece = board.pieces_by_id.get(int(piece_id)) if piece_id else None
+        return self.piece_values.get(piece.type, 0.0) if piece else 0.0
+
+    def move_score(self, board, move: Move, ply: int, tt_move_code: int = 0) -> float:
+        """Ключ сортування ходу (більше - раніше)"""
+        code = encode_full_move(move)
+        if tt_move_code and code == tt_move_code:
+            return _TT_MOVE_SCORE
+
+        if is_tactical_move(move):
+            # MVV-LVA: найцінніша жертва (з прив'язаним партнером), найдешевший нападник
+            victim = capture_gain(board, move, self.piece_values)
+            mvv_lva = victim * 1000.0 - self._attacker_value(board, move)
+            if move.is_capture and static_exchange(board, move, self.piece_values) < 0:
+                return _BAD_CAPTURE_SCORE + mvv_lva
+            return _CAPTURE_SCORE + mvv_lva
+
+        if ply < MAX_SEARCH_PLY:
+            killers = self.killers[ply]
+            if code == killers[0]:
+                return _KILLER_SCORE + 1
+            if code == killers[1]:
+                return _KILLER_SCORE
+
+        if move.to_square is None:
+            return 0
+        return int(self.history[square_index(move.from_square), square_index(move.to_square)])
+
+    def order_moves(self, board, moves: List[Move], ply: int, tt_move_code: int = 0) -> List[Move]:
+        """Повертає ходи, впорядковані евристиками (стабільно для рівних ключів)"""
+        return sorted(moves, key=lambda move: self.move_score(board, move, ply, tt_move_code), reverse=True)
+
+    def is_killer(self, move: Move, ply: int) -> bool:
+        """Чи є хід вбивцею півходу ply"""
+        if ply >= MAX_SEARCH_PLY:
+            return False
+        code = encode_full_move(move)
+        return bool(code == self.killers[ply, 0] or code == self.killers[ply, 1])
+
+    def record_cutoff(self, move: Move, depth: int, ply: int, move_index: int):
+        """
+        Хід спричинив відсікання бета. Тихі ходи стають вбивцями півходу
+        і отримують історичний бал depth². move_index - позиція ходу у
+        впорядкованому списку (0 - відсікання першим ходом).
+        """
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+        if is_tactical_move(move) or move.to_square is None:
+            return
+
+        code = encode_full_move(move)
+        if ply < MAX_SEARCH_PLY and self.killers[ply, 0] != code:
+            self.killers[ply, 1] = self.killers[ply, 0]
+            self.killers[ply, 0] = code
+
+        from_index, to_index = square_index(move.from_square), square_index(move.to_square)
+        self.history[from_index, to_index] += depth * depth
+        if self.history[from_index, to_index] >= _HISTORY_LIMIT:
+            self.history >>= 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """Статистика якості впорядкування"""
+        return {
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoffs / max(1, self.cutoffs),
+        }
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+"""
+Експорт позицій партій у тензори ознак для навчання моделей ("Тренувальний датасет")
+
+Партії з JSONL симулятора та PGN (книга_дебютів.iter_games) відтворюються
+в пулі процесів; кожен півхід - позиція ПЕРЕД ходом:
+- площини 22×20 (uint8), PLANE_COUNT на позицію:
+    * по одній на (колір, тип фігури) - 1 там, де стоїть така фігура
+      (білі типи PieceType по порядку, потім чорні);
+    * параліч - ходів паралічу, що лишились, на клітинці фігури;
+    * туманність - таймер фігури в туманності;
+    * посилення - 1 на клітинці посиленої фігури;
+    * черга ходу - уся площина 1, якщо ходять білі;
+- мітки (LABEL_DTYPE): номер партії, півхід, повний код зіграного ходу
+  (транспозиції.encode_full_move - різні ходи позиції мають різні коди)
+  і результат партії з точки зору білих (1, 0, -1).
+
+Запис потоковий: головний процес дописує результати процесів у шарди
+фіксованого розміру (shard_size позицій) - площини_NNNNN.npy і
+мітки_NNNNN.npy через np.lib.format.open_memmap, тож у пам'яті лише
+поточний шард і кілька пакетів партій у дорозі. Порядок позицій не залежить
+від кількості процесів. Останній шард обрізається до фактичного розміру;
+опис.json перелічує площини і шарди.
+
+Приклад:
+    python -m штучний_інтелект.датасет логи/симуляції.jsonl --output логи/датасет --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from налаштування import PieceType, PieceColor, BOARD_ROWS, BOARD_COLS
+from логування import game_logger, set_quiet_mode
+from .транспозиції import encode_full_move
+
+# Площини фігур: індекси таблиць дошки (Board.piece_table_indices - колір × 16 + тип) без EMPTY
+PIECE_PLANE_TABLES = np.array([color_index * len(PieceType) + piece_type
+                               for color_index in (0, 1) for piece_type in PieceType
+                               if piece_type != PieceType.EMPTY], dtype=np.int8)
+PIECE_PLANE_COUNT = len(PIECE_PLANE_TABLES)
+PLANE_PARALYSIS = PIECE_PLANE_COUNT
+PLANE_NEBULA_TIMER = PIECE_PLANE_COUNT + 1
+PLANE_ENHANCED = PIECE_PLANE_COUNT + 2
+PLANE_SIDE_TO_MOVE = PIECE_PLANE_COUNT + 3
+PLANE_COUNT = PIECE_PLANE_COUNT + 4
+PLANE_NAMES = tuple(f"{'white' if color_index == 0 else 'black'}_{piece_type.name.lower()}"
+                    for color_index in (0, 1) for piece_type in PieceType
+                    if piece_type != PieceType.EMPTY) + ("paralysis", "nebula_timer", "enhanced", "side_to_move")
+
+LABEL_DTYPE = np.dtype([
+    ('game', '<u4'),        # Номер партії в порядку джерел
+    ('ply', '<u2'),         # Півхід партії (0 - перший хід)
+    ('move', '<u8'),        # Повний код зіграного ходу (encode_full_move)
+    ('result', 'i1'),       # Результат партії з точки зору білих: 1, 0, -1
+])
+
+# Результат партії з точки зору білих (партії без результату не експортуються)
+RESULT_LABELS = {"1-0": 1, "0-1": -1, "1/2-1/2": 0}
+
+# Позицій у шарді, партій у задачі процесу, задач у дорозі на процес
+DEFAULT_SHARD_SIZE = 4096
+EXPORT_CHUNK_GAMES = 4
+IN_FLIGHT_PER_WORKER = 2
+
+PLANES_FILE = "площини_{:05d}.npy"
+LABELS_FILE = "мітки_{:05d}.npy"
+MANIFEST_FILE = "опис.json"
+
+
+def encode_planes(game_state, out: np.ndarray):
+    """Площини позиції game_state в out (PLANE_COUNT, 22, 20) - векторні gather по mailbox"""
+    board = game_state.board
+    mailbox = board.mailbox
+    np.equal(board.piece_table_indices[mailbox][None], PIECE_PLANE_TABLES[:, None, None],
+             out=out[:PIECE_PLANE_COUNT], casting='unsafe')
+    # Порожня клітинка - ID 0, його паралічу, таймера і посилення немає
+    out[PLANE_PARALYSIS] = board.paralysis_turns[mailbox]
+    out[PLANE_NEBULA_TIMER] = board.nebula_timers[mailbox]
+    out[PLANE_ENHANCED] = board.enhanced[mailbox]
+    out[PLANE_SIDE_TO_MOVE] = game_state.current_player == PieceColor.WHITE
+
+
+# Стан процесу експорту: один GameState на процес
+_worker_state = None
+
+
+def _encode_games(games: List[Tuple[int, List[str], str]]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Задача процесу: площини і мітки всіх півходів партій (номер, ходи, результат); + зламані партії"""
+    global _worker_state
+    from стан_гри import GameState
+
+    set_quiet_mode(True)
+    if _worker_state is None:
+        _worker_state = GameState()
+    game_state = _worker_state
+
+    capacity = sum(len(notations) for _, notations, _ in games)
+    planes = np.zeros((capacity, PLANE_COUNT, BOARD_ROWS, BOARD_COLS), dtype=np.uint8)
+    labels = np.zeros(capacity, dtype=LABEL_DTYPE)
+    count = broken = 0
+    for game_index, notations, result in games:
+        game_state.reset_game()
+        for ply, notation in enumerate(notations):
+            if game_state.game_over:
+                break
+            move = game_state.find_move_by_notation(notation)
+            if move is None:
+                broken += 1
+                break
+            encode_planes(game_state, planes[count])
+            labels[count] = (game_index, ply, encode_full_move(move), RESULT_LABELS[result])
+            if not game_state.apply_move(move):
+                broken += 1
+                break
+            count += 1
+    return planes[:count], labels[:count], broken
+
+
+class ShardWriter:
+    """Дописує позиції в шарди фіксованого розміру (open_memmap, у пам'яті - поточний шард)"""
+
+    def __init__(self, directory: Path, shard_size: int = DEFAULT_SHARD_SIZE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.shards: List[Dict[str, object]] = []
+        self.positions = 0
+        self._planes: Optional[np.ndarray] = None
+        self._labels: Optional[np.ndarray] = None
+        self._filled = 0
+
+    def _open_shard(self):
+        index = len(self.shards)
+        self.shards.append({'planes': PLANES_FILE.format(index), 'labels': LABELS_FILE.format(index),
+                            'positions': 0})
+        self._planes = np.lib.format.open_memmap(
+            self.directory / PLANES_FILE.format(index), mode='w+', dtype=np.uint8,
+            shape=(self.shard_size, PLANE_COUNT, BOARD_ROWS, BOARD_COLS))
+        self._labels = np.lib.format.open_memmap(
+            self.directory / LABELS_FILE.format(index), mode='w+', dtype=LABEL_DTYPE, shape=(self.shard_size,))
+        self._filled = 0
+
+    def _close_shard(self):
+        """Скидає шард на диск; неповний (останній) переписується з фактичним розміром"""
+        shard = self.shards[-1]
+        shard['positions'] = self._filled
+        self._planes.flush()
+        self._labels.flush()
+        arrays = {}
+        if self._filled < self.shard_size:
+            arrays = {'planes': np.array(self._planes[:self._filled]), 'labels': np.array(self._labels[:self._filled])}
+        # Відображення закриваються до заміни файлів (Windows не замінює відображений файл)
+        self._planes = self._labels = None
+        for name, array in arrays.items():
+            path = self.directory / shard[name]
+            partial = path.with_suffix(".part.npy")
+            np.save(partial, array)
+            os.replace(partial, path)
+
+    def append(self, planes: np.ndarray, labels: np.ndarray):
+        """Дописує пакет позицій, розбиваючи його між шардами"""
+        start = 0
+        while start < len(labels):
+            if self._planes is None:
+                self._open_shard()
+            count = min(len(labels) - start, self.shard_size - self._filled)
+            self._planes[self._filled:self._filled + count] = planes[start:start + count]
+            self._labels[self._filled:self._filled + count] = labels[start:start + count]
+            self._filled += count
+            self.positions += count
+            start += count
+            if self._filled == self.shard_size:
+                self._close_shard()
+
+    def close(self, **manifest) -> Path:
+        """Закриває останній шард і пише опис датасету (manifest - додаткові поля)"""
+        if self._planes is not None:
+            self._close_shard()
+        path = self.directory / MANIFEST_FILE
+        description = {
+            'planes': list(PLANE_NAMES),
+            'plane_shape': [PLANE_COUNT, BOARD_ROWS, BOARD_COLS],
+            'plane_dtype': 'uint8',
+            'labels': {name: LABEL_DTYPE.fields[name][0].str for name in LABEL_DTYPE.names},
+            'shard_size': self.shard_size,
+            'positions': self.positions,
+            'shards': self.shards,
+            **manifest,
+        }
+        path.write_text(json.dumps(description, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+def _game_chunks(sources: Iterable[Path], chunk_games: int) -> Iterator[List[Tuple[int, List[str], str]]]:
+    """Партії з результатом, пронумеровані в порядку джерел, пакетами по chunk_games"""
+    from .книга_дебютів import iter_games
+
+    chunk = []
+    game_index = 0
+    for source in sources:
+        for notations, result in iter_games(source):
+            if result not in RESULT_LABELS:
+                continue
+            chunk.append((game_index, notations, result))
+            game_index += 1
+            if len(chunk) == chunk_games:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_dataset(sources: List[Path], output: Path, shard_size: int = DEFAULT_SHARD_SIZE,
+                   workers: int = 1) -> Dict[str, object]:
+    """
+    Експортує всі півходи партій sources у шарди теки output. Процесам
+    передається не більше IN_FLIGHT_PER_WORKER пакетів на процес наперед,
+    результати записуються в порядку партій. Повертає лічильники експорту.
+    """
+    start_time = time.perf_counter()
+    writer = ShardWriter(output, shard_size)
+    stats = {'games': 0, 'broken_games': 0}
+
+    def write(result: Tuple[np.ndarray, np.ndarray, int]):
+        planes, labels, broken = result
+        writer.append(planes, labels)
+        stats['broken_games'] += broken
+
+    chunks = _game_chunks(sources, EXPORT_CHUNK_GAMES)
+    if workers > 1:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context) as executor:
+            pending = deque()
+            for chunk in chunks:
+                stats['games'] += len(chunk)
+                pending.append(executor.submit(_encode_games, chunk))
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    else:
+        for chunk in chunks:
+            stats['games'] += len(chunk)
+            write(_encode_games(chunk))
+
+    stats['time'] = time.perf_counter() - start_time
+    stats['positions'] = writer.positions
+    stats['shards'] = len(writer.shards)
+    stats['manifest'] = writer.close(games=stats['games'], broken_games=stats['broken_games'])
+    game_logger.info(f"Експортовано датасет {output}: партій {stats['games']}, позицій {stats['positions']}, "
+                     f"шардів {stats['shards']}, зламаних партій {stats['broken_games']}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Експорт позицій партій у тензори ознак (.npy шарди)")
+    parser.add_argument("sources", type=Path, nargs="+", help="JSONL симулятора, .pgn або лог партій")
+    parser.add_argument("--output", type=Path, default=Path(__file__).resolve().parent.parent / "логи" / "датасет",
+                        help="тека шардів")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="позицій у шарді")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="кількість процесів")
+    args = parser.parse_args(argv)
+
+    stats = export_dataset(args.sources, args.output, args.shard_size, args.workers)
+    print(f"🧮 Датасет {args.output}: партій {stats['games']}, позицій {stats['positions']}, "
+          f"шардів {stats['shards']}, зламаних партій {stats['broken_games']}, "
+          f"{stats['positions'] / max(stats['time'], 1e-9):.0f} позицій/с")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+"""
+Книга дебютів ШІ гри "Вершителі часу"
+
+Кожна партія починається з тієї самої розстановки, тож перші ходи ШІ
+береться з книги, зібраної із записаних партій, а не шукає заново.
+
+Побудова (build_book): партії з PGN (логування.generate_pgn_string, блоки
+PGN у логи/партія.log) і JSONL симулятора відтворюються до max_plies
+півходів; для кожної позиції (GameState.compute_state_hash) і ходу
+(транспозиції.encode_full_move) рахуються партії, перемоги, нічиї й поразки з
+точки зору гравця, що ходить.
+
+Файл: заголовок BOOK_HEADER і масив записів BOOK_RECORD_DTYPE фіксованого
+розміру, відсортований за (ключ позиції, -партії). OpeningBook відкриває його
+через mmap: записи читаються прямо зі сторінок файлу без завантаження, а
+ходи позиції шукаються двійковим пошуком за ключем (мікросекунди).
+
+Приклад:
+    python -m штучний_інтелект.книга_дебютів логи/симуляції.jsonl логи/партія.log
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import random
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from розташування_фігур import Move
+from логування import game_logger, quiet_mode
+from .транспозиції import encode_full_move
+
+BOOK_MAGIC = b"VCHBOOK\0"
+BOOK_VERSION = 2
+# Заголовок: сигнатура, версія, розмір запису, кількість записів, глибина книги (півходи)
+BOOK_HEADER = struct.Struct("<8sIIQI4x")
+
+BOOK_RECORD_DTYPE = np.dtype([
+    ('key', '<u8'),         # Хеш стану позиції (GameState.compute_state_hash)
+    ('move', '<u8'),        # Повний код ходу (encode_full_move)
+    ('games', '<u4'),
+    ('wins', '<u4'),        # Результати з точки зору гравця, що ходить у позиції
+    ('draws', '<u4'),
+    ('losses', '<u4'),
+])
+
+DEFAULT_BOOK_PLIES = 24
+# Хід з книги грається, лише якщо його зіграно щонайменше в стільки партіях
+DEFAULT_MIN_GAMES = 1
+
+_PGN_RESULT_TAG = "[Result \""
+_PGN_RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+
+
+class BookEntry(NamedTuple):
+    """Хід позиції в книзі"""
+    move_code: int
+    games: int
+    wins: int
+    draws: int
+    losses: int
+
+    @property
+    def score(self) -> float:
+        """Частка очок гравця, що ходить (нічия - пів очка)"""
+        return (self.wins + 0.5 * self.draws) / max(1, self.games)
+
+
+def iter_pgn_games(text: str) -> Iterator[Tuple[List[str], str]]:
+    """
+    PGN-партії тексту: (токени ходів, результат). Підходить і для логу партій -
+    блок PGN починається з заголовка [Event і закінчується рядком з результатом.
+    """
+    from відтворення import parse_pgn_moves
+
+    lines: Optional[List[str]] = None
+    result = "*"
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("[Event"):
+            lines, result = [], "*"
+        if lines is None:
+            continue
+        if line.startswith(_PGN_RESULT_TAG):
+            result = line[len(_PGN_RESULT_TAG):].split("\"")[0]
+        lines.append(line)
+        tokens = line.split()
+        if not line.startswith("[") and tokens and tokens[-1] in _PGN_RESULTS:
+            yield parse_pgn_moves("\n".join(lines)), result
+            lines = None
+
+
+def iter_games(path: Path) -> Iterator[Tuple[List[str], str]]:
+    """Партії файлу: JSONL симулятора (поля moves, result) або текст з PGN"""
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix == ".jsonl":
+        for line in text.splitlines():
+            if line.strip():
+                record = json.loads(line)
+                yield record["moves"], record.get("result", "*")
+    else:
+        yield from iter_pgn_games(text)
+
+
+def build_book(sources: List[Path], output: Path, max_plies: int = DEFAULT_BOOK_PLIES,
+               min_games: int = DEFAULT_MIN_GAMES) -> Dict[str, int]:
+    """
+    Збирає книгу з партій sources у файл output. Партія відтворюється до
+    першого нерозпізнаного ходу. Пари (позиція, хід), зіграні менш ніж у
+    min_games партіях, не записуються. Повертає лічильники побудови.
+    """
+    from стан_гри import GameState
+
+    # (ключ, код ходу) -> [партії, перемоги, нічиї, поразки]
+    counts: Dict[Tuple[int, int], List[int]] = {}
+    stats = {'games': 0, 'positions': 0, 'broken_games': 0}
+    with quiet_mode():
+        game_state = GameState()
+        for source in sources:
+            for notations, result in iter_games(source):
+                game_state.reset_game()
+                stats['games'] += 1
+                for notation in notations[:max_plies]:
+                    if game_state.game_over:
+                        break
+                    key = game_state.compute_state_hash()
+                    mover = game_state.current_player
+                    move = game_state.find_move_by_notation(notation)
+                    if move is None or not game_state.apply_move(move):
+                        stats['broken_games'] += 1
+                        break
+                    entry = counts.setdefault((key, encode_full_move(move)), [0, 0, 0, 0])
+                    entry[0] += 1
+                    if result == "1/2-1/2":
+                        entry[2] += 1
+                    elif result in ("1-0", "0-1"):
+                        white_won = result == "1-0"
+                        entry[1 if white_won == (mover > 0) else 3] += 1
+                    stats['positions'] += 1
+
+    records = np.zeros(len(counts), dtype=BOOK_RECORD_DTYPE)
+    for index, ((key, move_code), (games, wins, draws, losses)) in enumerate(counts.items()):
+        records[index] = (key, move_code, games, wins, draws, losses)
+    records = records[records['games'] >= min_games]
+    # Сортування за ключем, у межах позиції - найчастіші ходи першими
+    records = records[np.lexsort((-records['games'].astype(np.int64), records['key']))]
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "wb") as out_file:
+        out_file.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, BOOK_RECORD_DTYPE.itemsize,
+                                        len(records), max_plies))
+        out_file.write(records.tobytes())
+    stats['records'] = len(records)
+    game_logger.info(f"Побудовано книгу дебютів {output}: партій {stats['games']}, "
+                     f"записів {stats['records']}, зламаних партій {stats['broken_games']}")
+    return stats
+
+
+class OpeningBook:
+    """Книга дебютів, відображена в пам'ять (mmap) - відкриття без завантаження записів"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Порожній файл книги дебютів: {self.path}")
+        magic, version, record_size, count, self.max_plies = BOOK_HEADER.unpack_from(self._mmap)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION or record_size != BOOK_RECORD_DTYPE.itemsize:
+            self.close()
+            raise ValueError(f"Несумісний файл книги дебютів: {self.path}")
+        self.records = np.frombuffer(self._mmap, dtype=BOOK_RECORD_DTYPE, count=count,
+                                     offset=BOOK_HEADER.size)
+        # Представлення поля без копіювання: bisect читає лише log2(n) ключів
+        self._keys = self.records['key']
+
+    @classmethod
+    def open_if_exists(cls, path: Path) -> Optional["OpeningBook"]:
+        """Книга з файлу або None, якщо файлу немає чи він несумісний"""
+        if not Path(path).is_file():
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as error:
+            game_logger.warning(f"Книгу дебютів не відкрито: {error}")
+            return None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def probe(self, key: int) -> List[BookEntry]:
+        """Ходи позиції з ключем key, найчастіші першими"""
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key, lo=start)
+        return [BookEntry(int(record['move']), int(record['games']), int(record['wins']),
+                          int(record['draws']), int(record['losses']))
+                for record in self.records[start:end]]
+
+    def choose_move(self, game_state, seed: int = 0, min_games: int = DEFAULT_MIN_GAMES) -> Optional[Move]:
+        """
+        Хід з книги для поточної позиції або None. Вибір зважений кількістю
+        партій; випадковість - від seed і ключа позиції, тож однакові seed
+        і позиція дають той самий хід.
+        """
+        key = game_state.compute_state_hash()
+        entries = [entry for entry in self.probe(key) if entry.games >= min_games]
+        if not entries:
+            return None
+        legal = {encode_full_move(move): move for move in game_state.generate_legal_moves()}
+        entries = [entry for entry in entries if entry.move_code in legal]
+        if not entries:
+            return None
+        rng = random.Random(key ^ seed)
+        entry = rng.choices(entries, weights=[entry.games for entry in entries])[0]
+        return legal[entry.move_code]
+
+    def close(self):
+        """Звільняє відображення файлу"""
+        self.records = self._keys = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    from налаштування import AI_OPENING_BOOK
+
+    parser = argparse.ArgumentParser(description="Побудова книги дебютів із записаних партій")
+    parser.add_argument("sources", type=Path, nargs="+", help="JSONL симулятора, .pgn або лог партій")
+    parser.add_argument("--output", type=Path, default=Path(__file__).resolve().parent.parent / AI_OPENING_BOOK,
+                        help="файл книги")
+    parser.add_argument("--plies", type=int, default=DEFAULT_BOOK_PLIES, help="глибина книги в півходах")
+    parser.add_argument("--min-games", type=int, default=DEFAULT_MIN_GAMES,
+                        help="мінімум партій для запису ходу")
+    args = parser.parse_args(argv)
+
+    stats = build_book(args.sources, args.output, args.plies, args.min_games)
+    print(f"📖 Книга {args.output}: партій {stats['games']}, позицій {stats['positions']}, "
+          f"записів {stats['records']}, зламаних партій {stats['broken_games']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,715 @@
+# -*- coding: utf-8 -*-
+
+"""
+Пошук Монте-Карло по дереву (MCTS/UCT) для ШІ гри "Вершителі часу"
+
+Альтернатива альфа-бета пошуку ChessAI з тим самим інтерфейсом
+(get_best_move, search, request_stop, set_difficulty, пондеринг), тож графіка
+(потік_ші.AIController) і симулятор перемикають рушій налаштуванням AI_ENGINE.
+
+Ітерація пошуку:
+- вибір: спуск за UCT до вузла, який ще не оцінено; розширення прогресивне -
+  вузол з n відвідуваннями має не більше WIDENING_FACTOR * sqrt(n) нащадків,
+  а ходи взяті в порядку MoveOrderer (взяття за MVV-LVA, історія), тож при
+  ~200 ходах у вузлі дерево не розпливається по тихих ходах;
+- оцінка листа: виконавець відтворює шлях ходів від кореня і грає з листа
+  коротку випадкову партію з дешевою політикою (серед кількох випадкових фігур
+  спочатку найвигідніше взяття, інакше випадковий хід - через
+  GameState.generate_piece_moves без генерації ходів усієї армії); після
+  PLAYOUT_DEPTH півходів позиція оцінюється PositionEvaluator і переводиться
+  в імовірність перемоги;
+- розширення ліниве: повні легальні ходи листа (найдорожча частина) генеруються
+  і впорядковуються лише при другому відвідуванні вузла - більшість листів
+  великого дерева так і лишаються з одним відвідуванням;
+- зворотне поширення: значення (імовірність перемоги білих) додається кожному
+  вузлу шляху з точки зору гравця, що зробив хід у вузол (після першого ходу
+  Місяця чи безкоштовного воскресіння ходить той самий гравець).
+
+При workers > 1 листи оцінюють процеси пулу пакетами по LEAVES_PER_TASK:
+поки процеси працюють, вибрані листи несуть віртуальну поразку, тож наступні
+вибори розходяться по інших гілках. Знімок кореня пересилається один раз на
+пакет, а не на лист. Дерево переживає хід: новий пошук шукає поточну позицію
+(за хешем стану) серед нащадків старого кореня на MAX_REUSE_DEPTH півходів.
+
+Аналіз (analyze): найбільш відвідані ходи кореня з шансом перемоги і
+головним варіантом за найбільш відвіданими нащадками; повторний запит на тій
+самій позиції продовжує те саме дерево.
+"""
+
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from налаштування import PieceType, PieceColor
+from розташування_фігур import Move
+from логування import game_logger, quiet_mode, set_quiet_mode
+from .оцінка import PositionEvaluator
+from .впорядкування import MoveOrderer
+from .тактика import capture_gain
+from .статистика import (SearchStats, AnalysisLine, append_jsonl,
+                         ANALYSIS_LINES, ANALYSIS_TIME_LIMIT)
+
+# Коефіцієнт дослідження UCT (значення вузлів - імовірності перемоги 0..1)
+EXPLORATION = 1.0
+# Прогресивне розширення: нащадків не більше WIDENING_FACTOR * sqrt(відвідувань)
+WIDENING_FACTOR = 2.0
+# Довжина випадкової партії з листа (півходи), далі - статична оцінка
+PLAYOUT_DEPTH = 8
+# Скільки випадкових фігур переглядає політика випадкової партії, шукаючи взяття
+PLAYOUT_SAMPLE_PIECES = 6
+# Перевага в пішаках, за якої імовірність перемоги ~73% (масштаб сигмоїди)
+PLAYOUT_SCALE = 4.0
+# Листів у задачі одного процесу (амортизує пересилання знімка кореня)
+LEAVES_PER_TASK = 8
+# Скільки півходів від старого кореня шукати нову позицію для повторного використання дерева
+MAX_REUSE_DEPTH = 4
+# Запобіжник пам'яті: після стількох збережених ходів розширених вузлів дерево більше не росте
+MAX_TREE_MOVES = 1000000
+# Як часто викликається on_iteration (секунди)
+REPORT_INTERVAL = 0.5
+
+# Рівні складності: (ліміт часу в секундах, ліміт оцінених листів)
+DIFFICULTY_LIMITS = {
+    1: (0.25, 20),
+    2: (0.5, 60),
+    3: (1.0, 200),
+    4: (2.5, 600),
+    5: (5.0, 2000),
+}
+
+
+class LeafResult(NamedTuple):
+    """Оцінка листа виконавцем: ходи для розширення і середнє значення випадкових партій"""
+    moves: Optional[List[Move]]  # Впорядковані легальні ходи (None - лист не розширювали)
+    to_move: int                # Хто ходить у листі (int(PieceColor))
+    key: int                    # Хеш стану листа (GameState.compute_state_hash)
+    value: float                # Імовірність перемоги білих
+    terminal: bool              # Партія в листі завершена - значення точне
+    plies: int                  # Зіграно півходів у випадкових партіях
+
+
+def _terminal_value(game_state) -> Optional[float]:
+    """Точне значення завершеної партії (імовірність перемоги білих) або None"""
+    if game_state.game_over:
+        if game_state.winner == 'white':
+            return 1.0
+        if game_state.winner == 'black':
+            return 0.0
+        return 0.5
+    # Шах не забороняє взяття Короля - втрата Короля означає програш
+    bitboards = game_state.board.bitboards
+    if not bitboards[PieceColor.WHITE][PieceType.KING]:
+        return 0.0
+    if not bitboards[PieceColor.BLACK][PieceType.KING]:
+        return 1.0
+    return None
+
+
+def playout_move(game_state, rng: random.Random, piece_values: Dict) -> Optional[Move]:
+    """
+    Дешева політика випадкової партії: фігури переглядаються у випадковому
+    порядку, доки PLAYOUT_SAMPLE_PIECES з них не знайдуть ходи. Серед цих ходів -
+    найвигідніше взяття (рівні - випадково), інакше випадковий хід першої
+    фігури. Воскресіння - лише якщо жодна фігура не має ходів.
+    ОПТИМІЗАЦІЯ: ходи без перевірки шаху власному королю (найдорожча частина
+    генерації) - рідкісний нелегальний хід відхиляє apply_move.
+    """
+    board = game_state.board
+    squares = board.get_all_pieces_of_color(game_state.current_player)
+    rng.shuffle(squares)
+    first_moves = None
+    best_gain, best_moves = 0.0, []
+    sampled = 0
+    for row, col in squares:
+        moves = game_state.generate_piece_moves(row, col, filter_legal=False)
+        if not moves:
+            continue
+        if first_moves is None:
+            first_moves = moves
+        for move in moves:
+            if move.is_capture or move.special_move_flag == 'TRIUMPHATOR_PARALYSIS':
+                gain = capture_gain(board, move, piece_values)
+                if gain > best_gain:
+                    best_gain, best_moves = gain, [move]
+                elif gain == best_gain and gain > 0:
+                    best_moves.append(move)
+        sampled += 1
+        if sampled >= PLAYOUT_SAMPLE_PIECES:
+            break
+
+    if best_moves:
+        return rng.choice(best_moves)
+    if first_moves:
+        return rng.choice(first_moves)
+
+    moves = game_state.generate_legal_moves()
+    return rng.choice(moves) if moves else None
+
+
+def playout(game_state, rng: random.Random, evaluator: PositionEvaluator,
+            depth: int = PLAYOUT_DEPTH) -> Tuple[float, int]:
+    """Випадкова партія з поточної позиції (стан змінюється): (імовірність перемоги білих, півходів)"""
+    piece_values = evaluator.PIECE_VALUES
+    plies = 0
+    while plies < depth:
+        value = _terminal_value(game_state)
+        if value is not None:
+            return value, plies
+        move = playout_move(game_state, rng, piece_values)
+        if move is None or not game_state.apply_move(move):
+            # Нелегальний псевдохід (або ходів немає) - партія обривається на статичній оцінці
+            break
+        plies += 1
+
+    value = _terminal_value(game_state)
+    if value is None:
+        score = max(-50.0, min(50.0, evaluator.evaluate_position(game_state) / PLAYOUT_SCALE))
+        value = 1.0 / (1.0 + math.exp(-score))
+    return value, plies
+
+
+def evaluate_leaves(game_state, root_snapshot: dict, leaves: List[Tuple[List[Move], bool]], playouts: int,
+                    rng: random.Random, evaluator: PositionEvaluator,
+                    move_orderer: MoveOrderer) -> List[LeafResult]:
+    """
+    Оцінка листів дерева: для кожного (шлях ходів від кореня, розширювати) -
+    за потреби впорядковані легальні ходи і середнє playouts випадкових партій.
+    Стан game_state після виклику - довільний.
+    """
+    results = []
+    for path, expand in leaves:
+        game_state.restore_snapshot(root_snapshot)
+        for move in path:
+            if not game_state.apply_move(move):
+                break
+
+        to_move = int(game_state.current_player)
+        key = game_state.compute_state_hash()
+        value = _terminal_value(game_state)
+        moves = None
+        if value is None and expand:
+            moves = game_state.generate_legal_moves()
+            if not moves:
+                # Немає ходів: мат (програш того, хто ходить) або пат
+                if game_state.get_turn_status().in_check:
+                    value = 0.0 if game_state.current_player == PieceColor.WHITE else 1.0
+                else:
+                    value = 0.5
+            else:
+                moves = move_orderer.order_moves(game_state.board, moves, 0)
+        if value is not None:
+            results.append(LeafResult([], to_move, key, value, True, 0))
+            continue
+
+        leaf_snapshot = game_state.snapshot() if playouts > 1 else None
+        total, plies = 0.0, 0
+        for index in range(playouts):
+            if index:
+                game_state.restore_snapshot(leaf_snapshot)
+            playout_value, playout_plies = playout(game_state, rng, evaluator)
+            total += playout_value
+            plies += playout_plies
+        results.append(LeafResult(moves, to_move, key, total / playouts, False, plies))
+    return results
+
+
+class MCTSNode:
+    """Вузол дерева: хід у нього, статистика UCT і (після оцінки) ходи для розширення"""
+
+    __slots__ = ('move', 'parent', 'mover', 'children', 'moves', 'evaluated', 'to_move', 'key',
+                 'visits', 'value_sum', 'terminal', 'terminal_value', 'pending')
+
+    def __init__(self, move: Optional[Move], parent: Optional["MCTSNode"], mover: int):
+        self.move = move
+        self.parent = parent
+        self.mover = mover              # Гравець, що зробив хід у вузол (int(PieceColor))
+        self.children: List["MCTSNode"] = []
+        self.moves: Optional[List[Move]] = None   # None - вузол ще не розширено
+        self.evaluated = False          # Була випадкова партія з вузла (відомі key і to_move)
+        self.to_move = 0
+        self.key = 0
+        self.visits = 0
+        self.value_sum = 0.0
+        self.terminal = False
+        self.terminal_value = 0.5       # Точне значення завершеної партії (імовірність перемоги білих)
+        self.pending = False            # Лист чекає на оцінку виконавцем
+
+    def value_for(self, color: int, white_value: float) -> float:
+        return white_value if color == int(PieceColor.WHITE) else 1.0 - white_value
+
+    def can_widen(self) -> bool:
+        """Чи можна додати наступний хід як нового нащадка (прогресивне розширення)"""
+        return (len(self.children) < len(self.moves)
+                and len(self.children) < WIDENING_FACTOR * math.sqrt(self.visits + 1))
+
+    def best_child(self) -> "MCTSNode":
+        """Нащадок з найбільшою UCT-оцінкою (віртуальні поразки враховані у visits)"""
+        log_visits = math.log(max(1, self.visits))
+        best, best_score = None, -math.inf
+        for child in self.children:
+            if child.pending:
+                continue
+            if child.visits == 0:
+                return child
+            score = child.value_sum / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def most_visited_child(self) -> Optional["MCTSNode"]:
+        if not self.children:
+            return None
+        return max(self.children, key=lambda child: (child.visits, child.value_sum))
+
+
+# Стан процесу-виконавця (ініціалізується _init_worker)
+_worker_state = None
+_worker_evaluator: Optional[PositionEvaluator] = None
+_worker_orderer: Optional[MoveOrderer] = None
+_worker_search_id = -1
+
+
+def _init_worker():
+    """Ініціалізатор процесу: власні GameState, оцінювач і впорядкування ходів"""
+    global _worker_state, _worker_evaluator, _worker_orderer
+    from стан_гри import GameState
+
+    set_quiet_mode(True)
+    _worker_state = GameState()
+    _worker_state.defer_turn_status = True
+    _worker_evaluator = PositionEvaluator()
+    _worker_orderer = MoveOrderer(_worker_evaluator.PIECE_VALUES)
+
+
+def _evaluate_batch(search_id: int, root_snapshot: dict, draw_limits: tuple,
+                    leaves: List[Tuple[List[Move], bool]], playouts: int, seed: int) -> List[LeafResult]:
+    """Задача процесу: пакет листів одного пошуку"""
+    global _worker_search_id
+    if search_id != _worker_search_id:
+        _worker_search_id = search_id
+        _worker_orderer.new_search()
+    _worker_state.repetition_draw_count, _worker_state.no_capture_draw_plies = draw_limits
+    return evaluate_leaves(_worker_state, root_snapshot, leaves, playouts, random.Random(seed),
+                           _worker_evaluator, _worker_orderer)
+
+
+class MCTSAI:
+    """Рушій MCTS/UCT з інтерфейсом ChessAI"""
+
+    def __init__(self, time_limit: Optional[float] = 2.0, node_limit: Optional[int] = None,
+                 workers: int = 1, playouts: int = 1, seed: int = 0):
+        """
+        Args:
+            time_limit: Ліміт часу на хід у секундах (None - без ліміту)
+            node_limit: Ліміт оцінених листів на хід (None - без ліміту)
+            workers: Кількість процесів оцінки листів (1 - у поточному процесі)
+            playouts: Випадкових партій з кожного листа
+            seed: Початковий seed випадкових партій
+        """
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.workers = max(1, workers)
+        self.playouts = max(1, playouts)
+        self.seed = seed
+        self.evaluator = PositionEvaluator()
+        self.move_orderer = MoveOrderer(self.evaluator.PIECE_VALUES)
+
+        self.root: Optional[MCTSNode] = None
+        self.tree_moves = 0
+        self.nodes = 0
+        self.playout_plies = 0
+        self.reused_visits = 0
+        self._batch = 0
+        self._search_id = 0
+        self._max_depth = 0
+        self._start_time = 0.0
+        self._last_report = 0.0
+        self._limit_start = 0.0
+        self._node_base = 0
+        self.pondering = False
+        # Відтворюваний хід (лише ліміт листів, без пондерингу) - set_difficulty(deterministic=True)
+        self.deterministic = False
+        # Книга дебютів (як у ChessAI), None - без книги
+        self.book = None
+        # Таблиці ендшпілю (як у ChessAI): у корені замість пошуку, у дереві не зондуються
+        self.tablebases = None
+        self._stop_requested = False
+        self._executor = None
+        self._search_stats: Dict[str, object] = {}
+        # Статистика останнього пошуку (як у ChessAI) і JSONL-файл для неї (None - не писати)
+        self.last_stats: Optional[SearchStats] = None
+        self.stats_log: Optional[Path] = None
+        # Виклик кожні REPORT_INTERVAL секунд зі статистикою (як get_search_stats)
+        self.on_iteration: Optional[Callable[[Dict[str, object]], None]] = None
+        game_logger.info(f"Ініціалізовано ШІ MCTS (час: {time_limit} с, листів: {node_limit}, "
+                         f"процесів: {self.workers})")
+
+    def get_best_move(self, game_state, color: PieceColor) -> Optional[Move]:
+        """Найкращий хід для color (пошук на копії стану)"""
+        if game_state.current_player != color or game_state.game_over:
+            return None
+
+        with quiet_mode():
+            best_move = self.search(self.clone_for_search(game_state))
+
+        stats = self._search_stats
+        game_logger.info(f"ШІ MCTS обрав {best_move}: листів {stats['nodes']}, "
+                         f"відвідувань ходу {stats['best_visits']}, шанс {stats['score']:.2f}, "
+                         f"{stats['nps']:.0f} листів/с, {stats['time']:.2f} с")
+        return best_move
+
+    @staticmethod
+    def clone_for_search(game_state):
+        """Копія партії для пошуку (як у ChessAI)"""
+        from .алгоритм import ChessAI
+        return ChessAI.clone_for_search(game_state)
+
+    def search(self, game_state) -> Optional[Move]:
+        """
+        MCTS з позиції game_state до вичерпання бюджету. Стан змінюється
+        і відновлюється. Повертає найчастіше відвіданий хід кореня.
+        """
+        self.start_clock()
+        self._stop_requested = False
+        if self.book is not None and not self.pondering:
+            book_move = self.book.choose_move(game_state, self.seed)
+            if book_move is not None:
+                return self._finish_without_search(game_state, book_move, 0.5, 'book')
+        if self.tablebases is not None and not self.pondering:
+            probed = self.tablebases.probe(game_state)
+            tablebase_move = self.tablebases.best_move(game_state) if probed is not None else None
+            if tablebase_move is not None:
+                return self._finish_without_search(game_state, tablebase_move, (probed.result + 1) / 2,
+                                                   'tablebase')
+        self._search_id += 1
+        self.move_orderer.new_search()
+
+        root_snapshot = game_state.snapshot()
+        draw_limits = (game_state.repetition_draw_count, game_state.no_capture_draw_plies)
+        root_key = game_state.compute_state_hash()
+        self._set_root(root_key, int(game_state.current_player))
+        try:
+            if self.workers > 1:
+                self._search_parallel(root_snapshot, draw_limits)
+            else:
+                self._search_sequential(game_state, root_snapshot)
+        finally:
+            game_state.restore_snapshot(root_snapshot)
+
+        best = self.root.most_visited_child()
+        self._search_stats = stats = self._collect_stats(best)
+        # Поля альфа-бета (таблиця, відсікання, ітерації) для MCTS лишаються нульовими
+        self.last_stats = SearchStats(engine='mcts', depth=stats['depth'], nodes=stats['nodes'],
+                                      time=stats['time'], nps=stats['nps'], score=stats['score'],
+                                      best_move=stats['best_move'], workers=self.workers,
+                                      position=f"{root_key:016x}")
+        if self.stats_log is not None:
+            append_jsonl(self.last_stats, self.stats_log, best_visits=stats['best_visits'],
+                         root_visits=stats['root_visits'], playout_plies=stats['playout_plies'])
+        return best.move if best is not None else None
+
+    def _finish_without_search(self, game_state, move: Move, score: float, engine: str) -> Move:
+        """Статистика ходу з книги чи таблиць ендшпілю (score - шанс перемоги)"""
+        self._search_stats = {'depth': 0, 'nodes': 0, 'time': 0.0, 'nps': 0.0, 'score': score,
+                              'best_move': move, 'best_visits': 0, 'root_visits': 0,
+                              'reused_visits': 0, 'tree_moves': self.tree_moves,
+                              'playout_plies': 0, 'workers': self.workers}
+        self.last_stats = SearchStats(engine=engine, score=score, best_move=move, workers=self.workers,
+                                      position=f"{game_state.compute_state_hash():016x}")
+        return move
+
+    def start_clock(self):
+        """Обнуляє лічильник листів і починає відлік часу пошуку та бюджету"""
+        self.nodes = 0
+        self.playout_plies = 0
+        self._node_base = 0
+        self._max_depth = 0
+        self._start_time = self._limit_start = self._last_report = time.perf_counter()
+
+    def _set_root(self, key: int, to_move: int):
+        """Корінь пошуку: вузол старого дерева з тим самим станом або нове дерево"""
+        root = self._find_reusable(key)
+        if root is None:
+            root = MCTSNode(None, None, -to_move)
+        root.parent = None
+        root.move = None
+        self.root = root
+        self.reused_visits = root.visits
+        self.tree_moves = self._count_tree_moves(root)
+
+    @staticmethod
+    def _count_tree_moves(root: MCTSNode) -> int:
+        """Кількість збережених ходів у піддереві (облік пам'яті після повторного використання)"""
+        total, stack = 0, [root]
+        while stack:
+            node = stack.pop()
+            if node.moves:
+                total += len(node.moves)
+            stack.extend(node.children)
+        return total
+
+    def _find_reusable(self, key: int) -> Optional[MCTSNode]:
+        """Пошук у ширину серед оцінених нащадків старого кореня на MAX_REUSE_DEPTH півходів"""
+        if self.root is None:
+            return None
+        level = [self.root]
+        for _ in range(MAX_REUSE_DEPTH + 1):
+            next_level = []
+            for node in level:
+                if not node.evaluated or node.pending:
+                    continue
+                if node.key == key:
+                    return node
+                next_level.extend(node.children)
+            level = next_level
+        return None
+
+    def _search_sequential(self, game_state, root_snapshot: dict):
+        rng = random.Random(self.seed + self._search_id)
+        while not self._budget_exhausted():
+            leaves = self._select_leaves(1)
+            if not leaves:
+                continue
+            results = evaluate_leaves(game_state, root_snapshot, self._leaf_tasks(leaves), self.playouts, rng,
+                                      self.evaluator, self.move_orderer)
+            self._apply_results(leaves, results)
+            if time.perf_counter() - self._last_report >= REPORT_INTERVAL:
+                self._report()
+
+    def _search_parallel(self, root_snapshot: dict, draw_limits: tuple):
+        """Оцінка листів у процесах пулу: у роботі завжди по задачі на процес"""
+        executor = self._get_executor()
+        in_flight = {}
+        try:
+            while True:
+                while len(in_flight) < self.workers and not self._budget_exhausted():
+                    leaves = self._select_leaves(LEAVES_PER_TASK)
+                    if not leaves:
+                        break
+                    self._batch += 1
+                    future = executor.submit(_evaluate_batch, self._search_id, root_snapshot, draw_limits,
+                                             self._leaf_tasks(leaves), self.playouts,
+                                             self.seed * 1000003 + self._batch)
+                    in_flight[future] = leaves
+                if not in_flight:
+                    if self._budget_exhausted():
+                        break
+                    continue
+                done, _ = wait(in_flight, timeout=REPORT_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._apply_results(in_flight.pop(future), future.result())
+                self._report()
+        finally:
+            # Незавершені пакети (скасування, ліміт) не потрібні - знімаємо віртуальні поразки
+            for future, leaves in in_flight.items():
+                future.cancel()
+                for leaf, _ in leaves:
+                    self._revert_virtual_loss(leaf)
+
+    def _select_leaves(self, count: int) -> List[Tuple[MCTSNode, List[Move]]]:
+        """
+        До count листів для оцінки. Кожен вибраний лист і шлях до нього отримують
+        віртуальну поразку (visits + 1 без значення), яку знімає _apply_results.
+        Кінцеві вузли оцінюються одразу без виконавця (і теж рахуються у nodes).
+        """
+        leaves = []
+        for _ in range(count * 4):
+            if len(leaves) == count:
+                break
+            selected = self._select_leaf()
+            if selected is None:
+                break
+            node, path = selected
+            self._max_depth = max(self._max_depth, len(path))
+            if node.terminal:
+                self.nodes += 1
+                self._backpropagate(node, node.terminal_value, virtual=False)
+                continue
+            node.pending = True
+            walk = node
+            while walk is not None:
+                walk.visits += 1
+                walk = walk.parent
+            leaves.append((node, path))
+        return leaves
+
+    @staticmethod
+    def _leaf_tasks(leaves: List[Tuple[MCTSNode, List[Move]]]) -> List[Tuple[List[Move], bool]]:
+        """Задачі виконавцям: шлях до листа і чи розширювати його (друге відвідування)"""
+        return [(path, node.evaluated) for node, path in leaves]
+
+    def _select_leaf(self) -> Optional[Tuple[MCTSNode, List[Move]]]:
+        """Спуск за UCT з прогресивним розширенням; None - усі шляхи чекають на виконавців"""
+        node, path = self.root, []
+        while node.moves is not None and not node.terminal:
+            if node.can_widen():
+                child = MCTSNode(node.moves[len(node.children)], node, node.to_move)
+                node.children.append(child)
+            else:
+                child = node.best_child()
+                if child is None:
+                    return None
+            node = child
+            path.append(node.move)
+        if node.pending or (node.moves is None and self.tree_moves >= MAX_TREE_MOVES):
+            return None
+        return node, path
+
+    def _apply_results(self, leaves: List[Tuple[MCTSNode, List[Move]]], results: List[LeafResult]):
+        """Розширення оцінених листів і зворотне поширення значень"""
+        for (node, _), result in zip(leaves, results):
+            node.pending = False
+            node.evaluated = True
+            node.moves = result.moves
+            node.to_move = result.to_move
+            node.key = result.key
+            node.terminal = result.terminal
+            node.terminal_value = result.value
+            if result.moves:
+                self.tree_moves += len(result.moves)
+            self.nodes += 1
+            self.playout_plies += result.plies
+            self._backpropagate(node, result.value, virtual=True)
+
+    def _backpropagate(self, node: MCTSNode, white_value: float, virtual: bool):
+        """Значення кожному вузлу шляху з точки зору його гравця; virtual - візит уже зараховано"""
+        while node is not None:
+            if not virtual:
+                node.visits += 1
+            node.value_sum += node.value_for(node.mover, white_value)
+            node = node.parent
+
+    def _revert_virtual_loss(self, node: MCTSNode):
+        node.pending = False
+        while node is not None:
+            node.visits -= 1
+            node = node.parent
+
+    def _budget_exhausted(self) -> bool:
+        if self._stop_requested:
+            return True
+        if self.tree_moves >= MAX_TREE_MOVES or self.root.terminal:
+            return True
+        if self.pondering:
+            return False
+        if self.node_limit is not None and self.nodes - self._node_base >= self.node_limit:
+            return True
+        return self.time_limit is not None and time.perf_counter() - self._limit_start >= self.time_limit
+
+    def _report(self):
+        self._last_report = time.perf_counter()
+        if self.on_iteration is not None:
+            self.on_iteration(self._collect_stats(self.root.most_visited_child()))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Пул процесів створюється при першому паралельному пошуку і живе до shutdown()"""
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker)
+        return self._executor
+
+    def _collect_stats(self, best: Optional[MCTSNode]) -> Dict[str, object]:
+        """Статистика пошуку на цю мить (ключі як у ChessAI; depth - найглибший лист)"""
+        elapsed = time.perf_counter() - self._start_time
+        return {
+            'depth': self._max_depth,
+            'nodes': self.nodes,
+            'time': elapsed,
+            'nps': self.nodes / elapsed if elapsed > 0 else 0.0,
+            'score': best.value_sum / best.visits if best is not None and best.visits else 0.5,
+            'best_move': best.move if best is not None else None,
+            'best_visits': best.visits if best is not None else 0,
+            'root_visits': self.root.visits,
+            'reused_visits': self.reused_visits,
+            'tree_moves': self.tree_moves,
+            'playout_plies': self.playout_plies,
+            'workers': self.workers,
+        }
+
+    def analyze(self, game_state, lines: int = ANALYSIS_LINES,
+                on_update: Optional[Callable[[List[AnalysisLine]], None]] = None,
+                time_limit: Optional[float] = ANALYSIS_TIME_LIMIT) -> List[AnalysisLine]:
+        """
+        Аналіз позиції (як ChessAI.analyze): lines найчастіше відвіданих ходів
+        кореня. on_update отримує рядки кожні REPORT_INTERVAL секунд.
+        """
+        limits = (self.time_limit, self.node_limit, self.on_iteration)
+        self.time_limit, self.node_limit = time_limit, None
+        if on_update is not None:
+            self.on_iteration = lambda stats: on_update(self._analysis_lines(lines))
+        self.pondering = False
+        try:
+            self.search(game_state)
+        finally:
+            self.time_limit, self.node_limit, self.on_iteration = limits
+        result = self._analysis_lines(lines)
+        if on_update is not None:
+            on_update(result)
+        return result
+
+    def _analysis_lines(self, lines: int) -> List[AnalysisLine]:
+        """Рядки аналізу з поточного дерева: шанс перемоги ходу і варіант за найбільш відвіданими нащадками"""
+        children = sorted((child for child in self.root.children if child.visits),
+                          key=lambda child: (child.visits, child.value_sum), reverse=True)
+        result = []
+        for child in children[:lines]:
+            pv, node = [child.move], child
+            while True:
+                node = node.most_visited_child()
+                if node is None or not node.visits:
+                    break
+                pv.append(node.move)
+            result.append(AnalysisLine(child.move, child.value_sum / child.visits, tuple(pv), len(pv)))
+        return result
+
+    def predict_reply(self, game_state) -> Optional[Move]:
+        """Очікувана відповідь суперника: найчастіше відвіданий хід у дереві, інакше - перший за впорядкуванням"""
+        if game_state.game_over:
+            return None
+        moves = game_state.generate_legal_moves()
+        if not moves:
+            return None
+        node = self._find_reusable(game_state.compute_state_hash())
+        best = node.most_visited_child() if node is not None else None
+        if best is not None and best.move in moves:
+            return best.move
+        return self.move_orderer.order_moves(game_state.board, moves, 0)[0]
+
+    def ponder_hit(self):
+        """Суперник зіграв передбачений хід: пондеринг стає звичайним пошуком (з іншого потоку)"""
+        self._node_base = self.nodes
+        self._limit_start = time.perf_counter()
+        self.pondering = False
+
+    def request_stop(self):
+        """Скасовує поточний пошук (з іншого потоку): повертається найкраще знайдене"""
+        self._stop_requested = True
+
+    def shutdown(self):
+        """Завершує процеси оцінки листів"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def get_search_stats(self) -> Dict[str, object]:
+        """Статистика останнього пошуку: листи, листи/с, час, шанс і відвідування найкращого ходу, дерево"""
+        return dict(self._search_stats)
+
+    def set_difficulty(self, level: int, deterministic: bool = False):
+        """
+        Рівень складності 1-5 задає ліміти часу і кількості оцінених листів.
+        deterministic - лише ліміт листів без ліміту часу (відтворюваний хід при workers = 1)
+        """
+        if level in DIFFICULTY_LIMITS:
+            self.time_limit, self.node_limit = DIFFICULTY_LIMITS[level]
+            if deterministic:
+                self.time_limit = None
+            self.deterministic = deterministic
+            game_logger.info(f"Встановлено рівень складності ШІ MCTS: {level} "
+                             f"(час: {self.time_limit} с, листів: {self.node_limit})")
+        else:
+            game_logger.warning(f"Некоректний рівень складності: {level}")
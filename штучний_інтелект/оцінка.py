@@ -1,472 +1,482 @@
-# -*- coding: utf-8 -*-
-
-"""from typing import Dict
-
-Модуль оцінки позиції для ШІ гри "Вершителі часу"from налаштування import PieceType, PieceColor
-
-from логування import game_logger
-
-Цей модуль відповідає за оцінку ігрових позицій та визначення переваги гравців.
-
-Використовується алгоритмом пошуку (minimax/alpha-beta) для вибору найкращих ходів.
-
-class PositionEvaluator:
-
-Архітектура:    """
-
-- PositionEvaluator: головний клас оцінки    ОНОВЛЕНІ ОЦІНКИ ФІГУР на основі детального аналізу правил та здібностей
-
-- PIECE_VALUES: базові оцінки фігур    
-
-- Методи оцінки: матеріал, позиція, мобільність, безпека короля, спеціальні здібності    Базова шкала: Пішак = 1.0
-
-    
-
-TODO для майбутньої реалізації:    Критерії оцінки:
-
-1. Позиційна оцінка (центр, розвиток, структура пішаків)    - Мобільність (кількість можливих ходів)
-
-2. Мобільність фігур (кількість можливих ходів)    - Атакуюча сила (радіус атаки, патерни)
-
-3. Безпека короля (атаки навколо, імунні зони)    - Спеціальні здібності (унікальні механіки)
-
-4. Контроль туманностей і телепортації    - Стратегічна цінність (вплив на гру)
-
-5. Оцінка паралізованих фігур    - Захисна функція
-
-6. Оцінка спеціальних здібностей (подвійний хід, воскресіння, обмін)    """
-
-7. Ендшпільна оцінка (король в атаці, просування пішаків)    
-
-"""    PIECE_VALUES = {
-
-        # === КЛАСИЧНІ ФІГУРИ ===
-
-from typing import Dict, Optional        PieceType.PAWN: 1.0,           # Базова одиниця
-
-from налаштування import PieceType, PieceColor        PieceType.KNIGHT: 3.2,         # L-ходи, перестрибування
-
-from логування import game_logger        PieceType.BISHOP: 3.5,         # Діагоналі необмежено
-
-        PieceType.ROOK: 5.5,           # Ортогоналі необмежено
-
-        PieceType.QUEEN: 10.0,         # Комбінація Тура+Слон
-
-class PositionEvaluator:        PieceType.KING: 1000.0,        # Безцінний (мат = програш)
-
-    """        
-
-    Клас для оцінки ігрових позицій.        # === УНІКАЛЬНІ ФІГУРИ (оновлені оцінки) ===
-
-            
-
-    Використовує багатофакторну оцінку:        # ШИТ - 3.0 (було 2.0)
-
-    1. Матеріальний баланс (найважливіше)        # + Рухається на 1-3 ортогонально
-
-    2. Позиційні фактори (розвиток, центр, структура)        # + Створює імунну зону 3×3 (захищає 8 клітинок!)
-
-    3. Тактичні фактори (атаки, загрози, мобільність)        # + Блокує ворожі атаки (крім Короля)
-
-    4. Спеціальні фактори (туманності, здібності)        # - Не атакує (тільки переміщення)
-
-            # = Висока захисна цінність, особливо в групі
-
-    Оцінка повертається з точки зору білих:        PieceType.SHIELD: 3.0,
-
-    - Позитивне значення = перевага білих        
-
-    - Негативне значення = перевага чорних        # ОКО - 3.5 (було 3.0)
-
-    - 0 = рівна позиція        # + Атакує ортогонально на 1 (базове)
-
-    """        # + Рухається діагонально 1-3
-
-            # + ПОСИЛЕННЯ через Тріумфатора: атака на 1-2, може "прослизнути" через ворога
-
-    # ============================================================================        # + Можливість стати дуже сильною в ендшпілі
-
-    # БАЗОВІ ОЦІНКИ ФІГУР (оновлено на основі детального аналізу)        # = Середня фігура з потенціалом зростання
-
-    # ============================================================================        PieceType.EYE: 3.5,
-
-    # Шкала: Пішак = 1.0        
-
-    # Оцінки враховують: мобільність, атаку, спецздібності, стратегічну цінність        # МІСЯЦЬ - 4.5 (було 4.0)
-
-    # ============================================================================        # + Ходи коня (L-подібні)
-
-            # + ПОДВІЙНИЙ ХІД: 1 раз за гру може зробити 2 ходи підряд!
-
-    PIECE_VALUES = {        # + Тактична бомба (раптові комбінації)
-
-        # === КЛАСИЧНІ ФІГУРИ ===        # + Висока мобільність
-
-        PieceType.PAWN: 1.0,           # Базова одиниця        # = Сильна тактична фігура з game-changing здібністю
-
-        PieceType.KNIGHT: 3.2,         # L-ходи, перестрибування        PieceType.MOON: 4.5,
-
-        PieceType.BISHOP: 3.5,         # Діагоналі необмежено        
-
-        PieceType.ROOK: 5.5,           # Ортогоналі необмежено        # ВСАДНИК - 5.0 (було 4.5)
-
-        PieceType.QUEEN: 10.0,         # Тура+Слон = найсильніша        # + Комбінація Коня + Офіцера з перестрибуванням
-
-        PieceType.KING: 1000.0,        # Безцінний (мат = програш)        # + L-ходи коня
-
-                # + Діагоналі з перестрибуванням ОДНОГО союзника
-
-        # === УНІКАЛЬНІ ФІГУРИ ===        # + ПОЛЮВАННЯ НА ДУШІ: може воскресити Коня/Слона/Всадника (1 раз за гру)
-
-        PieceType.SHIELD: 3.0,         # Імунна зона 3×3, захист        # + Дуже висока мобільність
-
-        PieceType.EYE: 3.5,            # Атака 1-2 (посилене), діагональний рух        # = Дуже сильна універсальна фігура з унікальною здібністю
-
-        PieceType.ARISTOCRAT: 4.0,     # Дипломатичний обмін, НЕ вбиває        PieceType.RIDER: 5.0,
-
-        PieceType.MOON: 4.5,           # L-ходи + подвійний хід (1 раз)        
-
-        PieceType.RIDER: 5.0,          # Кінь+Офіцер + воскресіння        # ХРАМ - 5.5 (було 5.5) ✓ правильно
-
-        PieceType.TEMPLE: 5.5,         # Стрибки + священний обмін        # + Ортогонально 1 + стрибки 2-3 вертикально, 2 горизонтально
-
-        PieceType.LIGHTNING: 6.5,      # L-атаки + електричний параліч        # + Може перестрибнути 1 ворога
-
-        PieceType.FURY: 7.5,           # Король+горизонталь 1-3        # + СВЯЩЕННИЙ ОБМІН: 1 раз за гру обмін з союзником (стратегічне переміщення)
-
-        PieceType.TRIUMPHATOR: 8.5,    # Паралізація замість вбивства        # + Не входить в імунні зони
-
-                # = Сильна фігура з унікальною мобільністю
-
-        # === ПОРОЖНЯ КЛІТИНКА ===        PieceType.TEMPLE: 5.5,
-
-        PieceType.EMPTY: 0.0        
-
-    }        # БЛИСКАВКА - 6.5 (було 6.0)
-
-            # + Діагоналі 1-2 (тільки ходи, не атаки)
-
-    # Ваги для різних компонентів оцінки        # + L-ПОДІБНІ АТАКИ: 3 діагональ + 1 перпендикуляр (дуже унікально!)
-
-    MATERIAL_WEIGHT = 1.0      # Матеріал (найважливіше)        # + ЕЛЕКТРИЧНИЙ ПАРАЛІЧ: хто захопить - паралізується на 2 ходи (крім Король/Блискавка)
-
-    POSITION_WEIGHT = 0.1      # Позиція фігур        # + Високий тактичний потенціал
-
-    MOBILITY_WEIGHT = 0.05     # Мобільність        # + Важко захопити без втрат
-
-    KING_SAFETY_WEIGHT = 0.3   # Безпека короля        # = Дуже сильна атакуюча фігура з унікальним патерном
-
-    CENTER_WEIGHT = 0.2        # Контроль центру        PieceType.LIGHTNING: 6.5,
-
-    NEBULA_WEIGHT = 0.15       # Контроль туманностей        
-
-            # АРИСТОКРАТ - 4.0 (було 4.0) ✓ правильно
-
-    def __init__(self):        # + Діагоналі 1-3
-
-        """Ініціалізація оцінювача з кешуванням"""        # + Ортогональні стрибки на 2
-
-        self._cache: Dict[int, float] = {}  # Кеш для оцінки позицій (хеш → оцінка)        # + ДИПЛОМАТИЧНИЙ ОБМІН: міняється місцями з будь-якою фігурою (союзник/ворог)
-
-        self._cache_hits = 0        # - НЕ вбиває (тільки обмін)
-
-        self._cache_misses = 0        # + Якщо обмін з ворожою Блискавкою - паралізується
-
-        game_logger.info("Ініціалізовано оцінювач позицій з кешуванням")        # + Обмеження: не може обміняти Короля на Короля
-
-            # = Унікальна стратегічна фігура, але не атакує
-
-    def evaluate_position(self, game_state) -> float:        PieceType.ARISTOCRAT: 4.0,
-
-        """        
-
-        Головний метод оцінки позиції.        # ФУРІЯ - 7.5 (було 9.0)
-
-                # + Атакує на 1 у всі боки (як Король)
-
-        Args:        # + Рухається ГОРИЗОНТАЛЬНО 1-3 клітинки
-
-            game_state: Поточний стан гри        # - Обмежена вертикальна мобільність (тільки атака)
-
-                    # = Сильна горизонтальна фігура, але не 9.0
-
-        Returns:        PieceType.FURY: 7.5,
-
-            float: Оцінка позиції (+ білі, - чорні)        
-
-        """        # ТРІУМФАТОР - 8.5 (було 10.0)
-
-        # Використовуємо хеш дошки для кешування        # + Діагоналі 1-2, ортогоналі 1-2, вертикаль 1-3
-
-        board_hash = game_state.board.position_hash        # + ПАРАЛІЗАЦІЯ замість вбивства: ціль паралізується на 2-3 ходи
-
-                # + Може паралізувати Короля (але не Блискавку/Щит)
-
-        if board_hash in self._cache:        # + Паралізований Король під шахом = МАТ!
-
-            self._cache_hits += 1        # + Зв'язок з Очима (посилення)
-
-            return self._cache[board_hash]        # - НЕ вбиває (фігура залишається на дошці)
-
-                # = Дуже сильна контрольна фігура, але не сильніша за Ферзя
-
-        self._cache_misses += 1        PieceType.TRIUMPHATOR: 8.5,
-
-                
-
-        # Перевірка на мат/пат        # ПОРОЖНЯ КЛІТИНКА
-
-        if game_state.game_over:        PieceType.EMPTY: 0.0
-
-            if game_state.winner == 'white':    }
-
-                score = 10000.0  # Білі виграли
-
-            elif game_state.winner == 'black':    def __init__(self):
-
-                score = -10000.0  # Чорні виграли        self._cache = {}  # Кеш для оцінки позицій
-
-            else:  # 'draw'        game_logger.info("Ініціалізовано оцінювач позицій з кешуванням")
-
-                score = 0.0  # Нічия
-
-            self._cache[board_hash] = score    def evaluate_position(self, game_state) -> float:
-
-            return score        # Використовуємо хеш дошки для кешування
-
-                board_hash = game_state.board.position_hash
-
-        # Комплексна оцінка        if board_hash in self._cache:
-
-        score = 0.0            return self._cache[board_hash]
-
-        
-
-        # 1. Матеріальний баланс (найважливіше)        score = 0.0
-
-        material_score = self._calculate_material(game_state)        material_score = self._calculate_material(game_state)
-
-        score += material_score * self.MATERIAL_WEIGHT        position_score = self._calculate_position(game_state)
-
-                center_score = self._calculate_center_control(game_state)
-
-        # 2. Позиційна оцінка (TODO: реалізувати детально)        king_safety = self._calculate_king_safety(game_state)
-
-        position_score = self._calculate_position(game_state)        score = material_score + position_score * 0.1 + center_score * 0.2 + king_safety * 0.3
-
-        score += position_score * self.POSITION_WEIGHT        
-
-                self._cache[board_hash] = score
-
-        # 3. Контроль центру (TODO: реалізувати детально)        return score
-
-        center_score = self._calculate_center_control(game_state)
-
-        score += center_score * self.CENTER_WEIGHT    def _calculate_material(self, game_state) -> float:
-
-                white_material = 0.0
-
-        # 4. Безпека короля (TODO: реалізувати детально)        black_material = 0.0
-
-        king_safety = self._calculate_king_safety(game_state)        for row in range(len(game_state.board)):
-
-        score += king_safety * self.KING_SAFETY_WEIGHT            for col in range(len(game_state.board[row])):
-
-                        piece = game_state.board[row][col]
-
-        # Кешуємо результат                if not piece.is_empty():
-
-        self._cache[board_hash] = score                    value = self.PIECE_VALUES.get(piece.type, 0)
-
-        return score                    if piece.color == PieceColor.WHITE:
-
-                            white_material += value
-
-    def _calculate_material(self, game_state) -> float:                    else:
-
-        """                        black_material += value
-
-        Розраховує матеріальний баланс.        return white_material - black_material
-
-        
-
-        Базова оцінка: підраховує вартість усіх фігур на дошці.    def _calculate_position(self, game_state) -> float:
-
-                return 0.0
-
-        TODO для покращення:
-
-        - Бонус за пару слонів    def _calculate_center_control(self, game_state) -> float:
-
-        - Штраф за подвоєні пішаки        center_squares = [
-
-        - Бонус за посилене Око            (8, 8), (8, 9), (8, 10), (8, 11),
-
-        - Оцінка паралізованих фігур (зменшена цінність)            (9, 8), (9, 9), (9, 10), (9, 11),
-
-                    (10, 8), (10, 9), (10, 10), (10, 11),
-
-        Returns:            (11, 8), (11, 9), (11, 10), (11, 11)
-
-            float: Різниця матеріалу (білі - чорні)        ]
-
-        """        white_control = 0
-
-        white_material = 0.0        black_control = 0
-
-        black_material = 0.0        for row, col in center_squares:
-
-                    piece = game_state.board[row][col]
-
-        # Отримуємо всі фігури на дошці            if not piece.is_empty():
-
-        all_pieces = game_state.board.get_all_pieces()                if piece.color == PieceColor.WHITE:
-
-                            white_control += 1
-
-        for row, col, piece in all_pieces:                else:
-
-            if piece.is_empty():                    black_control += 1
-
-                continue        return white_control - black_control
-
-            
-
-            # Базова вартість фігури    def _calculate_king_safety(self, game_state) -> float:
-
-            value = self.PIECE_VALUES.get(piece.type, 0.0)        return 0.0
-
-            
-            # TODO: Додати бонуси/штрафи
-            # - Посилене Око: +0.5
-            # - Паралізована фігура: -50% цінності
-            # - Фігура в туманності під таймером: -20%
-            
-            if piece.color == PieceColor.WHITE:
-                white_material += value
-            else:
-                black_material += value
-        
-        return white_material - black_material
-    
-    def _calculate_position(self, game_state) -> float:
-        """
-        Розраховує позиційну оцінку.
-        
-        TODO: Реалізувати:
-        - Розвиток фігур (чи вийшли з початкових позицій)
-        - Структура пішаків (подвоєні, ізольовані, прохідні)
-        - Відкриті лінії для тур
-        - Діагоналі для слонів
-        - Аванпости для коней
-        - Контроль ключових полів
-        
-        Returns:
-            float: Позиційна оцінка
-        """
-        # ЗАГЛУШКА: базова реалізація
-        return 0.0
-    
-    def _calculate_center_control(self, game_state) -> float:
-        """
-        Розраховує контроль центру дошки.
-        
-        Центр: клітинки (8-11, 8-11) - 16 центральних полів
-        
-        TODO: Покращення:
-        - Зважений контроль (атаковані клітинки)
-        - Розширений центр
-        - Контроль через пішаків (вища вага)
-        
-        Returns:
-            float: Оцінка контролю центру
-        """
-        # ЗАГЛУШКА: базова реалізація
-        center_squares = [
-            (8, 8), (8, 9), (8, 10), (8, 11),
-            (9, 8), (9, 9), (9, 10), (9, 11),
-            (10, 8), (10, 9), (10, 10), (10, 11),
-            (11, 8), (11, 9), (11, 10), (11, 11)
-        ]
-        
-        white_control = 0
-        black_control = 0
-        
-        for row, col in center_squares:
-            piece = game_state.board.get_piece_at(row, col)
-            if piece and not piece.is_empty():
-                if piece.color == PieceColor.WHITE:
-                    white_control += 1
-                else:
-                    black_control += 1
-        
-        return float(white_control - black_control)
-    
-    def _calculate_king_safety(self, game_state) -> float:
-        """
-        Розраховує безпеку королів.
-        
-        TODO: Реалізувати:
-        - Щити навколо короля (імунні зони)
-        - Пішакова структура біля короля
-        - Відкриті лінії атак на короля
-        - Наближеність ворожих фігур
-        - Король під шахом (велика загроза)
-        - Паралізований король (критична загроза)
-        - Можливість рокіровки (немає в цій грі, але є телепортація)
-        
-        Returns:
-            float: Оцінка безпеки королів
-        """
-        # ЗАГЛУШКА: базова реалізація
-        return 0.0
-    
-    def _calculate_mobility(self, game_state) -> float:
-        """
-        Розраховує мобільність фігур.
-        
-        TODO: Реалізувати:
-        - Підрахунок кількості легальних ходів для кожного кольору
-        - Зважена мобільність (різні фігури мають різну вагу)
-        - Мобільність в критичних зонах (центр, атака на короля)
-        
-        Returns:
-            float: Оцінка мобільності
-        """
-        # ЗАГЛУШКА
-        return 0.0
-    
-    def _calculate_special_abilities(self, game_state) -> float:
-        """
-        Оцінює спеціальні здібності та механіки гри.
-        
-        TODO: Реалізувати оцінку:
-        - Туманності: контроль, блокування, телепортація
-        - Паралізовані фігури: зменшена цінність
-        - Доступні обміни (Храм, Аристократ): стратегічна цінність
-        - Подвійний хід Місяця: доступний/використаний
-        - Воскресіння Всадником: можливість повернути фігури
-        - Посилені Очі: збільшена атакуюча сила
-        - Душі на полюванні: прогрес до воскресіння
-        
-        Returns:
-            float: Оцінка спеціальних здібностей
-        """
-        # ЗАГЛУШКА
-        return 0.0
-    
-    def clear_cache(self):
-        """Очищує кеш оцінок (викликати при новій грі)"""
-        self._cache.clear()
-        game_logger.info(f"Кеш очищено. Статистика: {self._cache_hits} hits, {self._cache_misses} misses")
-        self._cache_hits = 0
-        self._cache_misses = 0
-    
-    def get_cache_stats(self) -> Dict[str, int]:
-        """Повертає статистику використання кешу"""
-        return {
-            'size': len(self._cache),
-            'hits': self._cache_hits,
-            'misses': self._cache_misses,
-            'hit_rate': self._cache_hits / max(1, self._cache_hits + self._cache_misses)
-        }
+# -*- coding: utf-8 -*-
+
+"""
+Модуль оцінки позиції для ШІ гри "Вершителі часу"
+
+Цей модуль відповідає за оцінку ігрових позицій та визначення переваги гравців.
+Використовується алгоритмом пошуку (minimax/alpha-beta) для вибору найкращих ходів.
+
+Архітектура:
+- PositionEvaluator: головний клас оцінки
+- PIECE_VALUES: базові оцінки фігур
+- Методи оцінки: матеріал, позиція, мобільність, безпека короля, спеціальні здібності
+
+Позиційні терми (розвиток, контроль центру, безпека короля) - таблиці ваг
+клітинок 22×20 для кожного типу та кольору фігури (square_tables), які можна
+завантажити з файлу .npz (наприклад, після офлайн-налаштування). Повна сума -
+один векторний gather по Board.mailbox через індекс таблиці за ID фігури
+(Board.gather_square_score).
+
+Ваги оцінки (цінності фігур, бонуси спеціальних здібностей і таблиці клітинок)
+підбирає офлайн підбір_ваг.py (Texel-налаштування за результатами партій) і
+зберігає у файл EVALUATION_WEIGHTS_FILE, який оцінювач завантажує, якщо він є.
+
+ОПТИМІЗАЦІЯ: Інкрементальна оцінка. Матеріал, ваги клітинок
+та посилені фігури - накопичувачі Board (piece_counts, square_score,
+enhanced_counts), які оновлюються дельтами в set_piece/clear_square/move_piece
+і відновлюються разом зі знімком. Решта спеціальних термів - прапорці стану
+гри. Тож оцінка листа - O(1) без сканування дошки; verify_incremental()
+звіряє накопичувачі з повним перерахунком.
+
+TODO для майбутньої реалізації:
+1. Структура пішаків (подвоєні, ізольовані, прохідні)
+2. Мобільність фігур (кількість можливих ходів)
+3. Безпека короля (атаки навколо, імунні зони)
+4. Контроль туманностей і телепортації
+5. Оцінка паралізованих фігур
+6. Оцінка спеціальних здібностей (подвійний хід, воскресіння, обмін)
+7. Ендшпільна оцінка (король в атаці, просування пішаків)
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from налаштування import PieceType, PieceColor, BOARD_ROWS, BOARD_COLS
+from дошка import PIECE_ID_COLORS
+from стан_гри import TEMPLE_SWAP_KEYS
+from логування import game_logger
+
+# Центр дошки: клітинки (8-11, 8-11) - 16 центральних полів
+CENTER_ROWS = slice(8, 12)
+CENTER_COLS = slice(8, 12)
+
+# Ігрове поле без туманностей: рядки 1-20, колонки 1-18; домашній рядок білих - 20
+PLAY_ROWS = slice(1, BOARD_ROWS - 1)
+PLAY_COLS = slice(1, BOARD_COLS - 1)
+WHITE_HOME_ROW = BOARD_ROWS - 2
+
+# Форма таблиць ваг клітинок: [колір (0 - білі, 1 - чорні), тип, рядок, колонка]
+SQUARE_TABLES_SHAPE = (2, len(PieceType), BOARD_ROWS, BOARD_COLS)
+# Налаштовані таблиці завантажуються з цього файлу, якщо він існує
+SQUARE_TABLES_FILE = Path(__file__).parent / "таблиці_клітинок.npz"
+# Підібрані ваги оцінки (підбір_ваг.py): масиви piece_values, bonuses, tables
+EVALUATION_WEIGHTS_FILE = Path(__file__).parent / "ваги_оцінки.npz"
+
+# Бонуси спеціальних здібностей у порядку PositionEvaluator.special_features і масиву bonuses
+SPECIAL_BONUSES = ('ENHANCED_EYE_BONUS', 'MOON_DOUBLE_MOVE_BONUS', 'TEMPLE_SWAP_BONUS')
+
+# Фігури-стрибуни, яким вигідна централізація
+JUMPER_TYPES = (PieceType.KNIGHT, PieceType.MOON, PieceType.LIGHTNING, PieceType.RIDER)
+
+# Допуск звірки накопичувачів з повним перерахунком (сума float)
+VERIFY_TOLERANCE = 1e-6
+
+
+def _color_index(color: PieceColor) -> int:
+    """Індекс кольору в накопичувачах Board: 0 - білі, 1 - чорні"""
+    return 0 if color == PieceColor.WHITE else 1
+
+
+def _play_area_mask() -> np.ndarray:
+    """Маска ігрового поля 22×20 (без рамки з туманностями)"""
+    mask = np.zeros((BOARD_ROWS, BOARD_COLS), dtype=bool)
+    mask[PLAY_ROWS, PLAY_COLS] = True
+    return mask
+
+
+class PositionEvaluator:
+    """
+    Клас для оцінки ігрових позицій.
+
+    Використовує багатофакторну оцінку:
+    1. Матеріальний баланс (найважливіше)
+    2. Позиційні фактори (розвиток, центр, структура)
+    3. Тактичні фактори (атаки, загрози, мобільність)
+    4. Спеціальні фактори (туманності, здібності)
+
+    Оцінка повертається з точки зору білих:
+    - Позитивне значення = перевага білих
+    - Негативне значення = перевага чорних
+    - 0 = рівна позиція
+    """
+
+
+    # ============================================================================
+    # БАЗОВІ ОЦІНКИ ФІГУР (оновлено на основі детального аналізу)
+    # ============================================================================
+    # Шкала: Пішак = 1.0
+    # Оцінки враховують: мобільність, атаку, спецздібності, стратегічну цінність
+    # ============================================================================
+
+    PIECE_VALUES = {
+        # === КЛАСИЧНІ ФІГУРИ ===
+        PieceType.PAWN: 1.0,           # Базова одиниця
+        PieceType.KNIGHT: 3.2,         # L-ходи, перестрибування
+        PieceType.BISHOP: 3.5,         # Діагоналі необмежено
+        PieceType.ROOK: 5.5,           # Ортогоналі необмежено
+        PieceType.QUEEN: 10.0,         # Тура+Слон = найсильніша
+        PieceType.KING: 1000.0,        # Безцінний (мат = програш)
+
+        # === УНІКАЛЬНІ ФІГУРИ ===
+        PieceType.SHIELD: 3.0,         # Імунна зона 3×3, захист
+        PieceType.EYE: 3.5,            # Атака 1-2 (посилене), діагональний рух
+        PieceType.ARISTOCRAT: 4.0,     # Дипломатичний обмін, НЕ вбиває
+        PieceType.MOON: 4.5,           # L-ходи + подвійний хід (1 раз)
+        PieceType.RIDER: 5.0,          # Кінь+Офіцер + воскресіння
+        PieceType.TEMPLE: 5.5,         # Стрибки + священний обмін
+        PieceType.LIGHTNING: 6.5,      # L-атаки + електричний параліч
+        PieceType.FURY: 7.5,           # Король+горизонталь 1-3
+        PieceType.TRIUMPHATOR: 8.5,    # Паралізація замість вбивства
+
+        # === ПОРОЖНЯ КЛІТИНКА ===
+        PieceType.EMPTY: 0.0
+    }
+
+    # Ваги для різних компонентів оцінки
+    MATERIAL_WEIGHT = 1.0      # Матеріал (найважливіше)
+    POSITION_WEIGHT = 0.1      # Позиція фігур
+    MOBILITY_WEIGHT = 0.05     # Мобільність
+    KING_SAFETY_WEIGHT = 0.3   # Безпека короля
+    CENTER_WEIGHT = 0.2        # Контроль центру
+    NEBULA_WEIGHT = 0.15       # Контроль туманностей
+    SPECIAL_WEIGHT = 1.0       # Спеціальні здібності
+
+    # Бонуси спеціальних здібностей (у пішаках)
+    ENHANCED_EYE_BONUS = 0.5        # Посилене Око на дошці
+    MOON_DOUBLE_MOVE_BONUS = 0.3    # Подвійний хід Місяця ще доступний
+    TEMPLE_SWAP_BONUS = 0.2         # Невикористаний священний обмін Храму
+
+    def __init__(self, square_tables_path: Optional[Path] = None, weights_path: Optional[Path] = None):
+        """
+        Ініціалізація оцінювача: вектор цінностей і таблиці ваг клітинок.
+
+        Args:
+            square_tables_path: файл .npz з таблицями; за замовчуванням SQUARE_TABLES_FILE,
+                а якщо його немає - вбудовані таблиці
+            weights_path: файл підібраних ваг (цінності, бонуси, таблиці); за замовчуванням
+                EVALUATION_WEIGHTS_FILE, якщо він існує
+        """
+        self.set_piece_values(self.PIECE_VALUES)
+
+        self.evaluations = 0
+        if square_tables_path is None and SQUARE_TABLES_FILE.exists():
+            square_tables_path = SQUARE_TABLES_FILE
+        if square_tables_path is not None:
+            self.load_square_tables(square_tables_path)
+        else:
+            self.set_square_tables(self.build_default_square_tables())
+        if weights_path is None and EVALUATION_WEIGHTS_FILE.exists():
+            weights_path = EVALUATION_WEIGHTS_FILE
+        if weights_path is not None:
+            self.load_weights(weights_path)
+        game_logger.info("Ініціалізовано оцінювач позицій з інкрементальними накопичувачами")
+
+    def set_piece_values(self, piece_values: Dict[PieceType, float]):
+        """
+        Цінності фігур оцінювача (власна копія PIECE_VALUES - її ж бачать
+        впорядкування ходів і статичний розмін) і вектор для piece_counts
+        """
+        self.PIECE_VALUES = dict(piece_values)
+        # Цінності фігур, індексовані PieceType (для скалярного добутку з piece_counts)
+        self.piece_value_vector = np.zeros(len(PieceType), dtype=np.float64)
+        for piece_type, value in self.PIECE_VALUES.items():
+            self.piece_value_vector[piece_type] = value
+
+    # ------------------------------------------------------------------
+    # Таблиці ваг клітинок
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build_default_square_tables(cls) -> np.ndarray:
+        """
+        Вбудовані таблиці ваг клітинок з точки зору власника фігури:
+        позиція (POSITION_WEIGHT) + центр (CENTER_WEIGHT) + безпека короля
+        (KING_SAFETY_WEIGHT). Таблиці чорних - дзеркало таблиць білих по рядках.
+        """
+        white = (cls._position_table() * cls.POSITION_WEIGHT
+                 + cls._center_control_table() * cls.CENTER_WEIGHT
+                 + cls._king_safety_table() * cls.KING_SAFETY_WEIGHT)
+        tables = np.zeros(SQUARE_TABLES_SHAPE, dtype=np.float64)
+        tables[0] = white
+        tables[1] = white[:, ::-1, :]
+        return tables
+
+    @staticmethod
+    def _position_table() -> np.ndarray:
+        """
+        Позиційна таблиця білих [тип, рядок, колонка]:
+        - пішак: просування від домашнього рядка (0.5 за рядок);
+        - стрибуни: відстань від краю ігрового поля (до 4).
+
+        TODO: Покращення:
+        - Відкриті лінії для тур, діагоналі для слонів
+        - Аванпости для коней
+        """
+        table = np.zeros((len(PieceType), BOARD_ROWS, BOARD_COLS), dtype=np.float64)
+        rows, cols = np.mgrid[0:BOARD_ROWS, 0:BOARD_COLS]
+
+        advance = np.clip(WHITE_HOME_ROW - 1 - rows, 0, None)
+        table[PieceType.PAWN, PLAY_ROWS, PLAY_COLS] = 0.5 * advance[PLAY_ROWS, PLAY_COLS]
+
+        edge_distance = np.minimum(np.minimum(rows - 1, WHITE_HOME_ROW - rows),
+                                   np.minimum(cols - 1, BOARD_COLS - 2 - cols))
+        centralization = np.clip(edge_distance, 0, 4)[PLAY_ROWS, PLAY_COLS]
+        for piece_type in JUMPER_TYPES:
+            table[piece_type, PLAY_ROWS, PLAY_COLS] = centralization
+        return table
+
+    @staticmethod
+    def _center_control_table() -> np.ndarray:
+        """
+        Контроль центру [тип, рядок, колонка]: кожна фігура на клітинках
+        (8-11, 8-11) дає +1.
+
+        TODO: Покращення:
+        - Зважений контроль (атаковані клітинки)
+        - Розширений центр
+        """
+        table = np.zeros((len(PieceType), BOARD_ROWS, BOARD_COLS), dtype=np.float64)
+        table[:, CENTER_ROWS, CENTER_COLS] = 1.0
+        table[PieceType.EMPTY] = 0.0
+        return table
+
+    @staticmethod
+    def _king_safety_table() -> np.ndarray:
+        """
+        Безпека короля білих [тип, рядок, колонка]: штраф -0.5 за кожен рядок
+        від домашнього (до -2), король у туманності - максимальний штраф.
+
+        TODO: Реалізувати:
+        - Щити навколо короля (імунні зони)
+        - Відкриті лінії атак на короля, наближеність ворожих фігур
+        """
+        table = np.zeros((len(PieceType), BOARD_ROWS, BOARD_COLS), dtype=np.float64)
+        rows = np.arange(BOARD_ROWS)[:, None]
+        king = -0.5 * np.clip(WHITE_HOME_ROW - rows, 0, 4) * np.ones(BOARD_COLS)
+        king[~_play_area_mask()] = -2.0
+        table[PieceType.KING] = king
+        return table
+
+    def set_square_tables(self, square_tables: np.ndarray):
+        """
+        Задає таблиці ваг клітинок (з точки зору власника фігури) і будує
+        знакові ваги для накопичувача дошки (ваги чорних від'ємні).
+        """
+        square_tables = np.asarray(square_tables, dtype=np.float64)
+        if square_tables.shape != SQUARE_TABLES_SHAPE:
+            raise ValueError(f"Таблиці ваг клітинок мають форму {SQUARE_TABLES_SHAPE}, "
+                             f"отримано {square_tables.shape}")
+        self.square_tables = square_tables.copy()
+        self.square_tables[:, PieceType.EMPTY] = 0.0
+        # Новий об'єкт масиву - дошки з попередніми вагами перерахуються при _attach
+        self.square_weights = self.square_tables * np.array([1.0, -1.0])[:, None, None, None]
+
+    def load_square_tables(self, path: Path):
+        """Завантажує таблиці ваг клітинок з файлу .npz (масив 'tables')"""
+        with np.load(path) as data:
+            self.set_square_tables(data['tables'])
+        game_logger.info(f"Завантажено таблиці ваг клітинок: {path}")
+
+    def save_square_tables(self, path: Path):
+        """Зберігає таблиці ваг клітинок у файл .npz (масив 'tables')"""
+        np.savez_compressed(path, tables=self.square_tables)
+        game_logger.info(f"Збережено таблиці ваг клітинок: {path}")
+
+    def load_weights(self, path: Path):
+        """Завантажує підібрані ваги з файлу .npz (масиви piece_values, bonuses, tables)"""
+        with np.load(path) as data:
+            piece_values, bonuses, tables = data['piece_values'], data['bonuses'], data['tables']
+        if piece_values.shape != (len(PieceType),) or bonuses.shape != (len(SPECIAL_BONUSES),):
+            raise ValueError(f"Несумісний файл ваг оцінки {path}: цінності {piece_values.shape}, "
+                             f"бонуси {bonuses.shape}")
+        self.set_square_tables(tables)
+        self.set_piece_values({piece_type: float(piece_values[piece_type]) for piece_type in PieceType})
+        for name, value in zip(SPECIAL_BONUSES, bonuses):
+            setattr(self, name, float(value))
+        game_logger.info(f"Завантажено ваги оцінки: {path}")
+
+    def save_weights(self, path: Path):
+        """Зберігає цінності фігур, бонуси і таблиці ваг клітинок у файл .npz"""
+        np.savez_compressed(path, piece_values=self.piece_value_vector,
+                            bonuses=np.array([getattr(self, name) for name in SPECIAL_BONUSES]),
+                            tables=self.square_tables)
+        game_logger.info(f"Збережено ваги оцінки: {path}")
+
+    def _attach(self, board):
+        """Під'єднує таблиці ваг до дошки (один повний перерахунок на дошку)"""
+        if board.square_weights is not self.square_weights:
+            board.set_square_weights(self.square_weights)
+
+    # ------------------------------------------------------------------
+    # Оцінка
+    # ------------------------------------------------------------------
+
+    def evaluate_position(self, game_state) -> float:
+        """
+        Головний метод оцінки позиції.
+
+        Args:
+            game_state: Поточний стан гри
+
+        Returns:
+            float: Оцінка позиції (+ білі, - чорні)
+        """
+        self.evaluations += 1
+
+        # Перевірка на мат/пат
+        if game_state.game_over:
+            if game_state.winner == 'white':
+                return 10000.0  # Білі виграли
+            elif game_state.winner == 'black':
+                return -10000.0  # Чорні виграли
+            return 0.0  # Нічия
+
+        self._attach(game_state.board)
+
+        # Комплексна оцінка
+        score = 0.0
+
+        # 1. Матеріальний баланс (найважливіше)
+        material_score = self._calculate_material(game_state)
+        score += material_score * self.MATERIAL_WEIGHT
+
+        # 2. Таблиці ваг клітинок: позиція, центр, безпека короля (ваги вже в таблицях)
+        score += self._calculate_square_tables(game_state)
+
+        # 3. Спеціальні здібності
+        special_score = self._calculate_special_abilities(game_state)
+        score += special_score * self.SPECIAL_WEIGHT
+
+        return score
+
+    def _calculate_material(self, game_state) -> float:
+        """
+        Розраховує матеріальний баланс з накопичувача piece_counts дошки - O(1).
+
+        TODO для покращення:
+        - Бонус за пару слонів
+        - Штраф за подвоєні пішаки
+        - Оцінка паралізованих фігур (зменшена цінність)
+
+        Returns:
+            float: Різниця матеріалу (білі - чорні)
+        """
+        counts = game_state.board.piece_counts
+        return float(self.piece_value_vector @ (counts[0] - counts[1]))
+
+    def _calculate_square_tables(self, game_state) -> float:
+        """
+        Сума ваг клітинок усіх фігур з накопичувача square_score дошки - O(1).
+        Повний перерахунок - evaluate_square_tables().
+
+        Returns:
+            float: Позиційна оцінка (білі - чорні)
+        """
+        return float(game_state.board.square_score)
+
+    def evaluate_square_tables(self, board) -> float:
+        """Повна сума ваг клітинок одним векторним gather по mailbox (без накопичувача)"""
+        return board.gather_square_score(self.square_weights)
+
+    def _calculate_mobility(self, game_state) -> float:
+        """
+        Розраховує мобільність фігур.
+
+        TODO: Реалізувати:
+        - Підрахунок кількості легальних ходів для кожного кольору
+        - Зважена мобільність (різні фігури мають різну вагу)
+        - Мобільність в критичних зонах (центр, атака на короля)
+
+        Returns:
+            float: Оцінка мобільності
+        """
+        # ЗАГЛУШКА
+        return 0.0
+
+    def _calculate_special_abilities(self, game_state) -> float:
+        """
+        Оцінює спеціальні здібності та механіки гри - O(1):
+        - Посилені Очі (накопичувач enhanced_counts дошки)
+        - Подвійний хід Місяця: доступний, поки не використаний і Місяць на дошці
+        - Невикористані священні обміни Храмів, поки Храм на дошці
+
+        TODO: Реалізувати оцінку:
+        - Туманності: контроль, блокування, телепортація
+        - Паралізовані фігури: зменшена цінність
+        - Воскресіння Всадником: можливість повернути фігури
+        - Душі на полюванні: прогрес до воскресіння
+
+        Returns:
+            float: Оцінка спеціальних здібностей
+        """
+        eyes, moons, temples = self.special_features(game_state)
+        return (self.ENHANCED_EYE_BONUS * eyes + self.MOON_DOUBLE_MOVE_BONUS * moons
+                + self.TEMPLE_SWAP_BONUS * temples)
+
+    @staticmethod
+    def special_features(game_state) -> Tuple[float, float, float]:
+        """
+        Різниці (білі - чорні) ознак спеціальних здібностей у порядку SPECIAL_BONUSES:
+        посилені Очі, доступні подвійні ходи Місяця, невикористані обміни Храмів
+        """
+        board = game_state.board
+        enhanced = board.enhanced_counts
+        eyes = float(enhanced[0] - enhanced[1])
+
+        moons = 0.0
+        for color, sign in ((PieceColor.WHITE, 1.0), (PieceColor.BLACK, -1.0)):
+            color_name = 'white' if color == PieceColor.WHITE else 'black'
+            if (not game_state.moon_double_move_used.get(color_name, False)
+                    and board.piece_counts[_color_index(color), PieceType.MOON] > 0):
+                moons += sign
+
+        temples = 0.0
+        for temple_id, swap_key in TEMPLE_SWAP_KEYS.items():
+            if not game_state.temple_swap_used.get(swap_key, False) and temple_id in board.position_by_id:
+                temples += float(PIECE_ID_COLORS[temple_id])
+
+        return eyes, moons, temples
+
+    def verify_incremental(self, game_state) -> List[Tuple[str, float, float]]:
+        """
+        Звіряє накопичувачі дошки з повним перерахунком по всіх фігурах.
+
+        Returns:
+            List[Tuple[str, float, float]]: розбіжності (терм, накопичене, перераховане);
+            порожній список - накопичувачі узгоджені
+        """
+        board = game_state.board
+        self._attach(board)
+
+        counts = np.zeros_like(board.piece_counts)
+        enhanced = np.zeros_like(board.enhanced_counts)
+        for row, col, piece in board.get_all_pieces():
+            color_index = _color_index(piece.color)
+            counts[color_index, piece.type] += 1
+            if board.enhanced[piece.id]:
+                enhanced[color_index] += 1
+        square_score = self.evaluate_square_tables(board)
+
+        mismatches = []
+        for piece_type in PieceType:
+            for color_index in range(2):
+                actual = int(board.piece_counts[color_index, piece_type])
+                expected = int(counts[color_index, piece_type])
+                if actual != expected:
+                    mismatches.append((f"piece_counts[{color_index}, {piece_type.name}]", actual, expected))
+        for color_index in range(2):
+            if board.enhanced_counts[color_index] != enhanced[color_index]:
+                mismatches.append((f"enhanced_counts[{color_index}]",
+                                   int(board.enhanced_counts[color_index]), int(enhanced[color_index])))
+        if abs(board.square_score - square_score) > VERIFY_TOLERANCE:
+            mismatches.append(("square_score", float(board.square_score), float(square_score)))
+
+        if mismatches:
+            game_logger.warning(f"Інкрементальна оцінка розійшлася з перерахунком: {mismatches}")
+        return mismatches
+
+    def get_stats(self) -> Dict[str, int]:
+        """Повертає кількість оцінок позицій"""
+        return {'evaluations': self.evaluations}
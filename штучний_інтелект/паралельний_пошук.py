@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+Паралельний пошук у корені для ШІ гри "Вершителі часу"
+
+Ходи кореня кожної ітерації поглиблення розподіляються між процесами
+ProcessPoolExecutor (по черзі, щоб кожен процес отримав і сильні, і слабкі ходи):
+- кожен процес має власну копію позиції (знімок стану) і власний ChessAI з
+  евристиками впорядкування, що живуть між пошуками; таблиця транспозицій
+  одна на всіх - процеси під'єднуються до спільної пам'яті ChessAI-творця,
+  тож запис одного процесу відсікає повторну роботу іншого;
+- процеси шукають з вікном (спільна альфа, +∞): найкраща оцінка кореня лежить
+  у спільній пам'яті, тож хід, гірший за вже знайдений іншим процесом, відсікається;
+- спільний прапорець зупинки перериває всіх (ліміт часу, скасування) -
+  перервана ітерація відкидається, як і в послідовному пошуку.
+
+Процеси стартують методом spawn (безпечно поряд з потоками Qt) і створюються
+один раз на ChessAI. Паралельність 1 пул не використовує - пошук послідовний
+і детермінований.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from розташування_фігур import Move
+from логування import set_quiet_mode
+from .алгоритм import ChessAI, SearchTimeout, INFINITY_SCORE, MAX_QUIESCENCE_DEPTH
+from .транспозиції import TranspositionTable
+from .таблиці_ендшпілю import EndgameTablebases
+
+# Як часто головний процес перевіряє скасування, чекаючи на процеси (секунди)
+_POLL_INTERVAL = 0.05
+
+
+class RootChunkResult(NamedTuple):
+    """Результат процесу: найкращий з його ходів кореня та лічильники пошуку"""
+    best_index: Optional[int]   # Індекс ходу в списку кореня (None - жоден не покращив альфа)
+    best_score: float
+    completed: bool             # False - процес перервано до кінця своїх ходів
+    nodes: int
+    tt_probes: int
+    tt_hits: int
+    cutoffs: int
+    first_move_cutoffs: int
+    pruning_counts: Dict[str, int]   # Лічильники вибіркових відсікань (ChessAI.pruning_counts)
+    search_counters: Dict[str, float]   # Вузли форсованого пошуку, відсікання таблицею, час складників
+
+
+# Стан процесу-виконавця (ініціалізується _init_worker)
+_worker_ai: Optional[ChessAI] = None
+_worker_state = None
+_worker_search_id = -1
+_shared_alpha = None
+
+
+def _init_worker(shared_alpha, stop_flag, tt_layout: tuple, pruning: Dict[str, bool],
+                 tablebase_dir: Optional[Path]):
+    """Ініціалізатор процесу: власні ChessAI і GameState, спільна таблиця транспозицій, таблиці ендшпілю"""
+    global _worker_ai, _worker_state, _shared_alpha
+    from стан_гри import GameState
+
+    set_quiet_mode(True)
+    _shared_alpha = shared_alpha
+    shared_name, size_mb, bucket_size, entry_dtype = tt_layout
+    table = TranspositionTable(size_mb, bucket_size, entry_dtype, shared_name=shared_name)
+    _worker_ai = ChessAI(time_limit=None, transposition_table=table, pruning=pruning)
+    _worker_ai.stop_flag = stop_flag
+    # Таблиці відображаються в пам'ять кожним процесом - сторінки файлів спільні в кеші ОС
+    _worker_ai.tablebases = EndgameTablebases.open_if_exists(tablebase_dir)
+    _worker_state = GameState()
+    _worker_state.defer_turn_status = True
+
+
+def _search_root_chunk(search_id: int, generation: int, snapshot: dict, draw_limits: tuple, moves: List[Move],
+                       indices: List[int], depth: int, time_limit: Optional[float],
+                       node_limit: Optional[int], evaluation: tuple) -> RootChunkResult:
+    """Задача процесу: пошук своїх ходів кореня на глибину depth (evaluation - шум оцінки і форсований пошук)"""
+    global _worker_search_id
+    ai, state = _worker_ai, _worker_state
+    if search_id != _worker_search_id:
+        # Новий хід партії: покоління спільної таблиці - як у творця, історія старіє
+        _worker_search_id = search_id
+        ai.tt.new_search(generation)
+        ai.move_orderer.new_search()
+
+    state.repetition_draw_count, state.no_capture_draw_plies = draw_limits
+    state.restore_snapshot(snapshot)
+    state.move_calculator.update_board(state.board)
+
+    ai.time_limit, ai.node_limit = time_limit, node_limit
+    ai.eval_noise, ai.noise_seed, ai.quiescence_depth = evaluation
+    ai.start_clock()
+    ai.pruning_counts = dict.fromkeys(ai.pruning_counts, 0)
+    ai.search_counters = dict.fromkeys(ai.search_counters, 0)
+    probes, hits = ai.tt.probes, ai.tt.hits
+    cutoffs, first_move_cutoffs = ai.move_orderer.cutoffs, ai.move_orderer.first_move_cutoffs
+
+    color = state.current_player
+    best_index, best_score = None, -INFINITY_SCORE
+    completed = True
+    try:
+        for index, move in zip(indices, moves):
+            alpha = max(best_score, _shared_alpha.value)
+            score = ai._search_move(state, move, color, depth, alpha, INFINITY_SCORE, 0)
+            # Оцінка <= альфа - лише верхня межа: хід не кращий за знайдений
+            if score is None or score <= alpha:
+                continue
+            best_index, best_score = index, score
+            with _shared_alpha.get_lock():
+                if score > _shared_alpha.value:
+                    _shared_alpha.value = score
+    except SearchTimeout:
+        completed = False
+
+    return RootChunkResult(best_index, best_score, completed, ai.nodes,
+                           ai.tt.probes - probes, ai.tt.hits - hits,
+                           ai.move_orderer.cutoffs - cutoffs,
+                           ai.move_orderer.first_move_cutoffs - first_move_cutoffs,
+                           dict(ai.pruning_counts), dict(ai.search_counters))
+
+
+class ParallelRootSearch:
+    """Пул процесів для пошуку кореня однієї ітерації поглиблення"""
+
+    def __init__(self, workers: int, tt: TranspositionTable, pruning: Optional[Dict[str, bool]] = None,
+                 tablebase_dir: Optional[Path] = None):
+        """
+        tt - спільна таблиця ChessAI (shared=True), до якої під'єднуються процеси;
+        pruning - перемикачі вибіркових відсікань ChessAI процесів;
+        tablebase_dir - тека таблиць ендшпілю (None - без таблиць)
+        """
+        context = multiprocessing.get_context("spawn")
+        self.workers = workers
+        self.tt = tt
+        self.shared_alpha = context.Value('d', -INFINITY_SCORE)
+        # ОПТИМІЗАЦІЯ: прапорець читається в кожному вузлі - без блокування
+        self.stop_flag = context.RawValue('b', 0)
+        self.executor = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                            initargs=(self.shared_alpha, self.stop_flag,
+                                                      (tt.shared_name, tt.size_mb, tt.bucket_size,
+                                                       tt.entry_dtype), pruning, tablebase_dir))
+        self.search_id = 0
+
+    def new_search(self):
+        """Новий хід партії (процеси старять таблиці при першій задачі)"""
+        self.search_id += 1
+
+    def search_depth(self, game_state, moves: List[Move], depth: int, time_limit: Optional[float],
+                     node_limit: Optional[int], cancelled,
+                     evaluation: tuple = (0.0, 0, MAX_QUIESCENCE_DEPTH)) -> List[RootChunkResult]:
+        """
+        Ітерація кореня: ходи розподіляються по черзі між процесами
+        (evaluation - (eval_noise, noise_seed, quiescence_depth) ChessAI).
+        Повертає результати всіх процесів; після ліміту часу чи cancelled()
+        процеси зупиняються спільним прапорцем і повертають неповні результати.
+        """
+        self.shared_alpha.value = -INFINITY_SCORE
+        self.stop_flag.value = 0
+        snapshot = game_state.snapshot()
+        draw_limits = (game_state.repetition_draw_count, game_state.no_capture_draw_plies)
+        chunks = min(self.workers, len(moves))
+
+        futures = []
+        for chunk in range(chunks):
+            indices = list(range(chunk, len(moves), chunks))
+            futures.append(self.executor.submit(
+                _search_root_chunk, self.search_id, self.tt.generation, snapshot, draw_limits,
+                [moves[index] for index in indices], indices, depth, time_limit, node_limit, evaluation))
+
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=_POLL_INTERVAL)
+            if pending and (cancelled() or (deadline is not None and time.perf_counter() >= deadline)):
+                self.stop()
+                wait(pending)
+                break
+        return [future.result() for future in futures]
+
+    def stop(self):
+        """Зупиняє всі процеси в найближчому вузлі"""
+        self.stop_flag.value = 1
+
+    def shutdown(self):
+        """Завершує процеси пулу"""
+        self.stop()
+        self.executor.shutdown(wait=True, cancel_futures=True)
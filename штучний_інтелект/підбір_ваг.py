@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+
+"""
+Офлайн-підбір ваг оцінки ШІ гри "Вершителі часу" (Texel-налаштування)
+
+Цінності 15 фігур PositionEvaluator вгадані вручну. Підбір уточнює їх разом
+з бонусами спеціальних здібностей і таблицями ваг клітинок за результатами
+записаних партій:
+
+1. Вибірка (extract_positions): партії з JSONL симулятора та PGN (як у
+   книга_дебютів.iter_games) відтворюються в пулі процесів; з кожної беруться
+   тихі позиції - гравець не під шахом і не має тактичного ходу з додатним
+   статичним розміном, тож статична оцінка позиції має сенс.
+2. Матриця ознак NumPy (TuningSet): різниці кількості фігур кожного типу,
+   ознаки спеціальних здібностей (PositionEvaluator.special_features) і
+   індекси таблиць клітинок - код (колір, тип, клітинка) для кожної фігури.
+3. Оцінка - лінійна функція ваг, як в evaluate_position; ймовірність перемоги
+   білих - sigmoid(K · оцінка). Спершу підбирається K для поточних ваг, потім
+   ваги - міні-пакетним градієнтним спуском (Adam) на логістичній втраті
+   (перехресна ентропія з результатом партії). Прямий прохід - скалярні
+   добутки і gather таблиць, градієнт таблиць - np.bincount по індексах,
+   тож мільйон позицій налаштовується за хвилини.
+
+Масштаб фіксує цінність Пішака (1.0) - вона, як і цінність Короля, не
+підбирається. Таблиці чорних - дзеркало таблиць білих (як вбудовані таблиці).
+Результат - файл оцінка.EVALUATION_WEIGHTS_FILE, який оцінювач завантажує сам.
+
+Приклад:
+    python -m штучний_інтелект.підбір_ваг логи/симуляції.jsonl --dataset логи/позиції.npz
+    python -m штучний_інтелект.підбір_ваг --dataset логи/позиції.npz --epochs 40
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from налаштування import PieceType, PieceColor, BOARD_ROWS, BOARD_COLS
+from розташування_фігур import get_initial_piece_positions
+from логування import game_logger, set_quiet_mode
+from .оцінка import PositionEvaluator, SPECIAL_BONUSES, EVALUATION_WEIGHTS_FILE
+from .тактика import static_exchange
+
+# Коди клітинок: колір × тип × клітинка 22×20; PAD_CODE - порожнє місце рядка
+BOARD_SQUARES = BOARD_ROWS * BOARD_COLS
+TYPE_COUNT = len(PieceType)
+TABLE_CODES = 2 * TYPE_COUNT * BOARD_SQUARES
+PAD_CODE = TABLE_CODES
+# Фігур на дошці не буває більше, ніж у стартовій розстановці (воскресіння лише повертають взяті)
+MAX_PIECES = len(get_initial_piece_positions())
+
+# Вибірка: перші півходи партії (дебют однаковий) не беруться
+DEFAULT_SKIP_PLIES = 8
+# Партій в одній задачі процесу вибірки
+EXTRACT_CHUNK_GAMES = 32
+
+# Градієнтний спуск (Adam): епохи, розмір пакета, крок (у пішаках), L2 до стартових ваг
+DEFAULT_EPOCHS = 20
+DEFAULT_BATCH_SIZE = 16384
+DEFAULT_LEARNING_RATE = 0.01
+DEFAULT_L2 = 1e-6
+ADAM_BETAS = (0.9, 0.999)
+ADAM_EPSILON = 1e-8
+# Частка позицій, відкладених для перевірки (втрата на них не впливає на ваги)
+DEFAULT_VALIDATION_FRACTION = 0.1
+# Пошук K: межі (1/пішак), кількість ітерацій золотого перетину і позицій для нього
+K_BOUNDS = (0.01, 10.0)
+K_ITERATIONS = 30
+K_FIT_POSITIONS = 200000
+# Розмір пакета для повної втрати (обмежує тимчасові масиви gather)
+LOSS_CHUNK = 65536
+
+# Результат партії з точки зору білих
+RESULT_SCORES = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+
+# Параметри: цінності фігур, бонуси, таблиці білих [тип, клітинка]
+VALUES_OFFSET = 0
+BONUSES_OFFSET = TYPE_COUNT
+TABLES_OFFSET = BONUSES_OFFSET + len(SPECIAL_BONUSES)
+PARAMETER_COUNT = TABLES_OFFSET + TYPE_COUNT * BOARD_SQUARES
+# Цінності, що не підбираються: Пішак задає масштаб, Король безцінний
+FROZEN_VALUES = (PieceType.PAWN, PieceType.KING, PieceType.EMPTY)
+
+
+class TuningSet(NamedTuple):
+    """Матриця ознак тихих позицій (рядок - позиція)"""
+    material: np.ndarray    # (N, TYPE_COUNT) int8 - кількість фігур білих мінус чорних
+    special: np.ndarray     # (N, len(SPECIAL_BONUSES)) int8 - PositionEvaluator.special_features
+    squares: np.ndarray     # (N, MAX_PIECES) uint16 - коди клітинок фігур, PAD_CODE - порожньо
+    results: np.ndarray     # (N,) float32 - результат партії з точки зору білих
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def subset(self, rows) -> "TuningSet":
+        return TuningSet(*(array[rows] for array in self))
+
+    def save(self, path: Path):
+        """Зберігає вибірку у файл .npz (для повторних запусків підбору)"""
+        np.savez(path, **self._asdict())
+
+    @classmethod
+    def load(cls, path: Path) -> "TuningSet":
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in cls._fields})
+
+    @classmethod
+    def concatenate(cls, sets: List["TuningSet"]) -> "TuningSet":
+        if not sets:
+            return empty_set()
+        return cls(*(np.concatenate(arrays) for arrays in zip(*sets)))
+
+
+class TuningResult(NamedTuple):
+    """Підсумок підбору: ваги, K, втрати до і після, історія втрат по епохах"""
+    parameters: np.ndarray
+    k: float
+    initial_loss: float
+    train_loss: float
+    validation_loss: float
+    history: List[Tuple[float, float]]      # (втрата навчання, втрата перевірки) після кожної епохи
+    time: float
+
+
+def empty_set() -> TuningSet:
+    return TuningSet(np.zeros((0, TYPE_COUNT), dtype=np.int8),
+                     np.zeros((0, len(SPECIAL_BONUSES)), dtype=np.int8),
+                     np.zeros((0, MAX_PIECES), dtype=np.uint16),
+                     np.zeros(0, dtype=np.float32))
+
+
+# ----------------------------------------------------------------------
+# Вибірка тихих позицій
+# ----------------------------------------------------------------------
+
+def is_quiet(game_state, piece_values: Dict) -> bool:
+    """Тиха позиція: без шаху і без тактичного ходу з додатним статичним розміном"""
+    if game_state.get_turn_status().in_check:
+        return False
+    board = game_state.board
+    return all(static_exchange(board, move, piece_values) <= 0
+               for move in game_state.generate_legal_moves(tactical_only=True))
+
+
+def position_features(game_state) -> Tuple[np.ndarray, Tuple[float, float, float], np.ndarray]:
+    """Ознаки позиції: різниця кількості фігур, спеціальні здібності, коди клітинок фігур"""
+    board = game_state.board
+    material = board.piece_counts[0] - board.piece_counts[1]
+    squares = np.full(MAX_PIECES, PAD_CODE, dtype=np.uint16)
+    for slot, (piece_id, (row, col)) in enumerate(board.position_by_id.items()):
+        piece = board.pieces_by_id[piece_id]
+        color_index = 0 if piece.color == PieceColor.WHITE else 1
+        squares[slot] = (color_index * TYPE_COUNT + piece.type) * BOARD_SQUARES + row * BOARD_COLS + col
+    return material, PositionEvaluator.special_features(game_state), squares
+
+
+# Стан процесу вибірки: один GameState на процес
+_worker_state = None
+
+
+def _extract_games(games: List[Tuple[List[str], str]], skip_plies: int) -> Tuple[TuningSet, int]:
+    """Задача процесу: тихі позиції партій; повертає вибірку і кількість зламаних партій"""
+    global _worker_state
+    from стан_гри import GameState
+
+    set_quiet_mode(True)
+    if _worker_state is None:
+        _worker_state = GameState()
+    game_state = _worker_state
+    piece_values = PositionEvaluator.PIECE_VALUES
+
+    material, special, squares, results = [], [], [], []
+    broken = 0
+    for notations, result in games:
+        game_state.reset_game()
+        for ply, notation in enumerate(notations):
+            if game_state.game_over:
+                break
+            if ply >= skip_plies and is_quiet(game_state, piece_values):
+                counts, features, codes = position_features(game_state)
+                material.append(counts)
+                special.append(features)
+                squares.append(codes)
+                results.append(RESULT_SCORES[result])
+            move = game_state.find_move_by_notation(notation)
+            if move is None or not game_state.apply_move(move):
+                broken += 1
+                break
+
+    if not results:
+        return empty_set(), broken
+    return TuningSet(np.array(material, dtype=np.int8), np.array(special, dtype=np.int8),
+                     np.array(squares, dtype=np.uint16), np.array(results, dtype=np.float32)), broken
+
+
+def extract_positions(sources: List[Path], skip_plies: int = DEFAULT_SKIP_PLIES,
+                      workers: int = 1) -> TuningSet:
+    """
+    Тихі позиції партій sources з результатами. Партії без результату (*)
+    пропускаються; партія відтворюється до першого нерозпізнаного ходу.
+    """
+    from .книга_дебютів import iter_games
+
+    games = [(notations, result) for source in sources for notations, result in iter_games(source)
+             if result in RESULT_SCORES]
+    chunks = [games[start:start + EXTRACT_CHUNK_GAMES] for start in range(0, len(games), EXTRACT_CHUNK_GAMES)]
+    if workers > 1 and len(chunks) > 1:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=context) as executor:
+            parts = list(executor.map(_extract_games, chunks, [skip_plies] * len(chunks)))
+    else:
+        parts = [_extract_games(chunk, skip_plies) for chunk in chunks]
+
+    dataset = TuningSet.concatenate([part for part, _ in parts])
+    broken = sum(count for _, count in parts)
+    game_logger.info(f"Вибірка для підбору ваг: партій {len(games)}, тихих позицій {len(dataset)}, "
+                     f"зламаних партій {broken}")
+    return dataset
+
+
+# ----------------------------------------------------------------------
+# Ваги як вектор параметрів
+# ----------------------------------------------------------------------
+
+def _code_maps() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Код клітинки → (індекс параметра, знак): фігура чорних читає дзеркальну
+    клітинку таблиці білих зі знаком мінус; PAD_CODE → нульовий параметр за
+    кінцем вектора
+    """
+    index = np.full(TABLE_CODES + 1, PARAMETER_COUNT, dtype=np.int32)
+    sign = np.zeros(TABLE_CODES + 1, dtype=np.float64)
+    rows, cols = np.divmod(np.arange(BOARD_SQUARES), BOARD_COLS)
+    mirrored = (BOARD_ROWS - 1 - rows) * BOARD_COLS + cols
+    for piece_type in range(TYPE_COUNT):
+        table = TABLES_OFFSET + piece_type * BOARD_SQUARES
+        white = piece_type * BOARD_SQUARES
+        black = (TYPE_COUNT + piece_type) * BOARD_SQUARES
+        index[white:white + BOARD_SQUARES] = table + np.arange(BOARD_SQUARES)
+        sign[white:white + BOARD_SQUARES] = 1.0
+        index[black:black + BOARD_SQUARES] = table + mirrored
+        sign[black:black + BOARD_SQUARES] = -1.0
+    return index, sign
+
+
+def evaluator_parameters(evaluator: PositionEvaluator) -> np.ndarray:
+    """Вектор параметрів з ваг оцінювача (таблиці - білих, з вагами матеріалу і спецздібностей)"""
+    parameters = np.zeros(PARAMETER_COUNT)
+    parameters[VALUES_OFFSET:BONUSES_OFFSET] = evaluator.piece_value_vector * evaluator.MATERIAL_WEIGHT
+    parameters[BONUSES_OFFSET:TABLES_OFFSET] = [getattr(evaluator, name) * evaluator.SPECIAL_WEIGHT
+                                                for name in SPECIAL_BONUSES]
+    parameters[TABLES_OFFSET:] = evaluator.square_tables[0].ravel()
+    return parameters
+
+
+def apply_parameters(evaluator: PositionEvaluator, parameters: np.ndarray):
+    """Записує вектор параметрів в оцінювач (обернене до evaluator_parameters)"""
+    values = parameters[VALUES_OFFSET:BONUSES_OFFSET] / evaluator.MATERIAL_WEIGHT
+    evaluator.set_piece_values({piece_type: float(values[piece_type]) for piece_type in PieceType})
+    for name, value in zip(SPECIAL_BONUSES, parameters[BONUSES_OFFSET:TABLES_OFFSET]):
+        setattr(evaluator, name, float(value) / evaluator.SPECIAL_WEIGHT)
+    white = parameters[TABLES_OFFSET:].reshape(TYPE_COUNT, BOARD_ROWS, BOARD_COLS)
+    evaluator.set_square_tables(np.stack([white, white[:, ::-1, :]]))
+
+
+def _trainable_mask() -> np.ndarray:
+    mask = np.ones(PARAMETER_COUNT, dtype=bool)
+    for piece_type in FROZEN_VALUES:
+        mask[VALUES_OFFSET + piece_type] = False
+    empty_table = TABLES_OFFSET + PieceType.EMPTY * BOARD_SQUARES
+    mask[empty_table:empty_table + BOARD_SQUARES] = False
+    return mask
+
+
+# ----------------------------------------------------------------------
+# Логістична втрата і градієнтний спуск
+# ----------------------------------------------------------------------
+
+class _Model:
+    """
+    Лінійна оцінка вибірки: прямий прохід і градієнт логістичної втрати.
+
+    ОПТИМІЗАЦІЯ: дзеркало і знак чорних згортаються у вектор ваг кодів
+    (TABLE_CODES + 1 значень) один раз на крок, тож рядок вибірки - лише gather
+    по кодах без масивів індексів і знаків розміру (N, MAX_PIECES); градієнт
+    кодів (bincount по кодах) так само згортається назад у параметри.
+    """
+
+    def __init__(self):
+        self.code_index, self.code_sign = _code_maps()
+
+    def code_weights(self, parameters: np.ndarray) -> np.ndarray:
+        """Вага кожного коду клітинки зі знаком кольору (PAD_CODE - 0)"""
+        return np.append(parameters, 0.0)[self.code_index] * self.code_sign
+
+    def evaluate(self, parameters: np.ndarray, data: TuningSet,
+                 code_weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Оцінки позицій у пішаках з точки зору білих"""
+        if code_weights is None:
+            code_weights = self.code_weights(parameters)
+        return (data.material @ parameters[VALUES_OFFSET:BONUSES_OFFSET]
+                + data.special @ parameters[BONUSES_OFFSET:TABLES_OFFSET]
+                + code_weights[data.squares].sum(axis=1))
+
+    def loss(self, parameters: np.ndarray, data: TuningSet, k: float) -> float:
+        """Середня перехресна ентропія sigmoid(K · оцінка) і результату (пакетами LOSS_CHUNK)"""
+        total = 0.0
+        code_weights = self.code_weights(parameters)
+        for start in range(0, len(data), LOSS_CHUNK):
+            chunk = data.subset(slice(start, start + LOSS_CHUNK))
+            logits = k * self.evaluate(parameters, chunk, code_weights)
+            # log(1 + e^x) - y·x: стабільна форма перехресної ентропії з логітів
+            total += float(np.sum(np.logaddexp(0.0, logits) - chunk.results * logits))
+        return total / max(1, len(data))
+
+    def gradient(self, parameters: np.ndarray, data: TuningSet, k: float) -> np.ndarray:
+        """Градієнт середньої втрати пакета за параметрами"""
+        logits = k * self.evaluate(parameters, data)
+        # d втрата / d оцінка = K · (sigmoid(K · оцінка) - результат)
+        residual = k * (0.5 * (1.0 + np.tanh(0.5 * logits)) - data.results) / len(data)
+        code_gradient = np.bincount(data.squares.ravel(), weights=np.repeat(residual, data.squares.shape[1]),
+                                    minlength=TABLE_CODES + 1)
+        gradient = np.bincount(self.code_index, weights=self.code_sign * code_gradient,
+                               minlength=PARAMETER_COUNT + 1)[:PARAMETER_COUNT]
+        gradient[VALUES_OFFSET:BONUSES_OFFSET] += residual @ data.material
+        gradient[BONUSES_OFFSET:TABLES_OFFSET] += residual @ data.special
+        return gradient
+
+
+def fit_k(model: _Model, parameters: np.ndarray, data: TuningSet) -> float:
+    """K з мінімальною втратою для поточних ваг (золотий перетин по log K на перших K_FIT_POSITIONS)"""
+    data = data.subset(slice(0, K_FIT_POSITIONS))
+    ratio = (math.sqrt(5) - 1) / 2
+    low, high = math.log(K_BOUNDS[0]), math.log(K_BOUNDS[1])
+    for _ in range(K_ITERATIONS):
+        left, right = high - ratio * (high - low), low + ratio * (high - low)
+        if model.loss(parameters, data, math.exp(left)) <= model.loss(parameters, data, math.exp(right)):
+            high = right
+        else:
+            low = left
+    return math.exp((low + high) / 2)
+
+
+def tune(data: TuningSet, initial: np.ndarray, epochs: int = DEFAULT_EPOCHS,
+         batch_size: int = DEFAULT_BATCH_SIZE, learning_rate: float = DEFAULT_LEARNING_RATE,
+         l2: float = DEFAULT_L2, validation_fraction: float = DEFAULT_VALIDATION_FRACTION,
+         seed: int = 0, on_epoch: Optional[Callable[[int, float, float], None]] = None) -> TuningResult:
+    """
+    Підбір ваг міні-пакетним Adam на логістичній втраті. initial - стартовий
+    вектор параметрів (evaluator_parameters); l2 штрафує відхилення від нього.
+    on_epoch(епоха, втрата навчання, втрата перевірки) викликається після кожної епохи.
+    """
+    start_time = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(data))
+    validation_size = int(len(data) * validation_fraction)
+    validation, train = data.subset(order[:validation_size]), data.subset(order[validation_size:])
+
+    model = _Model()
+    k = fit_k(model, initial, train)
+    initial_loss = model.loss(initial, train, k)
+    game_logger.info(f"Підбір ваг: позицій {len(train)} (+{len(validation)} перевірки), "
+                     f"K = {k:.3f}, стартова втрата {initial_loss:.5f}")
+
+    trainable = _trainable_mask()
+    parameters = initial.copy()
+    moment, velocity = np.zeros(PARAMETER_COUNT), np.zeros(PARAMETER_COUNT)
+    beta1, beta2 = ADAM_BETAS
+    step = 0
+    history = []
+    for epoch in range(1, epochs + 1):
+        permutation = rng.permutation(len(train))
+        for start in range(0, len(train), batch_size):
+            batch = train.subset(permutation[start:start + batch_size])
+            gradient = model.gradient(parameters, batch, k) + 2.0 * l2 * (parameters - initial)
+            gradient[~trainable] = 0.0
+            step += 1
+            moment = beta1 * moment + (1 - beta1) * gradient
+            velocity = beta2 * velocity + (1 - beta2) * gradient * gradient
+            corrected = moment / (1 - beta1 ** step)
+            parameters -= learning_rate * corrected / (np.sqrt(velocity / (1 - beta2 ** step)) + ADAM_EPSILON)
+        losses = (model.loss(parameters, train, k), model.loss(parameters, validation, k))
+        history.append(losses)
+        if on_epoch is not None:
+            on_epoch(epoch, *losses)
+
+    train_loss, validation_loss = history[-1] if history else (initial_loss, model.loss(initial, validation, k))
+    elapsed = time.perf_counter() - start_time
+    game_logger.info(f"Підбір ваг завершено за {elapsed:.1f} с: втрата {initial_loss:.5f} → {train_loss:.5f} "
+                     f"(перевірка {validation_loss:.5f})")
+    return TuningResult(parameters, k, initial_loss, train_loss, validation_loss, history, elapsed)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Підбір ваг оцінки за результатами партій (Texel)")
+    parser.add_argument("sources", type=Path, nargs="*", help="JSONL симулятора, .pgn або лог партій")
+    parser.add_argument("--dataset", type=Path, default=None,
+                        help="файл вибірки .npz: зберегти зібрану з sources або взяти готову")
+    parser.add_argument("--output", type=Path, default=EVALUATION_WEIGHTS_FILE, help="файл ваг оцінки")
+    parser.add_argument("--skip-plies", type=int, default=DEFAULT_SKIP_PLIES, help="пропустити перші півходи партії")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="процесів вибірки")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS, help="епох градієнтного спуску")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="позицій у пакеті")
+    parser.add_argument("--learning-rate", type=float, default=DEFAULT_LEARNING_RATE, help="крок Adam")
+    parser.add_argument("--l2", type=float, default=DEFAULT_L2, help="штраф відхилення від стартових ваг")
+    parser.add_argument("--seed", type=int, default=0, help="seed перемішування")
+    args = parser.parse_args(argv)
+
+    if args.sources:
+        data = extract_positions(args.sources, args.skip_plies, args.workers)
+        if args.dataset is not None:
+            data.save(args.dataset)
+    elif args.dataset is not None:
+        data = TuningSet.load(args.dataset)
+    else:
+        parser.error("потрібні партії (sources) або готова вибірка (--dataset)")
+    if not len(data):
+        print("Немає тихих позицій для підбору")
+        return 1
+    print(f"🎯 Позицій: {len(data)}")
+
+    evaluator = PositionEvaluator()
+    result = tune(data, evaluator_parameters(evaluator), args.epochs, args.batch_size, args.learning_rate,
+                  args.l2, seed=args.seed,
+                  on_epoch=lambda epoch, train, validation: print(
+                      f"   епоха {epoch}: втрата {train:.5f}, перевірка {validation:.5f}"))
+    apply_parameters(evaluator, result.parameters)
+    evaluator.save_weights(args.output)
+
+    print(f"   K = {result.k:.3f}, втрата {result.initial_loss:.5f} → {result.train_loss:.5f} "
+          f"за {result.time:.1f} с; ваги: {args.output}")
+    print("   " + ", ".join(f"{piece_type.name} {evaluator.PIECE_VALUES[piece_type]:.2f}"
+                          for piece_type in PieceType if piece_type not in FROZEN_VALUES))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
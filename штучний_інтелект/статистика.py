@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+Статистика пошуку ШІ гри "Вершителі часу"
+
+Кожен пошук (ChessAI.search, MCTSAI.search) залишає SearchStats у last_stats:
+вузли (з них форсованого пошуку), вузли/с, ефективний коефіцієнт
+розгалуження, таблиця транспозицій, якість впорядкування, час кожної ітерації
+та розподіл часу між генерацією ходів, перевіркою шаху, make/unmake і оцінкою.
+Решта часу (other_time) - обхід дерева, впорядкування, таблиця, накладні витрати.
+У паралельному пошуку складники часу - сума по процесах, тож частки рахуються
+від процесорного часу time × workers.
+
+Статистику читає кнопка "Підказка" графічного інтерфейсу (format_report) і
+можна дописувати рядками JSON (append_jsonl) для відстеження регресій:
+    {"engine", "position", "depth", "nodes", "qnodes", "nps", "ebf", ...}
+
+Аналіз позиції (ChessAI.analyze, MCTSAI.analyze) повертає кілька найкращих
+ходів - AnalysisLine з оцінкою і головним варіантом (multi-PV).
+"""
+
+import datetime
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from розташування_фігур import Move
+
+# Аналіз за замовчуванням: кількість найкращих ходів і час на позицію (секунди)
+ANALYSIS_LINES = 3
+ANALYSIS_TIME_LIMIT = 5.0
+
+# Складники часу пошуку: ключ лічильника ChessAI.search_counters → назва у звіті
+TIME_SPLIT = (
+    ('movegen_time', "генерація ходів"),
+    ('legality_time', "перевірка шаху"),
+    ('make_time', "make/unmake"),
+    ('eval_time', "оцінка"),
+    ('other_time', "решта"),
+)
+
+
+@dataclass
+class SearchStats:
+    """Підсумок одного пошуку (значення за замовчуванням - рушій показник не рахує)"""
+    engine: str
+    depth: int = 0
+    nodes: int = 0                  # Усі вузли, разом з форсованим пошуком
+    qnodes: int = 0                 # З них вузли форсованого пошуку
+    time: float = 0.0
+    nps: float = 0.0
+    score: float = 0.0
+    best_move: Optional[Move] = None
+    workers: int = 1
+    ebf: float = 0.0                # Ефективний коефіцієнт розгалуження (вузли ітерації d / d-1)
+    tt_probes: int = 0
+    tt_hits: int = 0
+    tt_cutoffs: int = 0             # Зондування, що одразу повернули оцінку
+    tb_hits: int = 0                # Вузли, оцінені таблицями ендшпілю
+    tt_fill_rate: float = 0.0
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    iteration_times: List[float] = field(default_factory=list)
+    iteration_nodes: List[int] = field(default_factory=list)
+    movegen_time: float = 0.0
+    legality_time: float = 0.0
+    make_time: float = 0.0
+    eval_time: float = 0.0
+    pruning: Dict[str, int] = field(default_factory=dict)
+    position: str = ""              # Хеш стану кореня (hex) - ключ для порівняння між запусками
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / max(1, self.tt_probes)
+
+    @property
+    def tt_cutoff_rate(self) -> float:
+        return self.tt_cutoffs / max(1, self.tt_probes)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / max(1, self.cutoffs)
+
+    @property
+    def cpu_time(self) -> float:
+        """Процесорний час усіх процесів пошуку (знаменник розподілу часу)"""
+        return self.time * self.workers
+
+    @property
+    def other_time(self) -> float:
+        return max(0.0, self.cpu_time - self.movegen_time - self.legality_time - self.make_time - self.eval_time)
+
+    @staticmethod
+    def effective_branching_factor(iteration_nodes: List[int]) -> float:
+        """Відношення вузлів двох останніх завершених ітерацій (0 - ітерація одна)"""
+        if len(iteration_nodes) < 2 or iteration_nodes[-2] == 0:
+            return 0.0
+        return iteration_nodes[-1] / iteration_nodes[-2]
+
+    def as_dict(self) -> Dict[str, object]:
+        """Плоский словник для JSON: хід - PGN-токеном, частки й решта часу пораховані"""
+        from стан_гри import move_to_notation
+
+        data = asdict(self)
+        data['best_move'] = move_to_notation(self.best_move) if self.best_move else None
+        data.update(tt_hit_rate=self.tt_hit_rate, tt_cutoff_rate=self.tt_cutoff_rate,
+                    first_move_cutoff_rate=self.first_move_cutoff_rate, other_time=self.other_time)
+        return data
+
+    def format_report(self) -> str:
+        """Багаторядковий звіт для людини (діалог підказки, консоль)"""
+        data = self.as_dict()
+        lines = [
+            f"Рушій: {self.engine}, процесів: {self.workers}",
+            f"Хід: {data['best_move'] or '-'}, оцінка {self.score:.2f}, глибина {self.depth}",
+            f"Вузли: {self.nodes} (форсованих {self.qnodes}), {self.nps:.0f} вузлів/с, {self.time:.2f} с",
+        ]
+        # Рядки показників, яких рушій не рахує (нульові), пропускаються
+        if self.ebf:
+            lines.append(f"Ефективне розгалуження: {self.ebf:.1f}")
+        if self.tt_probes:
+            lines.append(f"Таблиця транспозицій: зондувань {self.tt_probes}, влучань {self.tt_hit_rate:.1%}, "
+                         f"відсікань {self.tt_cutoff_rate:.1%}, заповнена на {self.tt_fill_rate:.1%}")
+        if self.tb_hits:
+            lines.append(f"Таблиці ендшпілю: влучань {self.tb_hits}")
+        if self.cutoffs:
+            lines.append(f"Відсікання на першому ході: {self.first_move_cutoff_rate:.1%} з {self.cutoffs}")
+        if self.iteration_times:
+            lines.append("Ітерації: " + ", ".join(
+                f"г{depth} {seconds:.2f} с" for depth, seconds in enumerate(self.iteration_times, 1)))
+        if self.time > 0 and self.other_time < self.cpu_time:
+            lines.append("Час: " + ", ".join(
+                f"{title} {data[key] / self.cpu_time:.0%}" for key, title in TIME_SPLIT))
+        pruning = ", ".join(f"{name} {count}" for name, count in self.pruning.items() if count)
+        if pruning:
+            lines.append(f"Відсікання: {pruning}")
+        return "\n".join(lines)
+
+
+class AnalysisLine(NamedTuple):
+    """Один з найкращих ходів аналізу (оцінка - з точки зору гравця, що ходить)"""
+    move: Move
+    score: float                # Альфа-бета - оцінка в пішаках, MCTS - шанс перемоги
+    pv: Tuple[Move, ...]        # Головний варіант, що починається з move
+    depth: int
+
+
+def format_lines(lines: List[AnalysisLine]) -> str:
+    """Рядки аналізу для людини: номер, оцінка, глибина і головний варіант у PGN-токенах"""
+    from стан_гри import move_to_notation
+
+    return "\n".join(
+        f"{number}. {line.score:+.2f} г{line.depth}: " + " ".join(move_to_notation(move) for move in line.pv)
+        for number, line in enumerate(lines, 1))
+
+
+def append_jsonl(stats: SearchStats, path: Path, **extra):
+    """Дописує статистику рядком JSON (extra - додаткові поля, наприклад номер партії)"""
+    record = {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), **stats.as_dict(), **extra}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as out_file:
+        out_file.write(json.dumps(record, ensure_ascii=False) + "\n")
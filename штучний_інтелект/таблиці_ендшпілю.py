@@ -0,0 +1,579 @@
+# -*- coding: utf-8 -*-
+
+"""
+Таблиці ендшпілю ШІ гри "Вершителі часу"
+
+Пізня гра часто зводиться до Короля з однією фігурою проти голого Короля,
+а мат на дошці 20×18 буває довшим за горизонт пошуку. Для таких наборів
+(KQK, KRK, KFK, KBK, KNK) генератор будує повну таблицю відстаней до мату
+ретроградним аналізом:
+- позиція - клітинки сильного Короля, слабкого Короля і фігури (360 ігрових
+  клітинок; Ферзь, Слон і Кінь - ще й відкриті туманності з таймером 0-5),
+  окремо для ходу сильної (SIDE_STRONG) і слабкої (SIDE_WEAK) сторони;
+- значення uint8: CODE_DRAW - нічия, CODE_ILLEGAL - неможлива позиція,
+  інакше кількість півходів до мату + 1;
+- від матів назад: позиції слабкої сторони, програні за n півходів, роблять
+  виграними за n+1 усіх попередників (зворотні ходи сильної сторони), а
+  позиція слабкої сторони програна, коли всі її ходи ведуть у вже виграні.
+
+Правила туманностей як у GameState: туманності відкриваються парами
+(activate_nebulas), Король і Фурія в них не стають, фігуру в туманності не
+можна взяти, таймер 5 тікає на початку кожного ходу власника, і фігура зникає,
+коли він вичерпаний (тоді лишаються самі Королі - нічия); телепортація між
+рядами забирає ще одиницю часу. Таймер у таблиці - значення до тіку: для
+ходу сильної сторони це таймер дошки + 1. Таблиця для набору відкритих
+туманностей - окремий файл (маска бітів у порядку NEBULAS).
+
+Крок аналізу обробляє весь фронт позицій одного значення векторними
+операціями NumPy; дошка ділиться між процесами пулу за клітинкою Короля, що
+не рухається на цьому кроці, тож процеси пишуть у різні частини таблиці.
+Таблиця - файл .npy, який процеси відображають у пам'ять (np.load з
+mmap_mode): спільна пам'ять через сторінки файлу, а ChessAI так само
+відкриває готові таблиці без завантаження і зондує їх у кожному вузлі пошуку.
+
+Набори з двома фігурами (наприклад, K+R+Фурія проти K) не генеруються:
+щільна таблиця мала б 2×360⁴ байт (~34 ГБ).
+
+Приклад:
+    python -m штучний_інтелект.таблиці_ендшпілю KQK KRK --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from налаштування import PieceType, PieceColor, NEBULAS, BOARD_ROWS, BOARD_COLS
+from розташування_фігур import Move
+from правила_фігур import get_knight_deltas
+from логування import game_logger, quiet_mode
+
+# Ігрові клітинки (рядки 1-20, колонки 1-18) і туманності за ними
+SQUARES = 20 * 18
+CELLS = SQUARES + len(NEBULAS)
+# Таймер фігури в туманності до тіку: 1-5, 0 - таймер скинуто телепортацією (фігура не зникає)
+NEBULA_TIMER_STATES = 6
+NEBULA_ENTRY_TIMER = 5
+
+SIDE_STRONG = 0
+SIDE_WEAK = 1
+
+CODE_DRAW = 0
+CODE_ILLEGAL = 255
+MAX_CODE = 254
+
+# Туманності відкриваються парами: верхні (0b0011) - чорним, нижні (0b1100) - білим
+DEFAULT_NEBULA_MASKS = (0b0000, 0b0011, 0b1100, 0b1111)
+DEFAULT_MATERIALS = ("KQK", "KRK", "KFK")
+
+_KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+_ORTHOGONAL = ((0, 1), (0, -1), (1, 0), (-1, 0))
+_DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+_LONG_RANGE = max(BOARD_ROWS, BOARD_COLS)
+
+_TABLE_NAME = re.compile(r"^K([A-Z])K_([0-9a-f])\.npy$")
+
+
+class PieceRule(NamedTuple):
+    """Ходи й атаки фігури набору: промені (dr, dc, дальність)"""
+    letter: str
+    moves: Tuple[Tuple[int, int, int], ...]
+    attacks: Tuple[Tuple[int, int, int], ...]
+    enters_nebula: bool     # Фігура може стати в туманність (таймер - частина позиції)
+
+
+def _rays(steps, reach: int) -> Tuple[Tuple[int, int, int], ...]:
+    return tuple((dr, dc, reach) for dr, dc in steps)
+
+
+PIECE_RULES = {
+    PieceType.QUEEN: PieceRule('Q', _rays(_ORTHOGONAL + _DIAGONAL, _LONG_RANGE),
+                               _rays(_ORTHOGONAL + _DIAGONAL, _LONG_RANGE), True),
+    # Тура туманностей не досягає: вони лише по діагоналі від кутових клітинок
+    PieceType.ROOK: PieceRule('R', _rays(_ORTHOGONAL, _LONG_RANGE), _rays(_ORTHOGONAL, _LONG_RANGE), False),
+    PieceType.BISHOP: PieceRule('B', _rays(_DIAGONAL, _LONG_RANGE), _rays(_DIAGONAL, _LONG_RANGE), True),
+    PieceType.KNIGHT: PieceRule('N', _rays(get_knight_deltas(), 1), _rays(get_knight_deltas(), 1), True),
+    # Фурія ходить лише на порожні клітинки (до 3 по горизонталі, до 2 по вертикалі), б'є як Король
+    PieceType.FURY: PieceRule('F', ((0, 1, 3), (0, -1, 3), (1, 0, 2), (-1, 0, 2)), _rays(_KING_STEPS, 1), False),
+}
+_LETTER_TYPES = {rule.letter: piece_type for piece_type, rule in PIECE_RULES.items()}
+
+_CELL_COORDS = [(row, col) for row in range(1, 21) for col in range(1, 19)] + list(NEBULAS.values())
+_COORD_CELLS = {coords: cell for cell, coords in enumerate(_CELL_COORDS)}
+
+
+class ProbeResult(NamedTuple):
+    """Результат зондування з точки зору гравця, що ходить"""
+    result: int     # 1 - виграш, 0 - нічия, -1 - програш
+    plies: int      # Півходів до мату (0 - мат уже на дошці)
+
+
+def square_cell(row: int, col: int) -> Optional[int]:
+    """Клітинка таблиці для координат дошки (туманності - після ігрових), None - поза грою"""
+    return _COORD_CELLS.get((row, col))
+
+
+def table_name(piece_type: PieceType, nebula_mask: int) -> str:
+    """Ім'я файлу таблиці: KQK_0.npy, KQK_f.npy (маска відкритих туманностей)"""
+    return f"K{PIECE_RULES[piece_type].letter}K_{nebula_mask:x}.npy"
+
+
+def parse_material(material: str) -> PieceType:
+    """Тип фігури набору з позначення KXK"""
+    material = material.upper()
+    if len(material) != 3 or material[0] != 'K' or material[2] != 'K' or material[1] not in _LETTER_TYPES:
+        raise ValueError(f"Невідомий набір {material}: підтримуються "
+                         + ", ".join(f"K{letter}K" for letter in _LETTER_TYPES))
+    return _LETTER_TYPES[material[1]]
+
+
+class _Geometry(NamedTuple):
+    """Передобчислені таблиці кроків для набору і маски туманностей"""
+    size: int                   # Станів фігури: 360 клітинок (+ туманності × таймер)
+    dom_cell: np.ndarray        # Стан фігури → клітинка
+    dom_timer: np.ndarray       # Стан фігури → таймер до тіку (-1 - не в туманності)
+    dom_valid: np.ndarray
+    king_next: np.ndarray       # [клітинка, напрямок] → клітинка Короля (-1 - немає; рядок -1 - сторож)
+    move_rays: tuple            # ((таблиця кроку, дальність), ...) ходів фігури
+    attack_rays: tuple          # Те саме для атак (туманності - за відкритістю)
+    adjacent: np.ndarray        # [клітинка, клітинка] - сусідні ігрові клітинки
+    nebulas: tuple              # Відкриті туманності, куди фігура може стати: ((індекс, клітинка, рядок), ...)
+
+
+def _step_table(dr: int, dc: int, open_cells: frozenset) -> np.ndarray:
+    """Крок (dr, dc) з кожної клітинки; останній елемент - сторож -1 для індексу -1"""
+    table = np.full(CELLS + 1, -1, dtype=np.int64)
+    for cell, (row, col) in enumerate(_CELL_COORDS):
+        target = _COORD_CELLS.get((row + dr, col + dc))
+        if target is not None and (target < SQUARES or target in open_cells):
+            table[cell] = target
+    return table
+
+
+@lru_cache(maxsize=None)
+def _geometry(piece_type: PieceType, nebula_mask: int) -> _Geometry:
+    rule = PIECE_RULES[piece_type]
+    open_cells = frozenset(SQUARES + index for index in range(len(NEBULAS)) if nebula_mask >> index & 1)
+    piece_cells = open_cells if rule.enters_nebula else frozenset()
+
+    dom_cell = list(range(SQUARES))
+    dom_timer = [-1] * SQUARES
+    dom_valid = [True] * SQUARES
+    nebulas = []
+    if rule.enters_nebula and nebula_mask:
+        for index, (row, _) in enumerate(NEBULAS.values()):
+            cell = SQUARES + index
+            dom_cell += [cell] * NEBULA_TIMER_STATES
+            dom_timer += list(range(NEBULA_TIMER_STATES))
+            dom_valid += [cell in open_cells] * NEBULA_TIMER_STATES
+            if cell in open_cells:
+                nebulas.append((index, cell, row))
+
+    king_next = np.stack([_step_table(dr, dc, frozenset()) for dr, dc in _KING_STEPS], axis=1)
+    coords = np.array(_CELL_COORDS[:SQUARES])
+    distance = np.abs(coords[:, None, :] - coords[None, :, :]).max(axis=2)
+    return _Geometry(
+        size=len(dom_cell),
+        dom_cell=np.array(dom_cell, dtype=np.int64),
+        dom_timer=np.array(dom_timer, dtype=np.int64),
+        dom_valid=np.array(dom_valid),
+        king_next=king_next,
+        move_rays=tuple((_step_table(dr, dc, piece_cells), reach) for dr, dc, reach in rule.moves),
+        attack_rays=tuple((_step_table(dr, dc, open_cells), reach) for dr, dc, reach in rule.attacks),
+        adjacent=distance == 1,
+        nebulas=tuple(nebulas),
+    )
+
+
+def _attacked_squares(geometry: _Geometry, strong_king: int) -> np.ndarray:
+    """
+    [слабкий Король, клітинка фігури] - фігура б'є Короля (промінь від Короля;
+    сильний Король закриває промені, слабкий - ціль і не заважає)
+    """
+    attacked = np.zeros((SQUARES, CELLS), dtype=np.bool_)
+    for step, reach in geometry.attack_rays:
+        rows = np.arange(SQUARES)
+        cells = rows
+        for _ in range(reach):
+            cells = step[cells]
+            keep = cells >= 0
+            rows, cells = rows[keep], cells[keep]
+            if not len(cells):
+                break
+            attacked[rows, cells] = True
+            keep = cells != strong_king
+            rows, cells = rows[keep], cells[keep]
+    return attacked
+
+
+def _open_table(path: Path) -> np.ndarray:
+    """Таблиця для запису, пласке представлення [сторона, сильний Король, слабкий Король, фігура]"""
+    return np.load(path, mmap_mode='r+')
+
+
+def _flat_index(geometry: _Geometry, side: int, strong_king, weak_king, piece):
+    return ((side * SQUARES + strong_king) * SQUARES + weak_king) * geometry.size + piece
+
+
+def _init_slice(path: Path, piece_type: PieceType, nebula_mask: int, start: int, stop: int) -> int:
+    """
+    Неможливі позиції й мати для сильних Королів start..stop-1. Позиція ходу
+    сильної сторони неможлива, якщо слабкий Король під шахом. Повертає кількість матів.
+    """
+    geometry = _geometry(piece_type, nebula_mask)
+    table = _open_table(path)
+    weak_kings = np.arange(SQUARES)
+    piece_cells = geometry.dom_cell
+    mates = 0
+    for strong_king in range(start, stop):
+        attacked = _attacked_squares(geometry, strong_king)
+        adjacent = geometry.adjacent[strong_king]
+        legal_weak = (geometry.dom_valid[None, :] & (piece_cells[None, :] != weak_kings[:, None])
+                      & (piece_cells != strong_king)[None, :]
+                      & ((weak_kings != strong_king) & ~adjacent)[:, None])
+        in_check = attacked[:, piece_cells]
+        legal_strong = legal_weak & ~in_check
+
+        # Ходи слабкого Короля: у позицію без шаху або взяття незахищеної фігури
+        has_move = np.zeros_like(legal_weak)
+        for direction in range(len(_KING_STEPS)):
+            targets = geometry.king_next[:SQUARES, direction]
+            valid = targets >= 0
+            targets = np.where(valid, targets, 0)
+            capture = (piece_cells[None, :] == targets[:, None]) & ~adjacent[targets][:, None]
+            has_move |= valid[:, None] & (legal_strong[targets] | capture)
+
+        mate = legal_weak & in_check & ~has_move
+        mates += int(np.count_nonzero(mate))
+        table[SIDE_STRONG, strong_king] = np.where(legal_strong, CODE_DRAW, CODE_ILLEGAL)
+        table[SIDE_WEAK, strong_king] = np.where(mate, 1, np.where(legal_weak, CODE_DRAW, CODE_ILLEGAL))
+    table.flush()
+    return mates
+
+
+def _strong_predecessors(geometry: _Geometry, strong_king, weak_king, piece) -> np.ndarray:
+    """
+    Позиції ходу сильної сторони, з яких один хід веде в задані позиції ходу
+    слабкої: зворотні ходи Короля, фігури (промені симетричні) і телепортації
+    """
+    cells = geometry.dom_cell[piece]
+    timers = geometry.dom_timer[piece]
+    found = []
+
+    # Хід Короля: таймер фігури в туманності тікнув (0 - не тікає, 5 - фігура щойно увійшла)
+    previous = np.where(timers < 0, piece, np.where(timers == 0, piece, piece + 1))
+    previous[timers == NEBULA_ENTRY_TIMER] = -1
+    for direction in range(len(_KING_STEPS)):
+        kings = geometry.king_next[strong_king, direction]
+        keep = (kings >= 0) & (kings != weak_king) & (kings != cells) & (previous >= 0)
+        found.append(_flat_index(geometry, SIDE_STRONG, kings[keep], weak_king[keep], previous[keep]))
+
+    # Хід фігури: з клітинки в клітинку, з туманності (будь-який живий таймер) чи в туманність (таймер 5)
+    moved = (timers < 0) | (timers == NEBULA_ENTRY_TIMER)
+    source_timers = np.array([0, 2, 3, 4, 5])
+    for step, reach in geometry.move_rays:
+        index = np.flatnonzero(moved)
+        current = cells[index]
+        for _ in range(reach):
+            current = step[current]
+            keep = (current >= 0) & (current != strong_king[index]) & (current != weak_king[index])
+            index, current = index[keep], current[keep]
+            if not len(index):
+                break
+            on_square = current < SQUARES
+            found.append(_flat_index(geometry, SIDE_STRONG, strong_king[index[on_square]],
+                                     weak_king[index[on_square]], current[on_square]))
+            from_nebula = ~on_square & (timers[index] < 0)
+            if from_nebula.any():
+                bases = SQUARES + (current[from_nebula] - SQUARES) * NEBULA_TIMER_STATES
+                for timer in source_timers:
+                    found.append(_flat_index(geometry, SIDE_STRONG, strong_king[index[from_nebula]],
+                                             weak_king[index[from_nebula]], bases + timer))
+
+    # Телепортація: таймер після тіку мінус штраф за зміну ряду (скинутий таймер лишається 0)
+    in_nebula = np.flatnonzero(timers >= 0)
+    if len(in_nebula):
+        target_rows = np.array([_CELL_COORDS[cell][0] for cell in cells[in_nebula]])
+        for index, cell, row in geometry.nebulas:
+            keep = cells[in_nebula] != cell
+            source = in_nebula[keep]
+            penalty = (target_rows[keep] != row).astype(np.int64)
+            base = SQUARES + index * NEBULA_TIMER_STATES
+            timer_before = timers[source] + 1 + penalty
+            valid = (timer_before >= 2) & (timer_before <= NEBULA_ENTRY_TIMER)
+            found.append(_flat_index(geometry, SIDE_STRONG, strong_king[source[valid]],
+                                     weak_king[source[valid]], base + timer_before[valid]))
+            reset = source[timers[source] == 0]
+            found.append(_flat_index(geometry, SIDE_STRONG, strong_king[reset], weak_king[reset],
+                                     np.full(len(reset), base)))
+    return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+
+def _strong_step(path: Path, piece_type: PieceType, nebula_mask: int, start: int, stop: int,
+                 code: int) -> int:
+    """
+    Слабкі Королі start..stop-1: позиції ходу слабкої сторони зі значенням code
+    роблять попередників ходу сильної сторони виграними (code + 1). Повертає кількість нових.
+    """
+    geometry = _geometry(piece_type, nebula_mask)
+    table = _open_table(path)
+    strong_king, weak_king, piece = np.nonzero(table[SIDE_WEAK, :, start:stop] == code)
+    if not len(piece):
+        return 0
+    flat = table.reshape(-1)
+    found = _strong_predecessors(geometry, strong_king.astype(np.int64), weak_king + start,
+                                 piece.astype(np.int64))
+    found = np.unique(found[flat[found] == CODE_DRAW])
+    flat[found] = code + 1
+    table.flush()
+    return len(found)
+
+
+def _weak_step(path: Path, piece_type: PieceType, nebula_mask: int, start: int, stop: int,
+               code: int) -> int:
+    """
+    Сильні Королі start..stop-1: попередники (зворотні ходи слабкого Короля)
+    позицій ходу сильної сторони зі значенням code програні (code + 1), якщо
+    кожен хід слабкого Короля веде у виграну позицію. Повертає кількість нових.
+    """
+    geometry = _geometry(piece_type, nebula_mask)
+    table = _open_table(path)
+    strong_king, weak_king, piece = np.nonzero(table[SIDE_STRONG, start:stop] == code)
+    if not len(piece):
+        return 0
+    flat = table.reshape(-1)
+    strong_king = strong_king.astype(np.int64) + start
+    piece = piece.astype(np.int64)
+    cells = geometry.dom_cell[piece]
+
+    found = []
+    for direction in range(len(_KING_STEPS)):
+        kings = geometry.king_next[weak_king, direction]
+        keep = (kings >= 0) & (kings != strong_king) & (kings != cells)
+        found.append(_flat_index(geometry, SIDE_WEAK, strong_king[keep], kings[keep], piece[keep]))
+    candidates = np.unique(np.concatenate(found))
+    candidates = candidates[flat[candidates] == CODE_DRAW]
+
+    # Розбір кандидатів назад на (сильний Король, слабкий Король, фігура)
+    piece, rest = candidates % geometry.size, candidates // geometry.size
+    weak_king, strong_king = rest % SQUARES, rest // SQUARES % SQUARES
+    cells = geometry.dom_cell[piece]
+    lost = np.ones(len(candidates), dtype=np.bool_)
+    for direction in range(len(_KING_STEPS)):
+        kings = geometry.king_next[weak_king, direction]
+        valid = kings >= 0
+        capture = valid & (kings == cells)
+        lost &= ~(capture & ~geometry.adjacent[strong_king, np.where(valid, kings, 0)])
+        quiet = valid & ~capture
+        children = flat[_flat_index(geometry, SIDE_STRONG, strong_king[quiet], kings[quiet], piece[quiet])]
+        lost[np.flatnonzero(quiet)[children == CODE_DRAW]] = False
+    flat[candidates[lost]] = code + 1
+    table.flush()
+    return int(np.count_nonzero(lost))
+
+
+def generate_table(piece_type: PieceType, nebula_mask: int, directory: Path,
+                   workers: int = 1) -> Dict[str, object]:
+    """
+    Генерує таблицю KXK для маски відкритих туманностей у теку directory.
+    Фігурам, що не стають у туманності, маска не потрібна (завжди 0).
+    Повертає статистику: файл, розмір, мати, виграші, найдовший мат, час.
+    """
+    if not PIECE_RULES[piece_type].enters_nebula:
+        nebula_mask = 0
+    geometry = _geometry(piece_type, nebula_mask)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / table_name(piece_type, nebula_mask)
+    partial = path.with_suffix(".part")
+    start_time = time.perf_counter()
+
+    table = np.lib.format.open_memmap(partial, mode='w+', dtype=np.uint8,
+                                      shape=(2, SQUARES, SQUARES, geometry.size))
+    del table
+    slices = [(int(chunk[0]), int(chunk[-1]) + 1)
+              for chunk in np.array_split(np.arange(SQUARES), max(1, workers)) if len(chunk)]
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def run(function, *args) -> int:
+        """Задача для кожної частини дошки (процеси пулу або послідовно)"""
+        calls = [(partial, piece_type, nebula_mask, start, stop, *args) for start, stop in slices]
+        if executor is None:
+            return sum(function(*call) for call in calls)
+        return sum(executor.map(function, *zip(*calls)))
+
+    try:
+        mates = run(_init_slice)
+        # Фронт: програні позиції ходу слабкої сторони зі значенням code
+        code = 1
+        while True:
+            if code + 2 > MAX_CODE:
+                game_logger.warning(f"Таблиця {path.name}: мати довші за {MAX_CODE - 1} півходів лишилися нічиїми")
+                break
+            if not run(_strong_step, code) or not run(_weak_step, code + 1):
+                break
+            code += 2
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    table = np.load(partial, mmap_mode='r')
+    wins = int(np.count_nonzero((table[SIDE_STRONG] != CODE_DRAW) & (table[SIDE_STRONG] != CODE_ILLEGAL)))
+    longest = int(table[SIDE_STRONG][table[SIDE_STRONG] != CODE_ILLEGAL].max(initial=0))
+    del table
+    os.replace(partial, path)
+    stats = {'path': path, 'size_mb': path.stat().st_size / (1024 * 1024), 'mates': mates, 'wins': wins,
+             'longest_mate': max(0, longest - 1), 'time': time.perf_counter() - start_time}
+    game_logger.info(f"Згенеровано таблицю ендшпілю {path.name}: матів {mates}, виграшів {wins}, "
+                     f"найдовший мат {stats['longest_mate']} півходів, {stats['time']:.1f} с")
+    return stats
+
+
+class EndgameTablebases:
+    """Готові таблиці теки, відображені в пам'ять (np.load з mmap_mode - без завантаження)"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        # (тип фігури, маска туманностей) → таблиця [сторона, сильний Король, слабкий Король, фігура]
+        self.tables: Dict[Tuple[PieceType, int], np.ndarray] = {}
+        for path in sorted(self.directory.glob("K?K_*.npy")):
+            match = _TABLE_NAME.match(path.name)
+            if match is None or match.group(1) not in _LETTER_TYPES:
+                continue
+            piece_type, nebula_mask = _LETTER_TYPES[match.group(1)], int(match.group(2), 16)
+            table = np.load(path, mmap_mode='r')
+            if table.dtype != np.uint8 or table.shape != (2, SQUARES, SQUARES, _geometry(piece_type, nebula_mask).size):
+                game_logger.warning(f"Таблицю ендшпілю {path.name} пропущено: формат {table.dtype}, {table.shape}")
+                continue
+            self.tables[(piece_type, nebula_mask)] = table
+
+    @classmethod
+    def open_if_exists(cls, directory: Optional[Path]) -> Optional["EndgameTablebases"]:
+        """Таблиці теки або None, якщо теки чи таблиць немає"""
+        if directory is None or not Path(directory).is_dir():
+            return None
+        tablebases = cls(directory)
+        return tablebases if tablebases.tables else None
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def probe(self, game_state) -> Optional[ProbeResult]:
+        """
+        Точний результат позиції або None, якщо таблиці для неї немає: на дошці
+        не три фігури, є паралізовані, можливі воскресіння чи незавершений хід.
+        Виграш, який не встигає до ліміту півходів без взять, - нічия.
+        """
+        board = game_state.board
+        if len(board.pieces_by_id) != 3 or game_state.game_over:
+            return None
+        kings, piece = [], None
+        for piece_id, found in board.pieces_by_id.items():
+            if found.type == PieceType.KING:
+                kings.append(found)
+            elif piece is None and found.type in PIECE_RULES:
+                piece = found
+        if piece is None or len(kings) != 2:
+            return None
+        if (board.paralysis_turns[list(board.pieces_by_id)].any() or game_state.recently_resurrected_pieces
+                or game_state.soul_corners or game_state.moon_double_move_first_piece is not None
+                or game_state.eye_enhancement_selection or game_state.paralysis_selection
+                or game_state.can_resurrect_pawn(PieceColor.WHITE)
+                or game_state.can_resurrect_pawn(PieceColor.BLACK)):
+            return None
+
+        nebula_mask = sum(1 << index for index, name in enumerate(NEBULAS)
+                          if not game_state.nebula_blocked.get(name, True))
+        if bool(nebula_mask) != any(game_state.nebulas_activated.values()):
+            return None     # Телепортації можливі лише з активованими туманностями
+        if not PIECE_RULES[piece.type].enters_nebula:
+            nebula_mask = 0
+        table = self.tables.get((piece.type, nebula_mask))
+        if table is None:
+            return None
+
+        strong_king = kings[0] if kings[0].color == piece.color else kings[1]
+        weak_king = kings[1] if strong_king is kings[0] else kings[0]
+        side = SIDE_STRONG if game_state.current_player == piece.color else SIDE_WEAK
+        piece_cell = square_cell(*board.position_by_id[piece.id])
+        if piece_cell >= SQUARES:
+            timer = int(board.nebula_timers[piece.id])
+            # Таблиця зберігає таймер до тіку; на ході сильної сторони він уже тікнув
+            if side == SIDE_STRONG and timer > 0:
+                timer += 1
+            if timer >= NEBULA_TIMER_STATES:
+                return None
+            piece_cell = SQUARES + (piece_cell - SQUARES) * NEBULA_TIMER_STATES + timer
+        code = int(table[side, square_cell(*board.position_by_id[strong_king.id]),
+                         square_cell(*board.position_by_id[weak_king.id]), piece_cell])
+        if code == CODE_ILLEGAL:
+            return None
+        if code == CODE_DRAW:
+            return ProbeResult(0, 0)
+        plies = code - 1
+        limit = game_state.no_capture_draw_plies
+        if limit and game_state.no_capture_plies + plies > limit:
+            return ProbeResult(0, 0)
+        return ProbeResult(1 if side == SIDE_STRONG else -1, plies)
+
+    def best_move(self, game_state) -> Optional[Move]:
+        """
+        Найкращий хід за таблицями: найшвидший мат, інакше нічия, інакше
+        найдовший опір. None - позиції немає в таблицях.
+        """
+        if self.probe(game_state) is None:
+            return None
+        best_move, best_rank = None, None
+        snapshot = game_state.snapshot()
+        with quiet_mode():
+            for move in game_state.generate_legal_moves():
+                if not game_state.apply_move(move):
+                    continue
+                reply = self.probe(game_state)
+                if game_state.game_over and game_state.winner in ('white', 'black'):
+                    reply = ProbeResult(-1, 0)
+                elif reply is None:
+                    reply = ProbeResult(0, 0)   # Фігуру взято або вона зникла в туманності
+                game_state.restore_snapshot(snapshot)
+                # Ранг з точки зору того, хто ходить: виграш швидше - краще, програш довше - краще
+                rank = (-reply.result, reply.plies if reply.result > 0 else -reply.plies)
+                if best_rank is None or rank > best_rank:
+                    best_move, best_rank = move, rank
+        return best_move
+
+
+def main(argv: Optional[List[str]] = None):
+    from налаштування import AI_TABLEBASE_DIR
+
+    parser = argparse.ArgumentParser(description="Генерація таблиць ендшпілю ретроградним аналізом")
+    parser.add_argument("materials", nargs="*", default=list(DEFAULT_MATERIALS),
+                        help="набори KXK (X: " + ", ".join(_LETTER_TYPES) + ")")
+    parser.add_argument("--nebulas", type=lambda text: int(text, 0), nargs="+", default=list(DEFAULT_NEBULA_MASKS),
+                        help="маски відкритих туманностей (біти в порядку NEBULAS)")
+    parser.add_argument("--output", type=Path, default=Path(__file__).resolve().parent.parent / AI_TABLEBASE_DIR,
+                        help="тека таблиць")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="кількість процесів")
+    args = parser.parse_args(argv)
+
+    for material in args.materials:
+        piece_type = parse_material(material)
+        masks = sorted(set(args.nebulas)) if PIECE_RULES[piece_type].enters_nebula else [0]
+        for nebula_mask in masks:
+            stats = generate_table(piece_type, nebula_mask, args.output, args.workers)
+            print(f"♔ {stats['path'].name}: {stats['size_mb']:.0f} МБ, матів {stats['mates']}, "
+                  f"виграшів {stats['wins']}, найдовший мат {stats['longest_mate']} півходів, "
+                  f"{stats['time']:.1f} с")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тактичні ходи для пошуку ШІ гри "Вершителі часу"
+
+Тактичні ходи - ті, що змінюють матеріал або одразу виводять фігуру з гри:
+взяття, обмін Аристократа з ворожою фігурою, паралізація Тріумфатора.
+Саме їх продовжує форсований пошук (quiescence) після основної глибини.
+
+Оцінка виграшу ходу враховує побічні ефекти правил:
+- взяття Щита або Фурії знищує і прив'язаного партнера (handle_shield_fury_bond);
+- Блискавка, що бере Блискавку, гине разом із жертвою;
+- взяття Блискавки паралізує нападника (крім Короля) - це робить сам apply_move,
+  а відповідне взяття паралізованої фігури знаходить форсований пошук.
+
+Статичний розмін (SEE, static_exchange) оцінює серію взять на одній клітинці
+без make/unmake - лише на бітбордах дошки, тому його можна рахувати для кожного
+взяття в кожному вузлі. Модель атак спрощена до шаблонів генераторів ходів
+(обхід Місяця та умови шляху для стрибків Храму не перевіряються).
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from налаштування import PieceType, PieceColor, BOARD_ROWS, BOARD_COLS, NEBULAS
+from розташування_фігур import Move, is_valid_position
+from правила_фігур import BONDED_PARTNERS, get_knight_deltas
+
+TACTICAL_FLAGS = ('TRIUMPHATOR_PARALYSIS', 'ARISTOCRAT_EXCHANGE_ENEMY')
+
+# Паралізація не знищує фігуру - цінується нижче за взяття (як у жадібного гравця симулятора)
+PARALYSIS_VALUE_FACTOR = 0.25
+
+
+def is_tactical_move(move: Move) -> bool:
+    """Чи продовжує хід форсований пошук"""
+    return move.is_capture or move.special_move_flag in TACTICAL_FLAGS
+
+
+def _piece_on(board, square):
+    if square is None:
+        return None
+    piece_id = board.mailbox[square]
+    return board.pieces_by_id.get(int(piece_id)) if piece_id else None
+
+
+def capture_gain(board, move: Move, piece_values: Dict) -> float:
+    """
+    Оптимістичний матеріальний виграш тактичного ходу одразу після нього
+    (без відповіді суперника): жертва + прив'язаний партнер, мінус нападник
+    при взаємному знищенні Блискавок. Паралізація - частка цінності цілі.
+    """
+    victim = _piece_on(board, move.to_square)
+    if victim is None:
+        return 0.0
+    value = piece_values.get(victim.type, 0.0)
+
+    if move.special_move_flag == 'TRIUMPHATOR_PARALYSIS':
+        return value * PARALYSIS_VALUE_FACTOR
+    if move.special_move_flag == 'ARISTOCRAT_EXCHANGE_ENEMY':
+        # Обмін місцями нічого не знищує - виграш лише позиційний
+        return 0.0
+
+    partner_id = BONDED_PARTNERS.get(victim.id)
+    if partner_id is not None and partner_id in board.pieces_by_id:
+        value += piece_values.get(board.pieces_by_id[partner_id].type, 0.0)
+
+    attacker = _piece_on(board, move.from_square)
+    if attacker is not None and victim.type == PieceType.LIGHTNING and attacker.type == PieceType.LIGHTNING:
+        value -= piece_values.get(attacker.type, 0.0)
+    return value
+
+
+
+# ═══ СТАТИЧНИЙ РОЗМІН (SEE) ═══
+
+# Хто може брати фігуру в зоні її Щита (правила_фігур._can_attack_target)
+SHIELD_ZONE_ATTACKERS = frozenset((PieceType.KING, PieceType.EYE, PieceType.FURY))
+
+_ORTHOGONAL = ((0, 1), (0, -1), (1, 0), (-1, 0))
+_DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class AttackTables(NamedTuple):
+    """
+    Для кожної клітинки (індекс row * BOARD_COLS + col) - маски клітинок, з яких
+    фігура відповідного шаблону атакує її, та промені для ковзних фігур.
+    """
+    knight: List[int]         # Кінь, Всадник
+    king: List[int]           # Король, Фурія
+    orthogonal_1: List[int]   # Око, Храм
+    orthogonal_2: List[int]   # Посилене Око, Храм, Місяць
+    vertical_3: List[int]     # Храм
+    lightning: List[int]      # L-атаки Блискавки
+    pawn: Dict[PieceColor, List[int]]
+    orthogonal_rays: List[List[List[int]]]   # Тура, Ферзь
+    diagonal_rays: List[List[List[int]]]     # Слон, Ферзь, Всадник
+
+
+_ATTACK_TABLES: Optional[AttackTables] = None
+
+
+def _is_board_square(row: int, col: int) -> bool:
+    return is_valid_position(row, col) or (row, col) in NEBULAS.values()
+
+
+def _offsets_mask(row: int, col: int, offsets) -> int:
+    mask = 0
+    for dr, dc in offsets:
+        if _is_board_square(row + dr, col + dc):
+            mask |= 1 << ((row + dr) * BOARD_COLS + col + dc)
+    return mask
+
+
+def _rays(row: int, col: int, directions) -> List[List[int]]:
+    rays = []
+    for dr, dc in directions:
+        ray = []
+        r, c = row + dr, col + dc
+        while _is_board_square(r, c):
+            ray.append(1 << (r * BOARD_COLS + c))
+            r, c = r + dr, c + dc
+        rays.append(ray)
+    return rays
+
+
+def get_attack_tables() -> AttackTables:
+    """Таблиці атак будуються один раз на процес"""
+    global _ATTACK_TABLES
+    if _ATTACK_TABLES is None:
+        knight_offsets = get_knight_deltas()
+        king_offsets = _ORTHOGONAL + _DIAGONAL
+        lightning_offsets = [(3 * dr, dc) for dr, dc in _DIAGONAL] + [(dr, 3 * dc) for dr, dc in _DIAGONAL]
+        squares = [(row, col) for row in range(BOARD_ROWS) for col in range(BOARD_COLS)]
+
+        _ATTACK_TABLES = AttackTables(
+            knight=[_offsets_mask(r, c, knight_offsets) for r, c in squares],
+            king=[_offsets_mask(r, c, king_offsets) for r, c in squares],
+            orthogonal_1=[_offsets_mask(r, c, _ORTHOGONAL) for r, c in squares],
+            orthogonal_2=[_offsets_mask(r, c, [(2 * dr, 2 * dc) for dr, dc in _ORTHOGONAL]) for r, c in squares],
+            vertical_3=[_offsets_mask(r, c, [(3, 0), (-3, 0)]) for r, c in squares],
+            lightning=[_offsets_mask(r, c, lightning_offsets) for r, c in squares],
+            # Білий пішак б'є вгору (row - 1), тому атакує клітинку знизу (row + 1)
+            pawn={
+                PieceColor.WHITE: [_offsets_mask(r, c, [(1, -1), (1, 1)]) for r, c in squares],
+                PieceColor.BLACK: [_offsets_mask(r, c, [(-1, -1), (-1, 1)]) for r, c in squares],
+            },
+            orthogonal_rays=[_rays(r, c, _ORTHOGONAL) for r, c in squares],
+            diagonal_rays=[_rays(r, c, _DIAGONAL) for r, c in squares],
+        )
+    return _ATTACK_TABLES
+
+
+def _both_colors(board, *piece_types) -> int:
+    bitboards = board.bitboards
+    mask = 0
+    for piece_type in piece_types:
+        mask |= bitboards[PieceColor.WHITE][piece_type] | bitboards[PieceColor.BLACK][piece_type]
+    return mask
+
+
+def _piece_mask(board, piece_ids) -> int:
+    """Бітова маска клітинок фігур із заданими ID"""
+    mask = 0
+    for piece_id in piece_ids:
+        position = board.position_by_id.get(int(piece_id))
+        if position:
+            mask |= 1 << (position[0] * BOARD_COLS + position[1])
+    return mask
+
+
+def attackers_to(board, index: int, occupied: int, enhanced_eyes: int = 0) -> int:
+    """
+    Маска фігур (обох кольорів) серед occupied, що атакують клітинку index.
+    Ковзні фігури бачать крізь клітинки, прибрані з occupied (рентген після розміну).
+    """
+    tables = get_attack_tables()
+    attackers = tables.knight[index] & _both_colors(board, PieceType.KNIGHT, PieceType.RIDER)
+    attackers |= tables.king[index] & _both_colors(board, PieceType.KING, PieceType.FURY)
+    attackers |= tables.orthogonal_1[index] & _both_colors(board, PieceType.EYE, PieceType.TEMPLE)
+    attackers |= tables.orthogonal_2[index] & (_both_colors(board, PieceType.TEMPLE, PieceType.MOON) | enhanced_eyes)
+    attackers |= tables.vertical_3[index] & _both_colors(board, PieceType.TEMPLE)
+    attackers |= tables.lightning[index] & _both_colors(board, PieceType.LIGHTNING)
+    for color in (PieceColor.WHITE, PieceColor.BLACK):
+        attackers |= tables.pawn[color][index] & board.bitboards[color][PieceType.PAWN]
+
+    orthogonal_sliders = _both_colors(board, PieceType.ROOK, PieceType.QUEEN)
+    for ray in tables.orthogonal_rays[index]:
+        for bit in ray:
+            if occupied & bit:
+                attackers |= bit & orthogonal_sliders
+                break
+
+    diagonal_sliders = _both_colors(board, PieceType.BISHOP, PieceType.QUEEN, PieceType.RIDER)
+    riders = board.bitboards[PieceColor.WHITE][PieceType.RIDER], board.bitboards[PieceColor.BLACK][PieceType.RIDER]
+    white_pieces = board.all_pieces[PieceColor.WHITE]
+    for ray in tables.diagonal_rays[index]:
+        blocker = 0
+        for bit in ray:
+            if not occupied & bit:
+                continue
+            if not blocker:
+                attackers |= bit & diagonal_sliders
+                blocker = bit
+                continue
+            # Всадник перестрибує по діагоналі одну СВОЮ фігуру
+            rider = bit & (riders[0] if white_pieces & blocker else riders[1])
+            attackers |= rider
+            break
+
+    return attackers & occupied
+
+
+def _shield_zone_mask(board, color: PieceColor, occupied: int) -> int:
+    """Клітинки під захистом Щитів кольору color (зони 3×3 навколо Щитів, що лишились)"""
+    tables = get_attack_tables()
+    mask = 0
+    shields = board.bitboards[color][PieceType.SHIELD] & occupied
+    while shields:
+        bit = shields & -shields
+        index = bit.bit_length() - 1
+        mask |= tables.king[index] | bit
+        shields ^= bit
+    return mask
+
+
+def static_exchange(board, move: Move, piece_values: Dict) -> float:
+    """
+    Статичний розмін взяття move: матеріальний підсумок серії взять на клітинці
+    цілі, якщо обидві сторони щоразу беруть найдешевшою фігурою і можуть зупинитись.
+
+    Правила гри в моделі:
+    - фігура в туманності недосяжна для атак - розмін 0;
+    - фігуру в зоні її Щита можуть брати лише Король, Око і Фурія;
+    - паралізовані фігури не беруть (фігура, що взяла Блискавку, паралізована,
+      але вона вже стоїть на клітинці - далі її можуть лише взяти);
+    - Блискавка, що бере Блискавку, гине - клітинка порожніє, розмін закінчено;
+    - загибель Щита або Фурії знищує прив'язаного партнера (і він більше не атакує);
+    - Король не бере на клітинку, яку суперник ще атакує.
+    Не-взяття (паралізація, обмін Аристократа) оцінюються capture_gain.
+    """
+    if not move.is_capture:
+        return capture_gain(board, move, piece_values)
+
+    target_row, target_col = move.to_square
+    if board.is_nebula(target_row, target_col):
+        return 0.0
+    victim = _piece_on(board, move.to_square)
+    attacker = _piece_on(board, move.from_square)
+    if victim is None or attacker is None:
+        return 0.0
+
+    index = target_row * BOARD_COLS + target_col
+    occupied = board.all_pieces[PieceColor.WHITE] | board.all_pieces[PieceColor.BLACK]
+    paralyzed = _piece_mask(board, np.flatnonzero(board.paralysis_turns))
+    eyes = _both_colors(board, PieceType.EYE)
+    enhanced_eyes = _piece_mask(board, np.flatnonzero(board.enhanced)) & eyes
+    value_of = piece_values.get
+
+    def capture_value(piece) -> float:
+        """Цінність взятої фігури разом із прив'язаним партнером; партнер зникає з дошки"""
+        nonlocal occupied
+        value = value_of(piece.type, 0.0)
+        partner_id = BONDED_PARTNERS.get(piece.id)
+        if partner_id is not None:
+            partner_mask = _piece_mask(board, (partner_id,)) & occupied
+            if partner_mask:
+                value += value_of(board.pieces_by_id[partner_id].type, 0.0)
+                occupied &= ~partner_mask
+        return value
+
+    gains = [capture_value(victim)]
+    occupied &= ~(1 << (move.from_square[0] * BOARD_COLS + move.from_square[1]))
+    if victim.type == PieceType.LIGHTNING and attacker.type == PieceType.LIGHTNING:
+        return gains[0] - value_of(attacker.type, 0.0)
+
+    occupant = attacker
+    side = PieceColor.BLACK if attacker.color == PieceColor.WHITE else PieceColor.WHITE
+    capture_order = sorted((piece_type for piece_type in PieceType if piece_type != PieceType.EMPTY),
+                           key=lambda piece_type: value_of(piece_type, 0.0))
+
+    while True:
+        attackers = attackers_to(board, index, occupied, enhanced_eyes) & ~paralyzed
+        protected = _shield_zone_mask(board, occupant.color, occupied) >> index & 1
+
+        capturer_bit = 0
+        for piece_type in capture_order:
+            if protected and piece_type not in SHIELD_ZONE_ATTACKERS:
+                continue
+            candidates = attackers & board.bitboards[side][piece_type]
+            if candidates:
+                capturer_bit = candidates & -candidates
+                break
+        if not capturer_bit:
+            break
+
+        capturer_index = capturer_bit.bit_length() - 1
+        capturer = board.pieces_by_id[int(board.mailbox.flat[capturer_index])]
+        opponent = occupant.color
+        if capturer.type == PieceType.KING and attackers & board.all_pieces[opponent] & ~capturer_bit:
+            break
+
+        gains.append(capture_value(occupant) - gains[-1])
+        occupied &= ~capturer_bit
+        if occupant.type == PieceType.LIGHTNING and capturer.type == PieceType.LIGHTNING:
+            gains[-1] -= value_of(capturer.type, 0.0)
+            break
+        occupant = capturer
+        side = opponent
+
+    # Кожна сторона може не продовжувати розмін, якщо він їй невигідний
+    for depth in range(len(gains) - 1, 0, -1):
+        gains[depth - 1] = -max(-gains[depth - 1], gains[depth])
+    return gains[0]
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+"""
+Таблиця транспозицій для пошуку ШІ гри "Вершителі часу"
+
+Фіксований за розміром структурований масив NumPy, виділений один раз:
+- запис: перевірка (ключ XOR дані), глибина, оцінка, тип межі, код найкращого ходу, вік;
+- індекс кошика - молодші біти ключа (кількість кошиків - степінь двійки);
+- кошик з bucket_size записів: слот 0 зберігає найглибший результат (depth-preferred),
+  решта - слоти заміни: запис тієї самої позиції або порожній, інакше
+  найстаріше покоління, потім найменша глибина (при bucket_size = 2 -
+  заміна щоразу, always-replace);
+- новий пошук лише збільшує покоління (вік), таблиця не очищується -
+  записи старих поколінь просто перезаписуються першими.
+
+Спільна таблиця (shared=True) лежить у multiprocessing.shared_memory: процеси
+паралельного пошуку під'єднуються до неї за іменем (shared_name) і бачать
+записи одне одного. Блокувань немає - замість ключа в записі зберігається
+ключ XOR усі 64-бітні слова даних, а зондування перевіряє запис на знімку
+кошика. Розірваний запис (два процеси писали одночасно або читання збіглося
+з записом) не проходить перевірку і вважається промахом.
+"""
+
+from functools import reduce
+from multiprocessing import shared_memory
+from operator import xor
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from розташування_фігур import Move
+from логування import game_logger
+
+# Типи меж оцінки (0 - порожній запис)
+BOUND_NONE = 0
+BOUND_EXACT = 1
+BOUND_LOWER = 2   # Оцінка >= score (відсікання бета)
+BOUND_UPPER = 3   # Оцінка <= score (жоден хід не покращив альфа)
+
+DEFAULT_TABLE_SIZE_MB = 16
+DEFAULT_BUCKET_SIZE = 2
+
+# Розмір дошки для кодування ходу (22×20 клітинок + "немає клітинки" для воскресінь)
+BOARD_SQUARES = 22 * 20
+NO_SQUARE = BOARD_SQUARES
+
+# Вид ходу повного коду (encode_full_move): 0 - звичайний хід або взяття
+SPECIAL_MOVE_KINDS = ('TRIUMPHATOR_PARALYSIS', 'SOUL_RESURRECTION', 'TEMPLE_SWAP',
+                      'ARISTOCRAT_EXCHANGE_ALLY', 'ARISTOCRAT_EXCHANGE_ENEMY')
+_KIND_NEBULA_TELEPORT = len(SPECIAL_MOVE_KINDS) + 1
+_KIND_PAWN_RESURRECTION = len(SPECIAL_MOVE_KINDS) + 2
+_KIND_COUNT = len(SPECIAL_MOVE_KINDS) + 3
+# Кількість значень encode_move (з нулем)
+_MOVE_CODES = (BOARD_SQUARES + 1) ** 2 + 1
+_SPECIAL_KIND_INDEX = {flag: index + 1 for index, flag in enumerate(SPECIAL_MOVE_KINDS)}
+# Частина коду звичайного ходу над encode_move: вид 0, без душі, приземлення NO_SQUARE
+_PLAIN_MOVE_BASE = NO_SQUARE * _MOVE_CODES
+
+_DEPTH_SLOT = 0
+
+
+def make_entry_dtype(score_dtype=np.float32, depth_dtype=np.int16, move_dtype=np.int64) -> np.dtype:
+    """
+    Формат запису таблиці: слово перевірки + поля даних, доповнені до цілої
+    кількості 64-бітних слів (для XOR-перевірки).
+    """
+    fields = [
+        ('check', np.uint64),   # Ключ XOR усі слова даних
+        ('depth', depth_dtype),
+        ('score', score_dtype),
+        ('bound', np.uint8),
+        ('age', np.uint8),
+        ('move', move_dtype),   # Повний код ходу (encode_full_move, до 2^34)
+    ]
+    size = sum(np.dtype(field_type).itemsize for _, field_type in fields)
+    if size % 8:
+        fields.append(('padding', np.uint8, (8 - size % 8,)))
+    return np.dtype(fields)
+
+
+TT_ENTRY_DTYPE = make_entry_dtype()
+_ENTRY_FIELDS = ('check', 'depth', 'score', 'bound', 'age', 'move')
+
+
+class TTEntry(NamedTuple):
+    """Результат зондування таблиці"""
+    depth: int
+    score: float
+    bound: int
+    move: int
+
+
+def square_index(square) -> int:
+    """Плаский індекс клітинки дошки 22×20 (NO_SQUARE - клітинки немає)"""
+    return square[0] * 20 + square[1] if square is not None else NO_SQUARE
+
+
+def encode_move(move: Optional[Move]) -> int:
+    """
+    Код клітинок ходу: (звідки, куди) + 1, 0 - немає ходу. Ходи з однаковими
+    клітинками, але різними прапорцями мають один код - частина encode_full_move.
+    """
+    if move is None:
+        return 0
+    return square_index(move.from_square) * (BOARD_SQUARES + 1) + square_index(move.to_square) + 1
+
+
+def encode_full_move(move: Optional[Move]) -> int:
+    """
+    Повний код ходу (менше 2^34, 0 - немає ходу): encode_move, клітинка приземлення,
+    вид ходу і тип душі воскресіння. На відміну від encode_move, різні легальні
+    ходи позиції мають різні коди (таблиця транспозицій і вбивці, книга дебютів,
+    мітки датасету).
+    """
+    if move is None:
+        return 0
+    flag = move.special_move_flag
+    if flag is None and not move.is_nebula_teleport and not move.is_pawn_resurrection:
+        # Звичайний хід або взяття (найчастіше у пошуку): без приземлення і душі
+        return _PLAIN_MOVE_BASE + encode_move(move)
+    if flag in _SPECIAL_KIND_INDEX:
+        kind = _SPECIAL_KIND_INDEX[flag]
+    elif move.is_nebula_teleport:
+        kind = _KIND_NEBULA_TELEPORT
+    elif move.is_pawn_resurrection:
+        kind = _KIND_PAWN_RESURRECTION
+    else:
+        kind = 0
+    soul = int(move.resurrected_type) + 1 if move.resurrected_type is not None else 0
+    code = (soul * _KIND_COUNT + kind) * (BOARD_SQUARES + 1) + square_index(move.landing_square)
+    return code * _MOVE_CODES + encode_move(move)
+
+
+def _entry_key(words) -> int:
+    """Ключ запису: XOR слова перевірки з усіма словами даних"""
+    return reduce(xor, words)
+
+
+class TranspositionTable:
+    """Таблиця транспозицій фіксованого розміру (size_mb мегабайт), за потреби спільна між процесами"""
+
+    def __init__(self, size_mb: float = DEFAULT_TABLE_SIZE_MB, bucket_size: int = DEFAULT_BUCKET_SIZE,
+                 entry_dtype: np.dtype = TT_ENTRY_DTYPE, shared: bool = False,
+                 shared_name: Optional[str] = None):
+        """
+        Args:
+            size_mb: Розмір таблиці в мегабайтах
+            bucket_size: Записів у кошику (>= 2: слот глибини + слоти заміни)
+            entry_dtype: Формат запису (make_entry_dtype)
+            shared: Створити таблицю в спільній пам'яті
+            shared_name: Під'єднатися до вже створеної спільної таблиці з цим іменем
+                (size_mb, bucket_size і entry_dtype мають збігатися з творцем)
+        """
+        entry_dtype = np.dtype(entry_dtype)
+        missing = [field for field in _ENTRY_FIELDS if field not in entry_dtype.names]
+        if missing or entry_dtype.names[0] != 'check' or entry_dtype.itemsize % 8:
+            raise ValueError(f"Формат запису має починатися з 'check', містити {_ENTRY_FIELDS} "
+                             f"і займати ціле число 64-бітних слів: {entry_dtype}")
+        if bucket_size < 2:
+            raise ValueError(f"Кошик має містити щонайменше 2 записи, отримано {bucket_size}")
+
+        self.size_mb = size_mb
+        self.bucket_size = bucket_size
+        self.entry_dtype = entry_dtype
+        bucket_bytes = entry_dtype.itemsize * bucket_size
+        buckets = max(1, int(size_mb * 1024 * 1024) // bucket_bytes)
+        # Кількість кошиків - степінь двійки, щоб індекс брався маскою
+        self.bucket_count = 1 << (buckets.bit_length() - 1)
+        self._mask = self.bucket_count - 1
+        nbytes = self.bucket_count * bucket_bytes
+
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._owner = shared_name is None
+        if shared or shared_name is not None:
+            self._shm = shared_memory.SharedMemory(name=shared_name, create=self._owner, size=nbytes)
+            self.table = np.ndarray((self.bucket_count, bucket_size), dtype=entry_dtype, buffer=self._shm.buf)
+            if self._owner:
+                self.table.fill(0)
+        else:
+            self.table = np.zeros((self.bucket_count, bucket_size), dtype=entry_dtype)
+        # Ті самі байти як 64-бітні слова: [кошик, слот, слово]
+        words_per_entry = entry_dtype.itemsize // 8
+        self._words = self.table.view(np.uint64).reshape(self.bucket_count, bucket_size, words_per_entry)
+        # Чернетка запису: поля заповнюються тут, у таблицю копіюється весь запис разом
+        self._scratch = np.zeros(1, dtype=entry_dtype)
+        self._scratch_words = self._scratch.view(np.uint64)
+        self.generation = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        if self._owner:
+            game_logger.info(f"Ініціалізовано таблицю транспозицій: {self.bucket_count} кошиків, "
+                             f"{self.table.nbytes / (1024 * 1024):.1f} МБ"
+                             f"{', спільна ' + self.shared_name if self._shm else ''}")
+
+    @property
+    def shared_name(self) -> Optional[str]:
+        """Ім'я спільної пам'яті (None - таблиця приватна)"""
+        return self._shm.name if self._shm is not None else None
+
+    def new_search(self, generation: Optional[int] = None):
+        """
+        Нове покоління пошуку: записи попередніх пошуків стають кандидатами на заміну.
+        generation задає покоління явно (процеси спільної таблиці беруть його у творця).
+        """
+        self.generation = (self.generation + 1) & 0xFF if generation is None else generation & 0xFF
+        self.probes = self.hits = self.stores = 0
+
+    def clear(self):
+        """Повне очищення (нова партія)"""
+        self.table.fill(0)
+        self.generation = 0
+        self.probes = self.hits = self.stores = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Шукає запис для ключа в слотах кошика"""
+        self.probes += 1
+        # Знімок кошика: перевірка і читання полів з однієї копії - запис,
+        # що змінився після копіювання, не змішається з перевіреним
+        bucket = self._words[key & self._mask].copy()
+        for slot, words in enumerate(bucket.tolist()):
+            if _entry_key(words) != key:
+                continue
+            entry = bucket[slot].view(self.entry_dtype)[0]
+            if entry['bound'] != BOUND_NONE:
+                self.hits += 1
+                return TTEntry(int(entry['depth']), float(entry['score']),
+                               int(entry['bound']), int(entry['move']))
+        return None
+
+    def store(self, key: int, depth: int, score: float, bound: int, move_code: int = 0):
+        """
+        Зберігає результат. Слот глибини замінюється, якщо там та сама позиція,
+        запис старого покоління або не глибший результат; інакше пише в слот заміни.
+        """
+        self.stores += 1
+        index = key & self._mask
+        bucket = self._words[index].copy()
+        deep_words = bucket[_DEPTH_SLOT]
+        deep = deep_words.view(self.entry_dtype)[0]
+        deep_key = _entry_key(deep_words.tolist())
+        if (deep['bound'] == BOUND_NONE or deep_key == key
+                or deep['age'] != self.generation or depth >= deep['depth']):
+            slot = _DEPTH_SLOT
+            # Не втрачаємо найкращий хід позиції, якщо новий запис його не знає
+            if move_code == 0 and deep_key == key:
+                move_code = int(deep['move'])
+        else:
+            slot = self._replacement_slot(key, bucket)
+
+        scratch = self._scratch[0]
+        scratch['check'] = 0
+        scratch['depth'] = depth
+        scratch['score'] = score
+        scratch['bound'] = bound
+        scratch['age'] = self.generation
+        scratch['move'] = move_code
+        scratch['check'] = key ^ _entry_key(self._scratch_words.tolist())
+        self.table[index, slot] = scratch
+
+    def _replacement_slot(self, key: int, bucket: np.ndarray) -> int:
+        """Слот заміни кошика (знімок bucket): та сама позиція або порожній, інакше найстаріше покоління, потім найменша глибина"""
+        if self.bucket_size == 2:
+            return 1
+        best_slot, best_rank = 1, None
+        for slot in range(1, self.bucket_size):
+            words = bucket[slot]
+            entry = words.view(self.entry_dtype)[0]
+            if entry['bound'] == BOUND_NONE or _entry_key(words.tolist()) == key:
+                return slot
+            # Вік у поколіннях (покоління - байт, що переповнюється) - старші першими
+            rank = (-((self.generation - int(entry['age'])) & 0xFF), int(entry['depth']))
+            if best_rank is None or rank < best_rank:
+                best_slot, best_rank = slot, rank
+        return best_slot
+
+    def fill_rate(self) -> float:
+        """Частка зайнятих записів (усіх поколінь)"""
+        return float(np.count_nonzero(self.table['bound'] != BOUND_NONE)) / self.table.size
+
+    def get_stats(self) -> Dict[str, float]:
+        """Статистика таблиці: зондування, влучання, записи, заповненість"""
+        return {
+            'size_mb': self.table.nbytes / (1024 * 1024),
+            'entries': self.table.size,
+            'shared': self._shm is not None,
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'hit_rate': self.hits / max(1, self.probes),
+            'fill_rate': self.fill_rate(),
+        }
+
+    def close(self):
+        """Від'єднує спільну пам'ять (творець таблиці також звільняє її)"""
+        if self._shm is None:
+            return
+        # Масиви-представлення мають зникнути до закриття буфера
+        self.table = self._words = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None